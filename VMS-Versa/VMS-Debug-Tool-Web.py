@@ -41,18 +41,99 @@ Technical Details:
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 import threading
-import queue
 import time
-import paramiko
+import sys
 import json
-import re
-from datetime import datetime
+import fnmatch
+import itertools
+import shlex
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 import os
 
+from tenant_snapshot_store import TenantSnapshotStore
+from redis_entry_decoder import EntryDataDecoder
+from tenant_model import TenantModel, LOOKUP_KINDS
+from command_cache import CommandResultCache
+from ssh_transport import (connect_ssh_client, get_profile, set_host_profile, run_exec_command, ExecStream,
+                           DEFAULT_PROFILE)
+from pod_resource_sampler import PodResourceSampler
+from vms_output_parsers import (clean_ansi_codes, parse_kubectl_services, parse_redis_services,
+                                parse_configmap_listing, parse_hgetall_lines, clean_log_lines)
+from log_template_miner import LogTemplateMiner
+from vms_log_index import LogIndex, merge_queries, parse_time_range, level_code
+from support_bundle import SupportBundle
+from redis_keyspace_profiler import KeyspaceProfiler, render_report
+from rdb_key_index import RDBKeyIndex
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'vms-debug-tool-secret-key'
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+# Shared EntryData decoder - memoized results are reused across client sessions
+entry_decoder = EntryDataDecoder()
+
+# Idle session reaper: sessions without client activity for this long are closed,
+# and the least recently active sessions are closed while the total estimated
+# session memory is above the budget
+SESSION_IDLE_TIMEOUT = int(os.environ.get('VMS_SESSION_IDLE_TIMEOUT', 1800))
+SESSION_MEMORY_BUDGET_MB = int(os.environ.get('VMS_SESSION_MEMORY_BUDGET_MB', 512))
+SESSION_REAPER_INTERVAL = 60
+
+# Support bundles can only be loaded from under this directory on the tool's host
+SUPPORT_BUNDLE_DIRECTORY = os.environ.get('VMS_SUPPORT_BUNDLE_DIR', 'support_bundles')
+
+
+def _deep_sizeof(obj, seen=None):
+    """Approximate size in bytes of a structure of dicts, lists, tuples and scalars"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(key, seen) + _deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(_deep_sizeof(getattr(obj, slot, None), seen) for slot in obj.__slots__)
+    elif hasattr(obj, '__dict__'):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+# Shared read-only command results, keyed by (host, command) across client sessions
+command_cache = CommandResultCache()
+
+# Redis hashes fetched per redis-cli loop command when decoding in bulk
+REDIS_DECODE_FETCH_BATCH = 200
+
+# Cross-tenant Redis key search. sshd allows 10 sessions per connection by
+# default (MaxSessions) and the interactive shell already uses one.
+REDIS_SEARCH_MAX_PARALLEL = 8
+REDIS_SEARCH_TENANT_TIMEOUT = 20
+REDIS_SEARCH_MAX_HITS_PER_TENANT = 5000
+REDIS_SEARCH_EMIT_BATCH = 200
+
+# Redis keyspace profiler (sampled TYPE / MEMORY USAGE / TTL per key prefix)
+REDIS_PROFILE_SAMPLE_RATE = 0.05
+REDIS_PROFILE_PREFIX_LIMIT = 200
+
+# Offline RDB snapshot analysis ('redis-cli --rdb' streamed into a SQLite key index)
+REDIS_RDB_READ_TIMEOUT = 120
+REDIS_RDB_DIRECTORY = "rdb_snapshots"
+REDIS_RDB_SEARCH_LIMIT = 500
+
+# Log template mining ('templates' log filter)
+LOG_TEMPLATE_TIMEOUT = 60
+LOG_TEMPLATE_LIMIT = 200
+
+# Structured log queries: files indexed in parallel over exec channels
+LOG_QUERY_MAX_PARALLEL = 4
+LOG_QUERY_TIMEOUT = 60
+LOG_QUERY_RESULT_LIMIT = 2000
+
 class VMSDebugWeb:
     def __init__(self, session_id=None):
         # SSH connection variables
@@ -60,6 +141,10 @@ class VMSDebugWeb:
         self.shell = None
         self.connected = False
         
+        # SSH transport profile (compression, window/packet sizes, read size)
+        self.transport_profile = DEFAULT_PROFILE
+        self.recv_chunk_size = get_profile(DEFAULT_PROFILE)['recv_chunk_size']
+        
         # Session tracking
         self.session_id = session_id
         
@@ -69,11 +154,29 @@ class VMSDebugWeb:
         self.ssh_password = ""
         self.admin_password = ""
         
-        # Tenant database
+        # Background pod CPU/memory sampler and the view the client is looking at
+        self.pod_sampler = None
+        self.pod_sampler_view = {'namespace': None, 'top_n': 10}
+        
+        # Time-indexed log files for range/level queries: path -> (lines, LogIndex)
+        self.log_indexes = {}
+        
+        # Offline support bundle answering commands instead of SSH (None when live)
+        self.support_bundle = None
+        
+        # Key indexes of the last RDB snapshot analyzed per tenant
+        self.rdb_indexes = {}
+        
+        # Tenant database (assignments keep the indexed tenant model in sync)
+        self.tenant_model = TenantModel()
         self.tenant_database = {}
         
-        # Queue for thread communication
-        self.output_queue = queue.Queue()
+        # Last client activity, used by the idle session reaper
+        self.last_activity = time.time()
+        
+        # Exec channels currently open on the SSH connection (besides the interactive shell)
+        self.open_exec_channels = 0
+        self._exec_channels_lock = threading.Lock()
         
         # Create Logs directory if it doesn't exist
         self.logs_dir = "Logs"
@@ -84,6 +187,45 @@ class VMSDebugWeb:
         
         # Initialize log file if it doesn't exist
         self._initialize_log_file()
+        
+        # Versioned tenant snapshots (one compact delta per tenant data build)
+        self.snapshot_store = self._open_snapshot_store()
+    
+    @property
+    def tenant_database(self):
+        return self._tenant_database
+    
+    @tenant_database.setter
+    def tenant_database(self, tenant_data):
+        self._tenant_database = tenant_data
+        self.tenant_model.load(tenant_data)
+    
+    def lookup_tenants(self, kind, value):
+        """
+        Find tenants by service name, Redis IP, ConfigMap name or namespace prefix
+        
+        Returns:
+            dict: kind, value, matching tenants with a short summary each
+        """
+        value = (value or '').strip()
+        if kind not in LOOKUP_KINDS:
+            return {'kind': kind, 'value': value, 'tenants': [], 'error': f'Unknown lookup type: {kind}'}
+        if not value:
+            return {'kind': kind, 'value': value, 'tenants': [], 'error': 'No lookup value specified'}
+        
+        matches = []
+        for tenant_name in self.tenant_model.lookup(kind, value):
+            record = self.tenant_model.get(tenant_name)
+            if record is None:
+                continue
+            matches.append({
+                'tenant': tenant_name,
+                'services': len(record.services),
+                'redis_ip': record.redis_ip,
+                'configmaps': len(record.configmaps or ())
+            })
+        
+        return {'kind': kind, 'value': value, 'tenants': matches, 'error': None}
     
     def _ensure_logs_directory(self):
         """Create Logs directory if it doesn't exist"""
@@ -98,9 +240,52 @@ class VMSDebugWeb:
             # Fall back to current directory
             self.logs_dir = "."
     
+    def touch(self):
+        """Record client activity so the session is not reaped as idle"""
+        self.last_activity = time.time()
+    
+    def _track_exec_channel(self, delta):
+        with self._exec_channels_lock:
+            self.open_exec_channels += delta
+    
+    def session_summary(self):
+        """Resource usage of this session for the /sessions admin view"""
+        channels = self.open_exec_channels + (1 if self.shell else 0)
+        
+        return {
+            'session_id': self.session_id,
+            'host': self.host,
+            'username': self.username,
+            'connected': self.connected,
+            'transport_profile': self.transport_profile,
+            'idle_seconds': round(time.time() - self.last_activity),
+            'open_channels': channels,
+            'tenants': len(self.tenant_database),
+            'pod_sampler_running': bool(self.pod_sampler and self.pod_sampler.running),
+            'memory_bytes': self.estimate_memory()
+        }
+    
+    def estimate_memory(self):
+        """Approximate memory held by this session's data (tenant data, model, log and RDB indexes, sampler history)"""
+        # One seen set: in bundle mode log_indexes holds the bundle's own LogIndex objects
+        seen = set()
+        total = _deep_sizeof(self.tenant_database, seen)
+        total += _deep_sizeof(self.tenant_model._tenants, seen)
+        # Copies: request threads may add indexes while the reaper measures
+        total += _deep_sizeof(dict(self.log_indexes), seen)
+        total += _deep_sizeof(dict(self.rdb_indexes), seen)
+        bundle = self.support_bundle
+        if bundle:
+            total += _deep_sizeof(dict(bundle._log_indexes), seen)
+        if self.pod_sampler:
+            for series in list(self.pod_sampler._series.values()):
+                total += sum(sys.getsizeof(getattr(series, metric)) for metric in ('timestamps', 'cpu', 'memory', 'restarts'))
+        return total
+    
     def log_output(self, message, tag="normal"):
         """Add message to output display with timestamp"""
         timestamp = datetime.now().strftime("%H:%M:%S")
+        self.touch()
         
         # Emit to web interface - use instance session_id if available
         if self.session_id:
@@ -120,6 +305,13 @@ class VMSDebugWeb:
         # Also write to persistent log file
         self._write_to_log_file(message, tag)
     
+    def _emit_to_session(self, event, data):
+        """Emit an event to this client's session (or to all clients without a session)"""
+        if self.session_id:
+            socketio.emit(event, data, room=self.session_id)
+        else:
+            socketio.emit(event, data)
+    
     def _write_to_log_file(self, message, tag="normal"):
         """Write message to persistent log file with timestamp and decorative separator"""
         try:
@@ -165,6 +357,62 @@ class VMSDebugWeb:
         except Exception:
             return 0
     
+    def _open_snapshot_store(self):
+        """Open the tenant snapshot store in the Logs directory"""
+        try:
+            return TenantSnapshotStore(os.path.join(self.logs_dir, "tenant_snapshots.db"))
+        except Exception as e:
+            print(f"Warning: Could not open tenant snapshot store: {str(e)}")
+            return None
+    
+    def _record_tenant_snapshot(self, tenant_data, execution_count=None):
+        """Record the current tenant data build as a delta snapshot"""
+        if not self.snapshot_store:
+            return None
+        
+        try:
+            snapshot = self.snapshot_store.record_snapshot(
+                self.host,
+                tenant_data,
+                session_info=f"Host: {self.host}, User: {self.username}",
+                execution_count=execution_count
+            )
+            if snapshot['previous_id']:
+                self.log_output(f"Snapshot #{snapshot['id']} recorded: {snapshot['added_count']} added, "
+                                f"{snapshot['removed_count']} removed since snapshot #{snapshot['previous_id']}", "success")
+            else:
+                self.log_output(f"Snapshot #{snapshot['id']} recorded (first snapshot for {self.host})", "success")
+            return snapshot
+        except Exception as e:
+            self.log_output(f"Error recording tenant snapshot: {str(e)}", "error")
+            return None
+    
+    def list_tenant_snapshots(self, limit=100):
+        """List stored tenant snapshots for the connected host"""
+        if not self.snapshot_store:
+            return []
+        return self.snapshot_store.list_snapshots(host=self.host or None, limit=limit)
+    
+    def compare_tenant_snapshots(self, from_id, to_id):
+        """Compare two stored tenant snapshots of the connected host"""
+        if not self.snapshot_store:
+            return {'error': 'Snapshot store is not available'}
+        
+        self.log_output(f"Comparing tenant snapshots #{from_id} -> #{to_id}", "info")
+        # Only this session's host: snapshot ids of other hosts are not found
+        return self.snapshot_store.diff_snapshots(from_id, to_id, host=self.host or '')
+    
+    def compare_tenant_snapshots_since(self, hours):
+        """Changes on the connected host from its last snapshot at least `hours` old to its latest one"""
+        if not self.snapshot_store:
+            return {'error': 'Snapshot store is not available'}
+        if not self.host:
+            return {'error': 'Not connected to a host'}
+        
+        since = (datetime.now() - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S")
+        self.log_output(f"Comparing tenant data of {self.host} since {since}", "info")
+        return self.snapshot_store.diff_since(self.host, since)
+    
     def _initialize_log_file(self):
         """Initialize the log file with a header if it doesn't exist or is empty"""
         try:
@@ -293,7 +541,7 @@ Note: Each new session and operation is marked with decorative separators
                 'technical_error': str(error)
             }
     
-    def connect_to_server(self, host, username, ssh_password, admin_password):
+    def connect_to_server(self, host, username, ssh_password, admin_password, transport_profile=None):
         """Connect to the SSH server in a separate thread"""
         self.host = host
         self.username = username
@@ -306,20 +554,16 @@ Note: Each new session and operation is marked with decorative separators
         try:
             self.log_output("Attempting SSH connection...", "info")
             
-            # Create SSH client
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Connect
-            self.ssh_client.connect(
-                hostname=host,
-                username=username,
-                password=ssh_password,
-                look_for_keys=False,
-                timeout=10
-            )
+            # An explicit profile choice is remembered for this host; 'auto' uses the host mapping
+            if transport_profile:
+                set_host_profile(host, transport_profile)
+            
+            # Create SSH client and connect using the host's transport profile
+            self.ssh_client, self.transport_profile = connect_ssh_client(host, username, ssh_password, timeout=10)
+            self.recv_chunk_size = get_profile(self.transport_profile)['recv_chunk_size']
             
             self.log_output(f"SSH connection successful to {host}", "success")
+            self.log_output(f"Transport profile: {self.transport_profile} ({get_profile(self.transport_profile)['description']})", "info")
             
             # Create shell
             self.shell = self.ssh_client.invoke_shell()
@@ -392,8 +636,12 @@ Note: Each new session and operation is marked with decorative separators
         if not self.connected:
             return
         
+        self.stop_pod_sampler()
+        
         try:
             self.log_output("Disconnecting from server...", "info")
+            if self.support_bundle:
+                self.support_bundle.close()
             if self.shell:
                 self.shell.send("exit\n")
                 time.sleep(0.5)
@@ -409,6 +657,9 @@ Note: Each new session and operation is marked with decorative separators
         self.connected = False
         self.ssh_client = None
         self.shell = None
+        self.support_bundle = None
+        self.log_indexes = {}
+        self._remove_rdb_indexes()
         
         self.log_output("Disconnected from server", "info")
         if self.session_id:
@@ -416,6 +667,58 @@ Note: Each new session and operation is marked with decorative separators
         else:
             socketio.emit('connection_status', {'connected': False, 'message': 'Disconnected'})
     
+    def _remove_rdb_indexes(self):
+        """Delete the RDB index files of this session; they are only reachable through rdb_indexes"""
+        indexes, self.rdb_indexes = self.rdb_indexes, {}
+        for index in indexes.values():
+            try:
+                index.remove()
+            except OSError as e:
+                self.log_output(f"Could not remove RDB index {index.db_path}: {str(e)}", "error")
+    
+    def load_support_bundle(self, bundle_path):
+        """
+        Work offline from a support bundle instead of an SSH connection
+        
+        The bundle (a tarball or unpacked directory of kubectl outputs, Redis
+        dumps and /var/log/versa/vms files) answers every command the tool would
+        send to the VMS, so tenant, ConfigMap, Redis and log views work unchanged.
+        Only the inventory is parsed here; log files are indexed when first queried.
+        
+        Returns:
+            dict: bundle summary, or None on error
+        """
+        if self.connected:
+            self.disconnect_from_server()
+        
+        # The host keys the shared command cache: the real path and mtime tell bundles
+        # with the same name (or a bundle replaced in place) apart
+        real_path = os.path.realpath(bundle_path)
+        modified = int(os.path.getmtime(real_path)) if os.path.exists(real_path) else 0
+        self.host = f"bundle:{real_path}@{modified}"
+        self.start_new_session_log()
+        
+        try:
+            self.log_output(f"Loading support bundle {bundle_path}...", "info")
+            start_time = time.time()
+            bundle = SupportBundle(bundle_path)
+            summary = bundle.load()
+        except Exception as e:
+            self.log_output(f"Error loading support bundle: {str(e)}", "error")
+            self._emit_to_session('connection_status', {'connected': False, 'message': f'Bundle not loaded: {str(e)}'})
+            return None
+        
+        summary['elapsed'] = round(time.time() - start_time, 2)
+        self.support_bundle = bundle
+        self.log_indexes = {}
+        self.connected = True
+        
+        self.log_output(f"-> Support bundle loaded: {summary['tenants']} tenants, {summary['configmaps']} configmaps, "
+                        f"{summary['log_files']} log files in {summary['elapsed']}s", "success")
+        self._emit_to_session('connection_status', {'connected': True, 'offline': True,
+                                                    'message': f"Offline: {summary['name']}"})
+        return summary
+    
     def run_kubectl_commands(self):
         """Run basic kubectl commands"""
         if not self.connected:
@@ -442,12 +745,8 @@ Note: Each new session and operation is marked with decorative separators
                 self.log_output(f"Running: {command}", "command")
                 self.log_output(f"Description: {description}", "info")
                 
-                # Execute command
-                self.shell.send(f"{command}\n")
-                time.sleep(3)
-                
-                # Collect output
-                output = self._collect_command_output()
+                # Execute command (read-only, so a recent result from any session is reused)
+                output = self._run_cached_command(command, wait=3)
                 
                 # Clean and display output
                 cleaned_output = self._clean_ansi_codes(output)
@@ -484,9 +783,7 @@ Note: Each new session and operation is marked with decorative separators
             
             # Step 1: Get all services
             self.log_output("Step 1: Getting all services...", "command")
-            self.shell.send("kubectl get svc -A\n")
-            time.sleep(2)
-            kubectl_output = self._collect_command_output()
+            kubectl_output = self._run_cached_command("kubectl get svc -A")
             
             # Parse tenant services
             tenant_data = self._parse_kubectl_output(kubectl_output)
@@ -574,11 +871,12 @@ Note: Each new session and operation is marked with decorative separators
             try:
                 # Add timestamp header to the JSON file
                 current_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                execution_count = self._get_execution_count() + 1
                 tenant_data_with_meta = {
                     "_metadata": {
                         "last_updated": current_timestamp,
                         "session_info": f"Host: {self.host}, User: {self.username}",
-                        "execution_count": self._get_execution_count() + 1
+                        "execution_count": execution_count
                     },
                     "tenant_data": tenant_data
                 }
@@ -594,6 +892,10 @@ Note: Each new session and operation is marked with decorative separators
                 self.log_output(f"Tenant data updated in: {filepath}", "success")
             except Exception as e:
                 self.log_output(f"Error saving tenant data: {str(e)}", "error")
+                execution_count = None
+            
+            # Keep a versioned delta of this build for change queries
+            self._record_tenant_snapshot(tenant_data, execution_count)
             
             self.log_output("Tenant data building completed successfully!", "success")
             
@@ -610,15 +912,48 @@ Note: Each new session and operation is marked with decorative separators
                 socketio.emit('tenant_database_updated', {'tenants': list(tenant_data.keys())}, room=self.session_id)
                 # Send log files data to web interface
                 socketio.emit('log_files_response', {'log_files': log_files}, room=self.session_id)
+                # Send snapshot history so changes can be compared
+                socketio.emit('snapshot_list_response', {'snapshots': self.list_tenant_snapshots()}, room=self.session_id)
             else:
                 socketio.emit('tenant_data', {'data': tenant_data, 'filename': filename})
                 socketio.emit('tenant_database_updated', {'tenants': list(tenant_data.keys())})
                 # Send log files data to web interface
                 socketio.emit('log_files_response', {'log_files': log_files})
+                # Send snapshot history so changes can be compared
+                socketio.emit('snapshot_list_response', {'snapshots': self.list_tenant_snapshots()})
             
         except Exception as e:
             self.log_output(f"Error building tenant data: {str(e)}", "error")
     
+    def _run_shell_command(self, command, wait=2, timeout=10):
+        """Send a command to the interactive shell and collect its output"""
+        if self.support_bundle:
+            return self.support_bundle.run_command(command)
+        self.shell.send(f"{command}\n")
+        time.sleep(wait)
+        return self._collect_command_output(timeout=timeout)
+    
+    def _run_cached_command(self, command, wait=2, timeout=10):
+        """
+        Run a read-only command through the shared command result cache
+        
+        A result younger than the cache TTL (from any session on the same host
+        as the same user) is returned without touching the VMS; concurrent
+        identical requests share a single run.
+        """
+        output, age = command_cache.get_or_run(
+            self.host, self.username, command, lambda: self._run_shell_command(command, wait=wait, timeout=timeout)
+        )
+        if age is not None:
+            self.log_output(f"  (cached result of '{command}', {age:.0f}s old)", "info")
+        return output
+    
+    def clear_command_cache(self):
+        """Drop cached command results of this user on the connected host"""
+        removed = command_cache.invalidate(host=self.host, username=self.username)
+        self.log_output(f"Command cache cleared for {self.host}: {removed} cached results removed", "info")
+        return removed
+    
     def _collect_command_output(self, timeout=10):
         """Collect output from shell command"""
         output = ""
@@ -626,7 +961,7 @@ Note: Each new session and operation is marked with decorative separators
         
         while time.time() - start_time < timeout:
             if self.shell.recv_ready():
-                chunk = self.shell.recv(4096).decode('utf-8', errors='ignore')
+                chunk = self.shell.recv(self.recv_chunk_size).decode('utf-8', errors='ignore')
                 output += chunk
                 if chunk.endswith('# ') or chunk.endswith('$ '):
                     break
@@ -636,100 +971,23 @@ Note: Each new session and operation is marked with decorative separators
     
     def _clean_ansi_codes(self, text):
         """Remove ANSI escape codes from text"""
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return ansi_escape.sub('', text)
+        return clean_ansi_codes(text)
     
     def _parse_kubectl_output(self, output):
         """Parse kubectl get svc -A output and extract tenant information"""
-        tenant_services = {}
-        cleaned_output = self._clean_ansi_codes(output)
-        lines = cleaned_output.strip().split('\n')
+        tenant_services = parse_kubectl_services(output)
         
-        self.log_output(f"Debug: Parsing {len(lines)} lines of kubectl output", "info")
+        self.log_output(f"Debug: Parsed {len(tenant_services)} tenant namespaces from kubectl output", "info")
+        for namespace in tenant_services:
+            self.log_output(f"  Found new tenant namespace: {namespace}", "info")
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('NAMESPACE') or line.startswith('kubectl'):
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 2:
-                namespace = parts[0]
-                service = parts[1]
-                
-                # Skip system namespaces
-                if namespace in ['kube-system', 'kube-public', 'kube-node-lease', 'default']:
-                    continue
-                
-                # Ensure we create valid tenant entry
-                if namespace not in tenant_services:
-                    tenant_services[namespace] = {
-                        'services': [],
-                        'redis_info': None
-                    }
-                    self.log_output(f"  Found new tenant namespace: {namespace}", "info")
-                
-                # Ensure the tenant entry is valid before adding service
-                if tenant_services[namespace] is not None and isinstance(tenant_services[namespace], dict):
-                    if 'services' not in tenant_services[namespace]:
-                        tenant_services[namespace]['services'] = []
-                    
-                    if service not in tenant_services[namespace]['services']:
-                        tenant_services[namespace]['services'].append(service)
-        
-        # Validate all entries before returning
-        validated_services = {}
-        for tenant, data in tenant_services.items():
-            if data is not None and isinstance(data, dict):
-                validated_services[tenant] = {
-                    'services': data.get('services', []),
-                    'redis_info': data.get('redis_info', None)
-                }
-            else:
-                self.log_output(f"Warning: Invalid data for tenant {tenant}, creating default structure", "error")
-                validated_services[tenant] = {
-                    'services': [],
-                    'redis_info': None
-                }
-        
-        return validated_services
+        return tenant_services
     
     def _extract_redis_ips(self):
         """Extract Redis service IPs for each tenant/namespace"""
-        self.shell.send("kubectl get svc -A | grep redis\n")
-        time.sleep(2)
-        
-        output = self._collect_command_output()
-        cleaned_output = self._clean_ansi_codes(output)
-        
-        redis_info = {}
-        lines = cleaned_output.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('kubectl') or line.endswith('# ') or line.endswith('$ '):
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 4 and 'redis' in line.lower():
-                namespace = parts[0]
-                service_name = parts[1]
-                service_type = parts[2]
-                cluster_ip = parts[3]
-                external_ip = parts[4] if len(parts) > 4 else "N/A"
-                ports = parts[5] if len(parts) > 5 else "N/A"
-                age = parts[6] if len(parts) > 6 else "N/A"
-                
-                redis_info[namespace] = {
-                    'service_name': service_name,
-                    'service_type': service_type,
-                    'cluster_ip': cluster_ip,
-                    'external_ip': external_ip,
-                    'ports': ports,
-                    'age': age
-                }
-        
-        return redis_info
+        # Filter the (usually cached) full service listing instead of running a second command
+        output = self._run_cached_command("kubectl get svc -A")
+        return parse_redis_services(output)
     
     def extract_redis_keys_for_tenant(self, tenant_name):
         """Extract Redis keys for a specific tenant"""
@@ -754,11 +1012,7 @@ Note: Each new session and operation is marked with decorative separators
         try:
             # Execute redis-cli command to get all keys
             command = f"redis-cli -h {redis_ip} -p 6379 keys \"*\""
-            self.shell.send(f"{command}\n")
-            time.sleep(3)  # Wait for Redis response
-            
-            # Collect output
-            output = self._collect_command_output(timeout=15)
+            output = self._run_shell_command(command, wait=3, timeout=15)  # Wait for Redis response
             cleaned_output = self._clean_ansi_codes(output)
             lines = cleaned_output.strip().split('\n')
             
@@ -801,55 +1055,8 @@ Note: Each new session and operation is marked with decorative separators
         
         try:
             # Execute kubectl command to get all configmaps
-            self.shell.send("kubectl get configmaps -A\n")
-            time.sleep(3)  # Wait for command to complete
-            
-            # Collect output
-            output = self._collect_command_output(timeout=15)
-            cleaned_output = self._clean_ansi_codes(output)
-            
-            # Parse configmaps data
-            configmaps_data = {}
-            lines = cleaned_output.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                # Skip header line, empty lines, command echo, and prompts
-                if (not line or 
-                    line.startswith('NAMESPACE') or 
-                    line.startswith('kubectl') or 
-                    line.endswith('# ') or 
-                    line.endswith('$ ') or
-                    line.startswith('[root@')):
-                    continue
-                
-                # Parse configmap lines
-                # Expected format: NAMESPACE  NAME  DATA  AGE
-                parts = line.split()
-                if len(parts) >= 3:
-                    namespace = parts[0]  # Namespace (same as tenant)
-                    configmap_name = parts[1]  # ConfigMap name
-                    data_count = parts[2]  # Number of data items
-                    age = parts[3] if len(parts) > 3 else "N/A"
-                    
-                    # Skip system namespaces (optional filtering)
-                    if namespace in ['kube-system', 'kube-public', 'kube-node-lease', 'default']:
-                        continue
-                    
-                    if namespace not in configmaps_data:
-                        configmaps_data[namespace] = {
-                            'configmaps': [],
-                            'total_configmaps': 0
-                        }
-                    
-                    configmap_info = {
-                        'name': configmap_name,
-                        'data_count': data_count,
-                        'age': age
-                    }
-                    
-                    configmaps_data[namespace]['configmaps'].append(configmap_info)
-                    configmaps_data[namespace]['total_configmaps'] = len(configmaps_data[namespace]['configmaps'])
+            output = self._run_cached_command("kubectl get configmaps -A", wait=3, timeout=15)
+            configmaps_data = parse_configmap_listing(output)
             
             # Log summary
             total_tenants_with_configmaps = len(configmaps_data)
@@ -899,11 +1106,7 @@ Note: Each new session and operation is marked with decorative separators
             # Execute Command A: Raw format using kubectl describe
             raw_command = f"kubectl describe configmap {configmap_name} -n {tenant_name}"
             self.log_output(f"Executing raw format command: {raw_command}", "command")
-            self.shell.send(f"{raw_command}\n")
-            time.sleep(3)  # Wait for command to complete
-            
-            # Collect raw format output
-            raw_output = self._collect_command_output(timeout=15)
+            raw_output = self._run_cached_command(raw_command, wait=3, timeout=15)
             cleaned_raw_output = self._clean_ansi_codes(raw_output)
             
             # Parse the raw command output
@@ -926,11 +1129,7 @@ Note: Each new session and operation is marked with decorative separators
             # Execute Command B: Pretty format using kubectl get + jq
             pretty_command = f"kubectl get configmap {configmap_name} -n {tenant_name} -o json | jq \".data.config | fromjson\""
             self.log_output(f"Executing pretty format command: {pretty_command}", "command")
-            self.shell.send(f"{pretty_command}\n")
-            time.sleep(4)  # Wait for JSON processing
-            
-            # Collect pretty format output
-            pretty_output = self._collect_command_output(timeout=15)
+            pretty_output = self._run_cached_command(pretty_command, wait=4, timeout=15)  # Wait for JSON processing
             cleaned_pretty_output = self._clean_ansi_codes(pretty_output)
             
             # Parse the pretty command output
@@ -1015,62 +1214,447 @@ Note: Each new session and operation is marked with decorative separators
         try:
             # Execute redis-cli hgetall command
             command = f"redis-cli -h {redis_ip} -p 6379 hgetall \"{key_name}\""
-            self.shell.send(f"{command}\n")
-            time.sleep(2)
-            
-            # Collect output
-            output = self._collect_command_output(timeout=10)
+            output = self._run_shell_command(command, wait=2, timeout=10)
             cleaned_output = self._clean_ansi_codes(output)
             lines = cleaned_output.strip().split('\n')
             
-            # Clean lines and remove Redis CLI numbering
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                # Skip command echo, prompts, and empty lines
-                if (not line or 
-                    line.startswith('redis-cli') or 
-                    line.endswith('# ') or 
-                    line.endswith('$ ') or
-                    line.startswith('[root@')):
-                    continue
-                
-                # Remove Redis CLI numbering format like "1) \"field\"" -> "field"
-                if ')' in line and line.split(')')[0].strip().isdigit():
-                    line = ')'.join(line.split(')')[1:]).strip()
-                
-                # Remove outer quotes
-                line = line.strip('"\'')
-                cleaned_lines.append(line)
+            return self._parse_hgetall_lines(lines)
             
-            # Parse field-value pairs
-            key_value_pairs = {}
-            current_field = None
+        except Exception as e:
+            self.log_output(f"Error getting Redis key value: {str(e)}", "error")
+            return None
+    
+    def _parse_hgetall_lines(self, lines, parse_json=True):
+        """Parse redis-cli hgetall output lines into a field -> value dict"""
+        return parse_hgetall_lines(lines, parse_json)
+    
+    def _collect_until_marker(self, marker, timeout=30):
+        """Collect shell output until a marker line is printed or the timeout expires"""
+        output = ""
+        start_time = time.time()
+        
+        while time.time() - start_time < timeout:
+            if self.shell.recv_ready():
+                output += self.shell.recv(self.recv_chunk_size).decode('utf-8', errors='ignore')
+                if f"{marker}\n" in output.replace('\r', ''):
+                    break
+            else:
+                time.sleep(0.05)
+        
+        return output
+    
+    def _run_until_marker(self, command, marker, timeout=30):
+        """Send a command to the interactive shell and collect its output up to a marker line"""
+        if self.support_bundle:
+            return self.support_bundle.run_command(command)
+        self.shell.send(f"{command}\n")
+        return self._collect_until_marker(marker, timeout=timeout)
+    
+    def fetch_redis_hashes(self, tenant_name, keys):
+        """
+        Fetch many Redis hashes for a tenant with one redis-cli loop per batch
+        
+        Each key's hgetall output is preceded by a marker line so the combined
+        output can be split back into per-key hashes.
+        
+        Returns:
+            dict: {key_name: {field: raw_value}}
+        """
+        if not self.connected or tenant_name not in self.tenant_database:
+            return {}
+        
+        redis_info = self.tenant_database[tenant_name].get('redis_info')
+        if not redis_info or not redis_info.get('cluster_ip'):
+            return {}
+        
+        redis_ip = redis_info['cluster_ip']
+        hashes = {}
+        
+        for start in range(0, len(keys), REDIS_DECODE_FETCH_BATCH):
+            batch = keys[start:start + REDIS_DECODE_FETCH_BATCH]
+            quoted_keys = ' '.join("'" + key.replace("'", "'\\''") + "'" for key in batch)
+            
+            # Markers are printed from split pieces so the echoed command line never matches them
+            command = (f"for k in {quoted_keys}; do printf '%s%s %s\\n' '@@KEY' '@@' \"$k\"; "
+                       f"redis-cli -h {redis_ip} -p 6379 hgetall \"$k\"; done; printf '%s%s\\n' '@@END' '@@'")
+            output = self._run_until_marker(command, '@@END@@', timeout=15 + len(batch) * 0.1)
+            cleaned_output = self._clean_ansi_codes(output).replace('\r', '')
+            
+            current_key = None
+            current_lines = []
+            for line in cleaned_output.split('\n'):
+                if line.startswith('@@KEY@@ ') or line.startswith('@@END@@'):
+                    if current_key is not None:
+                        hashes[current_key] = self._parse_hgetall_lines(current_lines, parse_json=False)
+                    current_key = line[len('@@KEY@@ '):] if line.startswith('@@KEY@@ ') else None
+                    current_lines = []
+                elif current_key is not None and not line.strip().startswith(('(empty', '(error)', '(nil)')):
+                    current_lines.append(line)
+            
+            self.log_output(f"  Fetched {min(start + len(batch), len(keys))}/{len(keys)} hashes", "info")
+        
+        return hashes
+    
+    def decode_redis_keys(self, tenant_name, key_pattern='*', max_keys=1000):
+        """
+        Fetch and decode Redis hashes for a tenant in bulk
+        
+        Keys matching the glob pattern are fetched in batches, every field is
+        decoded (base64 / JSON / nested JSON) by the shared EntryDataDecoder,
+        and the result is flattened into one table across all keys.
+        
+        Returns:
+            dict: columns, rows and decoding stats, or None on error
+        """
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return None
+        
+        self.start_new_operation_log(f"Redis Bulk Decode - Tenant: {tenant_name}, Pattern: {key_pattern}")
+        
+        try:
+            keys = self.extract_redis_keys_for_tenant(tenant_name)
+            matching_keys = [key for key in keys if fnmatch.fnmatchcase(key, key_pattern or '*')]
+            if len(matching_keys) > max_keys:
+                self.log_output(f"Limiting decode to {max_keys} of {len(matching_keys)} matching keys", "info")
+                matching_keys = matching_keys[:max_keys]
             
-            for line in cleaned_lines:
-                if current_field is None:
-                    current_field = line
-                else:
-                    value = line
-                    # Handle escaped JSON strings
-                    if value.startswith('{') and '\\\"' in value:
-                        try:
-                            # Replace escaped quotes and parse as JSON
-                            unescaped_value = value.replace('\\"', '"').replace('\\\\', '\\')
-                            json_obj = json.loads(unescaped_value)
-                            value = json_obj
-                        except (json.JSONDecodeError, ValueError):
-                            value = value.replace('\\"', '"').replace('\\\\', '\\')
-                    
-                    key_value_pairs[current_field] = value
-                    current_field = None
+            self.log_output(f"Fetching {len(matching_keys)} Redis hashes for {tenant_name}...", "command")
+            hashes = self.fetch_redis_hashes(tenant_name, matching_keys)
             
-            return key_value_pairs
+            table = entry_decoder.build_table(hashes)
+            stats = table['stats']
+            self.log_output(f"-> Decoded {stats['keys']} keys / {stats['values']} values "
+                            f"({stats['cache_hits']} cached, worker pool: {'yes' if stats['worker_pool'] else 'no'})", "success")
             
+            table['tenant'] = tenant_name
+            table['pattern'] = key_pattern
+            return table
+        
         except Exception as e:
-            self.log_output(f"Error getting Redis key value: {str(e)}", "error")
+            self.log_output(f"Error decoding Redis keys for {tenant_name}: {str(e)}", "error")
             return None
     
+    def _exec_channel_command(self, command, timeout=30, sudo=False, on_line=None, input_data=None):
+        """
+        Run a command on its own SSH exec channel, independent of the interactive shell
+        
+        Several exec channels can run at the same time over the one SSH connection.
+        With sudo=True the command runs through 'sudo -S' and the admin password is
+        written to stdin, followed by input_data if given. If on_line is given it is
+        called with every complete stdout line as it arrives; returning False from it
+        stops the command early.
+        
+        Returns:
+            dict: output, error, exit_status (None if not finished), timed_out, stopped
+        """
+        if self.support_bundle:
+            return self.support_bundle.exec_command(command, on_line=on_line, input_data=input_data)
+        
+        self._track_exec_channel(1)
+        try:
+            return run_exec_command(self.ssh_client, command, timeout=timeout,
+                                    sudo_password=self.admin_password if sudo else None,
+                                    on_line=on_line, recv_chunk_size=self.recv_chunk_size, input_data=input_data)
+        finally:
+            self._track_exec_channel(-1)
+    
+    def profile_redis_keyspace(self, tenant_name, sample_rate=REDIS_PROFILE_SAMPLE_RATE, key_pattern='*'):
+        """
+        Memory-by-prefix report of a tenant Redis
+        
+        The keyspace is walked with SCAN on an exec channel, every key is counted
+        under its prefix pattern, and a sample of keys is measured with TYPE,
+        MEMORY USAGE and TTL in batches (one redis-cli round trip per batch).
+        
+        Returns:
+            dict: profiler report (see redis_keyspace_profiler) plus tenant and text table, or None on error
+        """
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return None
+        
+        redis_info = self.tenant_database.get(tenant_name, {}).get('redis_info')
+        if not redis_info or not redis_info.get('cluster_ip'):
+            self.log_output(f"Error: No Redis service known for {tenant_name}", "error")
+            return None
+        
+        self.start_new_operation_log(f"Redis Keyspace Profile - Tenant: {tenant_name}, Pattern: {key_pattern}")
+        self.log_output(f"Profiling Redis keyspace of {tenant_name} ({redis_info['cluster_ip']}), "
+                        f"sampling {sample_rate:.0%} of keys...", "info")
+        
+        profiler = KeyspaceProfiler(
+            lambda command, **kwargs: self._exec_channel_command(command, sudo=True, **kwargs),
+            redis_info['cluster_ip'], sample_rate=sample_rate,
+            progress=lambda message: self.log_output(message, "info")
+        )
+        try:
+            report = profiler.profile(key_pattern or '*', limit=REDIS_PROFILE_PREFIX_LIMIT)
+        except Exception as e:
+            self.log_output(f"Error profiling Redis keyspace for {tenant_name}: {str(e)}", "error")
+            return None
+        
+        for error in report['errors']:
+            self.log_output(f"  {error}", "error")
+        self.log_output(f"-> {report['keys_scanned']} keys in {report['prefix_count']} prefix patterns, "
+                        f"{report['keys_sampled']} measured ({report['elapsed']}s)", "success")
+        
+        report['tenant'] = tenant_name
+        report['content'] = render_report(report)
+        return report
+    
+    def analyze_redis_rdb(self, tenant_name):
+        """
+        Take a point-in-time RDB snapshot of a tenant Redis and index it locally
+        
+        'redis-cli --rdb' runs on its own exec channel and the snapshot is parsed
+        while it streams in (it is never held whole in memory or written to disk as
+        RDB); every key goes into a SQLite index in the Logs directory with its type,
+        size, element count, expiry and prefix pattern, and EntryData hashes keep
+        their fields for decoding. In bundle mode redis/<namespace>.rdb is used.
+        
+        Returns:
+            dict: index summary (keys, bytes, prefixes, aux fields, ...) plus tenant, or None on error
+        """
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return None
+        
+        redis_info = self.tenant_database.get(tenant_name, {}).get('redis_info')
+        if not redis_info or not redis_info.get('cluster_ip'):
+            self.log_output(f"Error: No Redis service known for {tenant_name}", "error")
+            return None
+        
+        redis_ip = redis_info['cluster_ip']
+        self.start_new_operation_log(f"Redis RDB Snapshot - Tenant: {tenant_name}")
+        self.log_output(f"Streaming RDB snapshot of {tenant_name} ({redis_ip}) into a local key index...", "info")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        index = RDBKeyIndex(os.path.join(self.logs_dir, REDIS_RDB_DIRECTORY, f"{tenant_name}_{timestamp}.db"))
+        progress = lambda message: self.log_output(message, "info")
+        stream = None
+        try:
+            if self.support_bundle:
+                summary = index.build(self.support_bundle.redis_rdb_stream(redis_ip), progress=progress)
+            else:
+                stream = ExecStream(self.ssh_client, f"redis-cli -h {redis_ip} -p 6379 --rdb /dev/stdout",
+                                    sudo_password=self.admin_password, timeout=REDIS_RDB_READ_TIMEOUT)
+                self._track_exec_channel(1)
+                summary = index.build(stream, progress=progress)
+                summary['bytes_streamed'] = stream.bytes_read
+        except Exception as e:
+            error = ''
+            if stream:
+                error = stream.close()['error']
+                self._track_exec_channel(-1)
+            self.log_output(f"Error analyzing RDB snapshot for {tenant_name}: {str(e)} {error}".strip(), "error")
+            return None
+        
+        if stream:
+            result = stream.close()
+            self._track_exec_channel(-1)
+            # The snapshot parsed to its EOF marker; redis-cli may still complain afterwards
+            # (older versions fail to fsync a pipe), which doesn't affect the data
+            if result['exit_status'] not in (0, None):
+                self.log_output(f"  redis-cli exited with status {result['exit_status']}: {result['error']}", "info")
+        
+        previous = self.rdb_indexes.get(tenant_name)
+        self.rdb_indexes[tenant_name] = index
+        if previous:
+            previous.remove()
+        self.log_output(f"-> Indexed {summary['keys']} keys in {summary['prefix_count']} prefix patterns, "
+                        f"{summary['hashes_stored']} hashes kept for decoding ({summary['elapsed']}s)", "success")
+        
+        summary['tenant'] = tenant_name
+        summary['index_path'] = index.db_path
+        return summary
+    
+    def search_rdb_keys(self, tenant_name, key_pattern='*', limit=REDIS_RDB_SEARCH_LIMIT):
+        """
+        Keys of the tenant's last analyzed RDB snapshot matching a glob pattern, largest first
+        
+        Returns:
+            list: key rows (see RDBKeyIndex.search), or None if no snapshot was analyzed
+        """
+        index = self.rdb_indexes.get(tenant_name)
+        if index is None:
+            return None
+        return index.search(key_pattern or '*', limit=limit)
+    
+    def decode_rdb_keys(self, tenant_name, key_pattern='*', max_keys=1000):
+        """
+        Decoded table of the hashes kept in the tenant's last analyzed RDB snapshot
+        
+        Returns:
+            dict: same shape as decode_redis_keys(), or None if no snapshot was analyzed
+        """
+        index = self.rdb_indexes.get(tenant_name)
+        if index is None:
+            return None
+        table = entry_decoder.build_table(index.hashes(key_pattern or '*', limit=max_keys))
+        table['tenant'] = tenant_name
+        table['pattern'] = f"{key_pattern} (RDB snapshot)"
+        return table
+    
+    def search_redis_keys_all_tenants(self, key_pattern, search_id=None,
+                                      max_parallel=REDIS_SEARCH_MAX_PARALLEL,
+                                      tenant_timeout=REDIS_SEARCH_TENANT_TIMEOUT,
+                                      max_hits_per_tenant=REDIS_SEARCH_MAX_HITS_PER_TENANT):
+        """
+        Search every tenant Redis for keys matching a glob pattern concurrently
+        
+        Each tenant is searched with 'redis-cli --scan --pattern' on its own exec
+        channel, at most max_parallel at a time. Hits are streamed to the client in
+        batches as they arrive ('redis_search_hits'), each tenant reports its own
+        completion ('redis_search_tenant_done') and a tenant that exceeds its
+        timeout keeps the hits found so far.
+        
+        Returns:
+            dict: summary with per-tenant status and total hit count
+        """
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return None
+        
+        search_id = search_id or datetime.now().strftime("%H%M%S%f")
+        endpoints = self.tenant_model.redis_endpoints()
+        
+        self.start_new_operation_log(f"Redis Key Search - All Tenants, Pattern: {key_pattern}")
+        self.log_output(f"Searching {len(endpoints)} tenant Redis instances for '{key_pattern}' "
+                        f"({max_parallel} in parallel, {tenant_timeout}s per tenant)", "info")
+        
+        start_time = time.time()
+        
+        def search_tenant(tenant_name, redis_ip):
+            tenant_start = time.time()
+            hits = []
+            batch = []
+            state = {'truncated': False}
+            
+            def flush():
+                if batch:
+                    self._emit_to_session('redis_search_hits', {
+                        'search_id': search_id, 'tenant': tenant_name, 'keys': list(batch)
+                    })
+                    del batch[:]
+            
+            def on_line(line):
+                key = line.strip()
+                if not key or key.startswith('(error)'):
+                    return True
+                hits.append(key)
+                batch.append(key)
+                if len(batch) >= REDIS_SEARCH_EMIT_BATCH:
+                    flush()
+                if len(hits) >= max_hits_per_tenant:
+                    state['truncated'] = True
+                    return False
+                return True
+            
+            command = (f"redis-cli -h {redis_ip} -p 6379 --scan "
+                       f"--pattern {shlex.quote(key_pattern)} --count 1000")
+            try:
+                result = self._exec_channel_command(command, timeout=tenant_timeout, sudo=True, on_line=on_line)
+                flush()
+                if state['truncated']:
+                    status, error = 'truncated', f'Stopped after {max_hits_per_tenant} hits'
+                elif result['timed_out']:
+                    status, error = 'timeout', f'Timed out after {tenant_timeout}s (partial results)'
+                elif result['exit_status'] != 0:
+                    status, error = 'error', result['error'] or f"redis-cli exited with status {result['exit_status']}"
+                else:
+                    status, error = 'ok', None
+            except Exception as e:
+                flush()
+                status, error = 'error', str(e)
+            
+            summary = {
+                'search_id': search_id,
+                'tenant': tenant_name,
+                'redis_ip': redis_ip,
+                'count': len(hits),
+                'status': status,
+                'error': error,
+                'elapsed': round(time.time() - tenant_start, 2)
+            }
+            self._emit_to_session('redis_search_tenant_done', summary)
+            return summary
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+            futures = [executor.submit(search_tenant, name, ip) for name, ip in endpoints]
+            for future in as_completed(futures):
+                summary = future.result()
+                results.append(summary)
+                tag = 'success' if summary['status'] == 'ok' else 'error'
+                message = f"  {summary['tenant']}: {summary['count']} keys ({summary['elapsed']}s)"
+                if summary['error']:
+                    message += f" - {summary['error']}"
+                self.log_output(message, tag)
+        
+        total_hits = sum(summary['count'] for summary in results)
+        elapsed = round(time.time() - start_time, 2)
+        self.log_output(f"-> Redis key search finished: {total_hits} keys in "
+                        f"{sum(1 for s in results if s['count'])} tenants ({elapsed}s)", "success")
+        
+        return {
+            'search_id': search_id,
+            'pattern': key_pattern,
+            'tenants': sorted(results, key=lambda summary: summary['tenant']),
+            'total_hits': total_hits,
+            'elapsed': elapsed
+        }
+    
+    def _run_sampler_command(self, command):
+        """Run a pod sampler command on its own exec channel (never the interactive shell)"""
+        if not self.connected:
+            raise RuntimeError("Not connected to server")
+        
+        result = self._exec_channel_command(command, timeout=60, sudo=True)
+        if result['timed_out']:
+            raise RuntimeError(f"'{command}' timed out")
+        if result['exit_status'] != 0:
+            raise RuntimeError(result['error'] or f"'{command}' exited with status {result['exit_status']}")
+        return result['output']
+    
+    def _emit_pod_resources(self, status=None):
+        """Send the current pod resource view to the client"""
+        if not self.pod_sampler:
+            return
+        view = self.pod_sampler.history(self.pod_sampler_view['namespace'], self.pod_sampler_view['top_n'])
+        self._emit_to_session('pod_resource_update', view)
+    
+    def start_pod_sampler(self, interval):
+        """Start sampling pod CPU/memory every interval seconds"""
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return False
+        
+        if self.pod_sampler and self.pod_sampler.running:
+            self.pod_sampler.interval = interval
+            self.log_output(f"Pod resource sampler interval changed to {interval}s", "info")
+            return True
+        
+        self.pod_sampler = PodResourceSampler(self._run_sampler_command, interval=interval,
+                                              on_sample=self._emit_pod_resources)
+        self.pod_sampler.start()
+        self.log_output(f"Pod resource sampler started (every {interval}s, "
+                        f"{self.pod_sampler.capacity} samples kept per pod)", "success")
+        return True
+    
+    def stop_pod_sampler(self):
+        """Stop the pod resource sampler (history is kept for viewing)"""
+        if self.pod_sampler and self.pod_sampler.running:
+            self.pod_sampler.stop()
+            self.log_output("Pod resource sampler stopped", "info")
+    
+    def get_pod_resources(self, namespace=None, top_n=10):
+        """Select the namespace / top-N view and return it from the in-memory history"""
+        self.pod_sampler_view = {'namespace': namespace or None, 'top_n': top_n}
+        if not self.pod_sampler:
+            return None
+        return self.pod_sampler.history(namespace or None, top_n)
+    
     def scan_log_files(self):
         """Scan for all log files in /var/log/versa/vms/apps directory and subdirectories, plus vms-admin.log"""
         if not self.connected:
@@ -1085,11 +1669,7 @@ Note: Each new session and operation is marked with decorative separators
             
             # Execute find command to get all files in the apps directory and subdirectories, excluding .gz files
             command = "find /var/log/versa/vms/apps -type f -name '*.log*' ! -name '*.gz' | sort"
-            self.shell.send(f"{command}\n")
-            time.sleep(3)
-            
-            # Collect output
-            output = self._collect_command_output(timeout=15)
+            output = self._run_shell_command(command, wait=3, timeout=15)
             cleaned_output = self._clean_ansi_codes(output)
             lines = cleaned_output.strip().split('\n')
             
@@ -1128,11 +1708,7 @@ Note: Each new session and operation is marked with decorative separators
             # Add vms-admin.log if it exists
             self.log_output("Checking for vms-admin.log file...", "info")
             vms_admin_command = "ls -la /var/log/versa/vms/vms-admin.log 2>/dev/null"
-            self.shell.send(f"{vms_admin_command}\n")
-            time.sleep(2)
-            
-            # Collect vms-admin.log check output
-            vms_admin_output = self._collect_command_output(timeout=10)
+            vms_admin_output = self._run_shell_command(vms_admin_command, wait=2, timeout=10)
             cleaned_vms_admin_output = self._clean_ansi_codes(vms_admin_output)
             vms_admin_lines = cleaned_vms_admin_output.strip().split('\n')
             
@@ -1192,6 +1768,9 @@ Note: Each new session and operation is marked with decorative separators
         try:
             self.log_output(f"Getting last {lines} lines from: {log_file_path} (filter: {log_filter})", "info")
             
+            if log_filter == 'templates':
+                return self.mine_log_templates(log_file_path, lines)
+            
             # Build command based on filter type
             if log_filter == 'all':
                 # Show last N lines as raw format
@@ -1205,26 +1784,10 @@ Note: Each new session and operation is marked with decorative separators
             else:
                 command = f"tail -n {lines} \"{log_file_path}\""
             
-            self.shell.send(f"{command}\n")
-            time.sleep(2)
-            
-            # Collect output
-            output = self._collect_command_output(timeout=20)
-            cleaned_output = self._clean_ansi_codes(output)
-            lines_output = cleaned_output.strip().split('\n')
+            output = self._run_shell_command(command, wait=2, timeout=20)
             
             # Clean lines and remove command echo/prompts
-            cleaned_lines = []
-            for line in lines_output:
-                line = line.rstrip()
-                # Skip command echo, prompts, and empty continuation
-                if (line.startswith('tail ') or 
-                    line.endswith('# ') or 
-                    line.endswith('$ ') or
-                    line.startswith('[root@')):
-                    continue
-                
-                cleaned_lines.append(line)
+            cleaned_lines = clean_log_lines(output)
             
             # Join lines back together
             log_content = '\n'.join(cleaned_lines)
@@ -1243,9 +1806,129 @@ Note: Each new session and operation is marked with decorative separators
         except Exception as e:
             self.log_output(f"Error getting log file tail: {str(e)}", "error")
             return None
+    
+    def mine_log_templates(self, log_file_path, lines=1500, limit=LOG_TEMPLATE_LIMIT):
+        """
+        Group the last N lines of a log file into message templates
+        
+        The tail runs on its own exec channel and each line is fed to the template
+        miner as it arrives, so the shell stays free and large tails collapse into
+        a few dozen templates with counts, first/last timestamps and samples.
+        
+        Returns:
+            dict: path, lines_requested, lines_retrieved, template_count, templates,
+                  content (plain-text table), command, timestamp
+        """
+        command = f"tail -n {int(lines)} {shlex.quote(log_file_path)}"
+        miner = LogTemplateMiner()
+        start_time = time.time()
+        
+        result = self._exec_channel_command(command, timeout=LOG_TEMPLATE_TIMEOUT, sudo=True,
+                                            on_line=lambda line: miner.add_line(clean_ansi_codes(line)))
+        if result['exit_status'] not in (0, None) and not miner.line_count:
+            self.log_output(f"Error mining log templates: {result['error'] or 'tail failed'}", "error")
+            return None
+        if result['timed_out']:
+            self.log_output(f"-> Log tail timed out after {LOG_TEMPLATE_TIMEOUT}s, templates cover the lines read so far", "info")
+        
+        summary = miner.summary(limit)
+        elapsed = round(time.time() - start_time, 2)
+        self.log_output(f"-> Grouped {summary['lines']} lines into {summary['template_count']} templates ({elapsed}s)", "success")
+        
+        return {
+            'path': log_file_path,
+            'lines_requested': lines,
+            'lines_retrieved': summary['lines'],
+            'template_count': summary['template_count'],
+            'templates': summary['templates'],
+            'content': miner.render_text(limit),
+            'command': command,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _build_log_index(self, log_file_path, lines):
+        """Tail a log file on its own exec channel and index its lines as they arrive"""
+        if self.support_bundle:
+            # Bundled logs are indexed whole, once, on their first query
+            return self.support_bundle.log_index(log_file_path)
+        
+        index = LogIndex(log_file_path)
+        command = f"tail -n {int(lines)} {shlex.quote(log_file_path)}"
+        result = self._exec_channel_command(command, timeout=LOG_QUERY_TIMEOUT, sudo=True,
+                                            on_line=lambda line: index.add_line(clean_ansi_codes(line)))
+        if result['exit_status'] not in (0, None) and not len(index):
+            raise RuntimeError(result['error'] or f"tail exited with status {result['exit_status']}")
+        return index.finalize()
+    
+    def query_logs(self, log_file_paths, lines=5000, start=None, end=None, min_level=None,
+                   logger=None, contains=None, limit=LOG_QUERY_RESULT_LIMIT, refresh=False):
+        """
+        Time-range / level query over the last N lines of one or more log files
+        
+        Each file is tailed once and kept as a time-indexed LogIndex, so further
+        queries on the same files are answered from memory by binary search
+        (refresh=True re-reads them). Results from several files are merged by
+        timestamp. Times may be "HH:MM[:SS]" (latest such time in the logs) or
+        full "YYYY-MM-DD HH:MM[:SS]".
+        
+        Returns:
+            dict: entries, truncated, files (per-file stats/errors), start, end, elapsed
+        """
+        if not self.connected:
+            self.log_output("Error: Not connected to server", "error")
+            return None
+        
+        start_time = time.time()
+        to_build = [path for path in log_file_paths
+                    if refresh or path not in self.log_indexes or self.log_indexes[path][0] != lines]
+        errors = {}
+        if to_build:
+            self.log_output(f"Indexing last {lines} lines of {len(to_build)} log file(s)...", "info")
+            with ThreadPoolExecutor(max_workers=min(LOG_QUERY_MAX_PARALLEL, len(to_build))) as executor:
+                futures = {executor.submit(self._build_log_index, path, lines): path for path in to_build}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        self.log_indexes[path] = (lines, future.result())
+                    except Exception as e:
+                        self.log_indexes.pop(path, None)
+                        errors[path] = str(e)
+                        self.log_output(f"  Error indexing {path}: {str(e)}", "error")
+        
+        indexes = [self.log_indexes[path][1] for path in log_file_paths if path in self.log_indexes]
+        reference = max((index.last_timestamp for index in indexes if len(index)), default=None)
+        try:
+            start_ts, end_ts = parse_time_range(start, end, reference)
+        except ValueError as e:
+            self.log_output(f"Error: {str(e)}", "error")
+            return {'entries': [], 'truncated': False, 'files': [], 'error': str(e)}
+        
+        entries = list(itertools.islice(
+            merge_queries(indexes, start=start_ts, end=end_ts, min_level=min_level or None,
+                          logger=logger or None, contains=contains or None),
+            limit + 1
+        ))
+        truncated = len(entries) > limit
+        entries = entries[:limit]
+        
+        files = [dict(index.stats(), levels=index.level_counts(start_ts, end_ts)) for index in indexes]
+        files.extend({'source': path, 'error': error} for path, error in errors.items())
+        elapsed = round(time.time() - start_time, 2)
+        self.log_output(f"-> Log query matched {len(entries)}{'+' if truncated else ''} entries "
+                        f"across {len(indexes)} file(s) ({elapsed}s)", "success")
+        
+        return {
+            'entries': entries,
+            'truncated': truncated,
+            'files': files,
+            'start': start_ts,
+            'end': end_ts,
+            'elapsed': elapsed
+        }
 
 # Session-based instances - each client gets their own instance
 client_instances = {}
+client_instances_lock = threading.RLock()
 
 def get_client_instance():
     """Get or create a VMSDebugWeb instance for the current client session"""
@@ -1256,27 +1939,112 @@ def get_client_instance():
     else:
         session_id = 'default'
     
-    if session_id not in client_instances:
-        print(f"DEBUG: Creating new VMSDebugWeb instance for session: {session_id}")
-        client_instances[session_id] = VMSDebugWeb(session_id=session_id)
-    
-    return client_instances[session_id]
+    with client_instances_lock:
+        if session_id not in client_instances:
+            print(f"DEBUG: Creating new VMSDebugWeb instance for session: {session_id}")
+            client_instances[session_id] = VMSDebugWeb(session_id=session_id)
+        client_vms = client_instances[session_id]
+        # Touched under the lock, so the reaper's re-check sees it
+        client_vms.touch()
+    return client_vms
 
 def cleanup_client_instance(session_id):
     """Clean up client instance when session disconnects"""
-    if session_id in client_instances:
+    with client_instances_lock:
+        client_vms = client_instances.pop(session_id, None)
+    
+    # Close the SSH connection outside the lock - it can take a while
+    if client_vms is not None:
         print(f"DEBUG: Cleaning up VMSDebugWeb instance for session: {session_id}")
         try:
-            client_instances[session_id].disconnect_from_server()
+            client_vms.disconnect_from_server()
         except:
             pass
-        del client_instances[session_id]
+
+def reap_client_instances():
+    """
+    Close idle sessions and enforce the session memory budget
+    
+    Returns:
+        list: (session_id, reason) for every evicted session
+    """
+    now = time.time()
+    with client_instances_lock:
+        sessions = [(session_id, client_vms, client_vms.last_activity)
+                    for session_id, client_vms in client_instances.items()]
+    
+    candidates = []
+    remaining = []
+    for session_id, client_vms, last_activity in sessions:
+        if now - last_activity > SESSION_IDLE_TIMEOUT:
+            candidates.append((session_id, client_vms, last_activity, f'idle for {int(now - last_activity)}s'))
+        else:
+            remaining.append((last_activity, session_id, client_vms, client_vms.estimate_memory()))
+    
+    # Over budget: evict the least recently active sessions first
+    budget = SESSION_MEMORY_BUDGET_MB * 1024 * 1024
+    total_memory = sum(memory for _, _, _, memory in remaining)
+    for last_activity, session_id, client_vms, memory in sorted(remaining, key=lambda entry: entry[0]):
+        if total_memory <= budget:
+            break
+        candidates.append((session_id, client_vms, last_activity,
+                           f'memory budget of {SESSION_MEMORY_BUDGET_MB} MB exceeded'))
+        total_memory -= memory
+    
+    evicted = []
+    for session_id, client_vms, last_activity, reason in candidates:
+        # A request since the snapshot keeps the session; get_client_vms touches it under this lock
+        with client_instances_lock:
+            if client_instances.get(session_id) is not client_vms or client_vms.last_activity != last_activity:
+                continue
+            client_instances.pop(session_id)
+        
+        print(f"Reaping session {session_id}: {reason}")
+        socketio.emit('session_expired', {'reason': reason}, room=session_id)
+        try:
+            client_vms.disconnect_from_server()
+        except:
+            pass
+        evicted.append((session_id, reason))
+    
+    return evicted
+
+def _session_reaper_loop():
+    while True:
+        time.sleep(SESSION_REAPER_INTERVAL)
+        try:
+            reap_client_instances()
+        except Exception as e:
+            print(f"Warning: Session reaper failed: {str(e)}")
+
+def start_session_reaper():
+    """Start the background thread that evicts idle and over-budget sessions"""
+    thread = threading.Thread(target=_session_reaper_loop, daemon=True)
+    thread.start()
+    return thread
 
 @app.route('/')
 def index():
     """Main page"""
     return render_template('index.html')
 
+@app.route('/sessions')
+def sessions():
+    """Admin view of active client sessions with memory and SSH channel usage"""
+    with client_instances_lock:
+        instances = list(client_instances.values())
+    
+    summaries = sorted((client_vms.session_summary() for client_vms in instances),
+                       key=lambda summary: summary['memory_bytes'], reverse=True)
+    return jsonify({
+        'sessions': summaries,
+        'session_count': len(summaries),
+        'total_memory_bytes': sum(summary['memory_bytes'] for summary in summaries),
+        'memory_budget_bytes': SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+        'idle_timeout_seconds': SESSION_IDLE_TIMEOUT,
+        'command_cache': command_cache.stats()
+    })
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
@@ -1308,6 +2076,7 @@ def handle_ssh_connect(data):
     username = data.get('username', '')
     ssh_password = data.get('ssh_password', '')
     admin_password = data.get('admin_password', '')
+    transport_profile = data.get('transport_profile', 'auto')
     
     if not all([host, username, ssh_password, admin_password]):
         emit('connection_status', {'connected': False, 'message': 'Missing connection parameters'})
@@ -1319,7 +2088,7 @@ def handle_ssh_connect(data):
     # Run connection in separate thread
     thread = threading.Thread(
         target=client_vms.connect_to_server,
-        args=(host, username, ssh_password, admin_password),
+        args=(host, username, ssh_password, admin_password, transport_profile),
         daemon=True
     )
     thread.start()
@@ -1330,6 +2099,35 @@ def handle_ssh_disconnect():
     client_vms = get_client_instance()
     client_vms.disconnect_from_server()
 
+def resolve_bundle_path(path):
+    """Real path of a bundle given relative to (or inside) SUPPORT_BUNDLE_DIRECTORY, or None if it is outside"""
+    root = os.path.realpath(SUPPORT_BUNDLE_DIRECTORY)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if resolved == root or os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+@socketio.on('load_support_bundle')
+def handle_load_support_bundle(data):
+    """Handle offline support bundle loading (tarball or directory under the bundle directory)"""
+    requested_path = (data.get('path') or '').strip()
+    bundle_path = resolve_bundle_path(requested_path) if requested_path else None
+    
+    if not bundle_path:
+        emit('connection_status', {'connected': False,
+                                   'message': f'Support bundles must be inside {SUPPORT_BUNDLE_DIRECTORY}: {requested_path}'})
+        return
+    if not os.path.exists(bundle_path):
+        emit('connection_status', {'connected': False, 'message': f'Support bundle not found: {requested_path}'})
+        return
+    
+    # Get client-specific instance
+    client_vms = get_client_instance()
+    
+    # Load in a separate thread (log indexing can take a while for large bundles)
+    thread = threading.Thread(target=client_vms.load_support_bundle, args=(bundle_path,), daemon=True)
+    thread.start()
+
 @socketio.on('run_kubectl')
 def handle_run_kubectl():
     """Handle kubectl commands execution"""
@@ -1435,33 +2233,154 @@ def handle_get_redis_key_value(data):
         return
     
     if not client_vms.connected:
-        print(f"DEBUG: Session {request.sid} - Not connected to server")
-        emit('redis_key_value_response', {
-            'tenant': tenant_name, 
-            'key': key_name, 
-            'value': None, 
-            'error': 'Not connected to server'
-        })
+        print(f"DEBUG: Session {request.sid} - Not connected to server")
+        emit('redis_key_value_response', {
+            'tenant': tenant_name, 
+            'key': key_name, 
+            'value': None, 
+            'error': 'Not connected to server'
+        })
+        return
+    
+    session_id = request.sid
+    print(f"DEBUG: Session {session_id} - Starting thread to get Redis key value")
+    
+    # Run Redis key value extraction in separate thread
+    def get_key_value():
+        print(f"DEBUG: Session {session_id} - In thread - calling get_redis_key_value for tenant '{tenant_name}', key '{key_name}'")
+        key_value = client_vms.get_redis_key_value(tenant_name, key_name)
+        print(f"DEBUG: Session {session_id} - Got key value result: {type(key_value)} - {key_value}")
+        socketio.emit('redis_key_value_response', {
+            'tenant': tenant_name,
+            'key': key_name, 
+            'value': key_value
+        }, room=session_id)
+        print(f"DEBUG: Session {session_id} - Emitted redis_key_value_response")
+    
+    thread = threading.Thread(target=get_key_value, daemon=True)
+    thread.start()
+
+@socketio.on('decode_redis_keys')
+def handle_decode_redis_keys(data):
+    """Handle request to fetch and decode Redis hashes in bulk for a tenant"""
+    client_vms = get_client_instance()
+    tenant_name = data.get('tenant', '')
+    key_pattern = data.get('pattern', '*') or '*'
+    
+    try:
+        max_keys = int(data.get('max_keys', 1000))
+    except (TypeError, ValueError):
+        max_keys = 1000
+    
+    if not tenant_name:
+        emit('decoded_redis_table_response', {'tenant': tenant_name, 'table': None, 'error': 'No tenant specified'})
+        return
+    
+    if not client_vms.connected:
+        emit('decoded_redis_table_response', {'tenant': tenant_name, 'table': None, 'error': 'Not connected to server'})
+        return
+    
+    session_id = request.sid
+    
+    # Run bulk decoding in separate thread
+    def decode_keys():
+        table = client_vms.decode_redis_keys(tenant_name, key_pattern, max_keys)
+        socketio.emit('decoded_redis_table_response', {
+            'tenant': tenant_name,
+            'table': table,
+            'error': None if table is not None else 'Failed to decode Redis keys'
+        }, room=session_id)
+    
+    thread = threading.Thread(target=decode_keys, daemon=True)
+    thread.start()
+
+@socketio.on('profile_redis_keyspace')
+def handle_profile_redis_keyspace(data):
+    """Handle request for a memory-by-prefix profile of a tenant Redis"""
+    client_vms = get_client_instance()
+    tenant_name = data.get('tenant', '')
+    key_pattern = data.get('pattern', '*') or '*'
+    
+    try:
+        sample_rate = float(data.get('sample_rate', REDIS_PROFILE_SAMPLE_RATE))
+    except (TypeError, ValueError):
+        sample_rate = REDIS_PROFILE_SAMPLE_RATE
+    
+    if not tenant_name:
+        emit('redis_profile_response', {'tenant': tenant_name, 'profile': None, 'error': 'No tenant specified'})
+        return
+    
+    if not client_vms.connected:
+        emit('redis_profile_response', {'tenant': tenant_name, 'profile': None, 'error': 'Not connected to server'})
+        return
+    
+    session_id = request.sid
+    
+    # Run profiling in separate thread
+    def profile_keyspace():
+        profile = client_vms.profile_redis_keyspace(tenant_name, sample_rate, key_pattern)
+        socketio.emit('redis_profile_response', {
+            'tenant': tenant_name,
+            'profile': profile,
+            'error': None if profile is not None else 'Failed to profile Redis keyspace'
+        }, room=session_id)
+    
+    thread = threading.Thread(target=profile_keyspace, daemon=True)
+    thread.start()
+
+@socketio.on('analyze_redis_rdb')
+def handle_analyze_redis_rdb(data):
+    """Handle request to snapshot a tenant Redis (RDB) and index it locally"""
+    client_vms = get_client_instance()
+    tenant_name = data.get('tenant', '')
+    
+    if not tenant_name:
+        emit('rdb_analysis_response', {'tenant': tenant_name, 'analysis': None, 'error': 'No tenant specified'})
+        return
+    
+    if not client_vms.connected:
+        emit('rdb_analysis_response', {'tenant': tenant_name, 'analysis': None, 'error': 'Not connected to server'})
         return
     
     session_id = request.sid
-    print(f"DEBUG: Session {session_id} - Starting thread to get Redis key value")
     
-    # Run Redis key value extraction in separate thread
-    def get_key_value():
-        print(f"DEBUG: Session {session_id} - In thread - calling get_redis_key_value for tenant '{tenant_name}', key '{key_name}'")
-        key_value = client_vms.get_redis_key_value(tenant_name, key_name)
-        print(f"DEBUG: Session {session_id} - Got key value result: {type(key_value)} - {key_value}")
-        socketio.emit('redis_key_value_response', {
+    # Stream and index the snapshot in separate thread
+    def analyze_rdb():
+        analysis = client_vms.analyze_redis_rdb(tenant_name)
+        socketio.emit('rdb_analysis_response', {
             'tenant': tenant_name,
-            'key': key_name, 
-            'value': key_value
+            'analysis': analysis,
+            'error': None if analysis is not None else 'Failed to analyze RDB snapshot'
         }, room=session_id)
-        print(f"DEBUG: Session {session_id} - Emitted redis_key_value_response")
     
-    thread = threading.Thread(target=get_key_value, daemon=True)
+    thread = threading.Thread(target=analyze_rdb, daemon=True)
     thread.start()
 
+@socketio.on('search_rdb_keys')
+def handle_search_rdb_keys(data):
+    """Handle key search (or EntryData decoding) in the last analyzed RDB snapshot of a tenant"""
+    client_vms = get_client_instance()
+    tenant_name = data.get('tenant', '')
+    key_pattern = data.get('pattern', '*') or '*'
+    
+    if data.get('decode'):
+        table = client_vms.decode_rdb_keys(tenant_name, key_pattern)
+        emit('decoded_redis_table_response', {
+            'tenant': tenant_name,
+            'table': table,
+            'error': None if table is not None else 'No RDB snapshot analyzed for this tenant'
+        })
+        return
+    
+    keys = client_vms.search_rdb_keys(tenant_name, key_pattern)
+    emit('rdb_search_response', {
+        'tenant': tenant_name,
+        'pattern': key_pattern,
+        'keys': keys or [],
+        'limit': REDIS_RDB_SEARCH_LIMIT,
+        'error': None if keys is not None else 'No RDB snapshot analyzed for this tenant'
+    })
+
 @socketio.on('get_configmaps')
 def handle_get_configmaps(data):
     """Handle request to get ConfigMaps for a tenant"""
@@ -1626,6 +2545,193 @@ def handle_get_log_file_content(data):
     thread = threading.Thread(target=get_log_file_content, daemon=True)
     thread.start()
 
+@socketio.on('get_snapshot_list')
+def handle_get_snapshot_list():
+    """Handle request for stored tenant snapshots of the connected host"""
+    client_vms = get_client_instance()
+    emit('snapshot_list_response', {'snapshots': client_vms.list_tenant_snapshots()})
+
+@socketio.on('start_pod_sampler')
+def handle_start_pod_sampler(data):
+    """Handle request to start the background pod resource sampler"""
+    client_vms = get_client_instance()
+    try:
+        interval = max(5, int(data.get('interval', 15)))
+    except (TypeError, ValueError):
+        interval = 15
+    
+    started = client_vms.start_pod_sampler(interval)
+    emit('pod_sampler_status', {'running': started, 'interval': interval})
+
+@socketio.on('stop_pod_sampler')
+def handle_stop_pod_sampler():
+    """Handle request to stop the background pod resource sampler"""
+    client_vms = get_client_instance()
+    client_vms.stop_pod_sampler()
+    emit('pod_sampler_status', {'running': False})
+
+@socketio.on('get_pod_resources')
+def handle_get_pod_resources(data):
+    """Handle request for the pod resource view (served from memory, no cluster commands)"""
+    client_vms = get_client_instance()
+    try:
+        top_n = int(data.get('top_n', 10))
+    except (TypeError, ValueError):
+        top_n = 10
+    
+    view = client_vms.get_pod_resources(data.get('namespace') or None, top_n)
+    if view is None:
+        emit('pod_resource_update', {'error': 'Pod resource sampler has not been started'})
+    else:
+        # Explicit requests always open the view; periodic updates only refresh it
+        view['requested'] = True
+        emit('pod_resource_update', view)
+
+@socketio.on('clear_command_cache')
+def handle_clear_command_cache():
+    """Handle request to drop cached command results for the connected host"""
+    client_vms = get_client_instance()
+    removed = client_vms.clear_command_cache()
+    emit('command_cache_cleared', {'removed': removed, 'stats': command_cache.stats()})
+
+@socketio.on('search_redis_keys')
+def handle_search_redis_keys(data):
+    """Handle request to search Redis keys across all tenants in parallel"""
+    client_vms = get_client_instance()
+    key_pattern = (data.get('pattern') or '').strip()
+    search_id = data.get('search_id')
+    
+    if not key_pattern:
+        emit('redis_search_complete', {'search_id': search_id, 'summary': None, 'error': 'No search pattern specified'})
+        return
+    
+    if not client_vms.connected:
+        emit('redis_search_complete', {'search_id': search_id, 'summary': None, 'error': 'Not connected to server'})
+        return
+    
+    session_id = request.sid
+    
+    # Run the search in separate thread; hits are streamed while it runs
+    def search_keys():
+        summary = client_vms.search_redis_keys_all_tenants(key_pattern, search_id=search_id)
+        socketio.emit('redis_search_complete', {
+            'search_id': search_id,
+            'summary': summary,
+            'error': None if summary else 'Redis key search failed'
+        }, room=session_id)
+    
+    thread = threading.Thread(target=search_keys, daemon=True)
+    thread.start()
+
+@socketio.on('query_logs')
+def handle_query_logs(data):
+    """Handle a time-range / level query across one or more log files"""
+    client_vms = get_client_instance()
+    paths = [path for path in (data.get('paths') or []) if path]
+    
+    if not paths:
+        emit('log_query_response', {'result': None, 'error': 'No log files selected'})
+        return
+    
+    if not client_vms.connected:
+        emit('log_query_response', {'result': None, 'error': 'Not connected to server'})
+        return
+    
+    try:
+        lines = max(1, int(data.get('lines', 5000)))
+    except (TypeError, ValueError):
+        lines = 5000
+    
+    # Reject a bad level or time here: inside the worker they would only fail on the first result
+    try:
+        level_code(data.get('min_level'))
+        parse_time_range(data.get('start'), data.get('end'))
+    except (AttributeError, ValueError) as e:
+        emit('log_query_response', {'result': None, 'error': str(e)})
+        return
+    
+    session_id = request.sid
+    
+    # Index (if needed) and query in separate thread
+    def query_logs():
+        try:
+            result = client_vms.query_logs(
+                paths, lines,
+                start=data.get('start'), end=data.get('end'), min_level=data.get('min_level'),
+                logger=data.get('logger'), contains=data.get('contains'), refresh=bool(data.get('refresh'))
+            )
+        except Exception as e:
+            client_vms.log_output(f"Error querying logs: {str(e)}", "error")
+            socketio.emit('log_query_response', {'result': None, 'error': str(e)}, room=session_id)
+            return
+        socketio.emit('log_query_response', {
+            'result': result,
+            'error': (result or {}).get('error') if result else 'Log query failed'
+        }, room=session_id)
+    
+    thread = threading.Thread(target=query_logs, daemon=True)
+    thread.start()
+
+@socketio.on('lookup_tenants')
+def handle_lookup_tenants(data):
+    """Handle cross-tenant lookup by service, Redis IP, ConfigMap or namespace"""
+    client_vms = get_client_instance()
+    result = client_vms.lookup_tenants(data.get('kind', ''), data.get('value', ''))
+    emit('tenant_lookup_response', result)
+
+@socketio.on('compare_snapshots')
+def handle_compare_snapshots(data):
+    """Handle request to compare two tenant snapshots"""
+    client_vms = get_client_instance()
+    from_id = data.get('from_id')
+    to_id = data.get('to_id')
+    
+    try:
+        from_id = int(from_id)
+        to_id = int(to_id)
+    except (TypeError, ValueError):
+        emit('snapshot_diff_response', {'diff': None, 'error': 'Two snapshots must be selected'})
+        return
+    
+    session_id = request.sid
+    
+    # Run snapshot comparison in separate thread
+    def compare_snapshots():
+        diff = client_vms.compare_tenant_snapshots(from_id, to_id)
+        socketio.emit('snapshot_diff_response', {
+            'diff': diff if 'error' not in diff else None,
+            'error': diff.get('error')
+        }, room=session_id)
+    
+    thread = threading.Thread(target=compare_snapshots, daemon=True)
+    thread.start()
+
+@socketio.on('compare_snapshots_since')
+def handle_compare_snapshots_since(data):
+    """Handle request for tenant changes since a number of hours ago"""
+    client_vms = get_client_instance()
+    
+    try:
+        hours = float(data.get('hours'))
+        if hours <= 0:
+            raise ValueError(hours)
+    except (TypeError, ValueError):
+        emit('snapshot_diff_response', {'diff': None, 'error': 'Invalid time range'})
+        return
+    
+    session_id = request.sid
+    
+    # Run snapshot comparison in separate thread
+    def compare_snapshots_since():
+        diff = client_vms.compare_tenant_snapshots_since(hours)
+        socketio.emit('snapshot_diff_response', {
+            'diff': diff if 'error' not in diff else None,
+            'error': diff.get('error')
+        }, room=session_id)
+    
+    thread = threading.Thread(target=compare_snapshots_since, daemon=True)
+    thread.start()
+
 if __name__ == '__main__':
     # Create templates directory and HTML file if they don't exist
     if not os.path.exists('templates'):
@@ -2318,6 +3424,48 @@ if __name__ == '__main__':
                 transform: translateY(0);
             }
         }
+        
+        /* Decoded Redis values table */
+        .decoded-table-controls {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 10px;
+        }
+        
+        .decoded-table-wrapper {
+            overflow: auto;
+            max-height: calc(100vh - 320px);
+            border: 1px solid #dee2e6;
+        }
+        
+        .decoded-table {
+            border-collapse: collapse;
+            font-size: 11px;
+            white-space: nowrap;
+        }
+        
+        .decoded-table th {
+            position: sticky;
+            top: 0;
+            background-color: #007acc;
+            color: white;
+            cursor: pointer;
+            padding: 6px 8px;
+            text-align: left;
+        }
+        
+        .decoded-table td {
+            padding: 4px 8px;
+            border-bottom: 1px solid #dee2e6;
+            max-width: 300px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        
+        .decoded-table tr:nth-child(even) td {
+            background-color: #f1f3f5;
+        }
     </style>
 </head>
 <body>
@@ -2343,8 +3491,21 @@ if __name__ == '__main__':
                     <label for="admin_password">Admin Password:</label>
                     <input type="password" id="admin_password" value="THS!5V3r5@vmsP@55">
                 </div>
+                <div class="form-group-inline">
+                    <label for="transport_profile">Transport:</label>
+                    <select id="transport_profile" title="Bulk enables SSH compression and larger windows for high-latency links">
+                        <option value="auto" selected>Auto (per host)</option>
+                        <option value="default">Default</option>
+                        <option value="bulk">Bulk transfer</option>
+                    </select>
+                </div>
                 <button id="connect-btn" class="btn-primary" onclick="connect()">Connect</button>
                 <button id="disconnect-btn" class="btn-danger" onclick="disconnect()" disabled>Disconnect</button>
+                <div class="form-group-inline">
+                    <label for="bundle_path">Support Bundle:</label>
+                    <input type="text" id="bundle_path" placeholder="vms-bundle.tar.gz" title="Tarball or directory in the tool's support bundle directory (VMS_SUPPORT_BUNDLE_DIR) with kubectl outputs, redis/&lt;namespace&gt;.json dumps and var/log/versa/vms files">
+                </div>
+                <button id="load-bundle-btn" class="btn-secondary" onclick="loadSupportBundle()" title="Work offline from a support bundle instead of SSH">Load Bundle</button>
                 <div id="status" class="status disconnected">Status: Not Connected</div>
             </div>
             
@@ -2353,6 +3514,7 @@ if __name__ == '__main__':
                 <button id="kubectl-btn" class="btn-success" onclick="runKubectl()" disabled>Run Kubectl Commands</button>
                 <button id="tenant-btn" class="btn-success" onclick="buildTenantData()" disabled style="display:none;">Build Tenant Data</button>
                 <button id="show-db-btn" class="btn-warning" onclick="showTenantDatabase()" disabled>Show Tenant Database</button>
+                <button id="clear-cache-btn" class="btn-secondary" onclick="clearCommandCache()" title="Drop cached kubectl results so the next run fetches fresh data">Clear Command Cache</button>
             </div>
             
             <div class="section" id="tenant-section" style="display:none;">
@@ -2364,6 +3526,24 @@ if __name__ == '__main__':
                     </select>
                 </div>
                 <button id="refresh-tenants-btn" class="btn-secondary" onclick="refreshTenantList()">Refresh List</button>
+                <div class="form-group">
+                    <label for="lookup-kind">Find Tenants By:</label>
+                    <select id="lookup-kind">
+                        <option value="service">Service name</option>
+                        <option value="redis_ip">Redis IP</option>
+                        <option value="configmap">ConfigMap name</option>
+                        <option value="namespace">Namespace prefix</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <input type="text" id="lookup-value" placeholder="Value to look up" onkeydown="if (event.key === 'Enter') lookupTenants()">
+                </div>
+                <button id="lookup-tenants-btn" class="btn-secondary" onclick="lookupTenants()">Find Tenants</button>
+                <div class="form-group">
+                    <label for="redis-search-pattern">Search Redis Keys (All Tenants):</label>
+                    <input type="text" id="redis-search-pattern" placeholder="e.g. *device-1234*" onkeydown="if (event.key === 'Enter') searchRedisKeysAllTenants()">
+                </div>
+                <button id="redis-search-btn" class="btn-warning" onclick="searchRedisKeysAllTenants()">Search All Tenants</button>
             </div>
             
             <div class="section" id="redis-section" style="display:none;">
@@ -2376,6 +3556,31 @@ if __name__ == '__main__':
                 </div>
                 <button id="refresh-keys-btn" class="btn-secondary" onclick="refreshRedisKeys()" disabled>Refresh Keys</button>
                 <button id="view-key-btn" class="btn-warning" onclick="viewRedisKeyValue()" disabled>View Key Value</button>
+                <div class="form-group">
+                    <label for="decode-pattern">Decode Key Pattern:</label>
+                    <input type="text" id="decode-pattern" value="*">
+                </div>
+                <div class="form-group">
+                    <label for="decode-max-keys">Max keys to decode:</label>
+                    <select id="decode-max-keys">
+                        <option value="100">100</option>
+                        <option value="1000" selected>1000</option>
+                        <option value="5000">5000</option>
+                        <option value="20000">20000</option>
+                    </select>
+                </div>
+                <button id="decode-keys-btn" class="btn-success" onclick="decodeRedisKeys()" disabled>Decode Keys (Table)</button>
+                <div class="form-group">
+                    <label for="profile-sample-rate">Memory profile sample:</label>
+                    <select id="profile-sample-rate" title="Share of keys measured with MEMORY USAGE (key counts are always exact)">
+                        <option value="0.01">1% of keys</option>
+                        <option value="0.05" selected>5% of keys</option>
+                        <option value="0.2">20% of keys</option>
+                        <option value="1">All keys</option>
+                    </select>
+                </div>
+                <button id="profile-keys-btn" class="btn-warning" onclick="profileRedisKeyspace()" disabled>Memory by Prefix</button>
+                <button id="rdb-snapshot-btn" class="btn-secondary" onclick="analyzeRedisRdb()" disabled title="Stream an RDB snapshot and index every key locally">RDB Snapshot Analysis</button>
             </div>
             
             <div class="section" id="configmaps-section" style="display:none;">
@@ -2413,9 +3618,96 @@ if __name__ == '__main__':
                         <option value="all">All</option>
                         <option value="errors">Errors</option>
                         <option value="pretty">Pretty format</option>
+                        <option value="templates">Templates (group similar lines)</option>
                     </select>
                 </div>
                 <button id="view-log-btn" class="btn-warning" onclick="viewLogFile()" disabled>View Logs</button>
+                
+                <div class="form-group" style="margin-top: 15px;">
+                    <label for="log-query-files">Query Files (Ctrl+click for several):</label>
+                    <select id="log-query-files" multiple size="4"></select>
+                </div>
+                <div class="form-group">
+                    <label for="log-query-start">From / To (HH:MM[:SS]):</label>
+                    <input type="text" id="log-query-start" placeholder="10:02">
+                    <input type="text" id="log-query-end" placeholder="10:05">
+                </div>
+                <div class="form-group">
+                    <label for="log-query-level">Minimum level:</label>
+                    <select id="log-query-level">
+                        <option value="">Any</option>
+                        <option value="DEBUG">DEBUG</option>
+                        <option value="INFO">INFO</option>
+                        <option value="WARN" selected>WARN</option>
+                        <option value="ERROR">ERROR</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label for="log-query-text">Message contains:</label>
+                    <input type="text" id="log-query-text" placeholder="Optional text">
+                </div>
+                <div class="form-group">
+                    <label><input type="checkbox" id="log-query-refresh"> Re-read files</label>
+                </div>
+                <button id="log-query-btn" class="btn-warning" onclick="queryLogs()">Query Logs</button>
+            </div>
+            
+            <div class="section" id="snapshots-section" style="display:none;">
+                <h3>Snapshot History</h3>
+                <div class="form-group">
+                    <label for="snapshot-from-select">Compare From:</label>
+                    <select id="snapshot-from-select" onchange="selectSnapshot()">
+                        <option value="">-- Select a snapshot --</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label for="snapshot-to-select">Compare To:</label>
+                    <select id="snapshot-to-select" onchange="selectSnapshot()">
+                        <option value="">-- Select a snapshot --</option>
+                    </select>
+                </div>
+                <button id="refresh-snapshots-btn" class="btn-secondary" onclick="refreshSnapshots()">Refresh Snapshots</button>
+                <button id="compare-snapshots-btn" class="btn-warning" onclick="compareSnapshots()" disabled>Compare Snapshots</button>
+                <div class="form-group">
+                    <label for="snapshot-since-select">Changes Since:</label>
+                    <select id="snapshot-since-select">
+                        <option value="1">1 hour ago</option>
+                        <option value="24" selected>Yesterday (24 hours ago)</option>
+                        <option value="168">Last week (7 days ago)</option>
+                    </select>
+                </div>
+                <button id="compare-since-btn" class="btn-warning" onclick="compareSnapshotsSince()">Show Changes</button>
+            </div>
+            
+            <div class="section" id="pod-resources-section" style="display:none;">
+                <h3>Pod Resources</h3>
+                <div class="form-group">
+                    <label for="pod-sampler-interval">Sample every:</label>
+                    <select id="pod-sampler-interval">
+                        <option value="10">10 seconds</option>
+                        <option value="15" selected>15 seconds</option>
+                        <option value="30">30 seconds</option>
+                        <option value="60">60 seconds</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label for="pod-resources-namespace">Tenant:</label>
+                    <select id="pod-resources-namespace" onchange="showPodResources()">
+                        <option value="">All tenants</option>
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label for="pod-resources-top">Top consumers:</label>
+                    <select id="pod-resources-top" onchange="showPodResources()">
+                        <option value="5">5</option>
+                        <option value="10" selected>10</option>
+                        <option value="20">20</option>
+                    </select>
+                </div>
+                <button id="start-sampler-btn" class="btn-success" onclick="startPodSampler()">Start Sampler</button>
+                <button id="stop-sampler-btn" class="btn-danger" onclick="stopPodSampler()" disabled>Stop Sampler</button>
+                <button id="show-pod-resources-btn" class="btn-warning" onclick="showPodResources()" disabled>Show Resources</button>
+                <div id="pod-sampler-status" style="font-size: 12px; margin-top: 8px;"></div>
             </div>
         </div>
         
@@ -2438,6 +3730,10 @@ if __name__ == '__main__':
         const socket = io();
         let connected = false;
         let currentTenantRedisKeys = [];
+        let decodedTable = null;
+        let redisSearch = null;
+        let redisSearchRenderTimer = null;
+        let decodedSort = { column: null, ascending: true };
 
         // Utility function to safely access DOM elements and prevent null reference errors
         function safeGetElement(id) {
@@ -2470,7 +3766,7 @@ if __name__ == '__main__':
             output.scrollTop = output.scrollHeight;
         });
 
-        socket.on('connection_status', function(data) {
+        function handleConnectionStatus(data) {
             connected = data.connected;
             const status = document.getElementById('status');
             const connectBtn = document.getElementById('connect-btn');
@@ -2478,13 +3774,14 @@ if __name__ == '__main__':
             const kubectlBtn = document.getElementById('kubectl-btn');
             const tenantBtn = document.getElementById('tenant-btn');
             const showDbBtn = document.getElementById('show-db-btn');
-            const inputs = document.querySelectorAll('input');
+            const inputs = document.querySelectorAll('.left-panel .section:first-child input, .left-panel .section:first-child select');
 
             if (connected) {
-                status.textContent = 'Status: Connected';
+                status.textContent = data.offline ? `Status: ${data.message}` : 'Status: Connected';
                 status.className = 'status connected';
                 connectBtn.disabled = true;
                 disconnectBtn.disabled = false;
+                document.getElementById('load-bundle-btn').disabled = true;
                 
                 // Show operations section immediately after connection
                 document.getElementById('operations-section').style.display = 'block';
@@ -2516,6 +3813,7 @@ if __name__ == '__main__':
                 status.className = 'status disconnected';
                 connectBtn.disabled = false;
                 disconnectBtn.disabled = true;
+                document.getElementById('load-bundle-btn').disabled = false;
                 
                 // Show detailed error popup if error details are provided
                 if (data.error_details) {
@@ -2528,6 +3826,12 @@ if __name__ == '__main__':
                 document.getElementById('tenant-section').style.display = 'none';
                 document.getElementById('redis-section').style.display = 'none';
                 document.getElementById('configmaps-section').style.display = 'none';
+                document.getElementById('snapshots-section').style.display = 'none';
+                document.getElementById('pod-resources-section').style.display = 'none';
+                document.getElementById('start-sampler-btn').disabled = false;
+                document.getElementById('stop-sampler-btn').disabled = true;
+                document.getElementById('show-pod-resources-btn').disabled = true;
+                document.getElementById('pod-sampler-status').textContent = '';
                 
                 // Disable all operation buttons on disconnect
                 kubectlBtn.disabled = true;
@@ -2547,6 +3851,7 @@ if __name__ == '__main__':
                 if (redisKeysSelect) redisKeysSelect.innerHTML = '<option value="">-- Select a Redis key --</option>';
                 if (configmapsSelect) configmapsSelect.innerHTML = '<option value="">-- Select a ConfigMap --</option>';
                 if (logsSelect) logsSelect.innerHTML = '<option value="">-- Select a Log file --</option>';
+                updateSnapshotDropdowns([]);
                 
                 // Hide tenant sections safely
                 safeSetDisplay('tenant-details', 'none');
@@ -2579,8 +3884,22 @@ if __name__ == '__main__':
                 if (viewKeyBtn) viewKeyBtn.disabled = true;
                 if (refreshConfigmapsBtn) refreshConfigmapsBtn.disabled = true;
                 if (showConfigmapJsonBtn) showConfigmapJsonBtn.disabled = true;
+                
+                const decodeKeysBtn = safeGetElement('decode-keys-btn');
+                if (decodeKeysBtn) decodeKeysBtn.disabled = true;
+                const profileKeysBtn = safeGetElement('profile-keys-btn');
+                if (profileKeysBtn) profileKeysBtn.disabled = true;
+                const rdbSnapshotBtn = safeGetElement('rdb-snapshot-btn');
+                if (rdbSnapshotBtn) rdbSnapshotBtn.disabled = true;
+                decodedTable = null;
+                
+                const redisSearchBtn = safeGetElement('redis-search-btn');
+                if (redisSearchBtn) redisSearchBtn.disabled = false;
+                redisSearch = null;
             }
-        });
+        }
+
+        socket.on('connection_status', handleConnectionStatus);
 
         socket.on('clear_output_response', function(data) {
             document.getElementById('output').innerHTML = '';
@@ -2596,6 +3915,8 @@ if __name__ == '__main__':
             // Show tenant and logs sections only after tenant data is available
             document.getElementById('tenant-section').style.display = 'block';
             document.getElementById('logs-section').style.display = 'block';
+            document.getElementById('snapshots-section').style.display = 'block';
+            document.getElementById('pod-resources-section').style.display = 'block';
             
             // Enable all operations buttons only after tenant data is built
             document.getElementById('kubectl-btn').disabled = false;
@@ -2617,6 +3938,85 @@ if __name__ == '__main__':
             updateTenantDropdown(data.tenants);
         });
 
+        socket.on('redis_search_hits', function(data) {
+            if (!redisSearch || data.search_id !== redisSearch.id) return;
+            const entry = getRedisSearchTenant(data.tenant);
+            entry.keys.push(...data.keys);
+            scheduleRedisSearchRender();
+        });
+
+        socket.on('redis_search_tenant_done', function(data) {
+            if (!redisSearch || data.search_id !== redisSearch.id) return;
+            const entry = getRedisSearchTenant(data.tenant);
+            entry.status = data.status;
+            entry.error = data.error;
+            entry.count = data.count;
+            entry.elapsed = data.elapsed;
+            redisSearch.done += 1;
+            scheduleRedisSearchRender();
+        });
+
+        socket.on('redis_search_complete', function(data) {
+            document.getElementById('redis-search-btn').disabled = false;
+            if (!redisSearch || data.search_id !== redisSearch.id) return;
+            redisSearch.complete = true;
+            redisSearch.error = data.error;
+            redisSearch.summary = data.summary;
+            displayRedisSearch();
+        });
+
+        socket.on('session_expired', function(data) {
+            const output = document.getElementById('output');
+            const line = document.createElement('div');
+            line.className = 'output-line error';
+            const timestamp = new Date().toLocaleTimeString();
+            line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Session closed by server (${escapeHtml(data.reason)}). Please connect again.`;
+            output.appendChild(line);
+            output.scrollTop = output.scrollHeight;
+            handleConnectionStatus({connected: false, message: 'Session expired'});
+            switchToOutput();
+        });
+
+        socket.on('pod_sampler_status', function(data) {
+            document.getElementById('start-sampler-btn').disabled = data.running;
+            document.getElementById('stop-sampler-btn').disabled = !data.running;
+            if (data.running) {
+                document.getElementById('show-pod-resources-btn').disabled = false;
+            }
+            document.getElementById('pod-sampler-status').textContent = data.running ?
+                `Sampling every ${data.interval}s...` : 'Sampler stopped';
+        });
+
+        socket.on('pod_resource_update', function(data) {
+            if (data.error) {
+                document.getElementById('pod-sampler-status').textContent = data.error;
+                return;
+            }
+            
+            const status = data.status;
+            let statusText = `${status.running ? 'Running' : 'Stopped'}: ${status.samples} samples, ${status.pods} pods`;
+            if (status.last_sample_time) {
+                statusText += `, last at ${new Date(status.last_sample_time * 1000).toLocaleTimeString()}`;
+            }
+            if (status.error) {
+                statusText += ` - Error: ${status.error}`;
+            }
+            document.getElementById('pod-sampler-status').textContent = statusText;
+            
+            updatePodNamespaceDropdown(data.namespaces);
+            // Only redraw while the resources view is on screen and for the selected tenant
+            const selected = document.getElementById('pod-resources-namespace').value || null;
+            const viewOpen = document.getElementById('pod-resources-view') &&
+                document.getElementById('tenant-details').style.display === 'block';
+            if ((viewOpen || data.requested) && (data.namespace || null) === selected) {
+                displayPodResources(data);
+            }
+        });
+
+        socket.on('tenant_lookup_response', function(data) {
+            displayTenantLookup(data);
+        });
+
         socket.on('tenant_info_response', function(data) {
             displayTenantInfo(data.tenant, data.info, data.error);
         });
@@ -2703,12 +4103,115 @@ if __name__ == '__main__':
                 // Add message to command output
                 const output = document.getElementById('output');
                 const line = document.createElement('div');
-                line.className = 'output-line info';
+                line.className = 'output-line info';
+                const timestamp = new Date().toLocaleTimeString();
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Key '${escapeHtml(data.key)}' not found or has no value.`;
+                output.appendChild(line);
+                output.scrollTop = output.scrollHeight;
+            }
+        });
+
+        socket.on('decoded_redis_table_response', function(data) {
+            document.getElementById('decode-keys-btn').disabled = false;
+            
+            if (data.error || !data.table) {
+                const output = document.getElementById('output');
+                const line = document.createElement('div');
+                line.className = 'output-line error';
+                const timestamp = new Date().toLocaleTimeString();
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Error decoding Redis keys: ${escapeHtml(data.error || 'No data')}`;
+                output.appendChild(line);
+                output.scrollTop = output.scrollHeight;
+                return;
+            }
+            
+            decodedTable = data.table;
+            decodedSort = { column: null, ascending: true };
+            displayDecodedTable();
+        });
+
+        socket.on('redis_profile_response', function(data) {
+            document.getElementById('profile-keys-btn').disabled = false;
+            
+            if (data.error || !data.profile) {
+                const output = document.getElementById('output');
+                const line = document.createElement('div');
+                line.className = 'output-line error';
+                const timestamp = new Date().toLocaleTimeString();
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Error profiling Redis keyspace: ${escapeHtml(data.error || 'No data')}`;
+                output.appendChild(line);
+                output.scrollTop = output.scrollHeight;
+                return;
+            }
+            
+            displayRedisProfile(data.profile);
+        });
+
+        socket.on('rdb_analysis_response', function(data) {
+            document.getElementById('rdb-snapshot-btn').disabled = false;
+            
+            if (data.error || !data.analysis) {
+                const output = document.getElementById('output');
+                const line = document.createElement('div');
+                line.className = 'output-line error';
+                const timestamp = new Date().toLocaleTimeString();
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Error analyzing RDB snapshot: ${escapeHtml(data.error || 'No data')}`;
+                output.appendChild(line);
+                output.scrollTop = output.scrollHeight;
+                return;
+            }
+            
+            displayRdbAnalysis(data.analysis);
+        });
+
+        socket.on('rdb_search_response', function(data) {
+            const resultsDiv = document.getElementById('rdb-search-results');
+            if (!resultsDiv) return;
+            if (data.error) {
+                resultsDiv.innerHTML = `<p>${escapeHtml(data.error)}</p>`;
+                return;
+            }
+            
+            let html = `<p>${data.keys.length} keys matching ${escapeHtml(data.pattern)}`;
+            html += data.keys.length >= data.limit ? ` (first ${data.limit}, largest first)</p>` : ' (largest first)</p>';
+            html += '<div class="decoded-table-wrapper"><table class="decoded-table"><thead><tr>';
+            ['Key', 'Type', 'Encoding', 'Size', 'Elements', 'Expires', 'DB'].forEach(column => {
+                html += `<th>${column}</th>`;
+            });
+            html += '</tr></thead><tbody>';
+            data.keys.forEach(entry => {
+                const expires = entry.expires_at ? new Date(entry.expires_at).toLocaleString() : '';
+                html += '<tr>';
+                html += `<td title="${escapeHtml(entry.key)}">${escapeHtml(entry.key)}</td>`;
+                html += `<td>${escapeHtml(entry.type)}</td>`;
+                html += `<td>${escapeHtml(entry.encoding)}</td>`;
+                html += `<td>${formatBytes(entry.size)}</td>`;
+                html += `<td>${entry.elements}</td>`;
+                html += `<td>${expires}</td>`;
+                html += `<td>${entry.db}</td>`;
+                html += '</tr>';
+            });
+            html += '</tbody></table></div>';
+            resultsDiv.innerHTML = html;
+        });
+
+        // Snapshot history event listeners
+        socket.on('snapshot_list_response', function(data) {
+            updateSnapshotDropdowns(data.snapshots || []);
+        });
+
+        socket.on('snapshot_diff_response', function(data) {
+            if (data.error) {
+                const output = document.getElementById('output');
+                const line = document.createElement('div');
+                line.className = 'output-line error';
                 const timestamp = new Date().toLocaleTimeString();
-                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Key '${escapeHtml(data.key)}' not found or has no value.`;
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Error comparing snapshots: ${escapeHtml(data.error)}`;
                 output.appendChild(line);
                 output.scrollTop = output.scrollHeight;
+                return;
             }
+            displaySnapshotDiff(data.diff);
         });
 
         // ConfigMaps event listeners
@@ -2839,6 +4342,63 @@ if __name__ == '__main__':
             updateLogFilesDropdown(data.log_files, data.error);
         });
 
+        socket.on('log_query_response', function(data) {
+            document.getElementById('log-query-btn').disabled = false;
+            
+            if (data.error || !data.result) {
+                const output = document.getElementById('output');
+                const line = document.createElement('div');
+                line.className = 'output-line error';
+                const timestamp = new Date().toLocaleTimeString();
+                line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Log query failed: ${escapeHtml(data.error || 'unknown error')}`;
+                output.appendChild(line);
+                output.scrollTop = output.scrollHeight;
+                return;
+            }
+            
+            const result = data.result;
+            let html = `<div class="tenant-info-header">Log Query - ${result.entries.length}${result.truncated ? '+' : ''} entries</div>`;
+            
+            html += '<div class="tenant-section"><h4>Files</h4>';
+            result.files.forEach(file => {
+                const name = file.source.split('/').pop();
+                let detail;
+                if (file.error) {
+                    detail = `Error: ${escapeHtml(file.error)}`;
+                } else {
+                    const levels = Object.entries(file.levels || {}).map(([level, count]) => `${level}: ${count}`).join(', ');
+                    detail = `${file.entries} lines indexed${levels ? ` - in range: ${escapeHtml(levels)}` : ''}`;
+                }
+                html += `<div class="tenant-property"><div class="tenant-property-name">${escapeHtml(name)}:</div>`;
+                html += `<div class="tenant-property-value">${detail}</div></div>`;
+            });
+            if (result.truncated) {
+                html += `<p>Showing the first ${result.entries.length} matches; narrow the time range to see the rest.</p>`;
+            }
+            html += '</div>';
+            
+            html += '<div class="tenant-section"><h4>Entries</h4>';
+            html += '<div class="decoded-table-wrapper"><table class="decoded-table"><thead><tr>';
+            html += '<th>Time</th><th>Level</th><th>File</th><th>Logger</th><th>Message</th></tr></thead><tbody>';
+            result.entries.forEach(entry => {
+                let rowStyle = '';
+                if (entry.level === 'ERROR' || entry.level === 'FATAL') {
+                    rowStyle = ' style="color: #ff6b6b;"';
+                } else if (entry.level === 'WARN') {
+                    rowStyle = ' style="color: #f0ad4e;"';
+                }
+                html += `<tr${rowStyle}><td>${escapeHtml(entry.time)}</td><td>${entry.level}</td>`;
+                html += `<td>${escapeHtml(entry.source.split('/').pop())}</td><td>${escapeHtml(entry.logger)}</td>`;
+                html += `<td style="white-space: pre-wrap;">${escapeHtml(entry.message)}</td></tr>`;
+            });
+            html += '</tbody></table></div></div>';
+            
+            document.getElementById('tenant-info-content').innerHTML = html;
+            document.getElementById('output').style.display = 'none';
+            document.getElementById('tenant-details').style.display = 'block';
+            document.getElementById('panel-title').textContent = 'Log Query';
+        });
+
         socket.on('log_file_content_response', function(data) {
             console.log('DEBUG: Received log_file_content_response:', data);
             
@@ -2886,7 +4446,9 @@ if __name__ == '__main__':
                 html += '<div class="database-view" style="max-height: 600px; overflow-y: auto;">';
                 
                 let logContent = data.content.content;
-                if (data.filter === 'pretty') {
+                if (data.filter === 'templates' && data.content.templates) {
+                    html += renderLogTemplates(data.content);
+                } else if (data.filter === 'pretty') {
                     // First escape HTML, then apply pretty formatting
                     logContent = escapeHtml(logContent);
                     logContent = logContent.replace(/^.*[Ee][Rr][Rr][Oo][Rr].*$/gm, '<span style="color: #ff6b6b; font-weight: bold;">$&</span>');
@@ -2920,6 +4482,26 @@ if __name__ == '__main__':
             }
         });
 
+        function renderLogTemplates(content) {
+            let html = `<p>${content.lines_retrieved} lines grouped into ${content.template_count} templates`;
+            if (content.template_count > content.templates.length) {
+                html += ` (showing the ${content.templates.length} most frequent)`;
+            }
+            html += '</p>';
+            html += '<table class="decoded-table"><thead><tr><th>Count</th><th>Levels</th><th>First Seen</th>';
+            html += '<th>Last Seen</th><th>Template</th><th>Sample Values</th></tr></thead><tbody>';
+            content.templates.forEach(template => {
+                const levels = Object.entries(template.levels).map(([level, count]) => `${level}: ${count}`).join(', ');
+                const rowStyle = template.levels.ERROR ? ' style="color: #ff6b6b;"' : '';
+                html += `<tr${rowStyle}><td>${template.count}</td><td>${escapeHtml(levels)}</td>`;
+                html += `<td>${escapeHtml(template.first_seen || '-')}</td><td>${escapeHtml(template.last_seen || '-')}</td>`;
+                html += `<td>${escapeHtml(template.template)}</td>`;
+                html += `<td>${template.samples.map(sample => escapeHtml(sample.join(' | '))).join('<br>')}</td></tr>`;
+            });
+            html += '</tbody></table>';
+            return html;
+        }
+
         // Helper functions
         function escapeHtml(text) {
             const div = document.createElement('div');
@@ -3037,6 +4619,7 @@ Technical Error: ${details.technical_error}`;
             const username = document.getElementById('username').value;
             const ssh_password = document.getElementById('ssh_password').value;
             const admin_password = document.getElementById('admin_password').value;
+            const transport_profile = document.getElementById('transport_profile').value;
 
             if (!host || !username || !ssh_password || !admin_password) {
                 alert('Please fill in all connection fields');
@@ -3050,10 +4633,24 @@ Technical Error: ${details.technical_error}`;
                 host: host,
                 username: username,
                 ssh_password: ssh_password,
-                admin_password: admin_password
+                admin_password: admin_password,
+                transport_profile: transport_profile
             });
         }
 
+        function loadSupportBundle() {
+            const path = document.getElementById('bundle_path').value.trim();
+            if (!path) {
+                alert('Please enter the support bundle path');
+                return;
+            }
+
+            // Switch to output view to show loading progress
+            switchToOutput();
+
+            socket.emit('load_support_bundle', { path: path });
+        }
+
         function disconnect() {
             socket.emit('ssh_disconnect');
         }
@@ -3106,10 +4703,229 @@ Technical Error: ${details.technical_error}`;
             socket.emit('show_tenant_database');
         }
 
+        function clearCommandCache() {
+            socket.emit('clear_command_cache');
+        }
+
         function refreshTenantList() {
             socket.emit('get_tenant_list');
         }
 
+        function searchRedisKeysAllTenants() {
+            const pattern = document.getElementById('redis-search-pattern').value.trim();
+            if (!pattern) return;
+            
+            redisSearch = {
+                id: Date.now().toString(),
+                pattern: pattern,
+                tenants: {},
+                done: 0,
+                complete: false,
+                error: null,
+                summary: null
+            };
+            document.getElementById('redis-search-btn').disabled = true;
+            socket.emit('search_redis_keys', { pattern: pattern, search_id: redisSearch.id });
+            displayRedisSearch();
+        }
+
+        function getRedisSearchTenant(tenant) {
+            if (!redisSearch.tenants[tenant]) {
+                redisSearch.tenants[tenant] = { keys: [], status: 'running', error: null, count: 0, elapsed: null };
+            }
+            return redisSearch.tenants[tenant];
+        }
+
+        function scheduleRedisSearchRender() {
+            // Hits can arrive in bursts from many tenants - redraw at most a few times per second
+            if (redisSearchRenderTimer) return;
+            redisSearchRenderTimer = setTimeout(function() {
+                redisSearchRenderTimer = null;
+                displayRedisSearch();
+            }, 300);
+        }
+
+        function displayRedisSearch() {
+            const outputDiv = document.getElementById('output');
+            const detailsDiv = document.getElementById('tenant-details');
+            const contentDiv = document.getElementById('tenant-info-content');
+            if (!redisSearch) return;
+            
+            const tenantNames = Object.keys(redisSearch.tenants).sort();
+            const totalKeys = tenantNames.reduce((sum, name) => sum + redisSearch.tenants[name].keys.length, 0);
+            
+            let html = `<div class="tenant-info-header">Redis Key Search: ${escapeHtml(redisSearch.pattern)}</div>`;
+            if (redisSearch.error) {
+                html += `<p style="color: #dc3545;">${escapeHtml(redisSearch.error)}</p>`;
+            } else if (redisSearch.complete && redisSearch.summary) {
+                html += `<p>Complete: ${redisSearch.summary.total_hits} keys across ${redisSearch.summary.tenants.length} tenants searched (${redisSearch.summary.elapsed}s)</p>`;
+            } else {
+                html += `<p>Searching... ${totalKeys} keys found so far, ${redisSearch.done} tenants finished</p>`;
+            }
+            
+            tenantNames.forEach(name => {
+                const entry = redisSearch.tenants[name];
+                if (entry.keys.length === 0 && entry.status === 'ok') return;
+                
+                const statusColor = entry.status === 'ok' ? '#28a745' : (entry.status === 'running' ? '#007acc' : '#dc3545');
+                html += `<div class="tenant-section"><h4>${escapeHtml(name)} - ${entry.keys.length} keys `;
+                html += `<span style="color: ${statusColor};">[${escapeHtml(entry.status)}]</span></h4>`;
+                if (entry.error) {
+                    html += `<p style="color: #dc3545;">${escapeHtml(entry.error)}</p>`;
+                }
+                if (entry.keys.length > 0) {
+                    html += '<ul>';
+                    entry.keys.slice(0, 200).forEach(key => {
+                        html += `<li>${escapeHtml(key)}</li>`;
+                    });
+                    html += '</ul>';
+                    if (entry.keys.length > 200) {
+                        html += `<p>... and ${entry.keys.length - 200} more keys</p>`;
+                    }
+                }
+                html += '</div>';
+            });
+            
+            if (redisSearch.complete && totalKeys === 0 && !redisSearch.error) {
+                html += '<p>No matching keys found in any tenant.</p>';
+            }
+            
+            contentDiv.innerHTML = html;
+            outputDiv.style.display = 'none';
+            detailsDiv.style.display = 'block';
+            document.getElementById('panel-title').textContent = `Redis Key Search: ${redisSearch.pattern}`;
+        }
+
+        function startPodSampler() {
+            const interval = parseInt(document.getElementById('pod-sampler-interval').value);
+            socket.emit('start_pod_sampler', { interval: interval });
+        }
+
+        function stopPodSampler() {
+            socket.emit('stop_pod_sampler');
+        }
+
+        function showPodResources() {
+            socket.emit('get_pod_resources', {
+                namespace: document.getElementById('pod-resources-namespace').value,
+                top_n: parseInt(document.getElementById('pod-resources-top').value)
+            });
+        }
+
+        function updatePodNamespaceDropdown(namespaces) {
+            const select = document.getElementById('pod-resources-namespace');
+            const current = select.value;
+            const existing = Array.from(select.options).map(option => option.value).slice(1);
+            if (JSON.stringify(existing) === JSON.stringify(namespaces)) return;
+            
+            select.innerHTML = '<option value="">All tenants</option>';
+            namespaces.forEach(namespace => {
+                const option = document.createElement('option');
+                option.value = namespace;
+                option.textContent = namespace;
+                select.appendChild(option);
+            });
+            select.value = namespaces.includes(current) ? current : '';
+        }
+
+        function renderSparkline(values, color) {
+            const width = 120;
+            const height = 24;
+            if (!values || values.length < 2) {
+                return `<svg width="${width}" height="${height}"></svg>`;
+            }
+            const max = Math.max(...values);
+            const min = Math.min(...values);
+            const range = max - min || 1;
+            const points = values.map((value, index) => {
+                const x = (index / (values.length - 1)) * width;
+                const y = height - 2 - ((value - min) / range) * (height - 4);
+                return `${x.toFixed(1)},${y.toFixed(1)}`;
+            }).join(' ');
+            return `<svg width="${width}" height="${height}"><polyline fill="none" stroke="${color}" stroke-width="1.5" points="${points}"/></svg>`;
+        }
+
+        function renderPodResourceTable(title, pods, metric, unit, color) {
+            let html = `<div class="tenant-section"><h4>${title}</h4>`;
+            if (pods.length === 0) {
+                return html + '<p>No samples yet.</p></div>';
+            }
+            html += '<table class="decoded-table"><thead><tr><th>Tenant</th><th>Pod</th>';
+            html += `<th>Current</th><th>Trend</th><th>Restarts</th></tr></thead><tbody>`;
+            pods.forEach(pod => {
+                html += `<tr><td>${escapeHtml(pod.namespace)}</td><td>${escapeHtml(pod.pod)}</td>`;
+                html += `<td>${pod['latest_' + metric]} ${unit}</td>`;
+                html += `<td>${renderSparkline(pod[metric], color)}</td>`;
+                html += `<td>${pod.latest_restarts}</td></tr>`;
+            });
+            return html + '</tbody></table></div>';
+        }
+
+        function displayPodResources(data) {
+            const outputDiv = document.getElementById('output');
+            const detailsDiv = document.getElementById('tenant-details');
+            const contentDiv = document.getElementById('tenant-info-content');
+            const scope = data.namespace || 'All tenants';
+            
+            let html = `<div class="tenant-info-header" id="pod-resources-view">Pod Resources: ${escapeHtml(scope)}</div>`;
+            html += `<p>${data.status.samples} samples every ${data.status.interval}s (history of ${data.status.capacity} samples per pod)</p>`;
+            html += renderPodResourceTable('Top CPU consumers', data.top_cpu, 'cpu', 'm', '#007acc');
+            html += renderPodResourceTable('Top memory consumers', data.top_memory, 'memory', 'MiB', '#28a745');
+            
+            contentDiv.innerHTML = html;
+            outputDiv.style.display = 'none';
+            detailsDiv.style.display = 'block';
+            document.getElementById('panel-title').textContent = `Pod Resources: ${scope}`;
+        }
+
+        function lookupTenants() {
+            const kind = document.getElementById('lookup-kind').value;
+            const value = document.getElementById('lookup-value').value.trim();
+            if (!value) return;
+            socket.emit('lookup_tenants', { kind: kind, value: value });
+        }
+
+        function openTenantFromLookup(tenant) {
+            const select = document.getElementById('tenant-select');
+            select.value = tenant;
+            selectTenant();
+        }
+
+        function displayTenantLookup(data) {
+            const outputDiv = document.getElementById('output');
+            const detailsDiv = document.getElementById('tenant-details');
+            const contentDiv = document.getElementById('tenant-info-content');
+            const kindLabels = {
+                service: 'Service',
+                redis_ip: 'Redis IP',
+                configmap: 'ConfigMap',
+                namespace: 'Namespace prefix'
+            };
+            const label = kindLabels[data.kind] || data.kind;
+            
+            let html = `<div class="tenant-info-header">Tenant Lookup: ${escapeHtml(label)} = ${escapeHtml(data.value)}</div>`;
+            
+            if (data.error) {
+                html += `<p style="color: #dc3545;">${escapeHtml(data.error)}</p>`;
+            } else if (!data.tenants || data.tenants.length === 0) {
+                html += '<p>No matching tenants found.</p>';
+            } else {
+                html += `<p>${data.tenants.length} matching tenant(s) - click a tenant to open it.</p>`;
+                html += '<div class="tenant-section"><ul>';
+                data.tenants.forEach(match => {
+                    const tenant = escapeHtml(match.tenant);
+                    html += `<li><a href="#" onclick="openTenantFromLookup('${tenant}'); return false;"><strong>${tenant}</strong></a>`;
+                    html += ` - ${match.services} services, Redis IP: ${escapeHtml(match.redis_ip || 'N/A')}, ${match.configmaps} ConfigMaps</li>`;
+                });
+                html += '</ul></div>';
+            }
+            
+            contentDiv.innerHTML = html;
+            outputDiv.style.display = 'none';
+            detailsDiv.style.display = 'block';
+            document.getElementById('panel-title').textContent = `Tenant Lookup: ${label}`;
+        }
+
         function selectTenant() {
             const select = document.getElementById('tenant-select');
             const selectedTenant = select.value;
@@ -3212,9 +5028,16 @@ Technical Error: ${details.technical_error}`;
             if (error) {
                 select.innerHTML = `<option value="">Error: ${error}</option>`;
                 document.getElementById('view-key-btn').disabled = true;
+                document.getElementById('decode-keys-btn').disabled = true;
+                document.getElementById('profile-keys-btn').disabled = true;
+                document.getElementById('rdb-snapshot-btn').disabled = true;
                 return;
             }
             
+            document.getElementById('decode-keys-btn').disabled = !(keys && keys.length > 0);
+            document.getElementById('profile-keys-btn').disabled = !(keys && keys.length > 0);
+            document.getElementById('rdb-snapshot-btn').disabled = !(keys && keys.length > 0);
+            
             select.innerHTML = '<option value="">-- Select a Redis key --</option>';
             
             if (keys && keys.length > 0) {
@@ -3429,6 +5252,42 @@ Technical Error: ${details.technical_error}`;
             }
             
             document.getElementById('view-log-btn').disabled = true;
+            
+            // Same files for the multi-file query list
+            const queryFiles = document.getElementById('log-query-files');
+            queryFiles.innerHTML = '';
+            select.querySelectorAll('optgroup').forEach(group => queryFiles.appendChild(group.cloneNode(true)));
+        }
+
+        function queryLogs() {
+            const paths = Array.from(document.getElementById('log-query-files').selectedOptions).map(option => option.value);
+            if (paths.length === 0) {
+                alert('Please select one or more log files to query');
+                return;
+            }
+            
+            const query = {
+                paths: paths,
+                lines: parseInt(document.getElementById('log-lines').value) || 1500,
+                start: document.getElementById('log-query-start').value.trim(),
+                end: document.getElementById('log-query-end').value.trim(),
+                min_level: document.getElementById('log-query-level').value,
+                contains: document.getElementById('log-query-text').value.trim(),
+                refresh: document.getElementById('log-query-refresh').checked
+            };
+            
+            const output = document.getElementById('output');
+            const line = document.createElement('div');
+            line.className = 'output-line info';
+            const timestamp = new Date().toLocaleTimeString();
+            line.innerHTML = `<span class="timestamp">[${timestamp}]</span> Querying ${paths.length} log file(s)` +
+                `${query.start || query.end ? ` from ${escapeHtml(query.start || 'start')} to ${escapeHtml(query.end || 'end')}` : ''}` +
+                `${query.min_level ? `, level ${query.min_level}+` : ''}`;
+            output.appendChild(line);
+            output.scrollTop = output.scrollHeight;
+            
+            document.getElementById('log-query-btn').disabled = true;
+            socket.emit('query_logs', query);
         }
 
         function showLogsHelp() {
@@ -3954,6 +5813,344 @@ Technical Error: ${details.technical_error}`;
             document.getElementById('panel-title').textContent = `Tenant Information: ${tenant}`;
         }
 
+        function decodeRedisKeys() {
+            const tenantSelect = document.getElementById('tenant-select');
+            const tenant = tenantSelect.value;
+            if (!tenant) return;
+            
+            const pattern = document.getElementById('decode-pattern').value || '*';
+            const maxKeys = parseInt(document.getElementById('decode-max-keys').value);
+            
+            document.getElementById('decode-keys-btn').disabled = true;
+            switchToOutput();
+            socket.emit('decode_redis_keys', { tenant: tenant, pattern: pattern, max_keys: maxKeys });
+        }
+
+        function profileRedisKeyspace() {
+            const tenant = document.getElementById('tenant-select').value;
+            if (!tenant) return;
+            
+            const pattern = document.getElementById('decode-pattern').value || '*';
+            const sampleRate = parseFloat(document.getElementById('profile-sample-rate').value);
+            
+            document.getElementById('profile-keys-btn').disabled = true;
+            switchToOutput();
+            socket.emit('profile_redis_keyspace', { tenant: tenant, pattern: pattern, sample_rate: sampleRate });
+        }
+
+        let rdbTenant = null;
+
+        function analyzeRedisRdb() {
+            const tenant = document.getElementById('tenant-select').value;
+            if (!tenant) return;
+            
+            document.getElementById('rdb-snapshot-btn').disabled = true;
+            switchToOutput();
+            socket.emit('analyze_redis_rdb', { tenant: tenant });
+        }
+
+        function searchRdbKeys(decode) {
+            if (!rdbTenant) return;
+            const pattern = document.getElementById('rdb-search-pattern').value || '*';
+            if (decode) {
+                switchToOutput();
+            }
+            socket.emit('search_rdb_keys', { tenant: rdbTenant, pattern: pattern, decode: decode });
+        }
+
+        function displayRdbAnalysis(analysis) {
+            const contentDiv = document.getElementById('tenant-info-content');
+            rdbTenant = analysis.tenant;
+            
+            const aux = analysis.aux || {};
+            let html = `<div class="tenant-info-header">Redis RDB Snapshot: ${escapeHtml(analysis.tenant)}</div>`;
+            html += `<p>${analysis.keys} keys in ${analysis.prefix_count} prefix patterns, ${formatBytes(analysis.bytes)} of RDB data`;
+            html += ` (RDB v${analysis.rdb_version}${aux['redis-ver'] ? ', Redis ' + escapeHtml(aux['redis-ver']) : ''}`;
+            html += `${aux['used-mem'] ? ', used memory ' + formatBytes(Number(aux['used-mem'])) : ''}) - `;
+            html += `${analysis.with_ttl} keys with TTL, ${analysis.hashes_stored} hashes kept for decoding, indexed in ${analysis.elapsed}s</p>`;
+            
+            html += '<div class="decoded-table-controls">';
+            html += `<input type="text" id="rdb-search-pattern" value="${escapeHtml(analysis.value_pattern)}" placeholder="Key glob pattern">`;
+            html += '<button class="btn-secondary" onclick="searchRdbKeys(false)">Search Keys</button>';
+            html += '<button class="btn-success" onclick="searchRdbKeys(true)">Decode Matching Hashes</button>';
+            html += '</div>';
+            html += '<div id="rdb-search-results"></div>';
+            
+            html += '<div class="decoded-table-wrapper"><table class="decoded-table"><thead><tr>';
+            ['Prefix', 'Keys', 'Size', 'Share', 'Avg Size', 'Elements', 'Types', 'With TTL', 'Largest Keys'].forEach(column => {
+                html += `<th>${column}</th>`;
+            });
+            html += '</tr></thead><tbody>';
+            analysis.prefixes.forEach(entry => {
+                const types = Object.entries(entry.types).map(([name, count]) => `${name}: ${count}`).join(', ');
+                const largest = entry.largest.map(item => `${item.key} (${formatBytes(item.bytes)})`).join(', ');
+                html += '<tr>';
+                html += `<td title="${escapeHtml(entry.prefix)}">${escapeHtml(entry.prefix)}</td>`;
+                html += `<td>${entry.keys}</td>`;
+                html += `<td>${formatBytes(entry.bytes)}</td>`;
+                html += `<td>${(entry.share * 100).toFixed(1)}%</td>`;
+                html += `<td>${formatBytes(entry.average_bytes)}</td>`;
+                html += `<td>${entry.elements}</td>`;
+                html += `<td>${escapeHtml(types)}</td>`;
+                html += `<td>${Math.round(entry.ttl_share * 100)}%</td>`;
+                html += `<td title="${escapeHtml(largest)}">${escapeHtml(largest)}</td>`;
+                html += '</tr>';
+            });
+            html += '</tbody></table></div>';
+            
+            contentDiv.innerHTML = html;
+            document.getElementById('output').style.display = 'none';
+            document.getElementById('tenant-details').style.display = 'block';
+            document.getElementById('panel-title').textContent = `Redis RDB Snapshot: ${analysis.tenant}`;
+        }
+
+        function formatBytes(size) {
+            const units = ['B', 'KB', 'MB', 'GB'];
+            let unit = 0;
+            while (size >= 1024 && unit < units.length - 1) {
+                size /= 1024;
+                unit++;
+            }
+            return unit === 0 ? `${Math.round(size)} B` : `${size.toFixed(1)} ${units[unit]}`;
+        }
+
+        function displayRedisProfile(profile) {
+            const contentDiv = document.getElementById('tenant-info-content');
+            
+            let html = `<div class="tenant-info-header">Redis Memory by Prefix: ${escapeHtml(profile.tenant)} (pattern: ${escapeHtml(profile.pattern)})</div>`;
+            html += `<p>${profile.keys_scanned} keys in ${profile.prefix_count} prefix patterns, ${profile.keys_sampled} measured `;
+            html += `(${Math.round(profile.sample_rate * 100)}% sample) - estimated ${formatBytes(profile.estimated_total_bytes)} in ${profile.elapsed}s`;
+            html += profile.truncated ? ' - keyspace scan stopped early, counts are partial' : '';
+            html += '</p>';
+            
+            html += '<div class="decoded-table-wrapper"><table class="decoded-table"><thead><tr>';
+            ['Prefix', 'Keys', 'Est. Memory', 'Share', 'Avg Size', 'Types', 'With TTL', 'Largest Sampled Keys'].forEach(column => {
+                html += `<th>${column}</th>`;
+            });
+            html += '</tr></thead><tbody>';
+            profile.prefixes.forEach(entry => {
+                const types = Object.entries(entry.types).map(([name, count]) => `${name}: ${count}`).join(', ');
+                const largest = entry.largest.map(item => `${item.key} (${formatBytes(item.bytes)})`).join(', ');
+                html += '<tr>';
+                html += `<td title="${escapeHtml(entry.prefix)}">${escapeHtml(entry.prefix)}</td>`;
+                html += `<td>${entry.keys}</td>`;
+                html += `<td>${formatBytes(entry.estimated_bytes)}</td>`;
+                html += `<td>${(entry.share * 100).toFixed(1)}%</td>`;
+                html += `<td>${formatBytes(entry.average_bytes)}</td>`;
+                html += `<td>${escapeHtml(types)}</td>`;
+                html += `<td>${Math.round(entry.ttl_share * 100)}%</td>`;
+                html += `<td title="${escapeHtml(largest)}">${escapeHtml(largest)}</td>`;
+                html += '</tr>';
+            });
+            html += '</tbody></table></div>';
+            if (profile.errors && profile.errors.length) {
+                html += `<p>${profile.errors.map(error => escapeHtml(error)).join('<br>')}</p>`;
+            }
+            
+            contentDiv.innerHTML = html;
+            document.getElementById('output').style.display = 'none';
+            document.getElementById('tenant-details').style.display = 'block';
+            document.getElementById('panel-title').textContent = `Redis Memory Profile: ${profile.tenant}`;
+        }
+
+        function compareDecodedValues(a, b) {
+            if (a === undefined || a === null) return 1;
+            if (b === undefined || b === null) return -1;
+            const numA = Number(a);
+            const numB = Number(b);
+            if (a !== '' && b !== '' && !isNaN(numA) && !isNaN(numB)) {
+                return numA - numB;
+            }
+            return String(a).localeCompare(String(b));
+        }
+
+        function sortDecodedTable(columnIndex) {
+            const column = decodedTable.columns[columnIndex];
+            if (decodedSort.column === column) {
+                decodedSort.ascending = !decodedSort.ascending;
+            } else {
+                decodedSort = { column: column, ascending: true };
+            }
+            renderDecodedRows();
+        }
+
+        function displayDecodedTable() {
+            const outputDiv = document.getElementById('output');
+            const detailsDiv = document.getElementById('tenant-details');
+            const contentDiv = document.getElementById('tenant-info-content');
+            if (!decodedTable) return;
+            
+            // Keep the current filter values (as typed) when new data arrives
+            const filterColumnEl = document.getElementById('decoded-filter-column');
+            const filterTextEl = document.getElementById('decoded-filter-text');
+            const filterColumn = filterColumnEl ? filterColumnEl.value : '';
+            const filterText = filterTextEl ? filterTextEl.value : '';
+            
+            let html = `<div class="tenant-info-header">Decoded Redis Values: ${escapeHtml(decodedTable.tenant)} (pattern: ${escapeHtml(decodedTable.pattern)})</div>`;
+            html += '<p id="decoded-table-summary"></p>';
+            
+            html += '<div class="decoded-table-controls">';
+            html += '<select id="decoded-filter-column" onchange="renderDecodedRows()"><option value="">All columns</option>';
+            decodedTable.columns.forEach(column => {
+                html += `<option value="${escapeHtml(column)}" ${column === filterColumn ? 'selected' : ''}>${escapeHtml(column)}</option>`;
+            });
+            html += '</select>';
+            html += `<input type="text" id="decoded-filter-text" placeholder="Filter..." value="${escapeHtml(filterText)}" oninput="renderDecodedRows()">`;
+            html += '</div>';
+            
+            html += '<div class="decoded-table-wrapper"><table class="decoded-table">';
+            html += '<thead id="decoded-table-head"></thead><tbody id="decoded-table-body"></tbody></table></div>';
+            html += '<p id="decoded-table-more"></p>';
+            
+            contentDiv.innerHTML = html;
+            renderDecodedRows();
+            
+            outputDiv.style.display = 'none';
+            detailsDiv.style.display = 'block';
+            document.getElementById('panel-title').textContent = `Decoded Redis Values: ${decodedTable.tenant}`;
+        }
+
+        // Re-render only the header, rows and counts, so the filter controls keep focus and caret
+        function renderDecodedRows() {
+            if (!decodedTable) return;
+            const filterColumn = document.getElementById('decoded-filter-column').value;
+            const filterText = document.getElementById('decoded-filter-text').value.toLowerCase();
+            
+            let rows = decodedTable.rows.filter(row => {
+                if (!filterText) return true;
+                const values = filterColumn ? [row[filterColumn]] : Object.values(row);
+                return values.some(value => value !== undefined && value !== null &&
+                    String(value).toLowerCase().includes(filterText));
+            });
+            
+            if (decodedSort.column) {
+                const column = decodedSort.column;
+                rows = rows.slice().sort((a, b) => {
+                    const result = compareDecodedValues(a[column], b[column]);
+                    return decodedSort.ascending ? result : -result;
+                });
+            }
+            
+            const stats = decodedTable.stats;
+            document.getElementById('decoded-table-summary').textContent =
+                `${stats.keys} keys, ${stats.values} values (${stats.cache_hits} from cache) - showing ${rows.length} rows`;
+            
+            let head = '<tr>';
+            decodedTable.columns.forEach((column, index) => {
+                const arrow = decodedSort.column === column ? (decodedSort.ascending ? ' ▲' : ' ▼') : '';
+                head += `<th onclick="sortDecodedTable(${index})">${escapeHtml(column)}${arrow}</th>`;
+            });
+            document.getElementById('decoded-table-head').innerHTML = head + '</tr>';
+            
+            let body = '';
+            rows.slice(0, 2000).forEach(row => {
+                body += '<tr>';
+                decodedTable.columns.forEach(column => {
+                    const value = row[column];
+                    const text = value === undefined || value === null ? '' : String(value);
+                    body += `<td title="${escapeHtml(text)}">${escapeHtml(text)}</td>`;
+                });
+                body += '</tr>';
+            });
+            document.getElementById('decoded-table-body').innerHTML = body;
+            document.getElementById('decoded-table-more').textContent = rows.length > 2000 ?
+                'Showing first 2000 rows - refine the filter to narrow results.' : '';
+        }
+
+        function refreshSnapshots() {
+            socket.emit('get_snapshot_list');
+        }
+
+        function selectSnapshot() {
+            const fromId = document.getElementById('snapshot-from-select').value;
+            const toId = document.getElementById('snapshot-to-select').value;
+            document.getElementById('compare-snapshots-btn').disabled = !(fromId && toId && fromId !== toId);
+        }
+
+        function compareSnapshots() {
+            const fromId = document.getElementById('snapshot-from-select').value;
+            const toId = document.getElementById('snapshot-to-select').value;
+            if (fromId && toId) {
+                socket.emit('compare_snapshots', { from_id: fromId, to_id: toId });
+            }
+        }
+
+        function compareSnapshotsSince() {
+            const hours = document.getElementById('snapshot-since-select').value;
+            socket.emit('compare_snapshots_since', { hours: hours });
+        }
+
+        function updateSnapshotDropdowns(snapshots) {
+            const fromSelect = safeGetElement('snapshot-from-select');
+            const toSelect = safeGetElement('snapshot-to-select');
+            if (!fromSelect || !toSelect) return;
+            
+            let options = '<option value="">-- Select a snapshot --</option>';
+            snapshots.forEach(snapshot => {
+                options += `<option value="${snapshot.id}">#${snapshot.id} - ${escapeHtml(snapshot.created_at)} (${snapshot.tenant_count} tenants, ${snapshot.change_count} changes)</option>`;
+            });
+            fromSelect.innerHTML = options;
+            toSelect.innerHTML = options;
+            
+            // Default to comparing the previous build with the latest one
+            if (snapshots.length >= 2) {
+                fromSelect.value = snapshots[1].id;
+                toSelect.value = snapshots[0].id;
+            }
+            selectSnapshot();
+        }
+
+        function displaySnapshotDiff(diff) {
+            const outputDiv = document.getElementById('output');
+            const detailsDiv = document.getElementById('tenant-details');
+            const contentDiv = document.getElementById('tenant-info-content');
+            
+            let html = `<div class="tenant-info-header">Snapshot #${diff.from.id} (${escapeHtml(diff.from.created_at)}) → #${diff.to.id} (${escapeHtml(diff.to.created_at)})</div>`;
+            
+            html += '<div class="tenant-section">';
+            html += '<h4>Summary</h4>';
+            html += `<div class="tenant-property">
+                <div class="tenant-property-name">Host:</div>
+                <div class="tenant-property-value">${escapeHtml(diff.from.host)}</div>
+            </div>`;
+            html += `<div class="tenant-property">
+                <div class="tenant-property-name">Total Changes:</div>
+                <div class="tenant-property-value">${diff.total_changes}</div>
+            </div>`;
+            html += '</div>';
+            
+            const sections = [
+                ['Tenants', diff.tenants, entry => escapeHtml(entry)],
+                ['Services', diff.services, entry => `${escapeHtml(entry.tenant)}: ${escapeHtml(entry.name)}`],
+                ['ConfigMaps', diff.configmaps, entry => `${escapeHtml(entry.tenant)}: ${escapeHtml(entry.name)}`],
+                ['Redis IPs', diff.redis_ips, entry => `${escapeHtml(entry.tenant)}: ${escapeHtml(entry.name)}`]
+            ];
+            
+            sections.forEach(([title, changes, format]) => {
+                html += '<div class="tenant-section">';
+                html += `<h4>${title} (+${changes.added.length} / -${changes.removed.length})</h4>`;
+                if (!changes.added.length && !changes.removed.length && !(changes.changed && changes.changed.length)) {
+                    html += '<p>No changes</p>';
+                }
+                changes.added.forEach(entry => {
+                    html += `<div class="tenant-property"><div class="tenant-property-value success">+ ${format(entry)}</div></div>`;
+                });
+                changes.removed.forEach(entry => {
+                    html += `<div class="tenant-property"><div class="tenant-property-value error">- ${format(entry)}</div></div>`;
+                });
+                (changes.changed || []).forEach(entry => {
+                    html += `<div class="tenant-property"><div class="tenant-property-value info">~ ${escapeHtml(entry.tenant)}: ${escapeHtml(entry.from)} → ${escapeHtml(entry.to)}</div></div>`;
+                });
+                html += '</div>';
+            });
+            
+            contentDiv.innerHTML = html;
+            
+            outputDiv.style.display = 'none';
+            detailsDiv.style.display = 'block';
+            document.getElementById('panel-title').textContent = `Snapshot Comparison: #${diff.from.id} → #${diff.to.id}`;
+        }
+
         function displayTenantDatabase(database) {
             const outputDiv = document.getElementById('output');
             const detailsDiv = document.getElementById('tenant-details');
@@ -3992,7 +6189,11 @@ Technical Error: ${details.technical_error}`;
     print()
     print("Server starting...")
     print("Open your web browser and go to: http://localhost:5000")
+    print("Session admin view: http://localhost:5000/sessions")
     print("Press Ctrl+C to stop the server")
     print("=" * 60)
     
+    # Evict idle / over-budget sessions even if their browser never disconnected cleanly
+    start_session_reaper()
+    
     socketio.run(app, host='0.0.0.0', port=5000, debug=False, allow_unsafe_werkzeug=True)
\ No newline at end of file
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Command Result Cache for the VMS Debug Tool
+
+Read-through cache for the output of read-only remote commands such as
+"kubectl get svc -A". Results are keyed by (host, username, normalized
+command), so all client sessions connected to the same VMS as the same user
+share them (sessions with other credentials, and so possibly another sudo
+context, never see each other's results). Each entry expires at its own time:
+the TTL it was stored with (VMS_COMMAND_CACHE_TTL environment variable, in
+seconds, unless the call overrides it).
+
+Identical requests that arrive while the command is still running are
+coalesced (single-flight): only the first caller runs the command, the others
+wait for and reuse its result. A failed run is not cached; its exception is
+raised in every waiting caller.
+
+Only commands without side effects should be run through the cache.
+"""
+
+import os
+import threading
+import time
+
+DEFAULT_TTL = 30
+
+
+def _ttl_from_environment():
+    try:
+        return float(os.environ.get('VMS_COMMAND_CACHE_TTL', DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def normalize_command(command):
+    """Collapse whitespace so trivially different spellings share one entry"""
+    return ' '.join(command.split())
+
+
+class _Flight:
+    """A command run that other callers can wait on"""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class CommandResultCache:
+    def __init__(self, ttl=None):
+        self.ttl = _ttl_from_environment() if ttl is None else ttl
+        self._entries = {}   # (host, username, command) -> (stored_at, expires_at, value)
+        self._inflight = {}  # (host, username, command) -> _Flight
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_run(self, host, username, command, runner, ttl=None):
+        """
+        Return the cached result of a command, running it on a miss
+
+        Args:
+            host (str): VMS host the command runs on
+            username (str): User the command runs as on that host
+            command (str): Command line (normalized for the cache key)
+            runner (callable): Runs the command and returns its result
+            ttl (float): Override of the cache TTL for this call (a cached result
+                older than it is not used either); 0 disables caching
+
+        Returns:
+            tuple: (result, age in seconds or None if the command was just run)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return runner(), None
+
+        key = (host, username, normalize_command(command))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry[1] and now - entry[0] < ttl:
+                self.hits += 1
+                return entry[2], now - entry[0]
+
+            flight = self._inflight.get(key)
+            owner = flight is None
+            if owner:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, 0.0
+
+        try:
+            flight.value = runner()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                stored_at = time.time()
+                # Drop expired entries so per-object commands don't accumulate
+                expired = [k for k, (_, expires_at, _) in self._entries.items() if expires_at <= stored_at]
+                for expired_key in expired:
+                    del self._entries[expired_key]
+                self._entries[key] = (stored_at, stored_at + ttl, flight.value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+        return flight.value, None
+
+    def invalidate(self, host=None, username=None, command=None):
+        """
+        Drop cached results
+
+        With no arguments everything is dropped; otherwise the results matching
+        every argument given (e.g. host and username: all results of one user
+        on that host).
+
+        Returns:
+            int: number of entries removed
+        """
+        with self._lock:
+            if host is None and username is None and command is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            normalized = normalize_command(command) if command is not None else None
+            keys = [key for key in self._entries
+                    if (host is None or key[0] == host) and
+                    (username is None or key[1] == username) and
+                    (normalized is None or key[2] == normalized)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'in_flight': len(self._inflight),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'ttl': self.ttl
+            }
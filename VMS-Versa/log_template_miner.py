@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Streaming log template miner for the VMS Debug Tool
+
+Groups log lines into message templates in one pass, using a Drain-style
+fixed-depth parse tree: lines are routed by token count and their first few
+tokens to a small leaf list of templates, and joined to the most similar one
+(or start a new template). Differing tokens become <*> wildcards.
+
+Before routing, the VMS log header (timestamp, [LEVEL]) is split off and
+obviously variable values (IPs, UUIDs, hex ids, numbers) are masked, so
+"Session 4411 refreshed for device dev-00013" and "Session 97 refreshed for
+device dev-20311" land in the same template. Each template keeps a count,
+first/last timestamps, level counts and a few sample variable values.
+
+Lines can be fed one at a time as they arrive (add_line), so a 10,000-line
+tail becomes a few dozen templates without holding the lines in memory.
+"""
+
+import re
+
+DEFAULT_DEPTH = 4
+DEFAULT_SIMILARITY = 0.5
+DEFAULT_MAX_CHILDREN = 100
+DEFAULT_MAX_SAMPLES = 3
+
+WILDCARD = '<*>'
+
+HEADER = re.compile(
+    r'^(?P<timestamp>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,.]\d+)?)\s*'
+    r'(?:\[?(?P<level>TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL|CRITICAL)\s*\]?\s*)?'
+    r'(?P<message>.*)$'
+)
+
+# Applied in order; none of the patterns span whitespace, so masked and raw
+# messages split into the same number of tokens
+MASKS = [
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<UUID>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '<HEX>'),
+    (re.compile(r'\b[0-9a-fA-F]{16,}\b'), '<HEX>'),
+    (re.compile(r'(?<![A-Za-z])\d+(?:\.\d+)?'), '<NUM>'),
+]
+
+
+def split_header(line):
+    """Split a VMS log line into (timestamp, level, message); missing parts are None"""
+    match = HEADER.match(line)
+    if not match:
+        return None, None, line
+    level = match.group('level')
+    if level == 'WARNING':
+        level = 'WARN'
+    return match.group('timestamp'), level, match.group('message')
+
+
+def mask_message(message):
+    for pattern, replacement in MASKS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+def _is_variable(token):
+    return token == WILDCARD or '<' in token or any(char.isdigit() for char in token)
+
+
+class LogTemplate:
+    """One message shape with its occurrence statistics"""
+    __slots__ = ('template_id', 'tokens', 'count', 'first_seen', 'last_seen', 'levels', 'samples')
+
+    def __init__(self, template_id, tokens):
+        self.template_id = template_id
+        self.tokens = tokens
+        self.count = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.levels = {}
+        self.samples = []
+
+    @property
+    def template(self):
+        return ' '.join(self.tokens)
+
+    def similarity(self, tokens):
+        """Fraction of positions where the template matches (wildcards are not counted)"""
+        matches = 0
+        for template_token, token in zip(self.tokens, tokens):
+            if template_token == token:
+                matches += 1
+        return matches / len(tokens) if tokens else 1.0
+
+    def merge(self, tokens):
+        self.tokens = [template_token if template_token == token else WILDCARD
+                       for template_token, token in zip(self.tokens, tokens)]
+
+    def record(self, timestamp, level, variables, max_samples):
+        self.count += 1
+        if timestamp:
+            if self.first_seen is None:
+                self.first_seen = timestamp
+            self.last_seen = timestamp
+        if level:
+            self.levels[level] = self.levels.get(level, 0) + 1
+        if variables and len(self.samples) < max_samples and variables not in self.samples:
+            self.samples.append(variables)
+
+    def to_dict(self):
+        return {
+            'id': self.template_id,
+            'template': self.template,
+            'count': self.count,
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen,
+            'levels': dict(self.levels),
+            'samples': [list(sample) for sample in self.samples]
+        }
+
+
+class LogTemplateMiner:
+    def __init__(self, depth=DEFAULT_DEPTH, similarity=DEFAULT_SIMILARITY,
+                 max_children=DEFAULT_MAX_CHILDREN, max_samples=DEFAULT_MAX_SAMPLES):
+        """
+        Args:
+            depth (int): Parse tree depth (token count level + depth - 2 leading-token levels)
+            similarity (float): Minimum fraction of matching tokens to join a template
+            max_children (int): Children per tree node before new tokens share a wildcard branch
+            max_samples (int): Sample variable lists kept per template
+        """
+        self.prefix_tokens = max(1, depth - 2)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_samples = max_samples
+
+        self._root = {}  # token count -> nested dicts of leading tokens -> list of LogTemplate
+        self._templates = []
+        self.line_count = 0
+
+    def add_line(self, line):
+        """Add one log line; returns its LogTemplate (None for blank lines)"""
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            return None
+        self.line_count += 1
+
+        timestamp, level, message = split_header(line)
+        raw_tokens = message.split()
+        tokens = mask_message(message).split()
+        if len(tokens) != len(raw_tokens):  # keep raw and masked tokens aligned
+            tokens = raw_tokens
+
+        leaf = self._leaf(tokens)
+        best = None
+        best_similarity = -1.0
+        for candidate in leaf:
+            score = candidate.similarity(tokens)
+            if score > best_similarity:
+                best, best_similarity = candidate, score
+
+        if best is None or best_similarity < self.similarity:
+            best = LogTemplate(len(self._templates) + 1, list(tokens))
+            leaf.append(best)
+            self._templates.append(best)
+        else:
+            best.merge(tokens)
+
+        variables = tuple(raw for raw, masked, template_token in zip(raw_tokens, tokens, best.tokens)
+                          if template_token == WILDCARD or raw != masked)
+        best.record(timestamp, level, variables, self.max_samples)
+        return best
+
+    def add_lines(self, lines):
+        for line in lines:
+            self.add_line(line)
+        return self
+
+    def _leaf(self, tokens):
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.prefix_tokens]:
+            key = WILDCARD if _is_variable(token) else token
+            if key not in node:
+                if len(node) >= self.max_children:
+                    key = WILDCARD
+                node = node.setdefault(key, {})
+            else:
+                node = node[key]
+        return node.setdefault(None, [])
+
+    def templates(self, order='count'):
+        """Templates sorted by count (default), first occurrence ('first') or id"""
+        if order == 'count':
+            return sorted(self._templates, key=lambda template: (-template.count, template.template_id))
+        if order == 'first':
+            return sorted(self._templates, key=lambda template: (template.first_seen or '', template.template_id))
+        return list(self._templates)
+
+    def summary(self, limit=200, order='count'):
+        """
+        Returns:
+            dict: lines, template_count, templates (list of template dicts, at most limit)
+        """
+        templates = self.templates(order)
+        return {
+            'lines': self.line_count,
+            'template_count': len(templates),
+            'templates': [template.to_dict() for template in templates[:limit]]
+        }
+
+    def render_text(self, limit=200):
+        """Plain-text table of the templates (for copying / pop-out windows)"""
+        rows = [f"{'COUNT':>7}  {'LEVELS':<22} {'FIRST':<23} {'LAST':<23} TEMPLATE"]
+        for template in self.templates()[:limit]:
+            levels = ','.join(f"{level}:{count}" for level, count in sorted(template.levels.items()))
+            rows.append(f"{template.count:>7}  {levels:<22} {template.first_seen or '-':<23} "
+                        f"{template.last_seen or '-':<23} {template.template}")
+        return '\n'.join(rows)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pod Resource Sampler for the VMS Debug Tool
+
+Runs "kubectl top pods -A" (CPU / memory) and "kubectl get pods -A -o json"
+(restart counts) every N seconds in a background thread and keeps a short
+history per pod, so CPU and memory trends of a slow tenant can be viewed
+without re-running anything on the cluster.
+
+History is kept in fixed-size ring buffers. Each pod owns one preallocated
+array per metric (array module, not lists of dicts), so memory is bounded by
+pods x capacity regardless of how long the sampler runs. Pods that stop
+appearing are dropped once their whole history window has passed.
+
+The sampler does not talk to SSH itself: it is given a run_command callable
+(the debug tool passes one that opens a separate exec channel per command,
+so the interactive shell is never blocked).
+"""
+
+import heapq
+import json
+import threading
+import time
+from array import array
+
+DEFAULT_INTERVAL = 15
+DEFAULT_CAPACITY = 240  # 1 hour at the default interval
+
+TOP_PODS_COMMAND = "kubectl top pods -A --no-headers"
+POD_STATUS_COMMAND = "kubectl get pods -A -o json"
+
+METRICS = ('cpu', 'memory', 'restarts')
+
+_CPU_UNITS = {'n': 1e-6, 'u': 1e-3, 'm': 1.0}
+_MEMORY_UNITS = {
+    'Ki': 1.0 / 1024, 'Mi': 1.0, 'Gi': 1024.0, 'Ti': 1024.0 * 1024,
+    'K': 1000.0 / (1024 * 1024), 'M': 1000.0 ** 2 / (1024 * 1024), 'G': 1000.0 ** 3 / (1024 * 1024)
+}
+
+
+def parse_cpu(value):
+    """Kubernetes CPU quantity -> millicores ("250m" -> 250, "2" -> 2000)"""
+    value = value.strip()
+    if value and value[-1] in _CPU_UNITS:
+        return float(value[:-1]) * _CPU_UNITS[value[-1]]
+    return float(value) * 1000
+
+
+def parse_memory(value):
+    """Kubernetes memory quantity -> MiB ("512Mi" -> 512, "1Gi" -> 1024)"""
+    value = value.strip()
+    for suffix in ('Ki', 'Mi', 'Gi', 'Ti', 'K', 'M', 'G'):
+        if value.endswith(suffix):
+            return float(value[:-len(suffix)]) * _MEMORY_UNITS[suffix]
+    return float(value) / (1024 * 1024)
+
+
+def parse_top_pods(output):
+    """
+    Parse "kubectl top pods -A" output
+
+    Returns:
+        dict: {(namespace, pod): (cpu_millicores, memory_mib)}
+    """
+    usage = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or parts[0] == 'NAMESPACE':
+            continue
+        try:
+            usage[(parts[0], parts[1])] = (parse_cpu(parts[2]), parse_memory(parts[3]))
+        except ValueError:
+            continue
+    return usage
+
+
+def parse_pod_restarts(output):
+    """
+    Parse "kubectl get pods -A -o json" output into restart counts
+
+    Returns:
+        dict: {(namespace, pod): total container restarts}
+    """
+    start = output.find('{')
+    if start < 0:
+        return {}
+    try:
+        data = json.loads(output[start:output.rfind('}') + 1])
+    except ValueError:
+        return {}
+
+    restarts = {}
+    for item in data.get('items', []):
+        metadata = item.get('metadata', {})
+        statuses = (item.get('status') or {}).get('containerStatuses') or []
+        restarts[(metadata.get('namespace'), metadata.get('name'))] = sum(
+            status.get('restartCount', 0) for status in statuses
+        )
+    return restarts
+
+
+class PodSeries:
+    """Fixed-size ring buffer of samples for one pod"""
+    __slots__ = ('namespace', 'pod', 'timestamps', 'cpu', 'memory', 'restarts', 'next', 'count')
+
+    def __init__(self, namespace, pod, capacity):
+        self.namespace = namespace
+        self.pod = pod
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.cpu = array('f', bytes(4 * capacity))
+        self.memory = array('f', bytes(4 * capacity))
+        self.restarts = array('l', [0]) * capacity
+        self.next = 0
+        self.count = 0
+
+    def append(self, timestamp, cpu, memory, restarts):
+        position = self.next
+        self.timestamps[position] = timestamp
+        self.cpu[position] = cpu
+        self.memory[position] = memory
+        self.restarts[position] = restarts
+        self.next = (position + 1) % len(self.timestamps)
+        self.count = min(self.count + 1, len(self.timestamps))
+
+    def _ordered(self, values):
+        """Values oldest -> newest"""
+        if self.count < len(values):
+            return values[:self.count].tolist()
+        return values[self.next:].tolist() + values[:self.next].tolist()
+
+    def latest(self, metric):
+        return getattr(self, metric)[self.next - 1] if self.count else 0
+
+    @property
+    def last_seen(self):
+        return self.timestamps[self.next - 1] if self.count else 0
+
+    def to_dict(self):
+        return {
+            'namespace': self.namespace,
+            'pod': self.pod,
+            'timestamps': self._ordered(self.timestamps),
+            'cpu': [round(value, 1) for value in self._ordered(self.cpu)],
+            'memory': [round(value, 1) for value in self._ordered(self.memory)],
+            'restarts': self._ordered(self.restarts),
+            'latest_cpu': round(self.latest('cpu'), 1),
+            'latest_memory': round(self.latest('memory'), 1),
+            'latest_restarts': self.latest('restarts')
+        }
+
+
+class PodResourceSampler:
+    def __init__(self, run_command, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY, on_sample=None):
+        """
+        Args:
+            run_command (callable): run_command(command) -> output text (raises on failure)
+            interval (float): Seconds between samples
+            capacity (int): Samples kept per pod
+            on_sample (callable): Called with a status dict after every sample
+        """
+        self.run_command = run_command
+        self.interval = interval
+        self.capacity = capacity
+        self.on_sample = on_sample
+
+        self._series = {}  # (namespace, pod) -> PodSeries
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.sample_count = 0
+        self.last_error = None
+        self.last_sample_time = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.time()
+            self.sample_once()
+            self._stop.wait(max(0.0, self.interval - (time.time() - started)))
+
+    def sample_once(self):
+        """Take one sample of all pods; errors are recorded, not raised"""
+        timestamp = time.time()
+        try:
+            usage = parse_top_pods(self.run_command(TOP_PODS_COMMAND))
+            if not usage:
+                raise RuntimeError("kubectl top returned no data (is metrics-server running?)")
+            try:
+                restarts = parse_pod_restarts(self.run_command(POD_STATUS_COMMAND))
+            except Exception:
+                restarts = {}
+
+            with self._lock:
+                for key, (cpu, memory) in usage.items():
+                    series = self._series.get(key)
+                    if series is None:
+                        series = self._series[key] = PodSeries(key[0], key[1], self.capacity)
+                    series.append(timestamp, cpu, memory, restarts.get(key, 0))
+
+                # Forget pods that have not been seen for a whole history window
+                expiry = timestamp - self.interval * self.capacity
+                for key in [key for key, series in self._series.items() if series.last_seen < expiry]:
+                    del self._series[key]
+
+            self.sample_count += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+
+        self.last_sample_time = timestamp
+        if self.on_sample:
+            self.on_sample(self.status())
+
+    def status(self):
+        with self._lock:
+            pod_count = len(self._series)
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'capacity': self.capacity,
+            'samples': self.sample_count,
+            'pods': pod_count,
+            'last_sample_time': self.last_sample_time,
+            'error': self.last_error
+        }
+
+    def namespaces(self):
+        with self._lock:
+            return sorted({namespace for namespace, _ in self._series})
+
+    def top(self, namespace=None, metric='cpu', n=10):
+        """Top-N pods by their latest value of a metric"""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        with self._lock:
+            candidates = [series for series in self._series.values()
+                          if namespace is None or series.namespace == namespace]
+            return [series.to_dict() for series in
+                    heapq.nlargest(n, candidates, key=lambda series: series.latest(metric))]
+
+    def history(self, namespace=None, n=10):
+        """
+        View for the UI: top-N by CPU and memory with their full history
+
+        Returns:
+            dict: status, namespaces, top_cpu, top_memory
+        """
+        return {
+            'status': self.status(),
+            'namespace': namespace,
+            'namespaces': self.namespaces(),
+            'top_cpu': self.top(namespace, 'cpu', n),
+            'top_memory': self.top(namespace, 'memory', n)
+        }
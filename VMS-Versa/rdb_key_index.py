@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+RDB Key Index for the VMS Debug Tool
+
+Turns one streamed RDB snapshot (see rdb_stream_parser) into a SQLite file in
+the Logs directory that can be queried long after the snapshot was taken,
+without touching the tenant Redis again:
+
+- rdb_keys:        one row per key (type, encoding, serialized size, element
+                   count, expiry, prefix pattern)
+- rdb_hash_fields: field/value rows of the hashes matching the value pattern
+                   (by default the EntryData hashes), for decoding
+- rdb_prefixes:    per-prefix totals, computed while streaming
+- rdb_meta:        RDB version, AUX fields (redis-ver, used-mem, ...) and totals
+
+Rows are inserted in batches while the snapshot streams in; the key indexes are
+created once at the end, which is much faster than maintaining them per insert.
+The file is built under a .partial name and only renamed into place once the
+whole snapshot was indexed, so a failed parse never leaves a truncated index.
+Prefix patterns come from redis_keyspace_profiler.normalize_key, so the report
+lines up with the sampled keyspace profile.
+"""
+
+import fnmatch
+import json
+import os
+import sqlite3
+import time
+
+from rdb_stream_parser import RDBParser, value_to_text
+from redis_keyspace_profiler import normalize_key
+
+DEFAULT_VALUE_PATTERN = '*EntryData*'
+INSERT_BATCH_SIZE = 5000
+PROGRESS_INTERVAL = 100000
+LARGEST_KEYS_PER_PREFIX = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rdb_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rdb_keys (
+    db INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    type TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    elements INTEGER NOT NULL,
+    expires_at INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS rdb_hash_fields (
+    db INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rdb_prefixes (
+    prefix TEXT PRIMARY KEY,
+    keys INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    elements INTEGER NOT NULL,
+    with_ttl INTEGER NOT NULL,
+    types TEXT NOT NULL,
+    largest TEXT NOT NULL
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_rdb_keys_key ON rdb_keys (key);
+CREATE INDEX IF NOT EXISTS idx_rdb_keys_size ON rdb_keys (size);
+CREATE INDEX IF NOT EXISTS idx_rdb_keys_prefix ON rdb_keys (prefix, size);
+CREATE INDEX IF NOT EXISTS idx_rdb_hash_fields_key ON rdb_hash_fields (key);
+"""
+
+
+class RDBKeyIndex:
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def _connect(self, path=None):
+        """Open a new SQLite connection (one per call keeps threads independent)"""
+        conn = sqlite3.connect(path or self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def build(self, stream, value_pattern=DEFAULT_VALUE_PATTERN, progress=None):
+        """
+        Parse an RDB stream into this index (replacing any previous content)
+
+        Args:
+            stream: Binary file-like object positioned at the start of the RDB
+            value_pattern (str): Glob of hash keys whose fields are stored for decoding
+            progress (callable): progress(message) for status lines
+
+        Returns:
+            dict: summary (see summary())
+        """
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        partial_path = self.db_path + '.partial'
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+        start_time = time.time()
+        parser = RDBParser(
+            stream,
+            keep_value=lambda key, key_type: key_type == 'hash' and fnmatch.fnmatchcase(key, value_pattern)
+        )
+        prefixes = {}
+        key_rows = []
+        field_rows = []
+        totals = {'keys': 0, 'bytes': 0, 'with_ttl': 0, 'hashes_stored': 0}
+
+        conn = self._connect(partial_path)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(_SCHEMA)
+
+            for entry in parser.entries():
+                prefix = normalize_key(entry.key)
+                key_rows.append((entry.db, entry.key, prefix, entry.type, entry.encoding,
+                                 entry.size, entry.elements, entry.expires_ms))
+
+                stats = prefixes.get(prefix)
+                if stats is None:
+                    stats = prefixes[prefix] = {'keys': 0, 'bytes': 0, 'elements': 0, 'with_ttl': 0,
+                                                'types': {}, 'largest': []}
+                stats['keys'] += 1
+                stats['bytes'] += entry.size
+                stats['elements'] += entry.elements
+                stats['types'][entry.type] = stats['types'].get(entry.type, 0) + 1
+                if entry.expires_ms is not None:
+                    stats['with_ttl'] += 1
+                    totals['with_ttl'] += 1
+                largest = stats['largest']
+                if len(largest) < LARGEST_KEYS_PER_PREFIX or entry.size > largest[-1][0]:
+                    largest.append((entry.size, entry.key))
+                    largest.sort(reverse=True)
+                    del largest[LARGEST_KEYS_PER_PREFIX:]
+
+                if entry.value is not None:
+                    totals['hashes_stored'] += 1
+                    for field, value in value_to_text(entry.value).items():
+                        field_rows.append((entry.db, entry.key, field, str(value)))
+
+                totals['keys'] += 1
+                totals['bytes'] += entry.size
+                if len(key_rows) >= INSERT_BATCH_SIZE:
+                    self._flush(conn, key_rows, field_rows)
+                if progress and totals['keys'] % PROGRESS_INTERVAL == 0:
+                    progress(f"  Indexed {totals['keys']} keys ({totals['bytes'] // (1024 * 1024)} MB of RDB data)")
+
+            self._flush(conn, key_rows, field_rows)
+            conn.executemany(
+                "INSERT INTO rdb_prefixes (prefix, keys, bytes, elements, with_ttl, types, largest) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(prefix, stats['keys'], stats['bytes'], stats['elements'], stats['with_ttl'],
+                  json.dumps(stats['types']),
+                  json.dumps([{'key': key, 'bytes': size} for size, key in stats['largest']]))
+                 for prefix, stats in prefixes.items()]
+            )
+            if progress:
+                progress("  Creating key indexes...")
+            conn.executescript(_INDEXES)
+
+            meta = {'rdb_version': parser.version, 'keys': totals['keys'], 'bytes': totals['bytes'],
+                    'with_ttl': totals['with_ttl'], 'hashes_stored': totals['hashes_stored'],
+                    'prefix_count': len(prefixes), 'value_pattern': value_pattern,
+                    'db_sizes': parser.db_sizes, 'aux': parser.aux,
+                    'elapsed': round(time.time() - start_time, 2)}
+            conn.executemany("INSERT INTO rdb_meta (name, value) VALUES (?, ?)",
+                             [(name, json.dumps(value)) for name, value in meta.items()])
+            conn.commit()
+            conn.close()
+            os.replace(partial_path, self.db_path)
+        except Exception:
+            conn.close()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        return self.summary()
+
+    def remove(self):
+        """Delete the index file"""
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    @staticmethod
+    def _flush(conn, key_rows, field_rows):
+        conn.executemany("INSERT INTO rdb_keys VALUES (?, ?, ?, ?, ?, ?, ?, ?)", key_rows)
+        conn.executemany("INSERT INTO rdb_hash_fields VALUES (?, ?, ?, ?)", field_rows)
+        conn.commit()
+        del key_rows[:]
+        del field_rows[:]
+
+    def summary(self, prefix_limit=200):
+        """
+        Totals of the snapshot and its prefix patterns
+
+        Returns:
+            dict: rdb_version, keys, bytes, with_ttl, hashes_stored, prefix_count, aux, db_sizes,
+                  elapsed, prefixes (largest first, at most prefix_limit)
+        """
+        conn = self._connect()
+        try:
+            summary = {row['name']: json.loads(row['value']) for row in conn.execute("SELECT * FROM rdb_meta")}
+            rows = conn.execute(
+                "SELECT * FROM rdb_prefixes ORDER BY bytes DESC, keys DESC, prefix LIMIT ?", (prefix_limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        total_bytes = summary.get('bytes') or 0
+        summary['prefixes'] = [{
+            'prefix': row['prefix'],
+            'keys': row['keys'],
+            'bytes': row['bytes'],
+            'average_bytes': round(row['bytes'] / row['keys']) if row['keys'] else 0,
+            'share': round(row['bytes'] / total_bytes, 4) if total_bytes else 0,
+            'elements': row['elements'],
+            'ttl_share': round(row['with_ttl'] / row['keys'], 3) if row['keys'] else 0,
+            'types': json.loads(row['types']),
+            'largest': json.loads(row['largest'])
+        } for row in rows]
+        return summary
+
+    def search(self, pattern='*', limit=200, order_by_size=True):
+        """
+        Keys matching a glob pattern (case-sensitive, like redis-cli --pattern)
+
+        Returns:
+            list: dicts with db, key, prefix, type, encoding, size, elements, expires_at
+        """
+        order = "size DESC" if order_by_size else "key"
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM rdb_keys WHERE key GLOB ? ORDER BY {order} LIMIT ?", (pattern or '*', limit)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def hashes(self, pattern='*', limit=1000):
+        """{key: {field: value}} of stored hashes matching a glob pattern, for EntryDataDecoder"""
+        conn = self._connect()
+        try:
+            keys = [row['key'] for row in conn.execute(
+                "SELECT DISTINCT key FROM rdb_hash_fields WHERE key GLOB ? ORDER BY key LIMIT ?",
+                (pattern or '*', limit)
+            )]
+            hashes = {key: {} for key in keys}
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                cursor = conn.execute(
+                    f"SELECT key, field, value FROM rdb_hash_fields WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for row in cursor:
+                    hashes[row['key']][row['field']] = row['value']
+            return hashes
+        finally:
+            conn.close()
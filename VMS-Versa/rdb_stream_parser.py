@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Streaming Redis RDB parser for the VMS Debug Tool
+
+Reads an RDB snapshot from any binary stream (an SSH channel running
+'redis-cli --rdb', a file, a bundle member) front to back, and yields one
+RDBEntry per key as soon as the key has been read. Only the current key is
+held in memory; the input is consumed through a fixed-size read buffer.
+
+Supported (RDB versions up to 12, Redis 2.x - 7.4):
+    - strings, including integer and LZF-compressed encodings
+    - lists (linked list, ziplist, quicklist with ziplist or listpack nodes)
+    - sets (plain, intset, listpack), sorted sets (plain, zset2, ziplist, listpack)
+    - hashes (plain, zipmap, ziplist, listpack, and the field-TTL forms)
+    - streams and module values are skipped over (size and entry count only)
+    - AUX fields, SELECTDB, RESIZEDB, expiry, LRU/LFU, function and slot opcodes
+
+Each entry carries its serialized size in the snapshot, a good proxy for the
+memory the key holds (values are compressed/encoded the same way in memory
+for small aggregates, and proportionally for large ones).
+"""
+
+import struct
+
+RDB_MAGIC = b'REDIS'
+READ_SIZE = 256 * 1024
+
+# Opcodes
+OP_SLOT_INFO = 0xF4
+OP_FUNCTION2 = 0xF5
+OP_FUNCTION_PRE_GA = 0xF6
+OP_MODULE_AUX = 0xF7
+OP_IDLE = 0xF8
+OP_FREQ = 0xF9
+OP_AUX = 0xFA
+OP_RESIZEDB = 0xFB
+OP_EXPIRETIME_MS = 0xFC
+OP_EXPIRETIME = 0xFD
+OP_SELECTDB = 0xFE
+OP_EOF = 0xFF
+
+# Value types -> (type name, encoding)
+TYPE_NAMES = {
+    0: ('string', 'raw'), 1: ('list', 'linkedlist'), 2: ('set', 'hashtable'), 3: ('zset', 'skiplist'),
+    4: ('hash', 'hashtable'), 5: ('zset', 'skiplist'), 6: ('module', 'module'), 7: ('module', 'module'),
+    9: ('hash', 'zipmap'), 10: ('list', 'ziplist'), 11: ('set', 'intset'), 12: ('zset', 'ziplist'),
+    13: ('hash', 'ziplist'), 14: ('list', 'quicklist'), 15: ('stream', 'listpacks'), 16: ('hash', 'listpack'),
+    17: ('zset', 'listpack'), 18: ('list', 'quicklist'), 19: ('stream', 'listpacks'), 20: ('set', 'listpack'),
+    21: ('stream', 'listpacks'), 22: ('hash', 'hashtable'), 23: ('hash', 'listpack'), 24: ('hash', 'hashtable'),
+    25: ('hash', 'listpack'),
+}
+
+_ENC_INT8, _ENC_INT16, _ENC_INT32, _ENC_LZF = 0, 1, 2, 3
+_MODULE_OPCODE_EOF, _MODULE_OPCODE_SINT, _MODULE_OPCODE_UINT = 0, 1, 2
+_MODULE_OPCODE_FLOAT, _MODULE_OPCODE_DOUBLE, _MODULE_OPCODE_STRING = 3, 4, 5
+
+
+class RDBError(Exception):
+    """Malformed or unsupported RDB content"""
+
+
+class RDBEntry:
+    __slots__ = ('db', 'key', 'type', 'encoding', 'value', 'elements', 'expires_ms', 'size')
+
+    def __init__(self, db, key, value_type, encoding, value, elements, expires_ms, size):
+        self.db = db
+        self.key = key
+        self.type = value_type
+        self.encoding = encoding
+        self.value = value
+        self.elements = elements
+        self.expires_ms = expires_ms
+        self.size = size
+
+
+def _text(data):
+    return data.decode('utf-8', errors='backslashreplace') if isinstance(data, bytes) else str(data)
+
+
+def lzf_decompress(data, expected_length):
+    """Decompress an LZF block (the compression Redis uses for long strings)"""
+    output = bytearray()
+    position = 0
+    end = len(data)
+    while position < end:
+        control = data[position]
+        position += 1
+        if control < 32:
+            # Literal run of control + 1 bytes
+            output += data[position:position + control + 1]
+            position += control + 1
+            continue
+        length = control >> 5
+        if length == 7:
+            length += data[position]
+            position += 1
+        reference = len(output) - ((control & 0x1F) << 8) - data[position] - 1
+        position += 1
+        length += 2
+        if reference < 0:
+            raise RDBError("Invalid LZF back reference")
+        if reference + length <= len(output):
+            output += output[reference:reference + length]
+        else:
+            # Overlapping copy repeats the pattern byte by byte
+            for offset in range(length):
+                output.append(output[reference + offset])
+    if len(output) != expected_length:
+        raise RDBError(f"LZF length mismatch ({len(output)} != {expected_length})")
+    return bytes(output)
+
+
+def parse_ziplist(data):
+    """Entries of a ziplist blob (bytes or int)"""
+    entries = []
+    position = 10  # zlbytes, zltail, zllen
+    while True:
+        if position >= len(data):
+            raise RDBError("Unterminated ziplist")
+        if data[position] == 0xFF:
+            return entries
+        position += 5 if data[position] == 0xFE else 1  # previous entry length
+        header = data[position]
+        kind = header >> 6
+        if kind == 0:
+            length = header & 0x3F
+            position += 1
+        elif kind == 1:
+            length = ((header & 0x3F) << 8) | data[position + 1]
+            position += 2
+        elif kind == 2:
+            length = struct.unpack('>I', data[position + 1:position + 5])[0]
+            position += 5
+        else:
+            position += 1
+            if header == 0xC0:
+                entries.append(struct.unpack('<h', data[position:position + 2])[0])
+                position += 2
+            elif header == 0xD0:
+                entries.append(struct.unpack('<i', data[position:position + 4])[0])
+                position += 4
+            elif header == 0xE0:
+                entries.append(struct.unpack('<q', data[position:position + 8])[0])
+                position += 8
+            elif header == 0xF0:
+                entries.append(int.from_bytes(data[position:position + 3], 'little', signed=True))
+                position += 3
+            elif header == 0xFE:
+                entries.append(struct.unpack('<b', data[position:position + 1])[0])
+                position += 1
+            elif 0xF1 <= header <= 0xFD:
+                entries.append((header & 0x0F) - 1)
+            else:
+                raise RDBError(f"Unknown ziplist entry encoding 0x{header:02x}")
+            continue
+        entries.append(bytes(data[position:position + length]))
+        position += length
+
+
+def _listpack_backlen_size(entry_length):
+    if entry_length <= 127:
+        return 1
+    if entry_length < 16383:
+        return 2
+    if entry_length < 2097151:
+        return 3
+    if entry_length < 268435455:
+        return 4
+    return 5
+
+
+def parse_listpack(data):
+    """Entries of a listpack blob (bytes or int)"""
+    entries = []
+    position = 6  # total bytes, number of elements
+    while True:
+        if position >= len(data):
+            raise RDBError("Unterminated listpack")
+        header = data[position]
+        if header == 0xFF:
+            return entries
+        start = position
+        if header & 0x80 == 0:
+            entries.append(header & 0x7F)
+            position += 1
+        elif header & 0xC0 == 0x80:
+            length = header & 0x3F
+            entries.append(bytes(data[position + 1:position + 1 + length]))
+            position += 1 + length
+        elif header & 0xE0 == 0xC0:
+            value = ((header & 0x1F) << 8) | data[position + 1]
+            entries.append(value - (1 << 13) if value >= 1 << 12 else value)
+            position += 2
+        elif header & 0xF0 == 0xE0:
+            length = ((header & 0x0F) << 8) | data[position + 1]
+            entries.append(bytes(data[position + 2:position + 2 + length]))
+            position += 2 + length
+        elif header == 0xF0:
+            length = struct.unpack('<I', data[position + 1:position + 5])[0]
+            entries.append(bytes(data[position + 5:position + 5 + length]))
+            position += 5 + length
+        elif header in (0xF1, 0xF2, 0xF3, 0xF4):
+            width = {0xF1: 2, 0xF2: 3, 0xF3: 4, 0xF4: 8}[header]
+            entries.append(int.from_bytes(data[position + 1:position + 1 + width], 'little', signed=True))
+            position += 1 + width
+        else:
+            raise RDBError(f"Unknown listpack entry encoding 0x{header:02x}")
+        position += _listpack_backlen_size(position - start)
+
+
+def parse_intset(data):
+    width, count = struct.unpack('<II', data[:8])
+    code = {2: 'h', 4: 'i', 8: 'q'}.get(width)
+    if code is None:
+        raise RDBError(f"Invalid intset encoding {width}")
+    return list(struct.unpack(f'<{count}{code}', data[8:8 + width * count]))
+
+
+def parse_zipmap(data):
+    """Field/value pairs of an old-style zipmap hash"""
+    pairs = {}
+    position = 1
+
+    def read_length():
+        nonlocal position
+        first = data[position]
+        if first < 254:
+            position += 1
+            return first
+        if first == 254:
+            length = struct.unpack('<I', data[position + 1:position + 5])[0]
+            position += 5
+            return length
+        return None
+
+    while True:
+        length = read_length()
+        if length is None:
+            return pairs
+        field = bytes(data[position:position + length])
+        position += length
+        length = read_length()
+        free = data[position]
+        value = bytes(data[position + 1:position + 1 + length])
+        position += 1 + length + free
+        pairs[field] = value
+
+
+class _Reader:
+    """Buffered exact reads from a stream, counting the bytes consumed"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = b''
+        self.position = 0
+        self.consumed = 0
+
+    def read(self, count):
+        end = self.position + count
+        if end > len(self.buffer):
+            chunks = [self.buffer[self.position:]]
+            available = len(chunks[0])
+            while available < count:
+                chunk = self.stream.read(max(READ_SIZE, count - available))
+                if not chunk:
+                    raise RDBError("Unexpected end of RDB stream")
+                chunks.append(chunk)
+                available += len(chunk)
+            self.buffer = b''.join(chunks)
+            self.position = 0
+            end = count
+        data = self.buffer[self.position:end]
+        self.position = end
+        self.consumed += count
+        return data
+
+    def byte(self):
+        return self.read(1)[0]
+
+
+class RDBParser:
+    def __init__(self, stream, keep_value=None):
+        """
+        Args:
+            stream: Binary file-like object with read(n)
+            keep_value (callable): keep_value(key, type_name) -> bool; values of
+                other keys are parsed but not returned (entry.value is None)
+        """
+        self.reader = _Reader(stream)
+        self.keep_value = keep_value
+        self.version = None
+        self.aux = {}
+        self.db_sizes = {}
+
+    # ---- primitives --------------------------------------------------------------
+
+    def _length(self):
+        """Returns (length, is_encoded)"""
+        first = self.reader.byte()
+        kind = first >> 6
+        if kind == 0:
+            return first & 0x3F, False
+        if kind == 1:
+            return ((first & 0x3F) << 8) | self.reader.byte(), False
+        if kind == 2:
+            if first == 0x80:
+                return struct.unpack('>I', self.reader.read(4))[0], False
+            if first == 0x81:
+                return struct.unpack('>Q', self.reader.read(8))[0], False
+            raise RDBError(f"Invalid length encoding 0x{first:02x}")
+        return first & 0x3F, True
+
+    def length(self):
+        length, encoded = self._length()
+        if encoded:
+            raise RDBError("Unexpected encoded length")
+        return length
+
+    def string(self):
+        """A string value: bytes, or int for integer-encoded strings"""
+        length, encoded = self._length()
+        if not encoded:
+            return self.reader.read(length)
+        if length == _ENC_INT8:
+            return struct.unpack('<b', self.reader.read(1))[0]
+        if length == _ENC_INT16:
+            return struct.unpack('<h', self.reader.read(2))[0]
+        if length == _ENC_INT32:
+            return struct.unpack('<i', self.reader.read(4))[0]
+        if length == _ENC_LZF:
+            compressed_length = self.length()
+            expected_length = self.length()
+            return lzf_decompress(self.reader.read(compressed_length), expected_length)
+        raise RDBError(f"Unknown string encoding {length}")
+
+    def blob(self):
+        value = self.string()
+        return value if isinstance(value, bytes) else str(value).encode('ascii')
+
+    def _double_text(self):
+        length = self.reader.byte()
+        if length == 253:
+            return float('nan')
+        if length == 254:
+            return float('inf')
+        if length == 255:
+            return float('-inf')
+        return float(self.reader.read(length))
+
+    def _binary_double(self):
+        return struct.unpack('<d', self.reader.read(8))[0]
+
+    def _millisecond_time(self):
+        return struct.unpack('<q', self.reader.read(8))[0]
+
+    # ---- values ------------------------------------------------------------------
+
+    def value(self, type_code):
+        """Read one value; returns (python value, element count)"""
+        if type_code == 0:
+            value = self.string()
+            return value, 1
+        if type_code in (1, 2):
+            count = self.length()
+            items = [self.string() for _ in range(count)]
+            return items, count
+        if type_code in (3, 5):
+            count = self.length()
+            read_score = self._double_text if type_code == 3 else self._binary_double
+            items = {}
+            for _ in range(count):
+                member = self.string()
+                items[member] = read_score()
+            return items, count
+        if type_code == 4:
+            count = self.length()
+            pairs = {}
+            for _ in range(count):
+                field = self.string()
+                pairs[field] = self.string()
+            return pairs, count
+        if type_code == 9:
+            pairs = parse_zipmap(self.blob())
+            return pairs, len(pairs)
+        if type_code == 10:
+            items = parse_ziplist(self.blob())
+            return items, len(items)
+        if type_code == 11:
+            items = parse_intset(self.blob())
+            return items, len(items)
+        if type_code in (12, 13, 16, 17):
+            parse = parse_ziplist if type_code in (12, 13) else parse_listpack
+            flat = parse(self.blob())
+            pairs = dict(zip(flat[0::2], flat[1::2]))
+            return pairs, len(pairs)
+        if type_code == 14:
+            items = []
+            for _ in range(self.length()):
+                items.extend(parse_ziplist(self.blob()))
+            return items, len(items)
+        if type_code == 18:
+            items = []
+            for _ in range(self.length()):
+                container = self.length()
+                node = self.blob()
+                if container == 1:  # plain node: a single large element
+                    items.append(node)
+                else:
+                    items.extend(parse_listpack(node))
+            return items, len(items)
+        if type_code == 20:
+            items = parse_listpack(self.blob())
+            return items, len(items)
+        if type_code in (22, 24):
+            if type_code == 24:
+                self._millisecond_time()  # minimum field expiry
+            count = self.length()
+            pairs = {}
+            for _ in range(count):
+                self.length()  # field TTL
+                field = self.string()
+                pairs[field] = self.string()
+            return pairs, count
+        if type_code in (23, 25):
+            if type_code == 25:
+                self._millisecond_time()
+            flat = parse_listpack(self.blob())
+            pairs = {flat[index]: flat[index + 1] for index in range(0, len(flat) - 2, 3)}
+            return pairs, len(pairs)
+        if type_code in (15, 19, 21):
+            return None, self._skip_stream(type_code)
+        if type_code == 7:
+            self.length()  # module id
+            self._skip_module_opcodes()
+            return None, 1
+        if type_code == 6:
+            raise RDBError("Module values in the pre-4.0 format (type 6) can't be skipped")
+        raise RDBError(f"Unknown value type {type_code}")
+
+    def _stream_id(self):
+        return self.length(), self.length()
+
+    def _skip_stream(self, type_code):
+        """Consume a stream value; returns its entry count"""
+        for _ in range(self.length()):
+            self.string()  # master ID of the listpack node
+            self.string()  # listpack
+        entries = self.length()
+        self._stream_id()  # last id
+        if type_code >= 19:
+            self._stream_id()  # first id
+            self._stream_id()  # max deleted id
+            self.length()  # entries added
+        for _ in range(self.length()):  # consumer groups
+            self.string()
+            self._stream_id()
+            if type_code >= 19:
+                self.length()  # entries read
+            for _ in range(self.length()):  # group PEL: id, delivery time, delivery count
+                self.reader.read(16 + 8)
+                self.length()
+            for _ in range(self.length()):  # consumers
+                self.string()
+                self._millisecond_time()  # seen time
+                if type_code >= 21:
+                    self._millisecond_time()  # active time
+                for _ in range(self.length()):
+                    self.reader.read(16)
+        return entries
+
+    def _skip_module_opcodes(self):
+        while True:
+            opcode = self.length()
+            if opcode == _MODULE_OPCODE_EOF:
+                return
+            if opcode in (_MODULE_OPCODE_SINT, _MODULE_OPCODE_UINT):
+                self.length()
+            elif opcode == _MODULE_OPCODE_FLOAT:
+                self.reader.read(4)
+            elif opcode == _MODULE_OPCODE_DOUBLE:
+                self.reader.read(8)
+            elif opcode == _MODULE_OPCODE_STRING:
+                self.string()
+            else:
+                raise RDBError(f"Unknown module opcode {opcode}")
+
+    # ---- entries -----------------------------------------------------------------
+
+    def entries(self):
+        """
+        Yield every key of the snapshot
+
+        Yields:
+            RDBEntry: db, key (str), type, encoding, value (python structure or None),
+                      elements, expires_ms (None if persistent), size (bytes in the RDB)
+        """
+        magic = self.reader.read(9)
+        if magic[:5] != RDB_MAGIC:
+            raise RDBError("Not an RDB file (missing REDIS header)")
+        self.version = int(magic[5:])
+
+        db = 0
+        expires_ms = None
+        entry_start = self.reader.consumed
+        while True:
+            opcode = self.reader.byte()
+            if opcode == OP_EOF:
+                if self.version >= 5:
+                    self.reader.read(8)  # CRC64 checksum
+                return
+            if opcode == OP_SELECTDB:
+                db = self.length()
+            elif opcode == OP_RESIZEDB:
+                self.db_sizes[db] = self.length()
+                self.length()  # expires hash table size
+            elif opcode == OP_AUX:
+                key = _text(self.string())
+                self.aux[key] = _text(self.string())
+            elif opcode == OP_EXPIRETIME_MS:
+                expires_ms = self._millisecond_time()
+                continue
+            elif opcode == OP_EXPIRETIME:
+                expires_ms = struct.unpack('<i', self.reader.read(4))[0] * 1000
+                continue
+            elif opcode == OP_IDLE:
+                self.length()
+                continue
+            elif opcode == OP_FREQ:
+                self.reader.read(1)
+                continue
+            elif opcode == OP_MODULE_AUX:
+                self.length()  # module id
+                self.length()  # when opcode
+                self.length()  # when
+                self._skip_module_opcodes()
+            elif opcode == OP_FUNCTION2:
+                self.string()
+            elif opcode == OP_FUNCTION_PRE_GA:
+                raise RDBError("Pre-release function format (opcode 0xF6) is not supported")
+            elif opcode == OP_SLOT_INFO:
+                self.length()  # slot id
+                self.length()  # slot size
+                self.length()  # expires slot size
+            else:
+                type_name, encoding = TYPE_NAMES.get(opcode, (None, None))
+                if type_name is None:
+                    raise RDBError(f"Unknown RDB opcode / value type {opcode}")
+                key = _text(self.string())
+                value, elements = self.value(opcode)
+                if self.keep_value is not None and not self.keep_value(key, type_name):
+                    value = None
+                yield RDBEntry(db, key, type_name, encoding, value, elements, expires_ms,
+                               self.reader.consumed - entry_start)
+            expires_ms = None
+            entry_start = self.reader.consumed
+
+
+def value_to_text(value):
+    """A parsed value (bytes / int / list / dict) with bytes decoded to text"""
+    if isinstance(value, dict):
+        return {_text(field): value_to_text(item) for field, item in value.items()}
+    if isinstance(value, list):
+        return [value_to_text(item) for item in value]
+    if isinstance(value, bytes):
+        return _text(value)
+    return value
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Redis EntryData Decoding Engine for the VMS Debug Tool
+
+Bulk version of the manual decoding shown in decode_data.py. Given a batch of
+fetched Redis hashes ({key: {field: value}}), every field value is inspected
+and decoded recursively:
+- JSON strings (including escaped JSON from redis-cli output)
+- base64 strings wrapping JSON or text (e.g. EntryData.data)
+- JSON nested inside decoded JSON values
+
+Decoded values are memoized by a content hash of the raw value, so repeated
+values (and repeated requests for the same keys) are only decoded once. Large
+batches are decoded in a process pool. The decoded hashes can then be flattened
+into one table across all keys, with dotted column names such as
+"EntryData.data.band".
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Batches with at least this many uncached values are decoded in worker processes
+POOL_THRESHOLD = 256
+POOL_CHUNK_SIZE = 64
+MAX_POOL_WORKERS = 4
+
+# Memoization cache size (number of distinct raw values)
+DEFAULT_CACHE_SIZE = 50000
+
+# Nested decoding depth limit (base64 -> JSON -> JSON string -> ...)
+MAX_DECODE_DEPTH = 4
+
+_BASE64_RE = re.compile(r'^[A-Za-z0-9+/\r\n]+={0,2}$')
+
+
+def _try_json(text):
+    """Parse text as JSON object/array, or return None"""
+    stripped = text.strip()
+    if not stripped or stripped[0] not in '{[':
+        return None
+    try:
+        return json.loads(stripped)
+    except (json.JSONDecodeError, ValueError):
+        pass
+    # redis-cli shows embedded quotes escaped: {\"tenantName\":\"X\"}
+    if '\\"' in stripped:
+        try:
+            return json.loads(stripped.replace('\\"', '"').replace('\\\\', '\\'))
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def _try_base64(text):
+    """Decode text as base64 to a printable UTF-8 string, or return None"""
+    stripped = text.strip()
+    if len(stripped) < 12 or len(stripped) % 4 != 0 or not _BASE64_RE.match(stripped):
+        return None
+    try:
+        decoded = base64.b64decode(stripped, validate=False).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if not decoded.strip() or not decoded.strip().isprintable():
+        return None
+    return decoded.strip()
+
+
+def decode_value(value, depth=0):
+    """
+    Decode a single Redis field value recursively
+
+    Returns:
+        tuple: (decoded_value, decode_type) where decode_type is one of
+               raw, json, base64, base64+json, nested
+    """
+    if depth >= MAX_DECODE_DEPTH:
+        return value, 'raw'
+
+    if isinstance(value, dict):
+        decoded = {}
+        nested = False
+        for field, field_value in value.items():
+            decoded[field], field_type = decode_value(field_value, depth + 1)
+            nested = nested or field_type != 'raw'
+        return decoded, 'nested' if nested else 'json'
+
+    if isinstance(value, list):
+        decoded = []
+        nested = False
+        for item in value:
+            decoded_item, item_type = decode_value(item, depth + 1)
+            decoded.append(decoded_item)
+            nested = nested or item_type != 'raw'
+        return decoded, 'nested' if nested else 'json'
+
+    if not isinstance(value, str):
+        return value, 'raw'
+
+    parsed = _try_json(value)
+    if parsed is not None:
+        decoded, inner_type = decode_value(parsed, depth + 1)
+        return decoded, 'nested' if inner_type == 'nested' else 'json'
+
+    text = _try_base64(value)
+    if text is not None:
+        parsed = _try_json(text)
+        if parsed is not None:
+            decoded, _ = decode_value(parsed, depth + 1)
+            return decoded, 'base64+json'
+        return text, 'base64'
+
+    return value, 'raw'
+
+
+def _decode_chunk(values):
+    """Worker-process entry point: decode a list of raw values"""
+    return [decode_value(value) for value in values]
+
+
+def content_hash(value):
+    """Stable content hash of a raw field value (strings or parsed JSON)"""
+    if isinstance(value, str):
+        payload = 's:' + value
+    else:
+        payload = 'j:' + json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+
+def flatten_record(value, prefix='', output=None):
+    """Flatten nested dicts into dotted column names; lists are kept as JSON text"""
+    if output is None:
+        output = {}
+
+    if isinstance(value, dict):
+        for field, field_value in value.items():
+            column = f"{prefix}.{field}" if prefix else str(field)
+            flatten_record(field_value, column, output)
+    elif isinstance(value, list):
+        output[prefix] = json.dumps(value, default=str)
+    else:
+        output[prefix] = value
+
+    return output
+
+
+class EntryDataDecoder:
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, pool_threshold=POOL_THRESHOLD,
+                 max_workers=None):
+        self.cache_size = cache_size
+        self.pool_threshold = pool_threshold
+        self.max_workers = max_workers or min(MAX_POOL_WORKERS, os.cpu_count() or 1)
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _get_pool(self):
+        """Create the worker pool on first use"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def _cache_get(self, digest):
+        with self._cache_lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+        return None
+
+    def _cache_put(self, digest, result):
+        with self._cache_lock:
+            self._cache[digest] = result
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def decode_values(self, values):
+        """
+        Decode a list of raw values, using the memo cache and the worker pool
+
+        Returns:
+            tuple: (list of (decoded, decode_type), stats dict)
+        """
+        results = [None] * len(values)
+        pending = OrderedDict()  # digest -> (raw value, [result positions])
+        hits = 0
+
+        for position, value in enumerate(values):
+            digest = content_hash(value)
+            cached = self._cache_get(digest)
+            if cached is not None:
+                results[position] = cached
+                hits += 1
+            elif digest in pending:
+                pending[digest][1].append(position)
+                hits += 1
+            else:
+                pending[digest] = (value, [position])
+
+        digests = list(pending.keys())
+        raw_values = [pending[digest][0] for digest in digests]
+        used_pool = False
+
+        if len(raw_values) >= self.pool_threshold and self.max_workers > 1:
+            try:
+                chunks = [raw_values[i:i + POOL_CHUNK_SIZE]
+                          for i in range(0, len(raw_values), POOL_CHUNK_SIZE)]
+                decoded = []
+                for chunk_result in self._get_pool().map(_decode_chunk, chunks):
+                    decoded.extend(chunk_result)
+                used_pool = True
+            except Exception as e:
+                print(f"Warning: Decoder worker pool failed, decoding inline: {str(e)}")
+                decoded = _decode_chunk(raw_values)
+        else:
+            decoded = _decode_chunk(raw_values)
+
+        for digest, result in zip(digests, decoded):
+            self._cache_put(digest, result)
+            for position in pending[digest][1]:
+                results[position] = result
+
+        with self._cache_lock:
+            self.cache_hits += hits
+            self.cache_misses += len(raw_values)
+
+        stats = {
+            'values': len(values),
+            'decoded': len(raw_values),
+            'cache_hits': hits,
+            'worker_pool': used_pool
+        }
+        return results, stats
+
+    def decode_hashes(self, hashes):
+        """
+        Decode a batch of Redis hashes
+
+        Args:
+            hashes (dict): {key_name: {field: raw_value}}
+
+        Returns:
+            tuple: ({key_name: {field: decoded}}, {key_name: {field: decode_type}}, stats)
+        """
+        positions = []
+        values = []
+        for key_name, fields in hashes.items():
+            for field, value in (fields or {}).items():
+                positions.append((key_name, field))
+                values.append(value)
+
+        results, stats = self.decode_values(values)
+
+        decoded_hashes = {key_name: {} for key_name in hashes}
+        decode_types = {key_name: {} for key_name in hashes}
+        for (key_name, field), (decoded, decode_type) in zip(positions, results):
+            decoded_hashes[key_name][field] = decoded
+            decode_types[key_name][field] = decode_type
+
+        stats['keys'] = len(hashes)
+        return decoded_hashes, decode_types, stats
+
+    def build_table(self, hashes):
+        """
+        Decode a batch of hashes and flatten them into one table
+
+        Returns:
+            dict: columns, rows (one per key, '_key' column first), stats
+        """
+        decoded_hashes, _, stats = self.decode_hashes(hashes)
+
+        rows = []
+        columns = OrderedDict()
+        columns['_key'] = True
+        for key_name, decoded in decoded_hashes.items():
+            row = {'_key': key_name}
+            flatten_record(decoded, '', row)
+            for column in row:
+                columns.setdefault(column, True)
+            rows.append(row)
+
+        stats['columns'] = len(columns)
+        stats['cache_size'] = len(self._cache)
+        return {
+            'columns': list(columns.keys()),
+            'rows': rows,
+            'stats': stats
+        }
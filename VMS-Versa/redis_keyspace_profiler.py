@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Redis keyspace profiler for the VMS Debug Tool
+
+Answers "why is this tenant Redis so large" without touching every key:
+
+1. The keyspace is walked with 'redis-cli --scan' (incremental SCAN, never
+   KEYS), streaming key names as they arrive. Every key is counted under its
+   prefix pattern, and a sample of keys is kept (sample_rate, plus the first
+   few keys of every pattern so small families are measured too).
+2. The sampled keys are measured in batches: one redis-cli process per batch
+   reads "TYPE / MEMORY USAGE / TTL" commands from stdin, so a batch costs a
+   single round trip and each command is O(1) (MEMORY USAGE uses a bounded
+   number of SAMPLES for big hashes).
+3. Per pattern, the average sampled size times the exact key count estimates
+   the memory held by that key family.
+
+Prefix patterns come from normalize_key(): ObjectID(...) arguments, UUIDs, hex
+ids and numbers are replaced by '*', so "EntryData:ObjectID(6541...):17" and
+"EntryData:ObjectID(98ab...):3" are one family "EntryData:ObjectID(*):*".
+
+The profiler does not talk to SSH itself: it is given an exec_command callable
+with the signature of VMSDebugWeb._exec_channel_command.
+"""
+
+import random
+import re
+import shlex
+import time
+
+DEFAULT_SAMPLE_RATE = 0.05
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_MAX_KEYS = 2000000
+DEFAULT_MEMORY_SAMPLES = 5
+MIN_SAMPLES_PER_PREFIX = 3
+LARGEST_KEYS_PER_PREFIX = 3
+SCAN_TIMEOUT = 300
+BATCH_TIMEOUT = 60
+
+KEY_MASKS = [
+    (re.compile(r'ObjectID\([^)]*\)'), 'ObjectID(*)'),
+    (re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'), '*'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '*'),
+    (re.compile(r'\b[0-9a-fA-F]{16,}\b'), '*'),
+    (re.compile(r'\d+'), '*'),
+]
+_STARS = re.compile(r'\*+')
+
+
+def normalize_key(key):
+    """Key name -> prefix pattern ('EntryData:tenant-00001:0042' -> 'EntryData:tenant-*:*')"""
+    for pattern, replacement in KEY_MASKS:
+        key = pattern.sub(replacement, key)
+    return _STARS.sub('*', key)
+
+
+def _quote(key):
+    """Quote a key for a redis-cli stdin command line"""
+    return '"' + key.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r') + '"'
+
+
+def _to_int(value):
+    try:
+        return int(value.strip())
+    except (AttributeError, ValueError):
+        return None
+
+
+class PrefixStats:
+    """Counts and sampled measurements of one key family"""
+    __slots__ = ('prefix', 'keys', 'sampled', 'measured', 'sampled_bytes', 'types', 'with_ttl', 'min_ttl', 'largest')
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.keys = 0
+        self.sampled = 0
+        self.measured = 0
+        self.sampled_bytes = 0
+        self.types = {}
+        self.with_ttl = 0
+        self.min_ttl = None
+        self.largest = []  # (bytes, key), at most LARGEST_KEYS_PER_PREFIX, largest first
+
+    def record(self, key, key_type, size, ttl):
+        if key_type and key_type != 'none':
+            self.types[key_type] = self.types.get(key_type, 0) + 1
+        if size is not None:
+            self.measured += 1
+            self.sampled_bytes += size
+            self.largest.append((size, key))
+            self.largest.sort(reverse=True)
+            del self.largest[LARGEST_KEYS_PER_PREFIX:]
+        if ttl is not None and ttl >= 0:
+            self.with_ttl += 1
+            self.min_ttl = ttl if self.min_ttl is None else min(self.min_ttl, ttl)
+
+    @property
+    def average_bytes(self):
+        return self.sampled_bytes / self.measured if self.measured else 0
+
+    @property
+    def estimated_bytes(self):
+        return int(self.average_bytes * self.keys)
+
+    def to_dict(self, total_bytes):
+        return {
+            'prefix': self.prefix,
+            'keys': self.keys,
+            'sampled': self.measured,
+            'average_bytes': round(self.average_bytes),
+            'estimated_bytes': self.estimated_bytes,
+            'share': round(self.estimated_bytes / total_bytes, 4) if total_bytes else 0,
+            'types': dict(self.types),
+            'ttl_share': round(self.with_ttl / self.measured, 3) if self.measured else 0,
+            'min_ttl': self.min_ttl,
+            'largest': [{'key': key, 'bytes': size} for size, key in self.largest]
+        }
+
+
+class KeyspaceProfiler:
+    def __init__(self, exec_command, redis_ip, port=6379, sample_rate=DEFAULT_SAMPLE_RATE,
+                 batch_size=DEFAULT_BATCH_SIZE, max_keys=DEFAULT_MAX_KEYS,
+                 memory_samples=DEFAULT_MEMORY_SAMPLES, seed=None, progress=None):
+        """
+        Args:
+            exec_command (callable): exec_command(command, timeout=, on_line=, input_data=) -> result dict
+            redis_ip (str): Tenant Redis service IP
+            sample_rate (float): Fraction of keys measured (0 < rate <= 1)
+            batch_size (int): Sampled keys measured per redis-cli round trip
+            max_keys (int): Stop scanning after this many keys
+            memory_samples (int): SAMPLES argument of MEMORY USAGE (nested values looked at)
+            seed: Random seed for reproducible samples
+            progress (callable): progress(message) for status lines
+        """
+        self.exec_command = exec_command
+        self.redis_ip = redis_ip
+        self.port = port
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.batch_size = max(1, batch_size)
+        self.max_keys = max_keys
+        self.memory_samples = memory_samples
+        self.progress = progress
+        self._random = random.Random(seed)
+        self.prefixes = {}
+        self.keys_scanned = 0
+        self.truncated = False
+        self.errors = []
+
+    def _redis_cli(self):
+        return f"redis-cli -h {self.redis_ip} -p {self.port}"
+
+    def scan(self, pattern='*'):
+        """SCAN the keyspace; returns the sampled keys as (key, PrefixStats) pairs"""
+        samples = []
+
+        def on_line(line):
+            key = line.strip()
+            if not key or key.startswith('(error)'):
+                return True
+            prefix = normalize_key(key)
+            stats = self.prefixes.get(prefix)
+            if stats is None:
+                stats = self.prefixes[prefix] = PrefixStats(prefix)
+            stats.keys += 1
+            if stats.sampled < MIN_SAMPLES_PER_PREFIX or self._random.random() < self.sample_rate:
+                stats.sampled += 1
+                samples.append((key, stats))
+            self.keys_scanned += 1
+            if self.keys_scanned >= self.max_keys:
+                self.truncated = True
+                return False
+            return True
+
+        command = f"{self._redis_cli()} --scan --pattern {shlex.quote(pattern)} --count 1000"
+        result = self.exec_command(command, timeout=SCAN_TIMEOUT, on_line=on_line)
+        if result['timed_out']:
+            self.truncated = True
+            self.errors.append(f"SCAN timed out after {SCAN_TIMEOUT}s (partial keyspace)")
+        elif result['exit_status'] not in (0, None) and not self.keys_scanned:
+            raise RuntimeError(result['error'] or f"redis-cli exited with status {result['exit_status']}")
+        return samples
+
+    def measure(self, samples):
+        """TYPE / MEMORY USAGE / TTL of the sampled keys, one redis-cli round trip per batch"""
+        for start in range(0, len(samples), self.batch_size):
+            batch = samples[start:start + self.batch_size]
+            commands = []
+            for key, _ in batch:
+                quoted = _quote(key)
+                commands.append(f"TYPE {quoted}\nMEMORY USAGE {quoted} SAMPLES {self.memory_samples}\nTTL {quoted}\n")
+
+            result = self.exec_command(self._redis_cli(), timeout=BATCH_TIMEOUT, input_data=''.join(commands))
+            replies = result['output'].replace('\r', '').split('\n')
+            if replies and replies[-1] == '':
+                replies.pop()
+            if len(replies) != 3 * len(batch):
+                self.errors.append(f"Batch at sample {start}: expected {3 * len(batch)} replies, "
+                                   f"got {len(replies)} {result['error'] or ''}".strip())
+                continue
+
+            for position, (key, stats) in enumerate(batch):
+                key_type, size, ttl = replies[3 * position:3 * position + 3]
+                stats.record(key, key_type.strip(), _to_int(size), _to_int(ttl))
+
+            if self.progress:
+                self.progress(f"  Measured {min(start + len(batch), len(samples))}/{len(samples)} sampled keys")
+
+    def profile(self, pattern='*', limit=None):
+        """
+        Scan, sample and measure; returns the memory-by-prefix report
+
+        Returns:
+            dict: redis_ip, pattern, keys_scanned, keys_sampled, sample_rate, truncated,
+                  estimated_total_bytes, prefixes (largest first), errors, elapsed
+        """
+        start_time = time.time()
+        samples = self.scan(pattern)
+        if self.progress:
+            self.progress(f"  Scanned {self.keys_scanned} keys in {len(self.prefixes)} prefix patterns, "
+                          f"measuring {len(samples)} samples")
+        self.measure(samples)
+        return self.report(pattern, limit, time.time() - start_time)
+
+    def report(self, pattern='*', limit=None, elapsed=0.0):
+        total_bytes = sum(stats.estimated_bytes for stats in self.prefixes.values())
+        ordered = sorted(self.prefixes.values(), key=lambda stats: (-stats.estimated_bytes, -stats.keys, stats.prefix))
+        return {
+            'redis_ip': self.redis_ip,
+            'pattern': pattern,
+            'keys_scanned': self.keys_scanned,
+            'keys_sampled': sum(stats.measured for stats in self.prefixes.values()),
+            'prefix_count': len(ordered),
+            'sample_rate': self.sample_rate,
+            'truncated': self.truncated,
+            'estimated_total_bytes': total_bytes,
+            'prefixes': [stats.to_dict(total_bytes) for stats in ordered[:limit]],
+            'errors': self.errors,
+            'elapsed': round(elapsed, 2)
+        }
+
+
+def render_report(report, limit=50):
+    """Plain-text memory-by-prefix table"""
+    rows = [f"{'EST. MEMORY':>12} {'SHARE':>6} {'KEYS':>9} {'AVG':>9} {'TYPES':<18} PREFIX"]
+    for entry in report['prefixes'][:limit]:
+        types = ','.join(f"{name}:{count}" for name, count in sorted(entry['types'].items()))
+        rows.append(f"{format_bytes(entry['estimated_bytes']):>12} {entry['share']:>6.1%} {entry['keys']:>9} "
+                    f"{format_bytes(entry['average_bytes']):>9} {types:<18} {entry['prefix']}")
+    return '\n'.join(rows)
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024.0
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+SSH Transport Profiles for the VMS Debug Tool
+
+A transport profile bundles the paramiko settings that matter for moving
+large command outputs (full pod listings, ConfigMap JSON, long log tails):
+- compress:         zlib compression on the SSH transport
+- window_size:      channel window, i.e. how much data the server may send
+                    before waiting for our acknowledgement
+- max_packet_size:  largest channel data packet we accept
+- recv_chunk_size:  bytes requested per channel recv() call
+
+On high-latency links the default 2 MB window is drained long before the
+window adjustment makes the round trip, so throughput is capped at roughly
+window / RTT. The "bulk" profile uses a larger window and packets and enables
+compression, which helps most with highly repetitive kubectl and log output.
+
+Profiles are chosen per host: an explicit choice from the UI, otherwise the
+VMS_SSH_PROFILES environment variable ("host1=bulk,host2=default"),
+otherwise "default".
+
+run_exec_command() runs one command on its own exec channel; the web tool and
+the headless collector (vms_collect_cli.py) both use it to run commands in
+parallel over a single connection. ExecStream does the same for binary output
+that is too large to hold (e.g. 'redis-cli --rdb'): stdout is read
+incrementally and the channel window throttles the sender to our read rate.
+"""
+
+import codecs
+import os
+import shlex
+import threading
+import time
+
+import paramiko
+
+TRANSPORT_PROFILES = {
+    'default': {
+        'description': 'Paramiko defaults, no compression',
+        'compress': False,
+        'window_size': None,
+        'max_packet_size': None,
+        'recv_chunk_size': 65536
+    },
+    'bulk': {
+        'description': 'zlib compression, 16 MB window, 128 KB packets',
+        'compress': True,
+        'window_size': 16 * 1024 * 1024,
+        'max_packet_size': 128 * 1024,
+        'recv_chunk_size': 256 * 1024
+    }
+}
+
+DEFAULT_PROFILE = 'default'
+
+# Runs "$0" as root. 'sudo -S' only reads stdin when it actually prompts, so when
+# 'sudo -n' already works the password line is consumed here instead of being
+# passed on as the first line of the command's input.
+SUDO_WRAPPER = ("sh -c 'if sudo -n true 2>/dev/null; then IFS= read -r _; exec sudo -n sh -c \"$0\"; "
+                "else exec sudo -S -p \"\" sh -c \"$0\"; fi' ")
+
+# Profiles chosen explicitly at runtime (e.g. from the web UI), keyed by host
+_host_profiles = {}
+_host_profiles_lock = threading.Lock()
+
+
+def _profiles_from_environment():
+    """Parse VMS_SSH_PROFILES ("host=profile,host=profile") into a dict"""
+    mapping = {}
+    for item in os.environ.get('VMS_SSH_PROFILES', '').split(','):
+        if '=' not in item:
+            continue
+        host, profile = (part.strip() for part in item.split('=', 1))
+        if host and profile in TRANSPORT_PROFILES:
+            mapping[host] = profile
+    return mapping
+
+
+def get_profile(name):
+    """Get a profile by name, falling back to the default profile"""
+    return TRANSPORT_PROFILES.get(name) or TRANSPORT_PROFILES[DEFAULT_PROFILE]
+
+
+def profile_for_host(host):
+    """Name of the profile to use for a host"""
+    with _host_profiles_lock:
+        if host in _host_profiles:
+            return _host_profiles[host]
+    return _profiles_from_environment().get(host, DEFAULT_PROFILE)
+
+
+def set_host_profile(host, name):
+    """Remember a profile choice for a host; 'auto' (or None) clears it"""
+    with _host_profiles_lock:
+        if name in TRANSPORT_PROFILES:
+            _host_profiles[host] = name
+        else:
+            _host_profiles.pop(host, None)
+
+
+def list_profiles():
+    """Profile names and descriptions for display"""
+    return [{'name': name, 'description': profile['description']}
+            for name, profile in TRANSPORT_PROFILES.items()]
+
+
+def apply_profile(transport, profile):
+    """Apply window/packet sizes to a connected transport (affects channels opened afterwards)"""
+    if profile.get('window_size'):
+        transport.default_window_size = profile['window_size']
+    if profile.get('max_packet_size'):
+        transport.default_max_packet_size = profile['max_packet_size']
+
+
+def connect_ssh_client(host, username, password, profile_name=None, timeout=10, port=22):
+    """
+    Open a paramiko SSHClient using a transport profile
+
+    Returns:
+        tuple: (connected SSHClient, profile name used)
+    """
+    profile_name = profile_name if profile_name in TRANSPORT_PROFILES else profile_for_host(host)
+    profile = get_profile(profile_name)
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        hostname=host,
+        port=port,
+        username=username,
+        password=password,
+        look_for_keys=False,
+        timeout=timeout,
+        compress=profile['compress']
+    )
+    apply_profile(client.get_transport(), profile)
+    return client, profile_name
+
+
+def sudo_command(command):
+    """
+    command wrapped to run as root, with the sudo password expected as the first stdin line
+
+    When sudo does not prompt (cached credentials, NOPASSWD) the wrapper reads
+    and drops the password line itself, so the command's own stdin always
+    starts right after it.
+    """
+    return SUDO_WRAPPER + shlex.quote(command)
+
+
+def run_exec_command(client, command, timeout=30, sudo_password=None, on_line=None, recv_chunk_size=65536,
+                     input_data=None):
+    """
+    Run a command on its own SSH exec channel, independent of any interactive shell
+
+    Several exec channels can run at the same time over the one SSH connection.
+    With sudo_password the command runs through sudo (see sudo_command) and the
+    password is written to stdin. input_data (text) is written to the command's stdin, e.g. a
+    batch of commands for redis-cli. If on_line is given it is called with every
+    complete stdout line as it arrives; returning False from it stops the command early.
+
+    Returns:
+        dict: output, error, exit_status (None if not finished), timed_out, stopped
+    """
+    result = {'output': '', 'error': '', 'exit_status': None, 'timed_out': False, 'stopped': False}
+
+    transport = client.get_transport() if client else None
+    if not transport or not transport.is_active():
+        result['error'] = 'SSH transport is not active'
+        return result
+
+    if sudo_password is not None:
+        command = sudo_command(command)
+
+    # Opening the channel counts against the timeout too (paramiko would otherwise wait up to an hour)
+    deadline = time.time() + timeout
+    channel = transport.open_session(timeout=max(timeout, 1))
+    try:
+        channel.exec_command(command)
+        if sudo_password is not None:
+            channel.sendall((sudo_password + "\n").encode('utf-8'))
+        if input_data:
+            channel.sendall(input_data.encode('utf-8'))
+        channel.shutdown_write()
+
+        # Incremental decoding: a multibyte character may be split across two recv() chunks
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        stdout_chunks = []
+        stderr_chunks = []
+        pending_line = ''
+
+        while True:
+            received = False
+            if channel.recv_ready():
+                chunk = decoder.decode(channel.recv(recv_chunk_size))
+                received = True
+                stdout_chunks.append(chunk)
+                if on_line:
+                    lines = (pending_line + chunk).split('\n')
+                    pending_line = lines.pop()
+                    for line in lines:
+                        if on_line(line.rstrip('\r')) is False:
+                            result['stopped'] = True
+                            break
+            if channel.recv_stderr_ready():
+                stderr_chunks.append(channel.recv_stderr(recv_chunk_size))
+                received = True
+
+            if result['stopped']:
+                break
+            if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                result['exit_status'] = channel.recv_exit_status()
+                break
+            if time.time() > deadline:
+                result['timed_out'] = True
+                break
+            if not received:
+                time.sleep(0.05)
+
+        tail = decoder.decode(b'', final=True)
+        stdout_chunks.append(tail)
+        pending_line += tail
+        if on_line and pending_line and not result['stopped']:
+            on_line(pending_line.rstrip('\r'))
+
+        result['output'] = ''.join(stdout_chunks)
+        result['error'] = b''.join(stderr_chunks).decode('utf-8', errors='ignore').strip()
+        return result
+    finally:
+        channel.close()
+
+
+class ExecStream:
+    """Binary stdout of a command on its own exec channel, read incrementally like a file"""
+
+    def __init__(self, client, command, sudo_password=None, timeout=60):
+        """
+        Args:
+            timeout (int): Seconds a single read may wait for data before socket.timeout is raised
+        """
+        transport = client.get_transport() if client else None
+        if not transport or not transport.is_active():
+            raise RuntimeError('SSH transport is not active')
+
+        if sudo_password is not None:
+            command = sudo_command(command)
+
+        self.channel = transport.open_session(timeout=timeout)
+        self.channel.settimeout(timeout)
+        self.channel.exec_command(command)
+        if sudo_password is not None:
+            self.channel.sendall((sudo_password + "\n").encode('utf-8'))
+        self.channel.shutdown_write()
+        self.bytes_read = 0
+        self.eof = False
+
+    def read(self, size=65536):
+        """Up to size bytes of stdout; b'' at end of output"""
+        data = self.channel.recv(size)
+        self.bytes_read += len(data)
+        if not data:
+            self.eof = True
+        return data
+
+    def close(self):
+        """
+        Close the channel
+
+        Returns:
+            dict: exit_status (None if the command had not finished), error (stderr text)
+        """
+        # After end of output the exit status follows; before it, don't wait for the command
+        exit_status = self.channel.recv_exit_status() if self.eof or self.channel.exit_status_ready() else None
+        error_chunks = []
+        while self.channel.recv_stderr_ready():
+            error_chunks.append(self.channel.recv_stderr(65536))
+        self.channel.close()
+        return {'exit_status': exit_status, 'error': b''.join(error_chunks).decode('utf-8', errors='ignore').strip()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.channel.close()
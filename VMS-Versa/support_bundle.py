@@ -0,0 +1,634 @@
+#!/usr/bin/env python3
+"""
+Offline support-bundle data source for the VMS Debug Tool
+
+A support bundle is a tarball (or an already unpacked directory) of kubectl
+outputs, Redis hash dumps and /var/log/versa/vms files collected from a VMS.
+SupportBundle answers the same shell commands the tool sends over SSH
+(kubectl listings, redis-cli keys/hgetall/--scan, find, ls, tail with grep/sed
+filters) from the bundle, so every tenant, ConfigMap, Redis and log view works
+without a connection.
+
+Archive access:
+    - an uncompressed .tar is memory-mapped once and members are read in place
+      from their data offsets (nothing is extracted)
+    - a compressed tarball (.tar.gz, .tgz, .tar.xz, ...) is read in a single
+      streaming pass and its members are spooled to a temporary directory,
+      which is memory-mapped the same way
+Log tails are found by scanning backwards for newlines in the mapping, so
+"tail -n 500" of a 2 GB log touches only its last few hundred KB.
+
+Bundle layout (any leading directory is ignored, file names are matched
+case-insensitively, '_' and '-' are interchangeable, .txt/.out are optional):
+
+    kubectl/get-ns.txt              kubectl get ns
+    kubectl/get-pods-A.txt          kubectl get pods -A
+    kubectl/get-pods-A.json         kubectl get pods -A -o json
+    kubectl/get-svc-A.txt           kubectl get svc -A
+    kubectl/get-pv.txt              kubectl get pv
+    kubectl/get-pvc-A.txt           kubectl get pvc -A
+    kubectl/get-cm-A.txt            kubectl get cm -A
+    kubectl/get-cm-A.json           kubectl get cm -A -o json (describe / get configmap)
+    kubectl/top-pods-A.txt          kubectl top pods -A
+    redis/<namespace>.json          {"<key>": {"<field>": "<value>", ...}, ...}
+    redis/<namespace>.rdb           RDB snapshot (redis-cli --rdb), for the RDB analyzer
+    var/log/versa/vms/...           log files, served at their absolute paths
+
+A manifest.json at the bundle root can map other file names to commands:
+    {"commands": {"kubectl get svc -A": "outputs/services.txt"}}
+
+load() parses the inventory; a log file is read and indexed into a LogIndex
+only the first time it is queried (log_index()).
+"""
+
+import fnmatch
+import json
+import mmap
+import os
+import re
+import shlex
+import shutil
+import tarfile
+import tempfile
+
+from ssh_transport import SUDO_WRAPPER
+from vms_output_parsers import parse_configmap_listing, parse_kubectl_services, parse_redis_services
+from vms_log_index import LogIndex
+
+LOG_ROOT = 'var/log/versa/vms/'
+
+# Normalized command -> bundle file names (see normalize_command / _member_key)
+INVENTORY_FILES = {
+    'kubectl get ns': ('get-ns', 'namespaces', 'ns'),
+    'kubectl get pods -A': ('get-pods-a', 'pods'),
+    'kubectl get pods -A -o json': ('get-pods-a.json', 'pods.json'),
+    'kubectl get svc -A': ('get-svc-a', 'services', 'svc'),
+    'kubectl get pv': ('get-pv', 'pv'),
+    'kubectl get pvc -A': ('get-pvc-a', 'pvc'),
+    'kubectl get cm -A': ('get-cm-a', 'configmaps', 'cm'),
+    'kubectl get cm -A -o json': ('get-cm-a.json', 'configmaps.json', 'cm.json'),
+    'kubectl top pods -A': ('top-pods-a', 'top-pods'),
+}
+
+RESOURCE_ALIASES = {
+    'namespace': 'ns', 'namespaces': 'ns',
+    'pod': 'pods', 'po': 'pods',
+    'service': 'svc', 'services': 'svc',
+    'configmap': 'cm', 'configmaps': 'cm',
+    'persistentvolume': 'pv', 'persistentvolumes': 'pv',
+    'persistentvolumeclaim': 'pvc', 'persistentvolumeclaims': 'pvc',
+}
+
+HGETALL_LOOP = re.compile(
+    r"^for k in (.*); do printf '%s%s %s\\n' '@@KEY' '@@' \"\$k\"; "
+    r"redis-cli -h (\S+) -p \d+ hgetall \"\$k\"; done; printf '%s%s\\n' '@@END' '@@'$"
+)
+
+
+class BundleCommandError(Exception):
+    """A command the bundle cannot answer (missing file, unsupported command)"""
+
+    def __init__(self, message, exit_status=1):
+        super().__init__(message)
+        self.exit_status = exit_status
+
+
+def normalize_command(args):
+    """kubectl argument list -> the INVENTORY_FILES key it corresponds to"""
+    normalized = []
+    for arg in args:
+        if arg in ('--all-namespaces', '--all-namespaces=true'):
+            arg = '-A'
+        elif arg == '--no-headers':
+            continue
+        normalized.append(RESOURCE_ALIASES.get(arg, arg))
+    return ' '.join(normalized)
+
+
+def _member_key(name):
+    """Bundle file name -> lookup key ('Get_Svc_A.txt' -> 'get-svc-a')"""
+    key = os.path.basename(name).lower().replace('_', '-')
+    for suffix in ('.txt', '.out'):
+        if key.endswith(suffix):
+            key = key[:-len(suffix)]
+    return key
+
+
+def _split_pipeline(command):
+    """Split a command line on '|' outside of quotes"""
+    stages, current, quote = [], [], None
+    for char in command:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '|':
+            stages.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    stages.append(''.join(current).strip())
+    return stages
+
+
+def _redis_quote(value):
+    """Quote a reply the way redis-cli does on a terminal"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r') + '"'
+
+
+def _read_member(location):
+    """Bytes of one member given (file path, offset, size)"""
+    path, offset, size = location
+    if not size:
+        return b''
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[offset:offset + size]
+
+
+def _index_log(path, location):
+    """Build the LogIndex of one bundled log file"""
+    text = _read_member(location).decode('utf-8', errors='ignore')
+    return LogIndex(path).add_lines(text.splitlines())
+
+
+def _parse_inventory(services_output, configmaps_output):
+    """Tenants, Redis endpoints and ConfigMap counts from the kubectl listings"""
+    tenants = parse_kubectl_services(services_output)
+    redis_services = parse_redis_services(services_output)
+    configmaps = parse_configmap_listing(configmaps_output)
+    return {
+        'tenants': sorted(tenants),
+        'redis_ips': {info['cluster_ip']: namespace for namespace, info in redis_services.items()},
+        'configmaps': sum(data['total_configmaps'] for data in configmaps.values())
+    }
+
+
+class _MappedStream:
+    """Sequential reads of one member from a memory-mapped file"""
+
+    def __init__(self, mapped, offset, size):
+        self.mapped = mapped
+        self.position = offset
+        self.end = offset + size
+
+    def read(self, size=-1):
+        end = self.end if size < 0 else min(self.end, self.position + size)
+        data = self.mapped[self.position:end]
+        self.position = end
+        return data
+
+
+class SupportBundle:
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Bundle tarball (any tarfile compression) or unpacked directory
+        """
+        self.path = path
+        self.name = os.path.basename(os.path.normpath(path))
+        self.members = {}  # logical name -> (file path, offset, size)
+        self.streamed = False
+        self._maps = {}
+        self._temp_dir = None
+        self._log_indexes = {}
+        self._redis_ips = None
+        self._redis_data = {}
+        self._configmaps = None
+
+        if os.path.isdir(path):
+            self._scan_directory(path)
+        elif tarfile.is_tarfile(path):
+            try:
+                self._scan_tar(path)
+            except tarfile.ReadError:
+                self._spool_compressed_tar(path)
+        else:
+            raise ValueError(f"Not a support bundle (tarball or directory): {path}")
+
+        self._commands = self._map_commands()
+        self.log_files = {self._log_path(name): name for name in self.members
+                          if LOG_ROOT in name and not name.endswith('.gz')}
+
+    # ---- archive access --------------------------------------------------------
+
+    def _scan_directory(self, root):
+        for directory, _, files in os.walk(root):
+            for file_name in files:
+                full_path = os.path.join(directory, file_name)
+                name = os.path.relpath(full_path, root).replace(os.sep, '/')
+                self.members[name] = (full_path, 0, os.path.getsize(full_path))
+
+    def _scan_tar(self, path):
+        """Uncompressed tar: members are read in place from the mapped archive"""
+        with tarfile.open(path, mode='r:') as tar:
+            for member in tar:
+                if member.isfile():
+                    self.members[self._clean_name(member.name)] = (path, member.offset_data, member.size)
+
+    def _spool_compressed_tar(self, path):
+        """Compressed tar: one streaming pass, members spooled to a temporary directory"""
+        self.streamed = True
+        self._temp_dir = tempfile.mkdtemp(prefix='vms-bundle-')
+        with tarfile.open(path, mode='r|*') as tar:
+            for number, member in enumerate(tar):
+                if not member.isfile():
+                    continue
+                # Spool under a generated name; member names never become file system paths
+                spool_path = os.path.join(self._temp_dir, f"{number:06d}")
+                with tar.extractfile(member) as source, open(spool_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
+                self.members[self._clean_name(member.name)] = (spool_path, 0, member.size)
+
+    @staticmethod
+    def _clean_name(name):
+        while name.startswith('./'):
+            name = name[2:]
+        return name.lstrip('/')
+
+    @staticmethod
+    def _log_path(name):
+        return '/' + name[name.index(LOG_ROOT):]
+
+    def _mapping(self, file_path):
+        mapped = self._maps.get(file_path)
+        if mapped is None:
+            with open(file_path, 'rb') as f:
+                mapped = self._maps[file_path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def read(self, name):
+        """Text of a bundle member"""
+        path, offset, size = self.members[name]
+        if not size:
+            return ''
+        return self._mapping(path)[offset:offset + size].decode('utf-8', errors='ignore')
+
+    def tail(self, log_path, count):
+        """Last count lines of a bundled log file, read backwards from the mapping"""
+        name = self.log_files.get(log_path)
+        if name is None:
+            raise BundleCommandError(f"tail: cannot open '{log_path}' for reading: No such file or directory")
+        path, offset, size = self.members[name]
+        if not size or count <= 0:
+            return []
+        mapped = self._mapping(path)
+        end = offset + size
+        if mapped[end - 1:end] == b'\n':
+            end -= 1
+        position = end
+        for _ in range(count):
+            position = mapped.rfind(b'\n', offset, position)
+            if position < 0:
+                position = offset - 1
+                break
+        return mapped[position + 1:end].decode('utf-8', errors='ignore').splitlines()
+
+    def close(self):
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    # ---- inventory -------------------------------------------------------------
+
+    def _map_commands(self):
+        """Normalized command -> member name, from the manifest and the naming conventions"""
+        keys = {}
+        for name in self.members:
+            if LOG_ROOT not in name:
+                keys.setdefault(_member_key(name), name)
+
+        commands = {}
+        for command, file_names in INVENTORY_FILES.items():
+            for file_name in file_names:
+                if file_name in keys:
+                    commands[command] = keys[file_name]
+                    break
+
+        manifest = next((name for name in self.members if os.path.basename(name) == 'manifest.json'), None)
+        if manifest:
+            for command, member in json.loads(self.read(manifest)).get('commands', {}).items():
+                prefix = manifest[:-len('manifest.json')]
+                member = prefix + self._clean_name(member)
+                if member in self.members:
+                    commands[normalize_command(shlex.split(command)[1:]) if command.startswith('kubectl ')
+                             else command] = member
+        return commands
+
+    def inventory_text(self, command):
+        """Stored output of a kubectl listing command (normalized form)"""
+        member = self._commands.get(command)
+        if member:
+            return self.read(member)
+        if command == 'kubectl get cm -A' and 'kubectl get cm -A -o json' in self._commands:
+            return self._configmap_listing()
+        raise BundleCommandError(f"Bundle has no output for '{command}'")
+
+    def _configmap_items(self):
+        if self._configmaps is None:
+            self._configmaps = {}
+            if 'kubectl get cm -A -o json' in self._commands:
+                document = json.loads(self.inventory_text('kubectl get cm -A -o json'))
+                for item in document.get('items', []):
+                    metadata = item.get('metadata', {})
+                    self._configmaps[(metadata.get('namespace'), metadata.get('name'))] = item
+        return self._configmaps
+
+    def _configmap_listing(self):
+        lines = ['NAMESPACE NAME DATA AGE']
+        for (namespace, name), item in sorted(self._configmap_items().items()):
+            lines.append(f"{namespace} {name} {len(item.get('data') or {})} -")
+        return '\n'.join(lines)
+
+    def _configmap(self, name, namespace):
+        item = self._configmap_items().get((namespace, name))
+        if item is None:
+            raise BundleCommandError(f'Error from server (NotFound): configmaps "{name}" not found')
+        return item
+
+    def _describe_configmap(self, name, namespace):
+        item = self._configmap(name, namespace)
+        metadata = item.get('metadata', {})
+        lines = [f"Name:         {name}", f"Namespace:    {namespace}",
+                 f"Labels:       {', '.join(f'{k}={v}' for k, v in (metadata.get('labels') or {}).items()) or '<none>'}",
+                 f"Annotations:  <none>", "", "Data", "===="]
+        for key, value in (item.get('data') or {}).items():
+            lines.extend([f"{key}:", "----", str(value), ""])
+        return '\n'.join(lines)
+
+    def redis_ips(self):
+        """Redis service cluster IP -> namespace"""
+        if self._redis_ips is None:
+            try:
+                services = self.inventory_text('kubectl get svc -A')
+            except BundleCommandError:
+                services = ''
+            self._redis_ips = _parse_inventory(services, '')['redis_ips']
+        return self._redis_ips
+
+    def redis_hashes(self, redis_ip):
+        """{key: {field: value}} of the Redis dump for the tenant behind redis_ip"""
+        namespace = self.redis_ips().get(redis_ip)
+        if namespace is None:
+            raise BundleCommandError(f"Could not connect to Redis at {redis_ip}:6379: Connection refused")
+        if namespace not in self._redis_data:
+            member = next((name for name in self.members
+                           if name.split('/')[-2:-1] == ['redis'] and os.path.basename(name) == f"{namespace}.json"),
+                          None)
+            self._redis_data[namespace] = json.loads(self.read(member)) if member else {}
+        return self._redis_data[namespace]
+
+    def redis_rdb_stream(self, redis_ip):
+        """Binary stream of the RDB snapshot for the tenant behind redis_ip, read from the mapping"""
+        namespace = self.redis_ips().get(redis_ip)
+        member = next((name for name in self.members
+                       if name.split('/')[-2:-1] == ['redis'] and os.path.basename(name) == f"{namespace}.rdb"),
+                      None)
+        if namespace is None or member is None:
+            raise BundleCommandError(f"No RDB snapshot in the bundle for Redis {redis_ip}")
+        path, offset, size = self.members[member]
+        return _MappedStream(self._mapping(path), offset, size)
+
+    # ---- command emulation -----------------------------------------------------
+
+    def run_command(self, command, tty=True):
+        """
+        Answer a shell command from the bundle
+
+        Args:
+            command (str): Command line as the tool sends it over SSH
+            tty (bool): Format redis-cli replies as on a terminal (numbered, quoted)
+
+        Returns:
+            str: command output (errors are returned as output text, like a shell)
+        """
+        result = self.exec_command(command, tty=tty)
+        return '\n'.join(filter(None, [result['output'].rstrip('\n'), result['error']]))
+
+    def exec_command(self, command, tty=False, on_line=None, input_data=None):
+        """
+        Answer a command in the shape of VMSDebugWeb._exec_channel_command
+
+        input_data is the command's stdin (only used by redis-cli, which runs
+        one command per line like the real client).
+
+        Returns:
+            dict: output, error, exit_status, timed_out, stopped
+        """
+        result = {'output': '', 'error': '', 'exit_status': 0, 'timed_out': False, 'stopped': False}
+        try:
+            lines = self._execute(command.strip(), tty, input_data)
+        except BundleCommandError as e:
+            result['error'] = str(e)
+            result['exit_status'] = e.exit_status
+            return result
+        except (ValueError, IndexError, KeyError) as e:
+            result['error'] = f"support bundle: cannot run '{command}': {e}"
+            result['exit_status'] = 1
+            return result
+
+        output = []
+        for line in lines:
+            output.append(line)
+            if on_line and on_line(line) is False:
+                result['stopped'] = True
+                break
+        result['output'] = '\n'.join(output) + ('\n' if output else '')
+        return result
+
+    def _execute(self, command, tty, input_data=None):
+        if command.startswith(SUDO_WRAPPER):
+            return self._execute(shlex.split(command)[-1], tty, input_data)
+        loop = HGETALL_LOOP.match(command)
+        if loop:
+            return self._hgetall_loop(shlex.split(loop.group(1)), loop.group(2), tty)
+
+        stages = _split_pipeline(command)
+        args = [arg for arg in shlex.split(stages[0]) if not re.match(r'^\d?>', arg)]
+        lines = self._run_base(args, tty, input_data)
+        for stage in stages[1:]:
+            lines = self._apply_filter(lines, shlex.split(stage))
+        return lines
+
+    def _run_base(self, args, tty, input_data=None):
+        program = args[0]
+        if program == 'kubectl':
+            return self._kubectl(args[1:])
+        if program == 'redis-cli':
+            return self._redis_cli(args[1:], tty, input_data)
+        if program == 'tail':
+            count = int(args[args.index('-n') + 1]) if '-n' in args else 10
+            return self.tail(args[-1], count)
+        if program == 'find':
+            return self._find(args[1:])
+        if program == 'ls':
+            if args[-1] in self.log_files:
+                size = self.members[self.log_files[args[-1]]][2]
+                return [f"-rw-r--r-- 1 root root {size} (bundle) {args[-1]}"]
+            raise BundleCommandError(f"ls: cannot access '{args[-1]}': No such file or directory", 2)
+        if program in ('echo', 'printf'):
+            return [' '.join(args[1:])]
+        raise BundleCommandError(f"{program}: not available in offline support bundle mode", 127)
+
+    def _kubectl(self, args):
+        normalized = normalize_command(args)
+        if len(args) >= 3 and args[0] in ('describe', 'get') and RESOURCE_ALIASES.get(args[1], args[1]) == 'cm' \
+                and '-n' in args:
+            namespace = args[args.index('-n') + 1]
+            if args[0] == 'describe':
+                return self._describe_configmap(args[2], namespace).split('\n')
+            item = self._configmap(args[2], namespace)
+            return json.dumps(item, indent=4).split('\n')
+
+        lines = self.inventory_text('kubectl ' + normalized).splitlines()
+        if '--no-headers' in args and lines and lines[0].startswith('NAMESPACE'):
+            lines = lines[1:]
+        return lines
+
+    def _redis_cli(self, args, tty, input_data=None):
+        host = args[args.index('-h') + 1]
+        hashes = self.redis_hashes(host)
+        if '--scan' in args:
+            pattern = args[args.index('--pattern') + 1] if '--pattern' in args else '*'
+            return [key for key in hashes if fnmatch.fnmatchcase(key, pattern)]
+
+        rest = [arg for position, arg in enumerate(args)
+                if arg not in ('-h', '-p') and (position == 0 or args[position - 1] not in ('-h', '-p'))]
+        if not rest:
+            # Commands on stdin, one reply line each
+            replies = []
+            for line in (input_data or '').splitlines():
+                if line.strip():
+                    replies.extend(self._redis_reply(hashes, shlex.split(line)))
+            return replies
+        return self._redis_reply(hashes, rest, tty)
+
+    def _redis_reply(self, hashes, rest, tty=False):
+        operation = rest[0].lower()
+        if operation == 'dbsize':
+            return [str(len(hashes))]
+        if operation == 'type':
+            return ['hash' if rest[1] in hashes else 'none']
+        if operation == 'ttl':
+            return ['-1' if rest[1] in hashes else '-2']
+        if operation == 'memory' and rest[1].lower() == 'usage':
+            # Approximation: the dumped field and value bytes
+            fields = hashes.get(rest[2])
+            return [str(len(json.dumps(fields))) if fields is not None else '']
+        if operation == 'keys':
+            keys = [key for key in hashes if fnmatch.fnmatchcase(key, rest[1])]
+            if tty:
+                return [f"{number}) {_redis_quote(key)}" for number, key in enumerate(keys, 1)]
+            return keys
+        if operation == 'hgetall':
+            return self._hgetall(hashes.get(rest[1], {}), tty)
+        raise BundleCommandError(f"(error) ERR '{operation}' is not available in the support bundle")
+
+    def _hgetall(self, fields, tty):
+        lines = []
+        for field, value in fields.items():
+            value = value if isinstance(value, str) else json.dumps(value)
+            lines.extend([field, value])
+        if tty:
+            return [f"{number}) {_redis_quote(item)}" for number, item in enumerate(lines, 1)]
+        return lines
+
+    def _hgetall_loop(self, keys, redis_ip, tty):
+        hashes = self.redis_hashes(redis_ip)
+        lines = []
+        for key in keys:
+            lines.append(f"@@KEY@@ {key}")
+            lines.extend(self._hgetall(hashes.get(key, {}), tty))
+        lines.append("@@END@@")
+        return lines
+
+    def _find(self, args):
+        root = '/' + self._clean_name(args[0]).rstrip('/') + '/'
+        include, exclude = [], []
+        for position, arg in enumerate(args):
+            if arg == '-name' and position + 1 < len(args):
+                (exclude if args[position - 1] == '!' else include).append(args[position + 1])
+        return [path for path in self.log_files if path.startswith(root)
+                and all(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in include)
+                and not any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in exclude)]
+
+    def _apply_filter(self, lines, args):
+        program = args[0]
+        if program == 'grep':
+            flags = {arg for arg in args[1:] if arg.startswith('-')}
+            pattern = next((arg for arg in args[1:] if not arg.startswith('-')), '')
+            regex = re.compile(pattern, re.IGNORECASE if '-i' in flags else 0)
+            return [line for line in lines if bool(regex.search(line)) != ('-v' in flags)]
+        if program == 'sort':
+            return sorted(lines)
+        if program == 'head':
+            return list(lines)[:int(args[args.index('-n') + 1]) if '-n' in args else 10]
+        if program == 'wc':
+            return [str(len(list(lines)))]
+        if program == 'jq':
+            document = json.loads('\n'.join(lines))
+            if 'fromjson' in ' '.join(args):
+                document = json.loads(document['data']['config'])
+            return json.dumps(document, indent=2).split('\n')
+        if program == 'sed':
+            return self._sed(lines, args[-1])
+        raise BundleCommandError(f"{program}: not available in offline support bundle mode", 127)
+
+    @staticmethod
+    def _sed(lines, script):
+        """The two sed forms the log viewer uses: s/^/prefix/ and /pattern/i\\ (blank line before)"""
+        substitute = re.match(r'^s/(.*?)/(.*?)/$', script)
+        if substitute:
+            regex = re.compile(substitute.group(1))
+            return [regex.sub(substitute.group(2), line, count=1) for line in lines]
+        insert = re.match(r'^/(.*)/i\\+(.*)$', script)
+        if insert:
+            regex = re.compile(insert.group(1))
+            result = []
+            for line in lines:
+                if regex.search(line):
+                    result.append(insert.group(2))
+                result.append(line)
+            return result
+        return lines
+
+    # ---- load --------------------------------------------------------------------
+
+    def load(self):
+        """
+        Parse the inventory (log files are indexed on first query, see log_index)
+
+        Returns:
+            dict: name, tenants, redis_endpoints, configmaps, log_files, streamed
+        """
+        texts = []
+        for command in ('kubectl get svc -A', 'kubectl get cm -A'):
+            try:
+                texts.append(self.inventory_text(command))
+            except BundleCommandError:
+                texts.append('')
+
+        inventory = _parse_inventory(*texts)
+        self._redis_ips = inventory['redis_ips']
+        return {
+            'name': self.name,
+            'tenants': len(inventory['tenants']),
+            'redis_endpoints': len(inventory['redis_ips']),
+            'configmaps': inventory['configmaps'],
+            'log_files': len(self.log_files),
+            'streamed': self.streamed
+        }
+
+    def log_index(self, log_path):
+        """LogIndex of a whole bundled log file, built on first use"""
+        index = self._log_indexes.get(log_path)
+        if index is None:
+            name = self.log_files.get(log_path)
+            if name is None:
+                raise BundleCommandError(f"{log_path} is not in the support bundle")
+            index = self._log_indexes[log_path] = _index_log(log_path, self.members[name])
+        return index
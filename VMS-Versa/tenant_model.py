@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Indexed Tenant Model for the VMS Debug Tool
+
+Typed, compact view of the tenant database built by "Build Tenant Data".
+Each tenant is stored as a slotted record, and secondary indexes answer
+cross-tenant questions without looping over every tenant:
+- which tenants run service X            -> tenants_for_service()
+- which tenant owns Redis cluster IP X   -> tenants_for_redis_ip()
+- which tenants have ConfigMap X         -> tenants_for_configmap()
+- which namespaces start with X          -> find_namespaces()
+
+Exact lookups are dict lookups (O(1)); namespace prefix lookups use bisect on
+a sorted name list (O(log n)). The indexes are built on load(); the tool
+replaces the whole tenant database after every build, so there are no
+single-tenant updates that could let them drift from the data.
+
+The legacy tenant_database dict ({tenant: {'services', 'redis_info',
+'configmaps_info'}}) stays the source for JSON files and the web interface;
+the model is only read through its lookups.
+"""
+
+import threading
+from bisect import bisect_left
+
+# Lookup kinds accepted by TenantModel.lookup()
+LOOKUP_KINDS = ('service', 'redis_ip', 'configmap', 'namespace')
+
+
+class RedisInfo:
+    __slots__ = ('service_name', 'service_type', 'cluster_ip', 'external_ip', 'ports', 'age')
+
+    def __init__(self, service_name, service_type, cluster_ip, external_ip='N/A', ports='N/A', age='N/A'):
+        self.service_name = service_name
+        self.service_type = service_type
+        self.cluster_ip = cluster_ip
+        self.external_ip = external_ip
+        self.ports = ports
+        self.age = age
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data:
+            return None
+        return cls(
+            data.get('service_name'),
+            data.get('service_type'),
+            data.get('cluster_ip'),
+            data.get('external_ip', 'N/A'),
+            data.get('ports', 'N/A'),
+            data.get('age', 'N/A')
+        )
+
+
+class ConfigMapInfo:
+    __slots__ = ('name', 'data_count', 'age')
+
+    def __init__(self, name, data_count=0, age='N/A'):
+        self.name = name
+        self.data_count = data_count
+        self.age = age
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('name'), data.get('data_count', 0), data.get('age', 'N/A'))
+
+
+class TenantRecord:
+    __slots__ = ('name', 'services', 'redis', 'configmaps')
+
+    def __init__(self, name, services=(), redis=None, configmaps=None):
+        self.name = name
+        self.services = tuple(services)
+        self.redis = redis
+        # None means ConfigMaps were never collected for this tenant
+        self.configmaps = tuple(configmaps) if configmaps is not None else None
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """Build a record from a legacy tenant_database entry (which may be None)"""
+        data = data or {}
+        configmaps_info = data.get('configmaps_info')
+        configmaps = None
+        if configmaps_info is not None:
+            configmaps = [ConfigMapInfo.from_dict(cm) for cm in configmaps_info.get('configmaps') or []]
+        return cls(
+            name,
+            data.get('services') or [],
+            RedisInfo.from_dict(data.get('redis_info')),
+            configmaps
+        )
+
+    @property
+    def redis_ip(self):
+        return self.redis.cluster_ip if self.redis else None
+
+    def configmap_names(self):
+        return [cm.name for cm in self.configmaps or () if cm.name]
+
+
+def _index_add(index, key, tenant):
+    if key:
+        index.setdefault(key, set()).add(tenant)
+
+
+class TenantModel:
+    def __init__(self, tenant_database=None):
+        self._lock = threading.RLock()
+        self.clear()
+        if tenant_database:
+            self.load(tenant_database)
+
+    def clear(self):
+        """Drop all tenants and indexes"""
+        with self._lock:
+            self._tenants = {}
+            self._namespaces = []      # sorted tenant names for prefix lookups
+            self._by_service = {}      # service name -> set of tenants
+            self._by_redis_ip = {}     # Redis cluster IP -> set of tenants
+            self._by_configmap = {}    # ConfigMap name -> set of tenants
+
+    def load(self, tenant_database):
+        """Replace the model contents with a legacy tenant_database dict"""
+        with self._lock:
+            self.clear()
+            for name, data in (tenant_database or {}).items():
+                self._add_record(TenantRecord.from_dict(name, data))
+            self._namespaces.sort()
+
+    def _add_record(self, record):
+        """Store a record and index it (load() sorts the namespace list afterwards)"""
+        self._tenants[record.name] = record
+        self._namespaces.append(record.name)
+        for service in record.services:
+            _index_add(self._by_service, service, record.name)
+        _index_add(self._by_redis_ip, record.redis_ip, record.name)
+        for configmap in record.configmap_names():
+            _index_add(self._by_configmap, configmap, record.name)
+
+    def __len__(self):
+        return len(self._tenants)
+
+    def __contains__(self, name):
+        return name in self._tenants
+
+    def get(self, name):
+        return self._tenants.get(name)
+
+    def tenants_for_service(self, service_name):
+        with self._lock:
+            return sorted(self._by_service.get(service_name, ()))
+
+    def tenants_for_redis_ip(self, cluster_ip):
+        with self._lock:
+            return sorted(self._by_redis_ip.get(cluster_ip, ()))
+
+    def tenants_for_configmap(self, configmap_name):
+        with self._lock:
+            return sorted(self._by_configmap.get(configmap_name, ()))
+
+    def redis_endpoints(self):
+        """(tenant, Redis cluster IP) pairs for every tenant with a Redis service"""
+        with self._lock:
+            return [(name, self._tenants[name].redis_ip)
+                    for name in self._namespaces if self._tenants[name].redis_ip]
+
+    def find_namespaces(self, prefix, limit=100):
+        """Tenant namespaces starting with prefix, in sorted order"""
+        with self._lock:
+            start = bisect_left(self._namespaces, prefix)
+            matches = []
+            for name in self._namespaces[start:start + limit]:
+                if not name.startswith(prefix):
+                    break
+                matches.append(name)
+            return matches
+
+    def lookup(self, kind, value):
+        """
+        Run one of the indexed lookups by kind
+
+        Returns:
+            list: matching tenant names (sorted)
+
+        Raises:
+            ValueError: for an unknown lookup kind
+        """
+        if kind == 'service':
+            return self.tenants_for_service(value)
+        if kind == 'redis_ip':
+            return self.tenants_for_redis_ip(value)
+        if kind == 'configmap':
+            return self.tenants_for_configmap(value)
+        if kind == 'namespace':
+            return self.find_namespaces(value)
+        raise ValueError(f"Unknown lookup kind: {kind}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tenants': len(self._tenants),
+                'services': len(self._by_service),
+                'redis_ips': len(self._by_redis_ip),
+                'configmaps': len(self._by_configmap)
+            }
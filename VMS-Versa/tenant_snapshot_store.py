@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Tenant Snapshot Store for the VMS Debug Tool
+
+Keeps every "Build Tenant Data" run as a compact delta against the previous
+build of the same host, so questions like "what changed since yesterday" can
+be answered without re-running anything on the VMS.
+
+Storage layout (SQLite, one file in the Logs directory):
+- snapshots:        one row per build (host, timestamp, counts)
+- snapshot_changes: one row per added/removed item in that build
+
+Tracked items per tenant:
+- tenant     -> the tenant/namespace itself
+- service    -> each Kubernetes service name
+- configmap  -> each ConfigMap name
+- redis_ip   -> the Redis cluster IP (a changed IP is a remove + an add)
+
+Because each delta is computed against the previous state, the add/remove
+operations of a single item always alternate. Comparing two snapshots therefore
+only needs the changes recorded between them: an item with an odd number of
+changes in that range has a net change equal to its first operation. Diffs
+are answered by grouped SQL queries, so the full history is never loaded into
+memory.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+OP_REMOVE = 0
+OP_ADD = 1
+
+# Item kinds stored in snapshot_changes, in display order
+ITEM_KINDS = ('tenant', 'service', 'configmap', 'redis_ip')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    host TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    session_info TEXT,
+    execution_count INTEGER,
+    tenant_count INTEGER NOT NULL DEFAULT 0,
+    change_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_host ON snapshots (host, id);
+
+CREATE TABLE IF NOT EXISTS snapshot_changes (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    host TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    item TEXT NOT NULL,
+    op INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_item
+    ON snapshot_changes (host, kind, tenant, item, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_changes_snapshot
+    ON snapshot_changes (host, snapshot_id);
+"""
+
+# Serializes writers across client sessions sharing the same database file
+_write_lock = threading.Lock()
+
+
+def tenant_data_items(tenant_data):
+    """Flatten a tenant_database dict into a set of (kind, tenant, item) tuples"""
+    items = set()
+
+    for tenant, data in (tenant_data or {}).items():
+        items.add(('tenant', tenant, ''))
+        if not data:
+            continue
+
+        for service in data.get('services') or []:
+            items.add(('service', tenant, service))
+
+        redis_info = data.get('redis_info') or {}
+        if redis_info.get('cluster_ip'):
+            items.add(('redis_ip', tenant, redis_info['cluster_ip']))
+
+        configmaps_info = data.get('configmaps_info') or {}
+        for configmap in configmaps_info.get('configmaps') or []:
+            if configmap.get('name'):
+                items.add(('configmap', tenant, configmap['name']))
+
+    return items
+
+
+class TenantSnapshotStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._initialize_database()
+
+    def _connect(self):
+        """Open a new SQLite connection (one per call keeps threads independent)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        """Create tables and indexes if they don't exist"""
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with _write_lock:
+            conn = self._connect()
+            try:
+                conn.executescript(_SCHEMA)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _iter_state(self, conn, host, snapshot_id):
+        """Yield (kind, tenant, item) present on a host as of a snapshot"""
+        cursor = conn.execute(
+            """
+            SELECT kind, tenant, item, op, MAX(snapshot_id)
+            FROM snapshot_changes
+            WHERE host = ? AND snapshot_id <= ?
+            GROUP BY kind, tenant, item
+            """,
+            (host, snapshot_id)
+        )
+        for row in cursor:
+            # SQLite returns the bare "op" column from the row holding MAX(snapshot_id)
+            if row['op'] == OP_ADD:
+                yield (row['kind'], row['tenant'], row['item'])
+
+    def record_snapshot(self, host, tenant_data, session_info=None, execution_count=None):
+        """
+        Store a tenant_database build as a delta against the host's previous snapshot
+
+        Returns:
+            dict: snapshot metadata including 'id' and 'change_count'
+        """
+        current_items = tenant_data_items(tenant_data)
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        with _write_lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT MAX(id) AS last_id FROM snapshots WHERE host = ?", (host,)
+                ).fetchone()
+                previous_id = row['last_id'] if row and row['last_id'] is not None else 0
+                previous_items = set(self._iter_state(conn, host, previous_id)) if previous_id else set()
+
+                added = current_items - previous_items
+                removed = previous_items - current_items
+
+                cursor = conn.execute(
+                    """
+                    INSERT INTO snapshots (host, created_at, session_info, execution_count,
+                                           tenant_count, change_count)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (host, created_at, session_info, execution_count,
+                     len(tenant_data or {}), len(added) + len(removed))
+                )
+                snapshot_id = cursor.lastrowid
+
+                conn.executemany(
+                    """
+                    INSERT INTO snapshot_changes (snapshot_id, host, kind, tenant, item, op)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [(snapshot_id, host, kind, tenant, item, OP_ADD) for kind, tenant, item in added] +
+                    [(snapshot_id, host, kind, tenant, item, OP_REMOVE) for kind, tenant, item in removed]
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        return {
+            'id': snapshot_id,
+            'host': host,
+            'created_at': created_at,
+            'previous_id': previous_id or None,
+            'tenant_count': len(tenant_data or {}),
+            'change_count': len(added) + len(removed),
+            'added_count': len(added),
+            'removed_count': len(removed)
+        }
+
+    def get_snapshot(self, snapshot_id):
+        """Get metadata for a single snapshot"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def list_snapshots(self, host=None, limit=100):
+        """List snapshot metadata, newest first"""
+        conn = self._connect()
+        try:
+            if host:
+                cursor = conn.execute(
+                    "SELECT * FROM snapshots WHERE host = ? ORDER BY id DESC LIMIT ?", (host, limit)
+                )
+            else:
+                cursor = conn.execute("SELECT * FROM snapshots ORDER BY id DESC LIMIT ?", (limit,))
+            return [dict(row) for row in cursor]
+        finally:
+            conn.close()
+
+    def find_snapshot_before(self, host, timestamp):
+        """Get the latest snapshot of a host taken at or before a 'YYYY-MM-DD HH:MM:SS' timestamp"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                """
+                SELECT * FROM snapshots
+                WHERE host = ? AND created_at <= ?
+                ORDER BY id DESC LIMIT 1
+                """,
+                (host, timestamp)
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def diff_since(self, host, timestamp):
+        """
+        Changes on a host from its last snapshot at or before a 'YYYY-MM-DD HH:MM:SS'
+        timestamp to its latest snapshot ("what changed since yesterday")
+
+        Returns:
+            dict: see diff_snapshots, or a dict with an 'error' key
+        """
+        latest = self.list_snapshots(host=host, limit=1)
+        if not latest:
+            return {'error': f'No snapshots recorded for {host}'}
+        base = self.find_snapshot_before(host, timestamp)
+        if not base:
+            return {'error': f'No snapshot of {host} taken at or before {timestamp}'}
+        return self.diff_snapshots(base['id'], latest[0]['id'], host=host)
+
+    def diff_snapshots(self, from_id, to_id, host=None):
+        """
+        Compare two snapshots of the same host
+
+        Only the changes recorded between the two snapshots are read. The
+        comparison works in either direction (older -> newer or newer -> older).
+
+        Args:
+            host (str): if given, snapshots of any other host are treated as not found
+
+        Returns:
+            dict: snapshot metadata plus added/removed items grouped by kind,
+                  or a dict with an 'error' key
+        """
+        from_snapshot = self.get_snapshot(from_id)
+        to_snapshot = self.get_snapshot(to_id)
+
+        if not from_snapshot or not to_snapshot:
+            return {'error': 'Snapshot not found'}
+        if host is not None and (from_snapshot['host'] != host or to_snapshot['host'] != host):
+            return {'error': 'Snapshot not found'}
+        if from_snapshot['host'] != to_snapshot['host']:
+            return {'error': 'Snapshots belong to different hosts and cannot be compared'}
+
+        low, high = sorted((from_id, to_id))
+        reverse = from_id > to_id
+
+        result = {
+            'from': from_snapshot,
+            'to': to_snapshot,
+            'tenants': {'added': [], 'removed': []},
+            'services': {'added': [], 'removed': []},
+            'configmaps': {'added': [], 'removed': []},
+            'redis_ips': {'added': [], 'removed': [], 'changed': []},
+            'total_changes': 0
+        }
+        section_for_kind = {
+            'tenant': 'tenants',
+            'service': 'services',
+            'configmap': 'configmaps',
+            'redis_ip': 'redis_ips'
+        }
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                """
+                SELECT kind, tenant, item, op, MIN(snapshot_id), COUNT(*) AS change_count
+                FROM snapshot_changes
+                WHERE host = ? AND snapshot_id > ? AND snapshot_id <= ?
+                GROUP BY kind, tenant, item
+                HAVING COUNT(*) % 2 = 1
+                ORDER BY kind, tenant, item
+                """,
+                (from_snapshot['host'], low, high)
+            )
+            for row in cursor:
+                # Odd number of alternating changes: the net change is the first one
+                op = row['op']
+                if reverse:
+                    op = OP_REMOVE if op == OP_ADD else OP_ADD
+
+                bucket = 'added' if op == OP_ADD else 'removed'
+                section = result[section_for_kind[row['kind']]]
+                if row['kind'] == 'tenant':
+                    section[bucket].append(row['tenant'])
+                else:
+                    section[bucket].append({'tenant': row['tenant'], 'name': row['item']})
+                result['total_changes'] += 1
+        finally:
+            conn.close()
+
+        # A tenant whose Redis IP was both removed and added had its IP changed
+        redis_ips = result['redis_ips']
+        removed_by_tenant = {entry['tenant']: entry['name'] for entry in redis_ips['removed']}
+        for entry in list(redis_ips['added']):
+            if entry['tenant'] in removed_by_tenant:
+                redis_ips['changed'].append({
+                    'tenant': entry['tenant'],
+                    'from': removed_by_tenant[entry['tenant']],
+                    'to': entry['name']
+                })
+        changed_tenants = {entry['tenant'] for entry in redis_ips['changed']}
+        redis_ips['added'] = [e for e in redis_ips['added'] if e['tenant'] not in changed_tenants]
+        redis_ips['removed'] = [e for e in redis_ips['removed'] if e['tenant'] not in changed_tenants]
+
+        return result
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the time-range handling of vms_log_index
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vms_log_index import LogIndex, parse_time, parse_time_range  # noqa: E402
+
+LOG_LINES = [
+    "2026-01-01 10:01:05,100 [INFO ] [main] com.versa.vms.api - started",
+    "2026-01-01 10:02:13,482 [WARN ] [worker-4] com.versa.vms.api - slow request",
+    "2026-01-01 10:03:00,000 [ERROR] [worker-2] com.versa.vms.db - connection lost",
+]
+
+
+def build_index():
+    return LogIndex('vms.log').add_lines(LOG_LINES)
+
+
+def test_clock_range_straddling_last_entry():
+    """A range that ends after the last entry must not roll its end back a day"""
+    index = build_index()
+    start, end = parse_time_range('10:02', '10:05', index.last_timestamp)
+    assert start < end
+    messages = [entry['message'] for entry in index.query(start=start, end=end)]
+    assert messages == ['slow request', 'connection lost']
+
+
+def test_clock_range_across_midnight():
+    """An end clock time before the start clock time is on the next day"""
+    index = build_index()
+    start, end = parse_time_range('23:00', '00:30', index.last_timestamp)
+    assert end - start == 90 * 60
+
+
+def test_clock_start_after_reference_is_previous_day():
+    index = build_index()
+    start, _ = parse_time_range('11:00', None, index.last_timestamp)
+    assert start == parse_time('2025-12-31 11:00')
+
+
+def test_full_timestamps_are_taken_as_given():
+    index = build_index()
+    start, end = parse_time_range('2026-01-01 10:01', '2026-01-01 10:02:30', index.last_timestamp)
+    messages = [entry['message'] for entry in index.query(start=start, end=end)]
+    assert messages == ['started', 'slow request']
+
+
+if __name__ == "__main__":
+    test_clock_range_straddling_last_entry()
+    test_clock_range_across_midnight()
+    test_clock_start_after_reference_is_previous_day()
+    test_full_timestamps_are_taken_as_given()
+    print("All log index tests passed")
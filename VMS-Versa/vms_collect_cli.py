@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Headless VMS collection CLI
+
+Non-interactive counterpart of the web tool for cron jobs. For each host it
+opens one SSH connection and runs the whole collection over a pool of
+parallel exec channels (through sudo), then writes a timestamped,
+gzip-compressed JSON archive:
+
+    <output-dir>/<host>/<host>-YYYYmmdd-HHMMSS.json.gz
+
+Collected sections:
+    status      kubectl get ns / pods -A / svc -A / pv / pvc -A / cm -A (raw lines)
+    tenants     services, Redis endpoint and ConfigMap names per tenant namespace
+    configmaps  data of every tenant ConfigMap (JSON values decoded)
+    redis_keys  key count of every tenant Redis (DBSIZE)
+    logs        manifest of /var/log/versa/vms log files (path, size, mtime)
+    commands    exit status, duration and errors of every command run
+
+Object keys are sorted and lists are ordered, so archives from two nights can
+be compared line by line (e.g. diff <(zcat a.json.gz) <(zcat b.json.gz)).
+Hosts are collected in parallel as well; a host that can't be reached doesn't
+stop the others.
+
+Passwords are read from VMS_SSH_PASSWORD and VMS_ADMIN_PASSWORD (the admin
+password defaults to the SSH password), or prompted for on a terminal.
+
+Examples:
+    python3 vms_collect_cli.py vms1.example.net vms2.example.net
+    VMS_SSH_PASSWORD=... python3 vms_collect_cli.py --channels 8 --output-dir /var/backups/vms vms1
+
+Exit status: 0 all hosts collected cleanly, 1 some commands failed,
+2 at least one host could not be collected.
+"""
+
+import argparse
+import getpass
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ssh_transport import TRANSPORT_PROFILES, connect_ssh_client, get_profile, run_exec_command
+from vms_output_parsers import (SYSTEM_NAMESPACES, parse_configmap_listing, parse_kubectl_services,
+                                parse_redis_services)
+
+ARCHIVE_FORMAT = 'vms-collection/1'
+
+DEFAULT_CHANNELS = 6
+DEFAULT_HOSTS_PARALLEL = 4
+DEFAULT_COMMAND_TIMEOUT = 120
+DEFAULT_OUTPUT_DIR = 'collections'
+
+# section name -> command (the same discovery commands as run_kubectl_commands)
+STATUS_COMMANDS = {
+    'namespaces': "kubectl get ns",
+    'pods': "kubectl get pods -A",
+    'services': "kubectl get svc -A",
+    'persistent_volumes': "kubectl get pv",
+    'persistent_volume_claims': "kubectl get pvc -A",
+    'configmaps': "kubectl get cm -A",
+}
+CONFIGMAPS_JSON_COMMAND = "kubectl get configmaps -A -o json"
+LOG_MANIFEST_COMMAND = "find /var/log/versa/vms -type f -name '*.log*' -printf '%p\\t%s\\t%T@\\n' | sort"
+REDIS_DBSIZE_COMMAND = "redis-cli -h {redis_ip} -p 6379 dbsize"
+
+
+def _output_lines(output):
+    return [line.rstrip() for line in output.replace('\r', '').split('\n') if line.strip()]
+
+
+def parse_configmaps_json(output):
+    """
+    "kubectl get configmaps -A -o json" -> {namespace: {name: data}} for tenant namespaces
+
+    Data values that hold JSON (like the "config" key) are decoded.
+    """
+    configmaps = {}
+    for item in json.loads(output).get('items', []):
+        metadata = item.get('metadata', {})
+        namespace = metadata.get('namespace')
+        if not namespace or namespace in SYSTEM_NAMESPACES:
+            continue
+        data = {}
+        for key, value in (item.get('data') or {}).items():
+            if isinstance(value, str) and value.lstrip()[:1] in ('{', '['):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            data[key] = value
+        configmaps.setdefault(namespace, {})[metadata.get('name')] = data
+    return configmaps
+
+
+def parse_log_manifest(output):
+    """find -printf '%p\\t%s\\t%T@\\n' output -> [{path, size, mtime}]"""
+    manifest = []
+    for line in _output_lines(output):
+        parts = line.split('\t')
+        if len(parts) != 3:
+            continue
+        try:
+            manifest.append({'path': parts[0], 'size': int(parts[1]), 'mtime': int(float(parts[2]))})
+        except ValueError:
+            continue
+    return manifest
+
+
+def parse_dbsize(output):
+    """redis-cli dbsize output ("123" or "(integer) 123") -> int, None if unparseable"""
+    lines = _output_lines(output)
+    try:
+        return int(lines[-1].split()[-1]) if lines else None
+    except ValueError:
+        return None
+
+
+class VMSCollector:
+    def __init__(self, run_command, channels=DEFAULT_CHANNELS, progress=None):
+        """
+        Args:
+            run_command (callable): run_command(command) -> dict with output, error,
+                exit_status, timed_out (see ssh_transport.run_exec_command); called
+                from up to `channels` threads at once
+            channels (int): Commands run in parallel
+            progress (callable): progress(message) for status lines
+        """
+        self.run_command = run_command
+        self.channels = max(1, channels)
+        self.progress = progress
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    def _run(self, command):
+        """Run one command and record its status; returns its (possibly partial) output"""
+        start_time = time.time()
+        try:
+            result = self.run_command(command)
+        except Exception as e:
+            result = {'output': '', 'error': str(e), 'exit_status': None, 'timed_out': False}
+
+        ok = result['exit_status'] == 0 and not result['timed_out']
+        record = {
+            'exit_status': result['exit_status'],
+            'elapsed': round(time.time() - start_time, 3),
+            'ok': ok
+        }
+        if result['timed_out']:
+            record['error'] = 'timed out'
+        elif not ok:
+            record['error'] = result['error'] or f"exited with status {result['exit_status']}"
+        with self._lock:
+            self.commands[command] = record
+        if self.progress:
+            self.progress(f"  {command} ({record['elapsed']}s){'' if ok else ' - ' + record['error']}")
+        return result['output']
+
+    def collect(self):
+        """
+        Run the full collection
+
+        Returns:
+            dict: status, tenants, configmaps, redis_keys, logs, commands, failed_commands
+        """
+        with ThreadPoolExecutor(max_workers=self.channels) as pool:
+            status_futures = {name: pool.submit(self._run, command) for name, command in STATUS_COMMANDS.items()}
+            configmaps_future = pool.submit(self._run, CONFIGMAPS_JSON_COMMAND)
+            logs_future = pool.submit(self._run, LOG_MANIFEST_COMMAND)
+
+            # Redis counts need the service listing; they share the pool with the slower commands
+            services_output = status_futures['services'].result()
+            tenants = parse_kubectl_services(services_output)
+            redis_services = {namespace: info for namespace, info in parse_redis_services(services_output).items()
+                              if namespace in tenants}
+            redis_futures = {namespace: pool.submit(self._run, REDIS_DBSIZE_COMMAND.format(redis_ip=info['cluster_ip']))
+                             for namespace, info in redis_services.items()}
+
+            status = {name: _output_lines(future.result()) for name, future in status_futures.items()}
+            redis_keys = {namespace: parse_dbsize(future.result()) for namespace, future in redis_futures.items()}
+            configmaps_output = configmaps_future.result()
+            logs = parse_log_manifest(logs_future.result())
+
+        try:
+            configmaps = parse_configmaps_json(configmaps_output) if configmaps_output else {}
+        except ValueError as e:
+            configmaps = {}
+            self.commands[CONFIGMAPS_JSON_COMMAND].update(ok=False, error=f"invalid JSON: {e}")
+
+        configmap_listing = parse_configmap_listing('\n'.join(status['configmaps']))
+        for namespace, info in tenants.items():
+            info['redis_info'] = redis_services.get(namespace)
+            info['configmaps'] = sorted(entry['name'] for entry in
+                                        configmap_listing.get(namespace, {}).get('configmaps', []))
+            info['services'] = sorted(info['services'])
+
+        return {
+            'status': status,
+            'tenants': tenants,
+            'configmaps': configmaps,
+            'redis_keys': redis_keys,
+            'logs': logs,
+            'commands': self.commands,
+            'failed_commands': sorted(command for command, record in self.commands.items() if not record['ok'])
+        }
+
+
+def write_archive(document, output_dir, host, stamp):
+    """Write <output_dir>/<host>/<host>-<stamp>.json.gz atomically; returns its path"""
+    host_dir = os.path.join(output_dir, host.replace(os.sep, '_'))
+    os.makedirs(host_dir, exist_ok=True)
+    path = os.path.join(host_dir, f"{os.path.basename(host_dir)}-{stamp}.json.gz")
+    partial_path = path + '.partial'
+    try:
+        with gzip.open(partial_path, 'wt', encoding='utf-8') as f:
+            json.dump(document, f, indent=1, sort_keys=True)
+        os.replace(partial_path, path)
+    except OSError:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    return path
+
+
+def collect_host(host, args, ssh_password, admin_password, progress=None):
+    """
+    Connect to one host, collect and write its archive
+
+    Returns:
+        dict: host, path, ok, error, failed_commands, tenants, elapsed
+    """
+    started = datetime.now()
+    start_time = time.time()
+    summary = {'host': host, 'path': None, 'ok': False, 'error': None, 'failed_commands': [], 'tenants': 0}
+    client = None
+    try:
+        client, profile_name = connect_ssh_client(host, args.username, ssh_password,
+                                                  profile_name=args.profile, timeout=args.connect_timeout)
+        recv_chunk_size = get_profile(profile_name)['recv_chunk_size']
+
+        def run_command(command):
+            return run_exec_command(client, command, timeout=args.timeout, sudo_password=admin_password,
+                                    recv_chunk_size=recv_chunk_size)
+
+        result = VMSCollector(run_command, channels=args.channels, progress=progress).collect()
+    except Exception as e:
+        summary['error'] = str(e)
+        summary['elapsed'] = round(time.time() - start_time, 2)
+        return summary
+    finally:
+        if client:
+            client.close()
+
+    document = dict(result, format=ARCHIVE_FORMAT, host=host, username=args.username,
+                    transport_profile=profile_name, started=started.isoformat(timespec='seconds'),
+                    finished=datetime.now().isoformat(timespec='seconds'))
+    summary['failed_commands'] = result['failed_commands']
+    summary['tenants'] = len(result['tenants'])
+    try:
+        summary['path'] = write_archive(document, args.output_dir, host, started.strftime('%Y%m%d-%H%M%S'))
+    except OSError as e:
+        # Disk full, permission denied...: fails this host only, not the whole run
+        summary['error'] = f"Could not write archive: {str(e)}"
+    summary['ok'] = summary['path'] is not None and not result['failed_commands']
+    summary['elapsed'] = round(time.time() - start_time, 2)
+    return summary
+
+
+def _password(variable, prompt, default=None):
+    value = os.environ.get(variable)
+    if value:
+        return value
+    if default is not None:
+        return default
+    if not sys.stdin.isatty():
+        raise SystemExit(f"{variable} is not set and there is no terminal to prompt on")
+    return getpass.getpass(prompt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('hosts', nargs='+', help='VMS hosts to collect from')
+    parser.add_argument('-u', '--username', default='admin')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='Archive directory (one subdirectory per host)')
+    parser.add_argument('--channels', type=int, default=DEFAULT_CHANNELS,
+                        help='Parallel exec channels per host')
+    parser.add_argument('--hosts-parallel', type=int, default=DEFAULT_HOSTS_PARALLEL,
+                        help='Hosts collected at the same time')
+    parser.add_argument('--timeout', type=int, default=DEFAULT_COMMAND_TIMEOUT, help='Seconds per command')
+    parser.add_argument('--connect-timeout', type=int, default=10)
+    parser.add_argument('--profile', choices=sorted(TRANSPORT_PROFILES), default=None,
+                        help='SSH transport profile (default: per host, see ssh_transport.py)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print the per-host summary')
+    args = parser.parse_args()
+
+    ssh_password = _password('VMS_SSH_PASSWORD', 'SSH password: ')
+    admin_password = _password('VMS_ADMIN_PASSWORD', 'Admin (sudo) password: ', default=ssh_password)
+
+    print_lock = threading.Lock()
+
+    def progress_for(host):
+        if args.quiet:
+            return None
+
+        def progress(message):
+            with print_lock:
+                print(f"[{host}]{message}", file=sys.stderr)
+        return progress
+
+    with ThreadPoolExecutor(max_workers=max(1, args.hosts_parallel)) as pool:
+        summaries = list(pool.map(
+            lambda host: collect_host(host, args, ssh_password, admin_password, progress_for(host)), args.hosts))
+
+    exit_status = 0
+    for summary in summaries:
+        if summary['error']:
+            print(f"{summary['host']}: FAILED - {summary['error']}")
+            exit_status = 2
+        else:
+            failed = len(summary['failed_commands'])
+            print(f"{summary['host']}: {summary['tenants']} tenants, "
+                  f"{'all commands ok' if not failed else f'{failed} command(s) failed'} "
+                  f"({summary['elapsed']}s) -> {summary['path']}")
+            if failed and exit_status == 0:
+                exit_status = 1
+    sys.exit(exit_status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Time-indexed structured view of VMS application logs
+
+Parses the VMS log line format
+
+    2026-01-01 10:02:13,482 [WARN ] [worker-4] com.versa.vms.api - message
+
+into columnar arrays (epoch timestamps, level codes, interned logger ids and
+messages) kept sorted by timestamp. Time ranges are then answered by binary
+search on the timestamp column and level filters by comparing small integer
+codes, instead of re-reading the text. Lines that don't start with a
+timestamp (stack traces, wrapped messages) are appended to the previous entry.
+
+Several files are combined with merge_queries(), a heap-based k-way merge of
+the per-file results by timestamp.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+LEVELS = ('TRACE', 'DEBUG', 'INFO', 'WARN', 'ERROR', 'FATAL')
+LEVEL_CODES = {level: code for code, level in enumerate(LEVELS)}
+LEVEL_CODES.update({'WARNING': LEVEL_CODES['WARN'], 'CRITICAL': LEVEL_CODES['FATAL'],
+                    'SEVERE': LEVEL_CODES['ERROR']})
+UNKNOWN_LEVEL = LEVEL_CODES['INFO']
+
+LOG_LINE = re.compile(
+    r'^(?P<timestamp>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:[,.](?P<fraction>\d{1,6}))?\s+'
+    r'(?:\[\s*(?P<level>[A-Za-z]+)\s*\]|(?P<bare_level>[A-Z]{4,8}))?\s*'
+    r'(?:\[(?P<thread>[^\]]*)\]\s*)?'
+    r'(?:(?P<logger>[\w.$]+)\s+-\s+)?'
+    r'(?P<message>.*)$'
+)
+
+TIME_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+CLOCK_FORMATS = ('%H:%M:%S', '%H:%M')
+DAY_SECONDS = 86400
+
+# strptime is the slowest part of parsing; lines share the hour, so convert
+# each "YYYY-MM-DD HH" once and add minutes/seconds arithmetically
+_hour_epochs = {}
+_HOUR_CACHE_SIZE = 4096
+
+
+def _epoch(stamp):
+    """'YYYY-MM-DD HH:MM:SS' (or with 'T') -> epoch seconds in local time"""
+    hour = stamp[:13]
+    base = _hour_epochs.get(hour)
+    if base is None:
+        if len(_hour_epochs) >= _HOUR_CACHE_SIZE:
+            _hour_epochs.clear()
+        base = _hour_epochs[hour] = datetime.strptime(hour[:10] + ' ' + hour[11:], '%Y-%m-%d %H').timestamp()
+    return base + int(stamp[14:16]) * 60 + int(stamp[17:19])
+
+
+def parse_line(line):
+    """
+    Parse one VMS log line
+
+    Returns:
+        tuple: (epoch seconds, level code, logger, message) or None for continuation lines
+    """
+    match = LOG_LINE.match(line)
+    if not match:
+        return None
+    try:
+        timestamp = _epoch(match.group('timestamp'))
+    except ValueError:
+        return None
+    fraction = match.group('fraction')
+    if fraction:
+        timestamp += int(fraction) / (10 ** len(fraction))
+    level = (match.group('level') or match.group('bare_level') or '').upper()
+    return timestamp, LEVEL_CODES.get(level, UNKNOWN_LEVEL), match.group('logger') or '', match.group('message')
+
+
+def parse_time(value, reference=None):
+    """
+    Parse a query time: "2026-01-01 10:02[:30]", an ISO timestamp, or just
+    "10:02[:30]" - the latest occurrence of that clock time not after the
+    reference epoch timestamp (e.g. the last entry of a log)
+
+    Returns:
+        float: epoch seconds, or None for an empty value
+    """
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).timestamp()
+        except ValueError:
+            pass
+    timestamp = _clock_time(value, datetime.fromtimestamp(reference) if reference else datetime.now())
+    if timestamp is None:
+        raise ValueError(f"Unrecognized time: {value}")
+    if reference and timestamp > reference:
+        timestamp -= DAY_SECONDS
+    return timestamp
+
+
+def parse_time_range(start, end, reference=None):
+    """
+    Parse a query range with parse_time; a clock-only end is taken on the day
+    of the start (the next day if it would come before the start), so
+    "10:02" to "10:05" stays one range even when the log ends at 10:03
+
+    Returns:
+        tuple: (start, end) epoch seconds, either None for an empty value
+    """
+    start_ts = parse_time(start, reference)
+    if start_ts is not None and isinstance(end, str):
+        end_ts = _clock_time(end.strip(), datetime.fromtimestamp(start_ts))
+        if end_ts is not None:
+            if end_ts < start_ts:
+                end_ts += DAY_SECONDS
+            return start_ts, end_ts
+    return start_ts, parse_time(end, reference)
+
+
+def _clock_time(value, day):
+    """Epoch seconds of a "10:02[:30]" clock time on the day of a datetime, or None if value isn't one"""
+    for time_format in CLOCK_FORMATS:
+        try:
+            clock = datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+        return day.replace(hour=clock.hour, minute=clock.minute, second=clock.second, microsecond=0).timestamp()
+    return None
+
+
+def level_code(level):
+    """Level name (or code) -> code; None stays None"""
+    if level in (None, ''):
+        return None
+    if isinstance(level, int):
+        return level
+    code = LEVEL_CODES.get(level.strip().upper())
+    if code is None:
+        raise ValueError(f"Unknown log level: {level}")
+    return code
+
+
+class LogIndex:
+    """Columnar, timestamp-sorted entries of one log file"""
+
+    def __init__(self, source=''):
+        self.source = source
+        self.timestamps = array('d')
+        self.levels = array('b')
+        self.logger_ids = array('I')
+        self.messages = []
+        self.logger_names = []
+        self._logger_lookup = {}
+        self._sorted = True
+        self.skipped_lines = 0
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def _logger_id(self, logger):
+        logger_id = self._logger_lookup.get(logger)
+        if logger_id is None:
+            logger_id = self._logger_lookup[logger] = len(self.logger_names)
+            self.logger_names.append(logger)
+        return logger_id
+
+    def add_line(self, line):
+        """Add one raw log line (continuation lines extend the previous entry)"""
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            return
+        parsed = parse_line(line)
+        if parsed is None:
+            if self.messages:
+                self.messages[-1] += '\n' + line
+            else:
+                self.skipped_lines += 1
+            return
+
+        timestamp, code, logger, message = parsed
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self._sorted = False
+        self.timestamps.append(timestamp)
+        self.levels.append(code)
+        self.logger_ids.append(self._logger_id(logger))
+        self.messages.append(message)
+
+    def add_lines(self, lines):
+        for line in lines:
+            self.add_line(line)
+        return self.finalize()
+
+    def finalize(self):
+        """Sort the columns by timestamp if lines arrived out of order (stable)"""
+        if not self._sorted:
+            order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+            self.timestamps = array('d', (self.timestamps[i] for i in order))
+            self.levels = array('b', (self.levels[i] for i in order))
+            self.logger_ids = array('I', (self.logger_ids[i] for i in order))
+            self.messages = [self.messages[i] for i in order]
+            self._sorted = True
+        return self
+
+    @property
+    def first_timestamp(self):
+        return self.timestamps[0] if self.timestamps else None
+
+    @property
+    def last_timestamp(self):
+        return self.timestamps[-1] if self.timestamps else None
+
+    def bounds(self, start=None, end=None):
+        """Index range [lo, hi) of entries with start <= timestamp <= end (binary search)"""
+        self.finalize()
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return lo, max(lo, hi)
+
+    def entry(self, position):
+        return {
+            'timestamp': self.timestamps[position],
+            'time': datetime.fromtimestamp(self.timestamps[position]).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'level': LEVELS[self.levels[position]],
+            'logger': self.logger_names[self.logger_ids[position]],
+            'message': self.messages[position],
+            'source': self.source
+        }
+
+    def query(self, start=None, end=None, min_level=None, logger=None, contains=None):
+        """
+        Entries in a time range, at or above a level, optionally filtered by
+        logger substring and message text (case-insensitive), in time order
+
+        Yields:
+            dict: timestamp, time, level, logger, message, source
+        """
+        lo, hi = self.bounds(start, end)
+        min_code = level_code(min_level)
+        logger_ids = None
+        if logger:
+            logger = logger.lower()
+            logger_ids = {i for i, name in enumerate(self.logger_names) if logger in name.lower()}
+        contains = contains.lower() if contains else None
+
+        levels = self.levels
+        for position in range(lo, hi):
+            if min_code is not None and levels[position] < min_code:
+                continue
+            if logger_ids is not None and self.logger_ids[position] not in logger_ids:
+                continue
+            if contains and contains not in self.messages[position].lower():
+                continue
+            yield self.entry(position)
+
+    def level_counts(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        counts = [0] * len(LEVELS)
+        for code in self.levels[lo:hi]:
+            counts[code] += 1
+        return {LEVELS[code]: count for code, count in enumerate(counts) if count}
+
+    def stats(self):
+        return {
+            'source': self.source,
+            'entries': len(self),
+            'loggers': len(self.logger_names),
+            'first': self.first_timestamp,
+            'last': self.last_timestamp,
+            'skipped_lines': self.skipped_lines
+        }
+
+
+def merge_queries(indexes, limit=None, **filters):
+    """
+    k-way merge of the query results of several LogIndex objects by timestamp
+
+    Args:
+        indexes (list): LogIndex objects
+        limit (int): Stop after this many entries
+        **filters: start, end, min_level, logger, contains (see LogIndex.query)
+
+    Yields:
+        dict: entries in timestamp order across all sources
+    """
+    streams = [index.query(**filters) for index in indexes]
+    merged = heapq.merge(*streams, key=lambda entry: entry['timestamp'])
+    for count, entry in enumerate(merged):
+        if limit is not None and count >= limit:
+            return
+        yield entry
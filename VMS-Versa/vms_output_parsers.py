@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Output parsers for the VMS Debug Tool
+
+Pure functions that turn raw shell output (kubectl listings, redis-cli
+replies, log tails) into Python structures. They hold no SSH or session state,
+so VMSDebugWeb delegates to them and vms-benchmarks/bench_parsers.py can
+measure them on large corpora without a server.
+
+Hot paths avoid per-call regex compilation and repeated string splitting:
+the ANSI pattern is compiled once, lines are produced with splitlines(), and
+de-duplication uses dicts instead of list membership tests.
+"""
+
+import json
+import re
+
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+REDIS_NUMBERING = re.compile(r'^\d+\s*\)')
+
+SYSTEM_NAMESPACES = frozenset(['kube-system', 'kube-public', 'kube-node-lease', 'default'])
+
+
+def clean_ansi_codes(text):
+    """Remove ANSI escape codes from text"""
+    if '\x1b' not in text:
+        return text
+    return ANSI_ESCAPE.sub('', text)
+
+
+def _is_prompt(line):
+    return line.endswith('# ') or line.endswith('$ ') or line.startswith('[root@')
+
+
+def parse_kubectl_services(output):
+    """
+    Parse "kubectl get svc -A" output into tenants and their services
+
+    Returns:
+        dict: {namespace: {'services': [service, ...], 'redis_info': None}}
+    """
+    tenant_services = {}
+    for line in clean_ansi_codes(output).splitlines():
+        line = line.strip()
+        if not line or line.startswith('NAMESPACE') or line.startswith('kubectl') or _is_prompt(line):
+            continue
+
+        parts = line.split(None, 2)
+        if len(parts) < 2 or parts[0] in SYSTEM_NAMESPACES:
+            continue
+
+        services = tenant_services.get(parts[0])
+        if services is None:
+            services = tenant_services[parts[0]] = {}
+        services[parts[1]] = None
+
+    return {namespace: {'services': list(services), 'redis_info': None}
+            for namespace, services in tenant_services.items()}
+
+
+def parse_redis_services(output):
+    """
+    Parse the redis lines of "kubectl get svc -A" output
+
+    Returns:
+        dict: {namespace: {service_name, service_type, cluster_ip, external_ip, ports, age}}
+    """
+    redis_info = {}
+    for line in clean_ansi_codes(output).splitlines():
+        if 'redis' not in line:
+            continue
+        line = line.strip()
+        if not line or line.startswith('kubectl') or line.endswith('# ') or line.endswith('$ '):
+            continue
+
+        parts = line.split()
+        if len(parts) >= 4:
+            redis_info[parts[0]] = {
+                'service_name': parts[1],
+                'service_type': parts[2],
+                'cluster_ip': parts[3],
+                'external_ip': parts[4] if len(parts) > 4 else "N/A",
+                'ports': parts[5] if len(parts) > 5 else "N/A",
+                'age': parts[6] if len(parts) > 6 else "N/A"
+            }
+    return redis_info
+
+
+def parse_configmap_listing(output):
+    """
+    Parse "kubectl get configmaps -A" output (NAMESPACE NAME DATA AGE)
+
+    Returns:
+        dict: {namespace: {'configmaps': [{name, data_count, age}], 'total_configmaps': n}}
+    """
+    configmaps = {}
+    for line in clean_ansi_codes(output).splitlines():
+        line = line.strip()
+        if not line or line.startswith('NAMESPACE') or line.startswith('kubectl') or _is_prompt(line):
+            continue
+
+        parts = line.split()
+        if len(parts) < 3 or parts[0] in SYSTEM_NAMESPACES:
+            continue
+
+        entries = configmaps.get(parts[0])
+        if entries is None:
+            entries = configmaps[parts[0]] = []
+        entries.append({
+            'name': parts[1],
+            'data_count': parts[2],
+            'age': parts[3] if len(parts) > 3 else "N/A"
+        })
+
+    return {namespace: {'configmaps': entries, 'total_configmaps': len(entries)}
+            for namespace, entries in configmaps.items()}
+
+
+def parse_hgetall_lines(lines, parse_json=True):
+    """
+    Parse redis-cli hgetall output lines into a field -> value dict
+
+    Handles both the numbered terminal form (1) "field") and plain output.
+    With parse_json, escaped JSON values are decoded into objects.
+    """
+    key_value_pairs = {}
+    current_field = None
+
+    for line in lines:
+        line = line.strip()
+        # Skip command echo, prompts, and empty lines
+        if not line or line.startswith('redis-cli') or _is_prompt(line):
+            continue
+
+        # Remove Redis CLI numbering format like "1) \"field\"" -> "field"
+        numbered = REDIS_NUMBERING.match(line)
+        if numbered:
+            line = line[numbered.end():].strip()
+        line = line.strip('"\'')
+
+        if current_field is None:
+            current_field = line
+            continue
+
+        value = line
+        if parse_json and value.startswith('{') and '\\"' in value:
+            unescaped_value = value.replace('\\"', '"').replace('\\\\', '\\')
+            try:
+                value = json.loads(unescaped_value)
+            except ValueError:
+                value = unescaped_value
+
+        key_value_pairs[current_field] = value
+        current_field = None
+
+    return key_value_pairs
+
+
+def clean_log_lines(output, command_prefix='tail '):
+    """Log tail output -> lines without ANSI codes, the command echo and shell prompts"""
+    return [line for line in (raw.rstrip() for raw in clean_ansi_codes(output).strip().splitlines())
+            if not line.startswith(command_prefix) and not _is_prompt(line)]
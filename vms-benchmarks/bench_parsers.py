@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: output parsers and ANSI cleaning
+
+Times the text-processing functions from VMS-Versa/vms_output_parsers.py (and
+the redis-cli reply parser of vms-web-debug-tool's RedisService) on generated
+corpora from 16 KB up to 100 MB and reports throughput (ops/s and
+MB/s) and peak memory allocated during one call (tracemalloc). Corpora are
+built from synthetic_cluster.SyntheticCluster output with shell noise added
+(command echo, prompts, ANSI color codes), so they look like what the tools
+read from an interactive shell.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+the comparison exits with status 1 when a parser got slower or uses more
+memory than the tolerance allows.
+
+Examples:
+    python3 bench_parsers.py                                # small + medium corpora
+    python3 bench_parsers.py --sizes tiny,small,medium,large --json
+    python3 bench_parsers.py --save-baseline baselines/parsers.json
+    python3 bench_parsers.py --compare baselines/parsers.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'VMS-Versa'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vms-web-debug-tool', 'app'))
+
+from synthetic_cluster import SyntheticCluster  # noqa: E402
+import vms_output_parsers as parsers  # noqa: E402
+from services.redis_service import RedisService  # noqa: E402
+
+SIZES = {
+    'tiny': 16 * 1024,
+    'small': 1024 * 1024,
+    'medium': 10 * 1024 * 1024,
+    'large': 100 * 1024 * 1024,
+}
+DEFAULT_SIZES = 'small,medium'
+PROMPT = '[root@vms-sim admin]# '
+ANSI_LEVEL = {'ERROR': '\x1b[31m', 'WARN ': '\x1b[33m', 'INFO ': '\x1b[32m', 'DEBUG': '\x1b[36m'}
+
+
+def _namespaces_for(size, bytes_per_namespace):
+    return max(1, size // bytes_per_namespace)
+
+
+def kubectl_svc_corpus(size, seed):
+    cluster = SyntheticCluster(namespaces=_namespaces_for(size, 4 * 90), redis_keys=0, seed=seed)
+    lines = ['kubectl get svc -A'] + list(cluster.kubectl_get_svc()) + [PROMPT]
+    return '\r\n'.join(lines)
+
+
+def configmap_corpus(size, seed):
+    cluster = SyntheticCluster(namespaces=_namespaces_for(size, 5 * 54), redis_keys=0, seed=seed)
+    lines = ['kubectl get configmaps -A'] + list(cluster.kubectl_get_cm()) + [PROMPT]
+    return '\r\n'.join(lines)
+
+
+def hgetall_corpus(size, seed):
+    """hgetall replies of many EntryData keys, as lines (the parser takes a line list)"""
+    cluster = SyntheticCluster(namespaces=1, redis_keys=10 ** 9, seed=seed)
+    tenant = cluster.tenants[0]
+    lines = []
+    total = 0
+    index = 0
+    while total < size:
+        key = f"EntryData:{tenant}:{index * 5:07d}"
+        number = 1
+        for field, value in cluster.redis_hash(tenant, key):
+            for item in (f"{field}-{index}", value.replace('"', '\\"')):
+                line = f'{number}) "{item}"'
+                lines.append(line)
+                total += len(line) + 1
+                number += 1
+        index += 1
+    return lines
+
+
+def hgetall_text_corpus(size, seed):
+    """The same hgetall replies as one string, as the web tool's execute_command returns them"""
+    return '\n'.join(hgetall_corpus(size, seed))
+
+
+def log_tail_corpus(size, seed):
+    """tail output with colored levels, the command echo and a trailing prompt"""
+    cluster = SyntheticCluster(namespaces=200, redis_keys=0, log_lines=size // 150 + 1, seed=seed)
+    path = cluster.log_files[0]
+    lines = [f'tail -n {cluster.log_lines} "{path}"']
+    total = 0
+    for line in cluster.tail(path, cluster.log_lines):
+        level = line[25:30]
+        if level in ANSI_LEVEL:
+            line = f"{line[:24]}{ANSI_LEVEL[level]}[{level}]\x1b[0m{line[31:]}"
+        lines.append(line)
+        total += len(line) + 2
+        if total >= size:
+            break
+    lines.append(PROMPT)
+    return '\r\n'.join(lines)
+
+
+# name -> (corpus builder, parser called with the corpus)
+PARSERS = {
+    'clean_ansi_codes': (log_tail_corpus, parsers.clean_ansi_codes),
+    'parse_kubectl_services': (kubectl_svc_corpus, parsers.parse_kubectl_services),
+    'parse_redis_services': (kubectl_svc_corpus, parsers.parse_redis_services),
+    'parse_configmap_listing': (configmap_corpus, parsers.parse_configmap_listing),
+    'parse_hgetall_lines': (hgetall_corpus, parsers.parse_hgetall_lines),
+    'web_parse_redis_output': (hgetall_text_corpus, RedisService(None)._parse_redis_output),
+    'clean_log_lines': (log_tail_corpus, parsers.clean_log_lines),
+}
+
+
+def corpus_bytes(corpus):
+    if isinstance(corpus, str):
+        return len(corpus.encode('utf-8'))
+    return sum(len(line.encode('utf-8')) + 1 for line in corpus)
+
+
+def measure(func, corpus, min_time, max_iterations):
+    """Returns (iterations, seconds, peak bytes allocated during one call)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func(corpus)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while iterations < max_iterations and (iterations == 0 or elapsed < min_time):
+        func(corpus)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    return iterations, elapsed, peak
+
+
+def run(sizes, names, seed, min_time, max_iterations, progress=None):
+    results = []
+    corpora = {}
+    for size_name in sizes:
+        size = SIZES[size_name]
+        for name in names:
+            builder, func = PARSERS[name]
+            corpus = corpora.get((builder, size))
+            if corpus is None:
+                corpora.clear()  # keep at most one corpus of each size in memory
+                corpus = corpora[(builder, size)] = builder(size, seed)
+            if progress:
+                progress(f"{name} on {size_name} corpus")
+            iterations, elapsed, peak = measure(func, corpus, min_time, max_iterations)
+            mb = corpus_bytes(corpus) / (1024 * 1024)
+            results.append({
+                'parser': name,
+                'size': size_name,
+                'corpus_mb': round(mb, 2),
+                'iterations': iterations,
+                'ops_per_second': round(iterations / elapsed, 3),
+                'mb_per_second': round(mb * iterations / elapsed, 2),
+                'peak_memory_mb': round(peak / (1024 * 1024), 2)
+            })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Compare against a baseline; returns (rows, regressions)"""
+    previous = {(entry['parser'], entry['size']): entry for entry in baseline.get('results', [])}
+    rows = []
+    regressions = 0
+    for result in results:
+        old = previous.get((result['parser'], result['size']))
+        if not old:
+            rows.append((result, None, None, 'new'))
+            continue
+        speed = result['ops_per_second'] / old['ops_per_second'] - 1 if old['ops_per_second'] else 0
+        memory = result['peak_memory_mb'] / old['peak_memory_mb'] - 1 if old['peak_memory_mb'] else 0
+        status = 'ok'
+        if speed < -tolerance or memory > tolerance:
+            status = 'REGRESSION'
+            regressions += 1
+        rows.append((result, speed, memory, status))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma separated: ' + ', '.join(SIZES))
+    parser.add_argument('--parsers', default=','.join(PARSERS), help='Comma separated parser names')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=1.0, help='Minimum seconds per measurement')
+    parser.add_argument('--max-iterations', type=int, default=1000)
+    parser.add_argument('--save-baseline', metavar='PATH', help='Write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown / memory growth vs. the baseline (0.25 = 25%%)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(',')]
+    names = [name.strip() for name in args.parsers.split(',')]
+    for size in sizes:
+        if size not in SIZES:
+            parser.error(f"unknown size '{size}'")
+    for name in names:
+        if name not in PARSERS:
+            parser.error(f"unknown parser '{name}'")
+
+    progress = None if args.json else (lambda message: print(f"  running {message}...", file=sys.stderr))
+    results = run(sizes, names, args.seed, args.min_time, args.max_iterations, progress)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results
+    }
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    regressions = 0
+    rows = None
+    if args.compare:
+        with open(args.compare) as f:
+            rows, regressions = compare(results, json.load(f), args.tolerance)
+
+    if args.json:
+        if rows is not None:
+            report['comparison'] = [{'parser': result['parser'], 'size': result['size'],
+                                     'speed_change': speed, 'memory_change': memory, 'status': status}
+                                    for result, speed, memory, status in rows]
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'parser':<26} {'size':<7} {'MB':>8} {'ops/s':>10} {'MB/s':>9} {'peak MB':>9}  vs. baseline")
+        changes = {(row[0]['parser'], row[0]['size']): row for row in rows or []}
+        for result in results:
+            change = ''
+            row = changes.get((result['parser'], result['size']))
+            if row and row[1] is not None:
+                change = f"speed {row[1]:+.0%}, memory {row[2]:+.0%} {row[3]}"
+            elif row:
+                change = row[3]
+            print(f"{result['parser']:<26} {result['size']:<7} {result['corpus_mb']:>8.2f} "
+                  f"{result['ops_per_second']:>10.2f} {result['mb_per_second']:>9.2f} "
+                  f"{result['peak_memory_mb']:>9.2f}  {change}")
+
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.tolerance:.0%} tolerance", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
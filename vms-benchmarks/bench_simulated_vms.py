@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the VMS debug tools against a synthetic VMS
+
+Starts vms_simulator.VMSSimulator with a synthetic cluster of the requested
+size (optionally behind latency_proxy.LatencyProxy for network RTT) and times
+the same workflows in each tool:
+
+    vms-versa        VMS-Versa/VMS-Debug-Tool-Web.py VMSDebugWeb: connect, build
+                     tenant data, Redis keys for one tenant, cross-tenant key
+                     search, log scan and tail
+    web-debug-tool   vms-web-debug-tool SSHService + VMSService: connect, system
+                     overview, comprehensive tenant data collection
+    docker           VMS-Versa-Docker ssh-service HTTP API (Flask test client):
+                     /connect, /status, /execute
+
+The tools connect to port 22 of whatever host they are given, so the host
+name "vms-sim" is redirected to the simulator (or proxy) address for the
+duration of the run. Results are comparable across commits because the
+cluster contents only depend on the size arguments and --seed.
+
+Examples:
+    python3 bench_simulated_vms.py --namespaces 200 --redis-keys 100000
+    python3 bench_simulated_vms.py --namespaces 2000 --redis-keys 1000000 \\
+        --latency-ms 20 --rtt-ms 100 --targets vms-versa --json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+import paramiko
+
+from latency_proxy import LatencyProxy
+from synthetic_cluster import SyntheticCluster
+from vms_simulator import VMSSimulator
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SIMULATOR_HOST = 'vms-sim'
+TARGETS = ('vms-versa', 'web-debug-tool', 'docker')
+
+
+@contextlib.contextmanager
+def redirect_ssh(alias, address):
+    """Make paramiko.SSHClient.connect(alias, ...) connect to address instead"""
+    original = paramiko.SSHClient.connect
+
+    def connect(self, hostname, port=22, *args, **kwargs):
+        if hostname == alias:
+            hostname, port = address
+        return original(self, hostname, port, *args, **kwargs)
+
+    paramiko.SSHClient.connect = connect
+    try:
+        yield
+    finally:
+        paramiko.SSHClient.connect = original
+
+
+def load_module(name, path):
+    """Import a module from a file path under a unique name"""
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def summarize(value):
+    if isinstance(value, (dict, list, tuple, set)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.splitlines())
+    return value
+
+
+class Timer:
+    def __init__(self, target):
+        self.target = target
+        self.results = []
+
+    def step(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        error = None
+        value = None
+        try:
+            value = func(*args, **kwargs)
+        except Exception as e:
+            error = str(e)
+        self.results.append({
+            'target': self.target,
+            'step': name,
+            'seconds': round(time.perf_counter() - start, 3),
+            'items': summarize(value) if error is None else None,
+            'error': error
+        })
+        return value
+
+
+def bench_vms_versa(args, cluster):
+    timer = Timer('vms-versa')
+    module = load_module('vms_debug_tool_web', os.path.join(REPO_ROOT, 'VMS-Versa', 'VMS-Debug-Tool-Web.py'))
+    tenant = cluster.tenants[0]
+
+    previous_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_directory:
+        os.chdir(work_directory)  # Logs/ and snapshot files go to a scratch directory
+        try:
+            tool = module.VMSDebugWeb()
+            timer.step('connect', tool.connect_to_server,
+                       SIMULATOR_HOST, args.username, args.password, args.password)
+            if not tool.connected:
+                return timer.results
+            timer.step('build_tenant_data', tool.build_tenant_data)
+            timer.results[-1]['items'] = len(tool.tenant_database)
+            timer.step('redis_keys_one_tenant', tool.extract_redis_keys_for_tenant, tenant)
+            search = timer.step('redis_search_all_tenants', tool.search_redis_keys_all_tenants, 'EntryData:*')
+            if search:
+                timer.results[-1]['items'] = search['total_hits']
+            timer.step('scan_log_files', tool.scan_log_files)
+            tail = timer.step('log_tail', tool.get_log_file_tail,
+                              cluster.log_files[0], args.tail_lines)
+            if tail:
+                timer.results[-1]['items'] = tail['lines_retrieved']
+            timer.step('disconnect', tool.disconnect_from_server)
+        finally:
+            os.chdir(previous_directory)
+    return timer.results
+
+
+def bench_web_debug_tool(args, cluster):
+    timer = Timer('web-debug-tool')
+    services = os.path.join(REPO_ROOT, 'vms-web-debug-tool', 'app', 'services')
+    ssh_service = load_module('web_debug_ssh_service', os.path.join(services, 'ssh_service.py'))
+    vms_service = load_module('web_debug_vms_service', os.path.join(services, 'vms_service.py'))
+
+    ssh = ssh_service.SSHService()
+    vms = vms_service.VMSService(None, ssh)
+    connection_id = timer.step('connect', ssh.connect, SIMULATOR_HOST, args.username, args.password, args.password)
+    if not connection_id:
+        return timer.results
+    timer.step('system_overview', vms.get_system_overview, connection_id)
+    timer.step('collect_tenant_data', vms.collect_comprehensive_tenant_data, connection_id, args.include_keys)
+    timer.step('disconnect', ssh.disconnect, connection_id)
+    return timer.results
+
+
+def bench_docker(args, cluster):
+    timer = Timer('docker')
+    module = load_module('docker_ssh_service', os.path.join(REPO_ROOT, 'VMS-Versa-Docker', 'ssh-service', 'app.py'))
+    client = module.app.test_client()
+    headers = {'X-Session-ID': str(uuid.uuid4())}
+
+    def connect():
+        client.post('/connect', headers=headers, json={
+            'host': SIMULATOR_HOST, 'username': args.username,
+            'ssh_password': args.password, 'admin_password': args.password
+        })
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            if client.get('/status', headers=headers).get_json().get('connected'):
+                return True
+            time.sleep(0.05)
+        raise RuntimeError('ssh-service did not connect within 60s')
+
+    def execute(command):
+        response = client.post('/execute', headers=headers, json={'command': command, 'timeout': 60})
+        data = response.get_json()
+        if response.status_code != 200:
+            raise RuntimeError(data.get('error'))
+        return data['output']
+
+    if not timer.step('connect', connect):
+        return timer.results
+    timer.step('kubectl_get_svc', execute, 'kubectl get svc -A')
+    timer.step('kubectl_get_pods', execute, 'kubectl get pods -A')
+    redis_ip = cluster.tenant_redis_ip[cluster.tenants[0]]
+    timer.step('redis_keys_one_tenant', execute, f'redis-cli -h {redis_ip} -p 6379 keys "*"')
+    timer.step('disconnect', client.post, '/disconnect', headers=headers)
+    return timer.results
+
+
+BENCHMARKS = {
+    'vms-versa': bench_vms_versa,
+    'web-debug-tool': bench_web_debug_tool,
+    'docker': bench_docker,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--namespaces', type=int, default=50)
+    parser.add_argument('--redis-keys', type=int, default=10000, help='Total Redis keys across all tenants')
+    parser.add_argument('--log-lines', type=int, default=100000, help='Lines per log file')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Simulated per-command latency')
+    parser.add_argument('--rtt-ms', type=float, default=0, help='Emulated network round-trip time')
+    parser.add_argument('--bandwidth-mbit', type=float, default=0, help='Emulated link bandwidth (0 = unlimited)')
+    parser.add_argument('--targets', default=','.join(TARGETS), help='Comma separated: ' + ', '.join(TARGETS))
+    parser.add_argument('--tail-lines', type=int, default=5000)
+    parser.add_argument('--include-keys', action='store_true',
+                        help='web-debug-tool: collect Redis keys for every tenant (slow on large clusters)')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    cluster = SyntheticCluster(namespaces=args.namespaces, redis_keys=args.redis_keys,
+                               log_lines=args.log_lines, seed=args.seed)
+    simulator = VMSSimulator(cluster, username=args.username, password=args.password,
+                             command_latency_ms=args.latency_ms).start()
+    proxy = None
+    address = (simulator.host, simulator.port)
+    if args.rtt_ms or args.bandwidth_mbit:
+        proxy = LatencyProxy(simulator.host, simulator.port, rtt_ms=args.rtt_ms,
+                             bandwidth_mbit=args.bandwidth_mbit).start()
+        address = proxy.address
+
+    results = []
+    try:
+        with redirect_ssh(SIMULATOR_HOST, address):
+            for target in args.targets.split(','):
+                target = target.strip()
+                try:
+                    results.extend(BENCHMARKS[target](args, cluster))
+                except Exception as e:  # e.g. the target's dependencies are not installed
+                    results.append({'target': target, 'step': 'setup', 'seconds': 0, 'items': None, 'error': str(e)})
+    finally:
+        if proxy:
+            proxy.stop()
+        simulator.stop()
+
+    settings = {
+        'namespaces': args.namespaces, 'redis_keys': args.redis_keys, 'log_lines': args.log_lines,
+        'latency_ms': args.latency_ms, 'rtt_ms': args.rtt_ms, 'bandwidth_mbit': args.bandwidth_mbit,
+        'commands_served': simulator.commands_served
+    }
+    if args.json:
+        print(json.dumps({'settings': settings, 'results': results}, indent=2))
+        return
+
+    print(f"{args.namespaces} namespaces, {args.redis_keys} Redis keys, {args.latency_ms} ms/command, "
+          f"RTT {args.rtt_ms} ms, {simulator.commands_served} commands served")
+    print(f"{'target':<16} {'step':<26} {'seconds':>9} {'items':>9}  error")
+    for result in results:
+        items = '' if result['items'] is None else result['items']
+        print(f"{result['target']:<16} {result['step']:<26} {result['seconds']:>9.3f} {items:>9}  {result['error'] or ''}")
+
+
+if __name__ == '__main__':
+    main()
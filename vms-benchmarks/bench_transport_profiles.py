@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SSH transport profiles (default vs bulk) for large command outputs
+
+Runs a set of large read-only commands over an SSH exec channel once per
+transport profile from VMS-Versa/ssh_transport.py and reports the effective
+throughput (decoded output bytes per second). Use --rtt-ms / --bandwidth-mbit
+to route the connection through a local proxy that emulates a high-latency
+link to a remote data center.
+
+Examples:
+    python3 bench_transport_profiles.py --host vms1-tb163.versa-test.net \\
+        --username admin --password '...' --sudo-password '...' --rtt-ms 150
+
+    python3 bench_transport_profiles.py --host 127.0.0.1 --port 2222 \\
+        --username admin --password admin --command 'seq 1 2000000' --rtt-ms 80 --json
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'VMS-Versa'))
+
+from ssh_transport import TRANSPORT_PROFILES, connect_ssh_client, get_profile  # noqa: E402
+from latency_proxy import LatencyProxy  # noqa: E402
+
+DEFAULT_COMMANDS = [
+    "kubectl get pods -A",
+    "kubectl get configmaps -A -o json",
+    "tail -n 10000 /var/log/versa/vms/vms-admin.log",
+]
+
+
+def run_command(client, command, recv_chunk_size, sudo_password=None, timeout=300):
+    """Run one command on an exec channel; returns (output bytes, seconds, exit status)"""
+    if sudo_password:
+        command = f"sudo -S -p '' sh -c {shlex.quote(command)}"
+
+    channel = client.get_transport().open_session()
+    start = time.perf_counter()
+    try:
+        channel.exec_command(command)
+        if sudo_password:
+            channel.sendall((sudo_password + "\n").encode('utf-8'))
+        channel.shutdown_write()
+
+        received = 0
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if channel.recv_ready():
+                received += len(channel.recv(recv_chunk_size))
+            elif channel.recv_stderr_ready():
+                channel.recv_stderr(recv_chunk_size)
+            elif channel.exit_status_ready():
+                break
+            else:
+                time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        return received, elapsed, channel.recv_exit_status() if channel.exit_status_ready() else None
+    finally:
+        channel.close()
+
+
+def benchmark_profile(args, host, port, profile_name):
+    profile = get_profile(profile_name)
+    client, _ = connect_ssh_client(host, args.username, args.password,
+                                   profile_name=profile_name, timeout=30, port=port)
+    results = []
+    try:
+        for command in args.command:
+            runs = []
+            for _ in range(args.repeat):
+                size, elapsed, exit_status = run_command(
+                    client, command, profile['recv_chunk_size'], args.sudo_password
+                )
+                runs.append({'bytes': size, 'seconds': elapsed, 'exit_status': exit_status})
+            median_seconds = statistics.median(run['seconds'] for run in runs)
+            size = runs[-1]['bytes']
+            results.append({
+                'profile': profile_name,
+                'command': command,
+                'bytes': size,
+                'median_seconds': round(median_seconds, 3),
+                'mb_per_second': round(size / median_seconds / (1024 * 1024), 2) if median_seconds else None,
+                'exit_status': runs[-1]['exit_status']
+            })
+    finally:
+        client.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', required=True)
+    parser.add_argument('--port', type=int, default=22)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default=os.environ.get('VMS_BENCH_PASSWORD', ''))
+    parser.add_argument('--sudo-password', default=os.environ.get('VMS_BENCH_SUDO_PASSWORD'),
+                        help='Run commands through sudo -S (needed for kubectl on a VMS)')
+    parser.add_argument('--command', action='append', help='Command to run (repeatable)')
+    parser.add_argument('--profiles', default=','.join(TRANSPORT_PROFILES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--rtt-ms', type=float, default=0, help='Emulated round-trip time')
+    parser.add_argument('--bandwidth-mbit', type=float, default=0, help='Emulated link bandwidth (0 = unlimited)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    args.command = args.command or DEFAULT_COMMANDS
+
+    proxy = None
+    host, port = args.host, args.port
+    if args.rtt_ms or args.bandwidth_mbit:
+        proxy = LatencyProxy(args.host, args.port, rtt_ms=args.rtt_ms, bandwidth_mbit=args.bandwidth_mbit).start()
+        host, port = proxy.address
+
+    results = []
+    try:
+        for profile_name in args.profiles.split(','):
+            results.extend(benchmark_profile(args, host, port, profile_name.strip()))
+    finally:
+        if proxy:
+            proxy.stop()
+
+    if args.json:
+        print(json.dumps({'rtt_ms': args.rtt_ms, 'bandwidth_mbit': args.bandwidth_mbit, 'results': results}, indent=2))
+        return
+
+    print(f"RTT: {args.rtt_ms} ms, bandwidth: {args.bandwidth_mbit or 'unlimited'} Mbit/s, repeats: {args.repeat}")
+    print(f"{'profile':<10} {'MB':>9} {'seconds':>9} {'MB/s':>8}  command")
+    for result in results:
+        print(f"{result['profile']:<10} {result['bytes'] / (1024 * 1024):>9.2f} "
+              f"{result['median_seconds']:>9.3f} {result['mb_per_second'] or 0:>8.2f}  {result['command']}")
+
+
+if __name__ == '__main__':
+    main()
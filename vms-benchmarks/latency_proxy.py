@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Local TCP proxy that adds latency (and optionally a bandwidth cap)
+
+Used by the benchmarks to reproduce high-latency links to remote data
+centers from a lab machine: point the SSH client at the proxy instead of the
+VMS and every chunk is delivered one-way-delay later, in both directions.
+"""
+
+import collections
+import socket
+import threading
+import time
+
+
+class LatencyProxy:
+    def __init__(self, target_host, target_port, rtt_ms=0, bandwidth_mbit=0, listen_host='127.0.0.1'):
+        self.target = (target_host, target_port)
+        self.one_way_delay = rtt_ms / 2000.0
+        self.bytes_per_second = bandwidth_mbit * 1000 * 1000 / 8 if bandwidth_mbit else 0
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((listen_host, 0))
+        self._server.listen(16)
+        self.address = self._server.getsockname()
+        self._running = False
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._server.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                break
+            try:
+                upstream = socket.create_connection(self.target, timeout=10)
+                upstream.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+            for sock in (client, upstream):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._pipe(client, upstream)
+            self._pipe(upstream, client)
+
+    def _pipe(self, source, destination):
+        """Forward source -> destination, delaying every chunk by the one-way delay"""
+        pending = collections.deque()
+        condition = threading.Condition()
+        state = {'closed': False}
+
+        def reader():
+            while True:
+                try:
+                    data = source.recv(65536)
+                except OSError:
+                    data = b''
+                with condition:
+                    if not data:
+                        state['closed'] = True
+                    else:
+                        pending.append((time.time() + self.one_way_delay, data))
+                    condition.notify()
+                if not data:
+                    break
+
+        def writer():
+            while True:
+                with condition:
+                    while not pending and not state['closed']:
+                        condition.wait()
+                    if not pending:
+                        break
+                    deliver_at, data = pending.popleft()
+                delay = deliver_at - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    destination.sendall(data)
+                except OSError:
+                    break
+                if self.bytes_per_second:
+                    time.sleep(len(data) / self.bytes_per_second)
+            try:
+                destination.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+        threading.Thread(target=reader, daemon=True).start()
+        threading.Thread(target=writer, daemon=True).start()
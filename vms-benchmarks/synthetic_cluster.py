@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Synthetic VMS cluster for the SSH simulator
+
+Generates the command output a VMS host would produce for the commands the
+debug tools run: kubectl listings (namespaces, services, pods, ConfigMaps,
+PVs), kubectl top, redis-cli keys / hgetall / --scan against per-tenant Redis
+cluster IPs, and find / ls / tail on the VMS log directories.
+
+Everything is derived deterministically from indexes and a seed, so very
+large clusters (thousands of namespaces, millions of Redis keys, long log
+files) cost no memory up front: keys, hashes and log lines are generated on
+demand and command output is produced as a line iterator.
+
+Simple shell pipelines are supported for the filters the tools use
+(grep [-i] [-v], wc -l, sort, head -n, sed, jq ".data.config | fromjson").
+"""
+
+import base64
+import fnmatch
+import hashlib
+import json
+import random
+import re
+import shlex
+from datetime import datetime, timedelta
+
+SYSTEM_NAMESPACES = ['default', 'kube-system', 'kube-public', 'kube-node-lease']
+TENANT_SERVICES = ['redis', 'vms-api', 'vms-policy', 'vms-events', 'vms-ui', 'vms-auth']
+KEY_PREFIXES = ['EntryData', 'session', 'device', 'policy', 'user']
+LOG_APPS = ['vms-api', 'vms-auth', 'vms-tenant', 'vms-policy', 'vms-events']
+LOG_LEVELS = ['INFO'] * 12 + ['DEBUG'] * 4 + ['WARN'] * 2 + ['ERROR']
+LOG_ROOT = '/var/log/versa/vms/apps'
+ADMIN_LOG = '/var/log/versa/vms/vms-admin.log'
+BASE_TIME = datetime(2026, 1, 1, 0, 0, 0)
+
+
+class CommandResult:
+    __slots__ = ('lines', 'exit_status', 'error')
+
+    def __init__(self, lines, exit_status=0, error=''):
+        self.lines = lines
+        self.exit_status = exit_status
+        self.error = error
+
+
+def split_pipeline(command):
+    """Split a command line on top-level '|' (pipes inside quotes are kept)"""
+    parts = []
+    current = []
+    quote = None
+    for char in command:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '|':
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def _age(rng):
+    return f"{rng.randint(1, 400)}d"
+
+
+class SyntheticCluster:
+    def __init__(self, namespaces=50, redis_keys=10000, services_per_namespace=4,
+                 pods_per_namespace=6, configmaps_per_namespace=5, log_lines=100000, seed=1):
+        """
+        Args:
+            namespaces (int): Number of tenant namespaces
+            redis_keys (int): Total Redis keys, spread evenly across tenants
+            services_per_namespace (int): Services per tenant (always includes redis)
+            pods_per_namespace (int): Pods per tenant
+            configmaps_per_namespace (int): ConfigMaps per tenant
+            log_lines (int): Lines per log file
+            seed (int): Seed for all generated data
+        """
+        self.seed = seed
+        self.tenants = [f"tenant-{index:05d}" for index in range(1, namespaces + 1)]
+        self.keys_per_tenant = max(0, redis_keys // max(1, namespaces))
+        self.services_per_namespace = max(1, min(services_per_namespace, len(TENANT_SERVICES)))
+        self.pods_per_namespace = pods_per_namespace
+        self.configmaps_per_namespace = configmaps_per_namespace
+        self.log_lines = log_lines
+
+        # Redis cluster IPs: 10.96.x.y, one per tenant
+        self.redis_ips = {}
+        for index, tenant in enumerate(self.tenants):
+            self.redis_ips[f"10.{96 + index // 64000}.{(index // 250) % 256}.{index % 250 + 2}"] = tenant
+        self.tenant_redis_ip = {tenant: ip for ip, tenant in self.redis_ips.items()}
+
+        self.log_files = [f"{LOG_ROOT}/{app}/{app}.log" for app in LOG_APPS] + \
+                         [f"{LOG_ROOT}/{app}/{app}.log.1" for app in LOG_APPS[:2]]
+
+    def _rng(self, *parts):
+        digest = hashlib.md5(':'.join(str(part) for part in (self.seed,) + parts).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    # ---- kubectl -------------------------------------------------------------
+
+    def _service_rows(self):
+        for namespace in SYSTEM_NAMESPACES[:2]:
+            yield (namespace, 'kubernetes' if namespace == 'default' else 'kube-dns', 'ClusterIP',
+                   '10.96.0.1' if namespace == 'default' else '10.96.0.10', '<none>', '443/TCP', '400d')
+        for index, tenant in enumerate(self.tenants):
+            rng = self._rng('svc', tenant)
+            for service in TENANT_SERVICES[:self.services_per_namespace]:
+                if service == 'redis':
+                    yield (tenant, 'redis', 'ClusterIP', self.tenant_redis_ip[tenant], '<none>', '6379/TCP', _age(rng))
+                else:
+                    yield (tenant, service, 'ClusterIP', f"10.100.{index % 250}.{rng.randint(2, 250)}",
+                           '<none>', '8080/TCP', _age(rng))
+
+    def kubectl_get_svc(self, headers=True):
+        if headers:
+            yield f"{'NAMESPACE':<16}{'NAME':<16}{'TYPE':<12}{'CLUSTER-IP':<16}{'EXTERNAL-IP':<13}{'PORT(S)':<11}AGE"
+        for row in self._service_rows():
+            yield f"{row[0]:<16}{row[1]:<16}{row[2]:<12}{row[3]:<16}{row[4]:<13}{row[5]:<11}{row[6]}"
+
+    def kubectl_get_ns(self, headers=True):
+        if headers:
+            yield f"{'NAME':<20}{'STATUS':<10}AGE"
+        for namespace in SYSTEM_NAMESPACES + self.tenants:
+            yield f"{namespace:<20}{'Active':<10}400d"
+
+    def _pods(self):
+        for tenant in self.tenants:
+            for index in range(self.pods_per_namespace):
+                service = TENANT_SERVICES[index % self.services_per_namespace]
+                rng = self._rng('pod', tenant, index)
+                suffix = '0' if service == 'redis' else f"{rng.randint(0x10000, 0xfffff):x}-{rng.randint(0x1000, 0xffff):x}"
+                yield tenant, f"{service}-{suffix}", rng
+
+    def kubectl_get_pods(self, headers=True):
+        if headers:
+            yield f"{'NAMESPACE':<16}{'NAME':<32}{'READY':<8}{'STATUS':<10}{'RESTARTS':<10}AGE"
+        for tenant, pod, rng in self._pods():
+            yield f"{tenant:<16}{pod:<32}{'1/1':<8}{'Running':<10}{rng.randint(0, 3):<10}{_age(rng)}"
+
+    def kubectl_get_pods_json(self):
+        items = []
+        for tenant, pod, rng in self._pods():
+            items.append({
+                'metadata': {'namespace': tenant, 'name': pod},
+                'status': {'phase': 'Running',
+                           'containerStatuses': [{'name': pod.split('-')[0], 'restartCount': rng.randint(0, 3)}]}
+            })
+        return json.dumps({'apiVersion': 'v1', 'kind': 'List', 'items': items}, indent=4).split('\n')
+
+    def kubectl_top_pods(self, headers=True):
+        if headers:
+            yield f"{'NAMESPACE':<16}{'NAME':<32}{'CPU(cores)':<12}MEMORY(bytes)"
+        for tenant, pod, rng in self._pods():
+            yield f"{tenant:<16}{pod:<32}{str(rng.randint(1, 900)) + 'm':<12}{rng.randint(20, 2048)}Mi"
+
+    def _configmap_names(self, tenant):
+        return [f"{tenant}-config-{index}" for index in range(self.configmaps_per_namespace)]
+
+    def _configmap_config(self, tenant, name):
+        rng = self._rng('cm', tenant, name)
+        return {
+            'tenantName': tenant,
+            'logLevel': rng.choice(['INFO', 'DEBUG', 'WARN']),
+            'maxSessions': rng.randint(100, 10000),
+            'features': {'policy': rng.random() > 0.5, 'analytics': rng.random() > 0.5},
+            'endpoints': [f"https://{tenant}.svc.local:{8000 + i}" for i in range(3)]
+        }
+
+    def kubectl_get_cm(self, headers=True):
+        if headers:
+            yield f"{'NAMESPACE':<16}{'NAME':<28}{'DATA':<6}AGE"
+        for tenant in self.tenants:
+            for name in self._configmap_names(tenant):
+                rng = self._rng('cm', tenant, name)
+                yield f"{tenant:<16}{name:<28}{1:<6}{_age(rng)}"
+
+    def _configmap_object(self, tenant, name):
+        return {
+            'apiVersion': 'v1',
+            'kind': 'ConfigMap',
+            'metadata': {'name': name, 'namespace': tenant},
+            'data': {'config': json.dumps(self._configmap_config(tenant, name))}
+        }
+
+    def kubectl_get_cm_json(self):
+        items = [self._configmap_object(tenant, name)
+                 for tenant in self.tenants for name in self._configmap_names(tenant)]
+        return json.dumps({'apiVersion': 'v1', 'kind': 'List', 'items': items}, indent=4).split('\n')
+
+    def kubectl_describe_cm(self, tenant, name):
+        if tenant not in self.tenant_redis_ip or name not in self._configmap_names(tenant):
+            return None
+        config = json.dumps(self._configmap_config(tenant, name))
+        return [f"Name:         {name}", f"Namespace:    {tenant}", "Labels:       <none>",
+                "Annotations:  <none>", "", "Data", "====", "config:", "----", config, "",
+                "BinaryData", "====", "", "Events:  <none>"]
+
+    def kubectl_get_pv(self, headers=True, namespaced=False):
+        if headers:
+            yield ("NAMESPACE   " if namespaced else "") + "NAME                 CAPACITY   STATUS   AGE"
+        for tenant in self.tenants:
+            prefix = f"{tenant:<12}" if namespaced else ''
+            yield f"{prefix}{'redis-data-' + tenant:<21}1Gi        Bound    400d"
+
+    def kubectl(self, args):
+        options = set(args)
+        headers = '--no-headers' not in options
+        json_output = '-o' in args and args[args.index('-o') + 1:args.index('-o') + 2] == ['json']
+
+        if args[:1] == ['top'] and 'pods' in args:
+            return self.kubectl_top_pods(headers)
+        if args[:1] == ['describe'] and len(args) >= 3 and args[1] in ('configmap', 'cm', 'configmaps'):
+            tenant = args[args.index('-n') + 1] if '-n' in args else 'default'
+            lines = self.kubectl_describe_cm(tenant, args[2])
+            if lines is None:
+                return CommandResult(iter(()), 1, f'Error from server (NotFound): configmaps "{args[2]}" not found')
+            return lines
+        if args[:1] != ['get'] or len(args) < 2:
+            return CommandResult(iter(()), 1, f"error: unknown command \"{' '.join(args)}\"")
+
+        resource = args[1]
+        if resource in ('configmap', 'cm', 'configmaps') and len(args) > 2 and not args[2].startswith('-'):
+            tenant = args[args.index('-n') + 1] if '-n' in args else 'default'
+            if tenant not in self.tenant_redis_ip or args[2] not in self._configmap_names(tenant):
+                return CommandResult(iter(()), 1, f'Error from server (NotFound): configmaps "{args[2]}" not found')
+            return json.dumps(self._configmap_object(tenant, args[2]), indent=4).split('\n')
+        if resource in ('ns', 'namespaces', 'namespace'):
+            return self.kubectl_get_ns(headers)
+        if resource in ('svc', 'services', 'service'):
+            return self.kubectl_get_svc(headers)
+        if resource in ('pods', 'pod', 'po'):
+            return self.kubectl_get_pods_json() if json_output else self.kubectl_get_pods(headers)
+        if resource in ('cm', 'configmaps', 'configmap'):
+            return self.kubectl_get_cm_json() if json_output else self.kubectl_get_cm(headers)
+        if resource in ('pv', 'pvc'):
+            return self.kubectl_get_pv(headers, namespaced=resource == 'pvc')
+        return CommandResult(iter(()), 1, f'error: the server doesn\'t have a resource type "{resource}"')
+
+    # ---- redis-cli -----------------------------------------------------------
+
+    def redis_keys(self, tenant):
+        """All key names of a tenant, generated lazily"""
+        for index in range(self.keys_per_tenant):
+            yield f"{KEY_PREFIXES[index % len(KEY_PREFIXES)]}:{tenant}:{index:07d}"
+
+    def redis_hash(self, tenant, key):
+        """Field/value pairs of a generated key, or None if the key doesn't exist"""
+        parts = key.split(':')
+        if len(parts) != 3 or parts[1] != tenant or not parts[2].isdigit():
+            return None
+        index = int(parts[2])
+        if index >= self.keys_per_tenant or parts[0] != KEY_PREFIXES[index % len(KEY_PREFIXES)]:
+            return None
+
+        rng = self._rng('key', key)
+        updated = int((BASE_TIME + timedelta(seconds=rng.randint(0, 86400 * 200))).timestamp())
+        fields = [('id', parts[2]), ('tenant', tenant), ('status', rng.choice(['active', 'idle', 'blocked'])),
+                  ('updated', str(updated))]
+        if parts[0] == 'EntryData':
+            payload = {'band': rng.choice(['low-risk', 'medium-risk', 'high-risk']),
+                       'score': rng.randint(0, 100), 'device': f"dev-{rng.randint(1, 99999):05d}"}
+            entry = {'tenantName': tenant, 'version': rng.randint(1, 9),
+                     'data': base64.b64encode(json.dumps(payload).encode()).decode()}
+            fields.append(('EntryData', json.dumps(entry)))
+        return fields
+
+    def redis_cli(self, args, tty=False):
+        host = args[args.index('-h') + 1] if '-h' in args else '127.0.0.1'
+        tenant = self.redis_ips.get(host)
+        if tenant is None:
+            return CommandResult(iter(()), 1, f"Could not connect to Redis at {host}:6379: Connection refused")
+
+        if '--scan' in args:
+            pattern = args[args.index('--pattern') + 1] if '--pattern' in args else '*'
+            return (key for key in self.redis_keys(tenant) if fnmatch.fnmatchcase(key, pattern))
+
+        remaining = [arg for i, arg in enumerate(args)
+                     if arg not in ('-h', '-p') and (i == 0 or args[i - 1] not in ('-h', '-p'))]
+        if not remaining:
+            return CommandResult(iter(()), 1, 'interactive mode is not supported by the simulator')
+
+        command = remaining[0].lower()
+        if command == 'ping':
+            return iter(['PONG'])
+        if command == 'keys':
+            pattern = remaining[1] if len(remaining) > 1 else '*'
+            matches = (key for key in self.redis_keys(tenant) if fnmatch.fnmatchcase(key, pattern))
+            if not tty:
+                return matches
+            return (f'{number}) "{key}"' for number, key in enumerate(matches, 1))
+        if command == 'dbsize':
+            return iter([f"(integer) {self.keys_per_tenant}"])
+        if command == 'hgetall':
+            fields = self.redis_hash(tenant, remaining[1] if len(remaining) > 1 else '')
+            if not fields:
+                return iter(['(empty array)'] if tty else ())
+            if not tty:
+                return [item for pair in fields for item in pair]
+            lines = []
+            for field, value in fields:
+                lines.append(f'{len(lines) + 1}) "{field}"')
+                lines.append(f'{len(lines) + 1}) "{value.replace(chr(34), chr(92) + chr(34))}"')
+            return lines
+        return CommandResult(iter(()), 0, '') if command == 'info' else \
+            iter([f"(error) ERR unknown command '{remaining[0]}'"])
+
+    # ---- log files -----------------------------------------------------------
+
+    def log_line(self, path, index):
+        rng = self._rng('log', path, index)
+        timestamp = BASE_TIME + timedelta(seconds=index * 2, milliseconds=rng.randint(0, 999))
+        level = rng.choice(LOG_LEVELS)
+        tenant = self.tenants[rng.randrange(len(self.tenants))] if self.tenants else 'default'
+        message = rng.choice([
+            f"Request processed for tenant {tenant} in {rng.randint(1, 900)} ms",
+            f"Session {rng.randint(1000, 99999)} refreshed for device dev-{rng.randint(1, 99999):05d}",
+            f"Policy sync completed for tenant {tenant}: {rng.randint(0, 50)} rules updated",
+            f"Connection to redis {self.tenant_redis_ip.get(tenant, '10.96.0.2')}:6379 timed out after {rng.randint(1, 30)}s",
+            f"Failed to process event {rng.randint(1, 10 ** 6)} for tenant {tenant}: invalid payload",
+        ])
+        return (f"{timestamp:%Y-%m-%d %H:%M:%S},{timestamp.microsecond // 1000:03d} [{level:<5}] "
+                f"[worker-{rng.randint(1, 16)}] com.versa.vms.{path.split('/')[-2].replace('-', '.')} - {message}")
+
+    def tail(self, path, count):
+        if path != ADMIN_LOG and path not in self.log_files:
+            return CommandResult(iter(()), 1, f"tail: cannot open '{path}' for reading: No such file or directory")
+        start = max(0, self.log_lines - count)
+        return (self.log_line(path, index) for index in range(start, self.log_lines))
+
+    # ---- dispatch ------------------------------------------------------------
+
+    def _run_base(self, args, tty):
+        program = args[0]
+        if program == 'kubectl':
+            return self.kubectl(args[1:])
+        if program == 'redis-cli':
+            return self.redis_cli(args[1:], tty)
+        if program == 'tail':
+            count = int(args[args.index('-n') + 1]) if '-n' in args else 10
+            return self.tail(args[-1], count)
+        if program == 'find':
+            root = args[1] if len(args) > 1 else '.'
+            return (path for path in self.log_files if path.startswith(root.rstrip('/') + '/'))
+        if program == 'ls':
+            path = args[-1]
+            if path == ADMIN_LOG or path in self.log_files:
+                return iter([f"-rw-r--r-- 1 root root {self.log_lines * 140} Jan  1 00:00 {path}"])
+            return CommandResult(iter(()), 2, f"ls: cannot access '{path}': No such file or directory")
+        if program == 'echo':
+            return iter([' '.join(args[1:])])
+        if program in ('alias', 'true', 'cd', 'export', 'clear'):
+            return iter(())
+        if program == 'printf':
+            return iter([''.join(args[2:])]) if len(args) > 2 else iter([args[1] if len(args) > 1 else ''])
+        return CommandResult(iter(()), 127, f"bash: {program}: command not found")
+
+    def _apply_filter(self, lines, args):
+        program = args[0]
+        if program == 'grep':
+            flags = {arg for arg in args[1:] if arg.startswith('-')}
+            pattern = next((arg for arg in args[1:] if not arg.startswith('-')), '')
+            regex = re.compile(pattern, re.IGNORECASE if '-i' in flags else 0)
+            invert = '-v' in flags
+            return (line for line in lines if bool(regex.search(line)) != invert)
+        if program == 'wc':
+            return iter([str(sum(1 for _ in lines))])
+        if program == 'sort':
+            return iter(sorted(lines))
+        if program == 'head':
+            count = int(args[args.index('-n') + 1]) if '-n' in args else 10
+            return (line for number, line in enumerate(lines) if number < count)
+        if program == 'jq':
+            document = json.loads('\n'.join(lines))
+            if 'fromjson' in ' '.join(args):
+                return json.dumps(json.loads(document['data']['config']), indent=2).split('\n')
+            return json.dumps(document, indent=2).split('\n')
+        # sed and anything else: pass the input through unchanged
+        return lines
+
+    def _run_hgetall_loop(self, command, tty):
+        """The batched 'for k in ...; do printf marker; redis-cli hgetall "$k"; done' form"""
+        match = re.match(r"^for k in (.*); do printf '%s%s %s\\n' '@@KEY' '@@' \"\$k\"; "
+                         r"redis-cli -h (\S+) -p \d+ hgetall \"\$k\"; done; printf '%s%s\\n' '@@END' '@@'$", command)
+        if not match:
+            return None
+        keys = shlex.split(match.group(1))
+        host = match.group(2)
+
+        def lines():
+            for key in keys:
+                yield f"@@KEY@@ {key}"
+                result = self.redis_cli(['-h', host, 'hgetall', key], tty)
+                yield from (result.lines if isinstance(result, CommandResult) else result)
+            yield "@@END@@"
+        return lines()
+
+    def execute(self, command, tty=False):
+        """
+        Run a command line against the synthetic cluster
+
+        Args:
+            command (str): Shell command line
+            tty (bool): Format output as on a terminal (redis-cli numbers its replies)
+
+        Returns:
+            CommandResult: lines (iterator of output lines), exit_status, error
+        """
+        command = command.strip()
+        if not command:
+            return CommandResult(iter(()))
+
+        loop = self._run_hgetall_loop(command, tty)
+        if loop is not None:
+            return CommandResult(loop)
+
+        # Commands joined with ';' or '&&' run in order
+        if ';' in command and not command.startswith('for '):
+            segments = [segment for segment in re.split(r';|&&', command) if segment.strip()]
+            if len(segments) > 1:
+                results = [self.execute(segment, tty) for segment in segments]
+                return CommandResult((line for result in results for line in result.lines),
+                                     results[-1].exit_status, '\n'.join(r.error for r in results if r.error))
+
+        stages = split_pipeline(command)
+        try:
+            first = shlex.split(stages[0])
+            # Redirections like 2>/dev/null are ignored
+            first = [arg for arg in first if not re.match(r'^\d?>', arg)]
+            output = self._run_base(first, tty)
+            if isinstance(output, CommandResult):
+                if output.exit_status != 0 or len(stages) == 1:
+                    return output
+                output = output.lines
+            for stage in stages[1:]:
+                output = self._apply_filter(output, shlex.split(stage))
+            return CommandResult(iter(output))
+        except (ValueError, IndexError, KeyError) as e:
+            return CommandResult(iter(()), 1, f"simulator: cannot run '{command}': {e}")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Synthetic VMS SSH server for repeatable load and latency benchmarks
+
+A paramiko server that behaves like a VMS host as far as the debug tools can
+tell: password login, an interactive shell with a bash-like prompt, "sudo su"
+with a "[sudo] password for <user>:" prompt, and exec channels (including
+"sudo -S -p '' sh -c ..." and ssh_transport's sudo wrapper, with the password
+read from stdin). Commands are
+answered by a SyntheticCluster, so cluster size is a constructor argument
+instead of a property of whichever lab VMS happens to be free.
+
+Every command can be delayed by a fixed latency to emulate a slow kubectl /
+Redis; network latency is added separately with latency_proxy.LatencyProxy.
+
+Run standalone:
+    python3 vms_simulator.py --port 2222 --namespaces 2000 --redis-keys 1000000 --latency-ms 50
+    ssh -p 2222 admin@127.0.0.1        (password: admin)
+"""
+
+import argparse
+import shlex
+import socket
+import threading
+import time
+
+import paramiko
+
+from synthetic_cluster import SyntheticCluster
+
+SEND_CHUNK_SIZE = 32768
+SUDO_PREFIX = "sudo -S -p '' sh -c "
+# ssh_transport.SUDO_WRAPPER; the command is its last argument
+SUDO_WRAPPER_PREFIX = "sh -c 'if sudo -n true 2>/dev/null; "
+
+_host_key = None
+_host_key_lock = threading.Lock()
+
+
+def get_host_key():
+    """RSA host key, generated once per process"""
+    global _host_key
+    with _host_key_lock:
+        if _host_key is None:
+            _host_key = paramiko.RSAKey.generate(2048)
+        return _host_key
+
+
+class _SimulatorServer(paramiko.ServerInterface):
+    """Per-connection paramiko server interface"""
+
+    def __init__(self, simulator):
+        self.simulator = simulator
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_auth_password(self, username, password):
+        if username == self.simulator.username and password == self.simulator.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_window_change_request(self, channel, width, height, pixelwidth, pixelheight):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        threading.Thread(target=self.simulator._serve_shell, args=(channel,), daemon=True).start()
+        return True
+
+    def check_channel_exec_request(self, channel, command):
+        command = command.decode('utf-8', errors='ignore') if isinstance(command, bytes) else command
+        threading.Thread(target=self.simulator._serve_exec, args=(channel, command), daemon=True).start()
+        return True
+
+
+class VMSSimulator:
+    def __init__(self, cluster=None, host='127.0.0.1', port=0, username='admin', password='admin',
+                 sudo_password=None, command_latency_ms=0, hostname='vms-sim'):
+        """
+        Args:
+            cluster (SyntheticCluster): Cluster answering the commands (default: a small one)
+            host (str): Listen address
+            port (int): Listen port (0 = pick a free port)
+            username (str): Login user
+            password (str): Login password
+            sudo_password (str): Password expected by sudo (default: the login password)
+            command_latency_ms (float): Delay before every command's output
+            hostname (str): Host name shown in the prompt
+        """
+        self.cluster = cluster or SyntheticCluster()
+        self.username = username
+        self.password = password
+        self.sudo_password = sudo_password if sudo_password is not None else password
+        self.command_latency = command_latency_ms / 1000.0
+        self.hostname = hostname
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(64)
+        self.host, self.port = self._server.getsockname()[:2]
+
+        self._running = False
+        self._transports = []
+        self._lock = threading.Lock()
+        self.commands_served = 0
+
+    def start(self):
+        get_host_key()
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._server.close()
+        except OSError:
+            pass
+        with self._lock:
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                break
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(client)
+            transport.add_server_key(get_host_key())
+            try:
+                transport.start_server(server=_SimulatorServer(self))
+            except (paramiko.SSHException, EOFError, OSError):
+                transport.close()
+                continue
+            with self._lock:
+                self._transports = [t for t in self._transports if t.is_active()] + [transport]
+            threading.Thread(target=self._drain_accept_queue, args=(transport,), daemon=True).start()
+
+    def _drain_accept_queue(self, transport):
+        """Channels are served from the shell/exec callbacks; just keep paramiko's queue empty"""
+        while self._running and transport.is_active():
+            transport.accept(1)
+
+    def _run(self, command, tty):
+        self.commands_served += 1
+        if self.command_latency:
+            time.sleep(self.command_latency)
+        return self.cluster.execute(command, tty=tty)
+
+    @staticmethod
+    def _send_lines(channel, lines, newline):
+        """Send output lines in chunks so large outputs stream instead of building one string"""
+        buffer = []
+        size = 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line) + len(newline)
+            if size >= SEND_CHUNK_SIZE:
+                channel.sendall((newline.join(buffer) + newline).encode('utf-8'))
+                buffer, size = [], 0
+        if buffer:
+            channel.sendall((newline.join(buffer) + newline).encode('utf-8'))
+
+    def _serve_exec(self, channel, command):
+        try:
+            if command.startswith(SUDO_PREFIX) or command.startswith(SUDO_WRAPPER_PREFIX):
+                password = b''
+                while not password.endswith(b'\n'):
+                    data = channel.recv(1024)
+                    if not data:
+                        break
+                    password += data
+                if password.decode('utf-8', errors='ignore').strip() != self.sudo_password:
+                    channel.sendall_stderr(b"sudo: 1 incorrect password attempt\n")
+                    channel.send_exit_status(1)
+                    return
+                command = shlex.split(command)[-1]
+
+            result = self._run(command, tty=False)
+            self._send_lines(channel, result.lines, '\n')
+            if result.error:
+                channel.sendall_stderr((result.error + '\n').encode('utf-8'))
+            channel.send_exit_status(result.exit_status)
+        except (OSError, EOFError, paramiko.SSHException):
+            pass
+        finally:
+            channel.close()
+
+    def _prompt(self, root):
+        if root:
+            return f"[root@{self.hostname} {self.username}]# "
+        return f"[{self.username}@{self.hostname} ~]$ "
+
+    def _serve_shell(self, channel):
+        root = False
+        awaiting_password = False
+        buffer = ''
+        try:
+            channel.sendall(f"Last login: Thu Jan  1 00:00:00 2026 from 10.0.0.1\r\n{self._prompt(root)}".encode())
+            while True:
+                data = channel.recv(4096)
+                if not data:
+                    break
+                for char in data.decode('utf-8', errors='ignore'):
+                    if char not in '\r\n':
+                        buffer += char
+                        if not awaiting_password:
+                            channel.sendall(char.encode('utf-8'))
+                        continue
+                    line, buffer = buffer.strip(), ''
+                    channel.sendall(b"\r\n")
+
+                    if awaiting_password:
+                        awaiting_password = False
+                        if line == self.sudo_password:
+                            root = True
+                        else:
+                            channel.sendall(b"Sorry, try again.\r\n")
+                    elif line in ('sudo su', 'sudo su -', 'sudo -i') and not root:
+                        channel.sendall(f"[sudo] password for {self.username}: ".encode())
+                        awaiting_password = True
+                        continue
+                    elif line == 'exit':
+                        if not root:
+                            return
+                        root = False
+                    elif line:
+                        result = self._run(line, tty=True)
+                        self._send_lines(channel, result.lines, '\r\n')
+                        if result.error:
+                            channel.sendall((result.error + '\r\n').encode('utf-8'))
+                    channel.sendall(self._prompt(root).encode())
+        except (OSError, EOFError, paramiko.SSHException):
+            pass
+        finally:
+            channel.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2222)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--namespaces', type=int, default=50)
+    parser.add_argument('--redis-keys', type=int, default=10000, help='Total Redis keys across all tenants')
+    parser.add_argument('--log-lines', type=int, default=100000, help='Lines per log file')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay before every command output')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    cluster = SyntheticCluster(namespaces=args.namespaces, redis_keys=args.redis_keys,
+                               log_lines=args.log_lines, seed=args.seed)
+    simulator = VMSSimulator(cluster, host=args.host, port=args.port, username=args.username,
+                             password=args.password, command_latency_ms=args.latency_ms).start()
+    print(f"VMS simulator listening on {simulator.host}:{simulator.port} "
+          f"({args.namespaces} namespaces, {args.redis_keys} Redis keys, {args.latency_ms} ms/command)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
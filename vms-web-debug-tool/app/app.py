@@ -8,15 +8,19 @@ from flask import Flask, render_template, request, jsonify, session
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 import os
+import atexit
 import logging
 from datetime import datetime
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import our custom services
 from services.ssh_service import SSHService
 from services.tenant_service import TenantService
 from services.redis_service import RedisService
-from services.database_service import DatabaseService
+from services.cache_service import CacheService
+from services.database_service import DatabaseService, parse_utc_timestamp
 from services.vms_service import VMSService
 
 # Create logs directory
@@ -43,6 +47,8 @@ def create_app():
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'vms-debug-tool-secret-key-2025')
     app.config['MONGODB_URL'] = os.getenv('MONGODB_URL', 'mongodb://localhost:27017/vms_debug')
     app.config['REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379')
+    app.config['MONGODB_BULK_BATCH_SIZE'] = int(os.getenv('MONGODB_BULK_BATCH_SIZE', '1000'))
+    app.config['LOG_RETENTION_DAYS'] = float(os.getenv('LOG_RETENTION_DAYS', '30'))
     
     # Enable CORS
     CORS(app)
@@ -51,14 +57,19 @@ def create_app():
     socketio = SocketIO(app, cors_allowed_origins="*")
     
     # Initialize services
-    db_service = DatabaseService(app.config['MONGODB_URL'])
+    db_service = DatabaseService(app.config['MONGODB_URL'], bulk_batch_size=app.config['MONGODB_BULK_BATCH_SIZE'])
+    db_service.ensure_retention_indexes(app.config['LOG_RETENTION_DAYS'])
+    db_service.ensure_key_search_indexes()
+    cache_service = CacheService(app.config['REDIS_URL'])
     ssh_service = SSHService()
-    tenant_service = TenantService(db_service)
-    redis_service = RedisService(db_service)
+    atexit.register(ssh_service.stop_pool_manager)
+    tenant_service = TenantService(db_service, cache_service)
+    redis_service = RedisService(db_service, cache_service)
     vms_service = VMSService(db_service, ssh_service)
     
     # Store services in app context
     app.db_service = db_service
+    app.cache_service = cache_service
     app.ssh_service = ssh_service
     app.tenant_service = tenant_service
     app.redis_service = redis_service
@@ -73,6 +84,10 @@ app, socketio = create_app()
 # Global storage for collected tenant data (fallback when database unavailable)
 collected_tenant_data = []
 
+# Tenant scan: Redis key collection runs on this many exec channels at once,
+# leaving channel slots of the connection free for other requests
+REDIS_KEY_COLLECTION_PARALLELISM = 6
+
 # Routes
 @app.route('/')
 def index():
@@ -128,8 +143,9 @@ def health():
         "services": {
             "database": app.db_service.test_connection(),
             "ssh": "ready",
-            "redis_cache": "ready"
-        }
+            "redis_cache": app.cache_service.status()
+        },
+        "cache": app.cache_service.stats
     })
 
 # SSH Connection Routes
@@ -209,6 +225,15 @@ def ssh_status():
         logger.error(f"SSH status error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/ssh/pool')
+def ssh_pool():
+    """Get the state of every pooled SSH connection"""
+    try:
+        return jsonify({"connections": app.ssh_service.pool_stats()})
+    except Exception as e:
+        logger.error(f"SSH pool status error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/ssh/auto-connect', methods=['POST'])
 def ssh_auto_connect():
     """Automatically connect to VMS server with default credentials"""
@@ -440,27 +465,46 @@ def vms_status_check_background(connection_id):
 
 @app.route('/api/logs/system')
 def get_system_logs():
-    """Get system logs"""
+    """
+    Get system logs (keyset pages: pass next_cursor / prev_cursor of a page as 'cursor')
+    
+    Optional filters: command, search (text in command or output), since / until (ISO timestamps)
+    """
     try:
-        page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 50))
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
         log_type = request.args.get('type')
-        
-        logs = app.db_service.get_system_logs(page=page, limit=limit, log_type=log_type)
+        cursor = request.args.get('cursor') or None
+        
+        logs = app.db_service.get_system_logs(
+            limit=limit, log_type=log_type, cursor=cursor,
+            command=request.args.get('command') or None,
+            search=request.args.get('search') or None,
+            since=parse_utc_timestamp(request.args.get('since')),
+            until=parse_utc_timestamp(request.args.get('until'))
+        )
         return jsonify({"logs": logs})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Get system logs error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/logs/system/commands')
+def get_system_log_commands():
+    """Distinct commands of the system logs (for the command filter)"""
+    return jsonify({"commands": app.db_service.get_system_log_commands()})
+
 @app.route('/api/logs/vms-status')
 def get_vms_status_logs():
-    """Get VMS status check logs"""
+    """Get VMS status check logs (keyset pages: pass next_cursor / prev_cursor of a page as 'cursor')"""
     try:
-        page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 20))
+        limit = min(max(int(request.args.get('limit', 20)), 1), 500)
+        cursor = request.args.get('cursor') or None
         
-        logs = app.db_service.get_vms_status_logs(page=page, limit=limit)
+        logs = app.db_service.get_vms_status_logs(limit=limit, cursor=cursor)
         return jsonify({"logs": logs})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Get VMS status logs error: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -600,6 +644,37 @@ def get_redis_key_value_by_name(key_name):
         logger.error(f"Get Redis key value error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/redis/search')
+def search_redis_keys():
+    """Search Redis key names (q, tenant, match=contains|prefix, limit, cursor = next_cursor of a page)"""
+    try:
+        limit = min(max(int(request.args.get('limit', 100)), 1), 500)
+        page = app.redis_service.search_keys(
+            request.args.get('tenant') or None,
+            request.args.get('q', ''),
+            match=request.args.get('match', 'contains'),
+            limit=limit,
+            cursor=request.args.get('cursor') or None
+        )
+        
+        keys = [{
+            "name": key['key_name'],
+            "tenant": key['tenant_name'],
+            "type": key.get('metadata', {}).get('type', 'string')
+        } for key in page['keys']]
+        
+        return jsonify({
+            "success": True,
+            "data": keys,
+            "next_cursor": page['next_cursor'],
+            "limit": page['limit']
+        })
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Search Redis keys error: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/tenant/export', methods=['POST'])
 def export_tenant_data():
     """Export all tenant data as JSON"""
@@ -782,6 +857,39 @@ def collect_redis_keys_for_tenant(connection_id, redis_ip, max_keys=20):
         logger.error(f"Error collecting Redis keys from {redis_ip}: {str(e)}")
         return []
 
+def collect_pod_counts_by_namespace(connection_id):
+    """Count pods per namespace with a single 'kubectl get pods -A' call"""
+    command = "kubectl get pods -A --no-headers -o custom-columns=NAMESPACE:.metadata.namespace"
+    output = app.ssh_service.execute_command(connection_id, command, timeout=60)
+    return Counter(line.strip() for line in clean_ansi_codes(output or '').split('\n')
+                   if line.strip() and ' ' not in line.strip())
+
+def collect_redis_keys_for_tenants(connection_id, redis_ips, progress=None):
+    """
+    Collect Redis keys of several tenants concurrently
+    
+    Args:
+        redis_ips (dict): namespace -> Redis cluster IP
+        progress (callable): progress(done, total, namespace, keys) after each tenant
+    
+    Returns:
+        dict: namespace -> list of keys
+    """
+    results = {}
+    if not redis_ips:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=REDIS_KEY_COLLECTION_PARALLELISM) as executor:
+        futures = {executor.submit(collect_redis_keys_for_tenant, connection_id, redis_ip): namespace
+                   for namespace, redis_ip in redis_ips.items()}
+        for future in as_completed(futures):
+            namespace = futures[future]
+            results[namespace] = future.result()
+            if progress:
+                progress(len(results), len(futures), namespace, results[namespace])
+    
+    return results
+
 def collect_tenant_data_background(connection_id, include_redis_keys=True):
     """Enhanced background task for collecting comprehensive tenant data"""
     try:
@@ -856,46 +964,47 @@ def collect_tenant_data_background(connection_id, include_redis_keys=True):
                 socketio.emit('progress_update', {'message': f'Found {len(tenant_services)} tenant namespaces. Collecting detailed data...', 'progress': 35})
                 
                 collected_tenants = []
-        
-                # Step 2: Process each tenant namespace (VMS-Debug-Tool style)
-                for i, (namespace, service_data) in enumerate(tenant_services.items()):
-                    progress = 35 + int((i / len(tenant_services)) * 45)  # 35-80%
-                    socketio.emit('progress_update', {'message': f'Processing tenant {i+1}/{len(tenant_services)}: {namespace}', 'progress': progress})
-                    logger.info(f"Processing tenant {i+1}/{len(tenant_services)}: {namespace}")
+                
+                # Step 2: Pod counts of every namespace from one pod listing
+                socketio.emit('progress_update', {'message': 'Executing: kubectl get pods -A...', 'progress': 38})
+                try:
+                    pod_counts = collect_pod_counts_by_namespace(connection_id)
+                    logger.info(f"Found {sum(pod_counts.values())} pods in {len(pod_counts)} namespaces")
+                except Exception as pod_error:
+                    logger.warning(f"Error getting pod counts: {str(pod_error)}")
+                    pod_counts = Counter()
+                
+                # Step 3: Redis keys of every tenant with a Redis service, collected concurrently
+                redis_keys_by_namespace = {}
+                if include_redis_keys:
+                    redis_ips = {namespace: service_data['redis_info']['cluster_ip']
+                                 for namespace, service_data in tenant_services.items()
+                                 if service_data.get('redis_info')}
+                    socketio.emit('progress_update', {'message': f'Collecting Redis keys for {len(redis_ips)} tenants...', 'progress': 40})
                     
-                    # Get pod count for this namespace
-                    try:
-                        logger.info(f"Getting pod count for namespace: {namespace}")
-                        socketio.emit('progress_update', {'message': f'Counting pods in {namespace}...', 'progress': progress + 1})
-                        
-                        pods_output = app.ssh_service.execute_command(connection_id, f"kubectl get pods -n {namespace} --no-headers")
-                        pods_count = len([line for line in clean_ansi_codes(pods_output).split('\n') if line.strip()]) if pods_output else 0
-                        logger.info(f"Found {pods_count} pods in namespace: {namespace}")
-                    except Exception as pod_error:
-                        logger.warning(f"Error getting pod count for {namespace}: {str(pod_error)}")
-                        pods_count = 0
+                    def redis_progress(done, total, namespace, keys):
+                        logger.info(f"Collected {len(keys)} Redis keys for {namespace} ({done}/{total})")
+                        socketio.emit('progress_update', {'message': f'Redis keys {done}/{total}: {namespace} ({len(keys)} keys)',
+                                                          'progress': 40 + int((done / total) * 40)})  # 40-80%
                     
-                    # Collect Redis keys if Redis service exists
-                    redis_keys_count = 0
-                    redis_keys = []
+                    redis_keys_by_namespace = collect_redis_keys_for_tenants(connection_id, redis_ips, redis_progress)
+                else:
+                    logger.info("Redis key collection disabled")
+                
+                # Step 4: Assemble tenant records (VMS-Debug-Tool style)
+                for i, (namespace, service_data) in enumerate(tenant_services.items()):
+                    pods_count = pod_counts.get(namespace, 0)
                     
-                    if service_data.get('redis_info') and include_redis_keys:
-                        redis_ip = service_data['redis_info']['cluster_ip']
-                        logger.info(f"Found Redis service for {namespace} at IP: {redis_ip}")
-                        socketio.emit('progress_update', {'message': f'Collecting Redis keys for {namespace} (IP: {redis_ip})...', 'progress': progress + 2})
-                        
-                        redis_keys = collect_redis_keys_for_tenant(connection_id, redis_ip)
+                    redis_keys_count = 0
+                    if namespace in redis_keys_by_namespace:
+                        redis_keys = redis_keys_by_namespace[namespace]
                         redis_keys_count = len(redis_keys)
-                        logger.info(f"Collected {redis_keys_count} Redis keys for {namespace}")
                         
                         # Update redis_info with keys
                         service_data['redis_info']['keys'] = redis_keys
                         service_data['redis_info']['key_count'] = redis_keys_count
-                    else:
-                        if not service_data.get('redis_info'):
-                            logger.info(f"No Redis service found for namespace: {namespace}")
-                        elif not include_redis_keys:
-                            logger.info(f"Redis key collection disabled for namespace: {namespace}")
+                    elif not service_data.get('redis_info'):
+                        logger.info(f"No Redis service found for namespace: {namespace}")
                     
                     # Create comprehensive tenant data structure (VMS-Debug-Tool format)
                     tenant_data = {
@@ -915,7 +1024,8 @@ def collect_tenant_data_background(connection_id, include_redis_keys=True):
                     collected_tenants.append(tenant_data)
                     
                     logger.info(f"Completed processing tenant {namespace}: {len(service_data.get('services', []))} services, {pods_count} pods, {redis_keys_count} Redis keys")
-                    socketio.emit('progress_update', {'message': f'✓ {namespace}: {len(service_data.get("services", []))} services, {pods_count} pods', 'progress': progress + 3})
+                
+                socketio.emit('progress_update', {'message': f'✓ {len(collected_tenants)} tenants: {sum(pod_counts.values())} pods', 'progress': 82})
                     
         except Exception as e:
             error_msg = f"Error during comprehensive tenant scanning: {str(e)}"
@@ -0,0 +1,228 @@
+"""
+Cache Service - Read-through cache of API reads in Redis
+
+Values are cached under a name with a TTL and any number of tags. A write
+invalidates a tag, which deletes every cached value carrying it (each tag is
+a Redis set of the cache keys stored under it) and bumps the tag's generation.
+A load records the generations of its tags before it starts and is only
+stored if none changed, so a load that overlapped a write never puts the
+pre-write data back.
+
+On a miss only one caller runs the loader: it takes a short-lived lock key
+(SET NX PX) while the others poll for the value it stores, so an expired hot
+entry costs one database query instead of one per concurrent request. A
+caller that waits longer than the lock timeout loads the value itself.
+
+When Redis is unreachable every read goes straight to the loader; the
+application keeps working without the cache.
+"""
+
+import json
+import logging
+import time
+import uuid
+from datetime import datetime
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'vms:cache:'
+TAG_PREFIX = 'vms:cache-tag:'
+GENERATION_PREFIX = 'vms:cache-gen:'
+LOCK_PREFIX = 'vms:cache-lock:'
+
+# Stampede protection: how long a loader may hold the lock, and how often waiters look for its value
+LOCK_TIMEOUT_MS = 5000
+LOCK_POLL_INTERVAL = 0.05
+
+# Seconds before a failed Redis connection is tried again
+RECONNECT_INTERVAL = 30
+
+# Stores a value and its tag memberships only if no tag generation changed since the load started.
+# KEYS: value key, tag sets..., generation keys...; ARGV: value, ttl, generations...
+_STORE_SCRIPT = """
+local tags = (#KEYS - 1) / 2
+for i = 1, tags do
+    if (redis.call('get', KEYS[1 + tags + i]) or '0') ~= ARGV[2 + i] then
+        return 0
+    end
+end
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 1, tags do
+    redis.call('sadd', KEYS[1 + i], KEYS[1])
+    -- A tag set outlives the entries it lists, never the other way round
+    if redis.call('expire', KEYS[1 + i], ARGV[2], 'GT') == 0 then
+        redis.call('expire', KEYS[1 + i], ARGV[2], 'NX')
+    end
+end
+return 1
+"""
+
+# Deletes the lock only if it still holds our token (it may have expired and been taken over)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _encode(value):
+    """JSON with datetimes tagged, so cached values come back with the types they were stored with"""
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {'$date': obj.isoformat()}
+        return str(obj)
+    return json.dumps(value, default=default, separators=(',', ':'))
+
+
+def _decode(payload):
+    def object_hook(obj):
+        if len(obj) == 1 and '$date' in obj:
+            return datetime.fromisoformat(obj['$date'])
+        return obj
+    return json.loads(payload, object_hook=object_hook)
+
+
+class CacheService:
+    def __init__(self, redis_url):
+        self.redis_url = redis_url
+        self.client = None
+        self.connected = False
+        self._last_connect_attempt = 0
+        self._release_lock = None
+        self._store_value = None
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0, 'lock_waits': 0, 'stale_loads': 0, 'errors': 0}
+        self._connect()
+
+    def _connect(self):
+        """Connect to Redis; failures leave the cache disabled until the next retry"""
+        self._last_connect_attempt = time.time()
+        try:
+            client = redis.Redis.from_url(self.redis_url, socket_timeout=1, socket_connect_timeout=1)
+            client.ping()
+            self.client = client
+            self._release_lock = client.register_script(_RELEASE_LOCK_SCRIPT)
+            self._store_value = client.register_script(_STORE_SCRIPT)
+            self.connected = True
+            logger.info("Redis cache connection established successfully")
+        except Exception as e:
+            self.connected = False
+            logger.warning(f"Redis cache unavailable, serving reads without cache: {str(e)}")
+        return self.connected
+
+    def _available(self):
+        if self.connected:
+            return True
+        if time.time() - self._last_connect_attempt >= RECONNECT_INTERVAL:
+            return self._connect()
+        return False
+
+    def _on_error(self, action, error):
+        self.stats['errors'] += 1
+        self.connected = False
+        logger.warning(f"Redis cache {action} failed, cache disabled for {RECONNECT_INTERVAL}s: {str(error)}")
+
+    def get_or_set(self, name, ttl, loader, tags=()):
+        """
+        Cached value of name, loading and storing it on a miss
+
+        Args:
+            name (str): cache entry name (e.g. 'tenant:detail:acme')
+            ttl (int): seconds the value is kept
+            loader (callable): loader() -> JSON-serializable value; exceptions propagate and nothing is cached
+            tags (iterable): tags that invalidate this entry (see invalidate_tags)
+        """
+        if not self._available():
+            return loader()
+
+        key = KEY_PREFIX + name
+        tags = list(tags)
+        try:
+            cached = self.client.get(key)
+            if cached is not None:
+                self.stats['hits'] += 1
+                return _decode(cached)
+            self.stats['misses'] += 1
+            generations = self._generations(tags)
+
+            token = uuid.uuid4().hex
+            lock_key = LOCK_PREFIX + name
+            if not self.client.set(lock_key, token, nx=True, px=LOCK_TIMEOUT_MS):
+                # Another request is loading this value: wait for it instead of querying too
+                self.stats['lock_waits'] += 1
+                deadline = time.time() + LOCK_TIMEOUT_MS / 1000.0
+                while time.time() < deadline:
+                    time.sleep(LOCK_POLL_INTERVAL)
+                    cached = self.client.get(key)
+                    if cached is not None:
+                        return _decode(cached)
+                    if not self.client.exists(lock_key):
+                        break  # the loader failed; load it ourselves
+        except redis.RedisError as e:
+            self._on_error('read', e)
+            return loader()
+
+        try:
+            value = loader()
+            self.stats['loads'] += 1
+            self._store(key, value, ttl, tags, generations)
+            return value
+        finally:
+            try:
+                self._release_lock(keys=[lock_key], args=[token])
+            except redis.RedisError:
+                pass  # the lock expires on its own
+
+    def _generations(self, tags):
+        """Current generation of each tag (b'0' for a tag never invalidated)"""
+        if not tags:
+            return []
+        return [generation or b'0' for generation in self.client.mget([GENERATION_PREFIX + tag for tag in tags])]
+
+    def _store(self, key, value, ttl, tags, generations):
+        try:
+            stored = self._store_value(
+                keys=[key] + [TAG_PREFIX + tag for tag in tags] + [GENERATION_PREFIX + tag for tag in tags],
+                args=[_encode(value), ttl] + generations
+            )
+            if not stored:
+                self.stats['stale_loads'] += 1
+                logger.debug(f"Cache entry {key} not stored: its tags were invalidated during the load")
+        except redis.RedisError as e:
+            self._on_error('write', e)
+
+    def invalidate_tags(self, *tags):
+        """Delete every cached entry stored with any of the tags"""
+        if not tags or not self._available():
+            return 0
+        try:
+            tag_keys = [TAG_PREFIX + tag for tag in tags]
+            # Bump the generations first: loads already running no longer get stored
+            pipe = self.client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(GENERATION_PREFIX + tag)
+            pipe.sunion(tag_keys)
+            keys = set(pipe.execute()[-1])
+            pipe = self.client.pipeline(transaction=False)
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            pipe.execute()
+            logger.debug(f"Cache invalidated {len(keys)} entries for tags {', '.join(tags)}")
+            return len(keys)
+        except redis.RedisError as e:
+            self._on_error('invalidation', e)
+            return 0
+
+    def status(self):
+        """'ready' when Redis answers a ping, otherwise 'unavailable'"""
+        if not self._available():
+            return 'unavailable'
+        try:
+            self.client.ping()
+            return 'ready'
+        except redis.RedisError as e:
+            self._on_error('ping', e)
+            return 'unavailable'
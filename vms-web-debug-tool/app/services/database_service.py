@@ -2,15 +2,149 @@
 Database Service - Handles MongoDB operations
 """
 
-from pymongo import MongoClient, DESCENDING
-from datetime import datetime
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+import base64
+import binascii
+import json
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Operations sent per bulk_write() call
+BULK_WRITE_BATCH_SIZE = 1000
+
+# Write errors kept in a bulk summary (the counts cover all of them)
+BULK_ERROR_SAMPLE = 10
+
+# Filtered log counts are cached this long (unfiltered totals use collection metadata)
+COUNT_CACHE_SECONDS = 60
+
+# Tenant statistics are cached this long; any tenant write invalidates them
+TENANT_STATS_CACHE_SECONDS = 30
+
+# Tenant documents come from the tenant scan (service_count, redis_key_count, has_redis)
+# and from the data collection task (services_count, pods_count, redis_keys_count, status)
+_TENANT_STATS_PIPELINE = [
+    {'$group': {
+        '_id': None,
+        'total': {'$sum': 1},
+        'active': {'$sum': {'$cond': [{'$eq': ['$status', 'active']}, 1, 0]}},
+        'inactive': {'$sum': {'$cond': [{'$eq': ['$status', 'inactive']}, 1, 0]}},
+        'tenants_with_redis': {'$sum': {'$cond': [
+            {'$or': [{'$eq': ['$has_redis', True]}, {'$gt': ['$redis_info.cluster_ip', None]}]}, 1, 0
+        ]}},
+        'total_services': {'$sum': {'$ifNull': ['$service_count', {'$ifNull': ['$services_count', 0]}]}},
+        'total_pods': {'$sum': {'$ifNull': ['$pods_count', 0]}},
+        'total_redis_keys': {'$sum': {'$ifNull': ['$redis_key_count', {'$ifNull': ['$redis_keys_count', 0]}]}},
+        'latest_scan': {'$max': {'$ifNull': ['$scan_metadata.scan_time', '$created_at']}}
+    }},
+    {'$project': {'_id': 0}}
+]
+
+# Log retention: MongoDB's TTL monitor removes documents older than this in the background
+LOG_RETENTION_DAYS = 30
+
+# (collection, date field) of the log collections; each gets a descending TTL index on the field
+LOG_RETENTION_INDEXES = [
+    ('system_logs', 'timestamp'),
+    ('ssh_connections', 'created_at'),
+    ('vms_status_logs', 'run_time')
+]
+
+# create_index() error codes when an index on the same keys exists with other options
+_INDEX_CONFLICT_CODES = (85, 86)  # IndexOptionsConflict, IndexKeySpecsConflict
+
+# Redis key search: substring terms shorter than this can't use the trigram index
+KEY_TRIGRAM_LENGTH = 3
+
+# Redis key search page size bounds
+KEY_SEARCH_MAX_LIMIT = 500
+
+# Indexes of redis_keys used by search_redis_keys: page order / prefix ranges, and trigram lookups
+KEY_SEARCH_INDEXES = [
+    [('tenant_name', ASCENDING), ('key_name_lower', ASCENDING), ('key_name', ASCENDING)],
+    [('tenant_name', ASCENDING), ('key_trigrams', ASCENDING)],
+    [('key_trigrams', ASCENDING)]
+]
+
+
+def key_trigrams(key_name):
+    """Distinct lowercase 3-character substrings of a key name, stored for indexed substring search"""
+    name = key_name.lower()
+    return sorted({name[i:i + KEY_TRIGRAM_LENGTH] for i in range(len(name) - KEY_TRIGRAM_LENGTH + 1)})
+
+
+def _key_search_fields(key_name):
+    """Derived fields of a redis_keys document used by search_redis_keys"""
+    return {'key_name_lower': key_name.lower(), 'key_trigrams': key_trigrams(key_name)}
+
+
+def encode_page_cursor(direction, value, doc_id):
+    """Opaque page token for the position (sort value, _id), read in a direction ('next' / 'prev')"""
+    if isinstance(value, datetime):
+        value = {'$date': value.isoformat()}
+    payload = json.dumps([direction, value, str(doc_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(cursor):
+    """Page token -> (direction, sort value, ObjectId); raises ValueError for a malformed token"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if isinstance(value, dict) and list(value) == ['$date']:
+            value = datetime.fromisoformat(value['$date'])
+        # The sort value goes into a $lt/$gt filter: anything but a datetime (or a missing
+        # field's None) could turn into an operator expression
+        if value is not None and not isinstance(value, datetime):
+            raise ValueError(value)
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return direction, value, ObjectId(doc_id)
+    except (ValueError, TypeError, binascii.Error, InvalidId) as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
+
+
+def parse_utc_timestamp(value):
+    """ISO timestamp from a client ('...Z' or with an offset) -> naive UTC datetime as stored; None stays None"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def encode_key_cursor(tenant_name, key_name_lower, key_name):
+    """Opaque page token for a position in the (tenant_name, key_name_lower, key_name) key order"""
+    payload = json.dumps([tenant_name, key_name_lower, key_name], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_key_cursor(cursor):
+    """Key page token -> (tenant_name, key_name_lower, key_name); raises ValueError for a malformed token"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not (isinstance(position, list) and len(position) == 3 and all(isinstance(v, str) for v in position)):
+            raise ValueError(position)
+        return tuple(position)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError(f"Invalid page cursor: {cursor}") from e
+
 class DatabaseService:
-    def __init__(self, mongodb_url):
+    def __init__(self, mongodb_url, bulk_batch_size=BULK_WRITE_BATCH_SIZE):
         self.mongodb_url = mongodb_url
+        self.bulk_batch_size = bulk_batch_size
+        self._count_cache = {}
+        self._tenant_stats_cache = None  # (computed at, stats)
         self.client = None
         self.db = None
         self.connected = False
@@ -60,24 +194,48 @@ class DatabaseService:
                 tenant_data,
                 upsert=True
             )
+            self._tenant_stats_cache = None
             
             return result.acknowledged
         except Exception as e:
             logger.error(f"Save tenant error: {str(e)}")
             return False
     
-    def get_tenant_by_name(self, name):
-        """Get tenant by name"""
+    def save_tenants_bulk(self, tenants, batch_size=None):
+        """
+        Upsert many tenant documents (matched by name) with unordered bulk writes
+        
+        Returns:
+            dict: bulk summary (see _bulk_write)
+        """
+        now = datetime.utcnow()
+        
+        def operations():
+            for tenant_data in tenants:
+                tenant_data['updated_at'] = now
+                yield ReplaceOne({'name': tenant_data['name']}, tenant_data, upsert=True)
+        
+        try:
+            return self._bulk_write(self.tenants, operations(), batch_size, 'tenants')
+        finally:
+            self._tenant_stats_cache = None
+    
+    def get_tenant_by_name(self, name, raise_errors=False):
+        """Get tenant by name (raise_errors: raise instead of returning None on a database error)"""
         try:
             return self.tenants.find_one({'name': name})
         except Exception as e:
             logger.error(f"Get tenant error: {str(e)}")
+            if raise_errors:
+                raise
             return None
     
-    def get_all_tenants(self):
-        """Get all tenants"""
+    def get_all_tenants(self, raise_errors=False):
+        """Get all tenants (raise_errors: raise instead of returning [] on a database error)"""
         if not self.connected:
             logger.debug("Database not connected, returning empty tenant list")
+            if raise_errors:
+                raise Exception("Database not connected")
             return []
             
         try:
@@ -85,12 +243,39 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"Get all tenants error: {str(e)}")
             self.connected = False
+            if raise_errors:
+                raise
             return []
     
+    def get_tenant_stats(self):
+        """
+        Tenant totals computed by one aggregation on the server
+        
+        The result is cached for TENANT_STATS_CACHE_SECONDS and dropped by every
+        tenant write through this service.
+        
+        Returns:
+            dict: total, active, inactive, tenants_with_redis, total_services, total_pods,
+                  total_redis_keys, latest_scan
+        """
+        cached = self._tenant_stats_cache
+        if cached and time.time() - cached[0] < TENANT_STATS_CACHE_SECONDS:
+            return dict(cached[1])
+        
+        computed_at = time.time()
+        results = list(self.tenants.aggregate(_TENANT_STATS_PIPELINE))
+        stats = results[0] if results else {
+            'total': 0, 'active': 0, 'inactive': 0, 'tenants_with_redis': 0,
+            'total_services': 0, 'total_pods': 0, 'total_redis_keys': 0, 'latest_scan': None
+        }
+        self._tenant_stats_cache = (computed_at, stats)
+        return dict(stats)
+    
     def delete_tenant(self, name):
         """Delete tenant"""
         try:
             result = self.tenants.delete_one({'name': name})
+            self._tenant_stats_cache = None
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Delete tenant error: {str(e)}")
@@ -108,6 +293,7 @@ class DatabaseService:
                 'created_at': datetime.utcnow(),
                 'updated_at': datetime.utcnow()
             }
+            doc.update(_key_search_fields(key_name))
             
             result = self.redis_keys.replace_one(
                 {'tenant_name': tenant_name, 'key_name': key_name},
@@ -120,16 +306,166 @@ class DatabaseService:
             logger.error(f"Save Redis key error: {str(e)}")
             return False
     
-    def get_tenant_redis_keys(self, tenant_name):
-        """Get Redis keys for tenant"""
+    def save_redis_keys_bulk(self, tenant_keys, metadata=None, batch_size=None):
+        """
+        Upsert discovered Redis keys with unordered bulk writes
+        
+        Existing keys only get their metadata, search fields and updated_at
+        refreshed, so a value already fetched for a key is kept; new keys are
+        inserted without a value.
+        
+        Args:
+            tenant_keys: iterable of (tenant_name, key_name) pairs
+            metadata (dict): metadata stored on every key
+        
+        Returns:
+            dict: bulk summary (see _bulk_write)
+        """
+        now = datetime.utcnow()
+        
+        def operations():
+            for tenant_name, key_name in tenant_keys:
+                yield UpdateOne(
+                    {'tenant_name': tenant_name, 'key_name': key_name},
+                    {
+                        '$set': {'metadata': metadata or {}, 'updated_at': now, **_key_search_fields(key_name)},
+                        '$setOnInsert': {'key_value': None, 'created_at': now}
+                    },
+                    upsert=True
+                )
+        
+        return self._bulk_write(self.redis_keys, operations(), batch_size, 'redis_keys')
+    
+    def _bulk_write(self, collection, operations, batch_size, label):
+        """
+        Send operations in batches through bulk_write(ordered=False)
+        
+        Unordered batches let the server apply independent writes in parallel and
+        continue past individual failures (e.g. a duplicate key), which are counted
+        rather than aborting the batch.
+        
+        Returns:
+            dict: operations, inserted, updated, unchanged, failed, batches, errors (sample)
+        """
+        summary = {'operations': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+                   'failed': 0, 'batches': 0, 'errors': []}
+        if not self.connected:
+            logger.debug(f"Database not connected, skipping bulk write to {label}")
+            return summary
+        
+        batch_size = max(1, batch_size or self.bulk_batch_size)
+        operations = iter(operations)
+        while True:
+            batch = list(islice(operations, batch_size))
+            if not batch:
+                break
+            summary['operations'] += len(batch)
+            summary['batches'] += 1
+            
+            try:
+                result = collection.bulk_write(batch, ordered=False).bulk_api_result
+            except BulkWriteError as e:
+                result = e.details
+                write_errors = result.get('writeErrors', [])
+                summary['failed'] += len(write_errors)
+                for error in write_errors[:BULK_ERROR_SAMPLE - len(summary['errors'])]:
+                    summary['errors'].append(error.get('errmsg', str(error)))
+            except Exception as e:
+                logger.error(f"Bulk write to {label} failed: {str(e)}")
+                summary['failed'] += len(batch)
+                if len(summary['errors']) < BULK_ERROR_SAMPLE:
+                    summary['errors'].append(str(e))
+                continue
+            
+            upserted = result.get('nUpserted', 0) + result.get('nInserted', 0)
+            matched = result.get('nMatched', 0)
+            modified = result.get('nModified', 0)
+            summary['inserted'] += upserted
+            summary['updated'] += modified
+            summary['unchanged'] += matched - modified
+        
+        logger.info(f"Bulk write to {label}: {summary['inserted']} inserted, {summary['updated']} updated, "
+                    f"{summary['unchanged']} unchanged, {summary['failed']} failed in {summary['batches']} batches")
+        return summary
+    
+    def get_tenant_redis_keys(self, tenant_name, raise_errors=False):
+        """Get Redis keys for tenant (raise_errors: raise instead of returning [] on a database error)"""
         try:
             return list(self.redis_keys.find(
                 {'tenant_name': tenant_name}
             ).sort('key_name', 1))
         except Exception as e:
             logger.error(f"Get tenant Redis keys error: {str(e)}")
+            if raise_errors:
+                raise
             return []
     
+    def search_redis_keys(self, tenant_name=None, term='', match='contains', limit=100, cursor=None):
+        """
+        One page of Redis keys whose name matches a search term (case-insensitive)
+        
+        Keys are ordered by (tenant_name, key_name_lower, key_name) and a page
+        continues from the position in its cursor, so paging never skips.
+        - match='prefix': anchored regex on key_name_lower, an index range scan
+        - match='contains': the term's trigrams must all be in key_trigrams
+          (multikey index), then the regex confirms their order; terms shorter
+          than a trigram fall back to a regex over the tenant's keys
+        
+        Args:
+            tenant_name (str): restrict to one tenant; None searches all tenants
+            cursor (str): next_cursor of a previous page; None for the first page
+        
+        Returns:
+            dict: keys, next_cursor, limit
+        
+        Raises:
+            ValueError: match or cursor is invalid
+        """
+        if match not in ('contains', 'prefix'):
+            raise ValueError(f"Invalid match mode: {match}")
+        limit = max(1, min(int(limit), KEY_SEARCH_MAX_LIMIT))
+        position = decode_key_cursor(cursor) if cursor else None
+        
+        clauses = []
+        if tenant_name:
+            clauses.append({'tenant_name': tenant_name})
+        term = (term or '').lower()
+        if term:
+            escaped = re.escape(term)
+            if match == 'prefix':
+                clauses.append({'key_name_lower': {'$regex': f'^{escaped}'}})
+            else:
+                if len(term) >= KEY_TRIGRAM_LENGTH:
+                    clauses.append({'key_trigrams': {'$all': key_trigrams(term)}})
+                clauses.append({'key_name_lower': {'$regex': escaped}})
+        if position:
+            last_tenant, last_lower, last_name = position
+            clauses.append({'$or': [
+                {'tenant_name': {'$gt': last_tenant}},
+                {'tenant_name': last_tenant, 'key_name_lower': {'$gt': last_lower}},
+                {'tenant_name': last_tenant, 'key_name_lower': last_lower, 'key_name': {'$gt': last_name}}
+            ]})
+        query = {'$and': clauses} if len(clauses) > 1 else (clauses[0] if clauses else {})
+        
+        try:
+            docs = list(self.redis_keys.find(query, {'key_value': 0, 'key_trigrams': 0})
+                        .sort([('tenant_name', ASCENDING), ('key_name_lower', ASCENDING), ('key_name', ASCENDING)])
+                        .limit(limit + 1))
+        except Exception as e:
+            logger.error(f"Search Redis keys error: {str(e)}")
+            return {'keys': [], 'next_cursor': None, 'limit': limit}
+        
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        next_cursor = None
+        if has_more:
+            last = docs[-1]
+            next_cursor = encode_key_cursor(last['tenant_name'], last.get('key_name_lower', ''), last['key_name'])
+        for doc in docs:
+            doc['_id'] = str(doc['_id'])
+        
+        return {'keys': docs, 'next_cursor': next_cursor, 'limit': limit}
+    
     def get_redis_key_value(self, tenant_name, key_name):
         """Get specific Redis key value"""
         try:
@@ -159,32 +495,49 @@ class DatabaseService:
             logger.error(f"Log system event error: {str(e)}")
             return False
     
-    def get_system_logs(self, page=1, limit=50, log_type=None):
-        """Get system logs with pagination"""
+    def get_system_logs(self, limit=50, log_type=None, cursor=None, command=None, search=None,
+                        since=None, until=None):
+        """
+        Get system logs, newest first, one keyset page at a time (see _keyset_page)
+        
+        The filters apply before paging, so pages and the total cover every
+        matching log; a cursor is only valid with the filters it was issued for.
+        
+        Args:
+            command (str): exact command
+            search (str): case-insensitive text in the command or output
+            since, until (datetime): timestamp range [since, until)
+        """
         try:
             query = {}
             if log_type:
                 query['log_type'] = log_type
+            if command:
+                query['command'] = command
+            if search:
+                pattern = {'$regex': re.escape(search), '$options': 'i'}
+                query['$or'] = [{'command': pattern}, {'output': pattern}]
+            if since or until:
+                query['timestamp'] = {}
+                if since:
+                    query['timestamp']['$gte'] = since
+                if until:
+                    query['timestamp']['$lt'] = until
             
-            skip = (page - 1) * limit
-            
-            logs = list(self.system_logs.find(query)
-                       .sort('timestamp', DESCENDING)
-                       .skip(skip)
-                       .limit(limit))
-            
-            total = self.system_logs.count_documents(query)
-            
-            return {
-                'logs': logs,
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'pages': (total + limit - 1) // limit
-            }
+            return self._keyset_page(self.system_logs, query, 'timestamp', limit, cursor)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Get system logs error: {str(e)}")
-            return {'logs': [], 'total': 0, 'page': 1, 'limit': limit, 'pages': 0}
+            return self._empty_page(limit)
+    
+    def get_system_log_commands(self):
+        """Distinct commands of the system logs, sorted (for the command filter)"""
+        try:
+            return sorted(self.system_logs.distinct('command'))
+        except Exception as e:
+            logger.error(f"Get system log commands error: {str(e)}")
+            return []
     
     # VMS status log operations
     def save_vms_status_log(self, command, output, run_time, metadata=None):
@@ -204,28 +557,94 @@ class DatabaseService:
             logger.error(f"Save VMS status log error: {str(e)}")
             return False
     
-    def get_vms_status_logs(self, page=1, limit=20):
-        """Get VMS status logs with pagination"""
+    def get_vms_status_logs(self, limit=20, cursor=None):
+        """Get VMS status logs, newest run first, one keyset page at a time (see _keyset_page)"""
         try:
-            skip = (page - 1) * limit
-            
-            logs = list(self.vms_status_logs.find()
-                       .sort('run_time', DESCENDING)
-                       .skip(skip)
-                       .limit(limit))
-            
-            total = self.vms_status_logs.count_documents({})
-            
-            return {
-                'logs': logs,
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'pages': (total + limit - 1) // limit
-            }
+            return self._keyset_page(self.vms_status_logs, {}, 'run_time', limit, cursor)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Get VMS status logs error: {str(e)}")
-            return {'logs': [], 'total': 0, 'page': 1, 'limit': limit, 'pages': 0}
+            return self._empty_page(limit)
+    
+    # Pagination helpers
+    def _keyset_page(self, collection, query, sort_field, limit, cursor=None):
+        """
+        One page of a collection ordered by (sort_field, _id) descending
+        
+        Instead of skipping over earlier pages, a page continues from the
+        (sort_field, _id) position in its cursor, so every page costs the same
+        index range scan however deep it is. _id breaks ties between documents
+        with the same sort value (e.g. the commands of one status check run).
+        
+        Args:
+            cursor (str): next_cursor / prev_cursor of a previous page; None for the newest page
+        
+        Returns:
+            dict: logs, next_cursor (older), prev_cursor (newer), limit, total, total_estimated
+        
+        Raises:
+            ValueError: cursor is malformed
+        """
+        direction, anchor_value, anchor_id = decode_page_cursor(cursor) if cursor else ('next', None, None)
+        
+        page_query = query
+        if anchor_id is not None:
+            op = '$lt' if direction == 'next' else '$gt'
+            after_anchor = {'$or': [
+                {sort_field: {op: anchor_value}},
+                {sort_field: anchor_value, '_id': {op: anchor_id}}
+            ]}
+            page_query = {'$and': [query, after_anchor]} if query else after_anchor
+        
+        order = DESCENDING if direction == 'next' else ASCENDING
+        docs = list(collection.find(page_query)
+                   .sort([(sort_field, order), ('_id', order)])
+                   .limit(limit + 1))
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        if direction == 'prev':
+            docs.reverse()
+        
+        has_older = has_more if direction == 'next' else anchor_id is not None
+        has_newer = has_more if direction == 'prev' else anchor_id is not None
+        next_cursor = encode_page_cursor('next', docs[-1].get(sort_field), docs[-1]['_id']) if docs and has_older else None
+        prev_cursor = encode_page_cursor('prev', docs[0].get(sort_field), docs[0]['_id']) if docs and has_newer else None
+        
+        for doc in docs:
+            doc['_id'] = str(doc['_id'])
+        
+        return {
+            'logs': docs,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'limit': limit,
+            'total': self._count(collection, query),
+            'total_estimated': True
+        }
+    
+    def _count(self, collection, query):
+        """
+        Document count without a collection scan per request
+        
+        Unfiltered totals come from collection metadata (estimated_document_count);
+        filtered counts are computed once and cached for COUNT_CACHE_SECONDS.
+        """
+        if not query:
+            return collection.estimated_document_count()
+        
+        cache_key = (collection.name, json.dumps(query, sort_keys=True, default=str))
+        cached = self._count_cache.get(cache_key)
+        if cached and time.time() - cached[0] < COUNT_CACHE_SECONDS:
+            return cached[1]
+        count = collection.count_documents(query)
+        self._count_cache[cache_key] = (time.time(), count)
+        return count
+    
+    @staticmethod
+    def _empty_page(limit):
+        return {'logs': [], 'next_cursor': None, 'prev_cursor': None, 'limit': limit,
+                'total': 0, 'total_estimated': True}
     
     # SSH connection tracking
     def log_ssh_connection(self, host, username, status, connection_id=None):
@@ -245,24 +664,91 @@ class DatabaseService:
             logger.error(f"Log SSH connection error: {str(e)}")
             return False
     
+    # Retention
+    def ensure_retention_indexes(self, retention_days=LOG_RETENTION_DAYS):
+        """
+        Create the TTL indexes that expire the log collections (see LOG_RETENTION_INDEXES)
+        
+        Called at startup. An existing index on the same field (the plain index of
+        an older init-mongo.js, or a TTL index with another retention) is changed
+        in place with collMod instead of being dropped and rebuilt.
+        
+        Returns:
+            bool: True if every index is in place
+        """
+        if not self.connected:
+            return False
+        
+        seconds = int(retention_days * 86400)
+        ok = True
+        for collection_name, field in LOG_RETENTION_INDEXES:
+            try:
+                try:
+                    self.db[collection_name].create_index([(field, DESCENDING)], expireAfterSeconds=seconds)
+                except OperationFailure as e:
+                    if e.code not in _INDEX_CONFLICT_CODES:
+                        raise
+                    self.db.command('collMod', collection_name,
+                                    index={'keyPattern': {field: DESCENDING}, 'expireAfterSeconds': seconds})
+                    logger.info(f"Set retention of {collection_name} to {retention_days} days")
+            except Exception as e:
+                ok = False
+                logger.error(f"Retention index error on {collection_name}: {str(e)}")
+        return ok
+    
+    def ensure_key_search_indexes(self, batch_size=None):
+        """
+        Prepare redis_keys for search_redis_keys (see KEY_SEARCH_INDEXES)
+        
+        Called at startup. Keys stored before key search existed get their
+        key_name_lower / key_trigrams fields, which both search modes filter on,
+        and the search indexes are created (init-mongo.js only runs on a fresh volume).
+        
+        Returns:
+            bool: True if the backfill and every index succeeded
+        """
+        if not self.connected:
+            return False
+        
+        ok = True
+        try:
+            missing = self.redis_keys.find({'key_name_lower': {'$exists': False}}, {'key_name': 1})
+            summary = self._bulk_write(
+                self.redis_keys,
+                (UpdateOne({'_id': doc['_id']}, {'$set': _key_search_fields(doc['key_name'])}) for doc in missing),
+                batch_size, 'redis_keys search fields'
+            )
+            ok = not summary['failed']
+        except Exception as e:
+            ok = False
+            logger.error(f"Key search backfill error: {str(e)}")
+        
+        for keys in KEY_SEARCH_INDEXES:
+            try:
+                self.redis_keys.create_index(keys)
+            except Exception as e:
+                ok = False
+                logger.error(f"Key search index error on {keys}: {str(e)}")
+        return ok
+    
     # Cleanup operations
-    def cleanup_old_logs(self, days_to_keep=30):
-        """Clean up old logs"""
+    def cleanup_old_logs(self, days_to_keep=LOG_RETENTION_DAYS):
+        """
+        Delete logs older than days_to_keep now
+        
+        The TTL indexes (ensure_retention_indexes) expire logs continuously; this
+        is only for an immediate purge, e.g. after shortening the retention.
+        """
         try:
-            cutoff_date = datetime.utcnow()
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_to_keep)
+            cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
             
-            # Clean system logs
-            result1 = self.system_logs.delete_many({
-                'timestamp': {'$lt': cutoff_date}
-            })
-            
-            # Clean SSH connection logs
-            result2 = self.ssh_connections.delete_many({
-                'created_at': {'$lt': cutoff_date}
-            })
+            deleted = {}
+            for collection_name, field in LOG_RETENTION_INDEXES:
+                result = self.db[collection_name].delete_many({field: {'$lt': cutoff_date}})
+                deleted[collection_name] = result.deleted_count
             
-            logger.info(f"Cleaned up {result1.deleted_count} system logs and {result2.deleted_count} SSH logs")
+            logger.info(f"Cleaned up {deleted['system_logs']} system logs, {deleted['ssh_connections']} SSH logs "
+                        f"and {deleted['vms_status_logs']} VMS status logs")
             return True
         except Exception as e:
             logger.error(f"Log cleanup error: {str(e)}")
@@ -11,8 +11,9 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 class RedisService:
-    def __init__(self, db_service):
+    def __init__(self, db_service, cache_service=None):
         self.db = db_service
+        self.cache = cache_service
     
     def get_tenant_keys(self, tenant_name):
         """Get Redis keys for a tenant"""
@@ -63,6 +64,9 @@ class RedisService:
                     'accessed_at': datetime.utcnow()
                 }
             )
+            if self.cache is not None:
+                # The tenant detail lists which keys have a stored value
+                self.cache.invalidate_tags(f'tenant:{tenant_name}')
             
             return formatted_value
             
@@ -275,20 +279,23 @@ class RedisService:
             logger.error(f"Decode value error: {str(e)}")
             return value, "raw"
     
-    def search_keys(self, tenant_name, search_term):
-        """Search Redis keys by name"""
+    def search_keys(self, tenant_name, search_term, match='contains', limit=100, cursor=None):
+        """
+        Search Redis keys by name, one page at a time
+        
+        The search runs in MongoDB on the indexed key name fields (see
+        DatabaseService.search_redis_keys); pass next_cursor back for the next page.
+        
+        Returns:
+            dict: keys, next_cursor, limit
+        
+        Raises:
+            ValueError: match or cursor is invalid
+        """
         try:
-            keys = self.db.get_tenant_redis_keys(tenant_name)
-            
-            if search_term:
-                filtered_keys = [
-                    key for key in keys 
-                    if search_term.lower() in key['key_name'].lower()
-                ]
-                return filtered_keys
-            
-            return keys
-            
+            return self.db.search_redis_keys(tenant_name, search_term, match, limit, cursor)
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Search keys error: {str(e)}")
-            return []
\ No newline at end of file
+            return {'keys': [], 'next_cursor': None, 'limit': limit}
\ No newline at end of file
@@ -1,74 +1,119 @@
 """
 SSH Service - Handles SSH connections to VMS servers
+
+Every command runs on its own exec channel over the connection's shared SSH
+transport, so concurrent requests on one connection never share a shell and
+can run in parallel. A per-connection semaphore caps the number of channels
+open at once (sshd allows 10 sessions per connection by default), and a
+command is complete when its exit status arrives.
+
+A pool manager thread (started with the first connection) looks after the
+pooled connections:
+- transports send SSH keepalives, so idle NAT/firewall mappings stay open
+- health is probed by running 'true' on a spare exec channel, never by typing
+  into anything a user is working with
+- connections unused for longer than the idle timeout are closed
+- a transport found dead (by the probe or by a request) is reconnected with
+  the stored credentials under the same connection id
+The number of connections per host is capped; connecting beyond the cap
+closes the least recently used connection to that host that nobody is using
+(no command running and idle for EVICTION_MIN_IDLE_SECONDS). Connections in
+use are never closed this way; the cap is then exceeded until they go idle.
 """
 
 import paramiko
+import shlex
+import socket
 import threading
 import time
 import re
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Concurrent exec channels per connection (sshd MaxSessions defaults to 10)
+MAX_CHANNELS_PER_CONNECTION = 8
+
+# Pool manager
+MAX_CONNECTIONS_PER_HOST = 4
+KEEPALIVE_INTERVAL = 30
+POOL_CHECK_INTERVAL = 60
+IDLE_TIMEOUT_MINUTES = 60
+PROBE_TIMEOUT = 10
+CONNECT_TIMEOUT = 15
+EVICTION_MIN_IDLE_SECONDS = 300
+
+# Runs "$0" as root with the sudo password as the first stdin line. 'sudo -S' only
+# reads stdin when it prompts; when 'sudo -n' already works (cached credentials,
+# NOPASSWD) the password line is consumed here so it never reaches the command.
+SUDO_WRAPPER = ("sh -c 'if sudo -n true 2>/dev/null; then IFS= read -r _; exec sudo -n sh -c \"$0\"; "
+                "else exec sudo -S -p \"\" sh -c \"$0\"; fi' ")
+
 class SSHService:
-    def __init__(self):
+    def __init__(self, max_channels_per_connection=MAX_CHANNELS_PER_CONNECTION,
+                 max_connections_per_host=MAX_CONNECTIONS_PER_HOST,
+                 idle_timeout_minutes=IDLE_TIMEOUT_MINUTES):
         self.connections = {}
         self.connection_lock = threading.Lock()
+        self.max_channels_per_connection = max_channels_per_connection
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout_minutes = idle_timeout_minutes
+        self._pool_manager = None
+        self._pool_stop = threading.Event()
+    
+    def _open_client(self, host, username, password):
+        """Open an SSH client with transport keepalives enabled"""
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        ssh.connect(host, username=username, password=password, look_for_keys=False, timeout=CONNECT_TIMEOUT)
+        ssh.get_transport().set_keepalive(KEEPALIVE_INTERVAL)
+        return ssh
     
     def connect(self, host, username, password, sudo_password=None):
         """Establish SSH connection"""
         try:
             connection_id = str(uuid.uuid4())
             
-            # Create SSH client
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
             # Connect
-            ssh.connect(host, username=username, password=password, look_for_keys=False)
+            ssh = self._open_client(host, username, password)
             
-            # Create interactive shell
-            shell = ssh.invoke_shell()
-            time.sleep(1)
-            shell.recv(10000)  # Clear banner
-            
-            # Perform sudo if password provided
-            if sudo_password:
-                shell.send("sudo su\n")
-                buff = ""
-                timeout = 10
-                start_time = time.time()
-                
-                while time.time() - start_time < timeout:
-                    if shell.recv_ready():
-                        resp = shell.recv(1000).decode()
-                        buff += resp
-                        if "password for" in buff.lower():
-                            break
-                    time.sleep(0.2)
-                
-                shell.send(sudo_password + "\n")
-                time.sleep(2)
-                output = shell.recv(10000).decode()
-                
-                # Set kubectl alias
-                shell.send("alias k=kubectl\n")
-                time.sleep(0.5)
-                shell.recv(10000)
-            
-            # Store connection
+            # Store connection; commands run as root through sudo (SUDO_WRAPPER) when a sudo password is given.
+            # Credentials stay in memory so a dead transport can be reconnected transparently.
             with self.connection_lock:
                 self.connections[connection_id] = {
                     'ssh': ssh,
-                    'shell': shell,
                     'host': host,
                     'username': username,
+                    'password': password,
+                    'sudo_password': sudo_password,
+                    'channel_slots': threading.BoundedSemaphore(self.max_channels_per_connection),
+                    'reconnect_lock': threading.Lock(),
+                    'healthy': True,
+                    'last_probe': datetime.utcnow(),
+                    'reconnects': 0,
+                    'active_commands': 0,
                     'connected_at': datetime.utcnow(),
                     'last_used': datetime.utcnow()
                 }
+                same_host = [conn_id for conn_id, conn in self.connections.items() if conn['host'] == host]
+                excess = len(same_host) - self.max_connections_per_host
+                idle_cutoff = datetime.utcnow() - timedelta(seconds=EVICTION_MIN_IDLE_SECONDS)
+                unused = sorted((conn['last_used'], conn_id) for conn_id, conn in self.connections.items()
+                                if conn['host'] == host and conn_id != connection_id
+                                and conn['active_commands'] == 0 and conn['last_used'] < idle_cutoff)
+                evicted = [conn_id for _, conn_id in unused[:max(0, excess)]]
+            
+            if excess > len(evicted):
+                logger.warning(f"Connection limit for {host} exceeded: {len(same_host) - len(evicted)} connections, "
+                               f"the others are in use")
+            
+            for conn_id in evicted:
+                logger.info(f"Connection limit for {host} reached, closing least recently used: {conn_id}")
+                self.disconnect(conn_id)
             
+            self.start_pool_manager()
             logger.info(f"SSH connection established: {connection_id} to {host}")
             return connection_id
             
@@ -80,83 +125,167 @@ class SSHService:
         """Disconnect SSH connection"""
         try:
             with self.connection_lock:
-                if connection_id in self.connections:
-                    conn = self.connections[connection_id]
-                    
-                    # Send exit command
-                    try:
-                        conn['shell'].send("exit\n")
-                        time.sleep(0.5)
-                    except:
-                        pass
-                    
-                    # Close SSH connection
-                    try:
-                        conn['ssh'].close()
-                    except:
-                        pass
-                    
-                    # Remove from connections
-                    del self.connections[connection_id]
-                    logger.info(f"SSH connection closed: {connection_id}")
+                conn = self.connections.pop(connection_id, None)
+            
+            if conn:
+                # Close SSH connection (open exec channels are closed with the transport)
+                try:
+                    conn['ssh'].close()
+                except:
+                    pass
+                logger.info(f"SSH connection closed: {connection_id}")
                     
         except Exception as e:
             logger.error(f"SSH disconnect error: {str(e)}")
     
     def get_connection(self, connection_id):
-        """Get SSH connection by ID"""
+        """Get SSH connection by ID, reconnecting a dead transport"""
         with self.connection_lock:
-            if connection_id in self.connections:
-                self.connections[connection_id]['last_used'] = datetime.utcnow()
-                return self.connections[connection_id]
-        return None
+            conn = self.connections.get(connection_id)
+            if conn is None:
+                return None
+            conn['last_used'] = datetime.utcnow()
+        
+        if not self._transport_active(conn):
+            self._reconnect(connection_id, conn)
+        return conn
     
     def get_connection_status(self, connection_id):
-        """Check if connection is active"""
+        """Check if connection is active (transport state and last health probe)"""
         with self.connection_lock:
-            if connection_id in self.connections:
-                try:
-                    # Test connection by sending a simple command
-                    conn = self.connections[connection_id]
-                    shell = conn['shell']
-                    
-                    # Check if shell is still responsive
-                    shell.send("echo test\n")
-                    time.sleep(0.5)
-                    
-                    if shell.recv_ready():
-                        shell.recv(1000)  # Clear buffer
-                        return True
-                    return False
-                except:
-                    return False
-        return False
+            conn = self.connections.get(connection_id)
+        if conn is None:
+            return False
+        return self._transport_active(conn) and conn['healthy']
+    
+    @staticmethod
+    def _transport_active(conn):
+        transport = conn['ssh'].get_transport()
+        return bool(transport and transport.is_active())
+    
+    def _reconnect(self, connection_id, conn):
+        """Replace a dead transport in place; requests waiting on it use the new one"""
+        with conn['reconnect_lock']:
+            if self._transport_active(conn):
+                return True  # another request reconnected it meanwhile
+            try:
+                conn['ssh'].close()
+            except Exception:
+                pass
+            try:
+                conn['ssh'] = self._open_client(conn['host'], conn['username'], conn['password'])
+            except Exception as e:
+                conn['healthy'] = False
+                logger.error(f"SSH reconnect failed for {connection_id} to {conn['host']}: {str(e)}")
+                return False
+            conn['healthy'] = True
+            conn['reconnects'] += 1
+            logger.info(f"SSH connection {connection_id} to {conn['host']} reconnected")
+            return True
+    
+    def _probe(self, conn):
+        """Run 'true' on a spare exec channel; a connection with every channel busy counts as alive"""
+        if not conn['channel_slots'].acquire(blocking=False):
+            return True
+        try:
+            _, exit_status = self._run_on_channel(conn, "true", PROBE_TIMEOUT, sudo=False)
+            return exit_status == 0
+        except Exception:
+            return False
+        finally:
+            conn['channel_slots'].release()
+    
+    def start_pool_manager(self):
+        """Start the pool manager thread if it isn't running"""
+        with self.connection_lock:
+            if self._pool_manager and self._pool_manager.is_alive():
+                return
+            self._pool_stop.clear()
+            self._pool_manager = threading.Thread(target=self._pool_manager_loop, name="ssh-pool-manager",
+                                                  daemon=True)
+            self._pool_manager.start()
+    
+    def stop_pool_manager(self):
+        """Stop the pool manager thread and close every connection (application shutdown)"""
+        self._pool_stop.set()
+        with self.connection_lock:
+            connection_ids = list(self.connections)
+        for connection_id in connection_ids:
+            self.disconnect(connection_id)
+    
+    def _pool_manager_loop(self):
+        while not self._pool_stop.wait(POOL_CHECK_INTERVAL):
+            try:
+                self.check_connections()
+            except Exception as e:
+                logger.error(f"SSH pool manager error: {str(e)}")
+    
+    def check_connections(self):
+        """One pool manager pass: evict idle connections, probe the rest, reconnect dead ones"""
+        self.cleanup_old_connections(self.idle_timeout_minutes)
+        
+        with self.connection_lock:
+            connections = list(self.connections.items())
+        
+        for connection_id, conn in connections:
+            healthy = self._transport_active(conn) and self._probe(conn)
+            conn['last_probe'] = datetime.utcnow()
+            if healthy:
+                conn['healthy'] = True
+                continue
+            
+            logger.warning(f"SSH connection {connection_id} to {conn['host']} failed its health probe")
+            try:
+                conn['ssh'].close()  # a hung transport that still looks active is replaced too
+            except Exception:
+                pass
+            self._reconnect(connection_id, conn)
+    
+    def pool_stats(self):
+        """Per-connection pool state (no credentials)"""
+        with self.connection_lock:
+            return [{
+                'connection_id': connection_id,
+                'host': conn['host'],
+                'username': conn['username'],
+                'healthy': conn['healthy'],
+                'reconnects': conn['reconnects'],
+                'connected_at': conn['connected_at'].isoformat(),
+                'last_used': conn['last_used'].isoformat(),
+                'last_probe': conn['last_probe'].isoformat()
+            } for connection_id, conn in self.connections.items()]
     
     def execute_command(self, connection_id, command, timeout=30):
-        """Execute command on SSH connection"""
+        """
+        Execute command on its own exec channel of the SSH connection
+        
+        Waits for one of the connection's channel slots, then runs the command and
+        collects its output (stdout and stderr combined, as a shell would show them)
+        until the exit status arrives. On timeout the partial output is returned.
+        """
         try:
             conn = self.get_connection(connection_id)
             if not conn:
                 raise Exception("SSH connection not found")
             
-            shell = conn['shell']
-            
-            # Send command
-            shell.send(f"{command}\n")
-            
-            # Collect output
-            output = ""
-            start_time = time.time()
+            started = time.time()
+            with self.connection_lock:
+                conn['active_commands'] += 1
+            try:
+                if not conn['channel_slots'].acquire(timeout=timeout):
+                    raise Exception(f"No free SSH channel on connection {connection_id} after {timeout}s")
+                try:
+                    output, exit_status = self._run_on_channel(conn, command, timeout - (time.time() - started))
+                finally:
+                    conn['channel_slots'].release()
+            finally:
+                with self.connection_lock:
+                    conn['active_commands'] -= 1
             
-            while time.time() - start_time < timeout:
-                if shell.recv_ready():
-                    chunk = shell.recv(4096).decode('utf-8', errors='ignore')
-                    output += chunk
-                    
-                    # Check for shell prompt (indicating command completion)
-                    if chunk.endswith('# ') or chunk.endswith('$ '):
-                        break
-                time.sleep(0.1)
+            if exit_status is None:
+                logger.warning(f"Command timed out after {timeout}s: {command}")
+            elif exit_status != 0:
+                logger.debug(f"Command exited with status {exit_status}: {command}")
             
             # Clean output
             cleaned_output = self._clean_command_output(output, command)
@@ -166,28 +295,60 @@ class SSHService:
             logger.error(f"Command execution error: {str(e)}")
             raise
     
+    def _run_on_channel(self, conn, command, timeout, sudo=True):
+        """Run one command on a new exec channel; returns (output, exit status or None on timeout)"""
+        transport = conn['ssh'].get_transport()
+        if not transport or not transport.is_active():
+            raise Exception("SSH transport is not active")
+        
+        sudo_password = conn.get('sudo_password') if sudo else None
+        if sudo_password:
+            command = SUDO_WRAPPER + shlex.quote(command)
+        
+        # Opening the channel counts against the timeout too (paramiko would otherwise wait up to an hour)
+        started = time.time()
+        channel = transport.open_session(timeout=max(timeout, 1))
+        try:
+            channel.set_combine_stderr(True)
+            channel.settimeout(0.5)
+            channel.exec_command(command)
+            if sudo_password:
+                channel.sendall((sudo_password + "\n").encode('utf-8'))
+            channel.shutdown_write()
+            
+            chunks = []
+            deadline = started + max(timeout, 0)
+            while True:
+                try:
+                    chunk = channel.recv(65536)
+                except socket.timeout:
+                    chunk = None
+                if chunk:
+                    chunks.append(chunk)
+                elif chunk == b'':
+                    # End of output: the exit status follows it
+                    break
+                if time.time() > deadline:
+                    return b''.join(chunks).decode('utf-8', errors='ignore'), None
+            
+            return b''.join(chunks).decode('utf-8', errors='ignore'), channel.recv_exit_status()
+        finally:
+            channel.close()
+    
     def _clean_command_output(self, output, command):
         """Clean SSH command output"""
         # Remove ANSI escape codes
         ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
         output = ansi_escape.sub('', output)
         
-        # Split into lines
+        # Split into lines (exec channels have no prompt or command echo to strip)
         lines = output.strip().split('\n')
         cleaned_lines = []
         
         for line in lines:
             line = line.strip()
-            
-            # Skip command echo, prompts, and empty lines
-            if (line == command or 
-                line.startswith('echo ') or
-                line.endswith('# ') or 
-                line.endswith('$ ') or 
-                line.startswith('[root@') or
-                not line):
+            if not line:
                 continue
-                
             cleaned_lines.append(line)
         
         return '\n'.join(cleaned_lines)
@@ -195,19 +356,16 @@ class SSHService:
     def cleanup_old_connections(self, max_age_minutes=60):
         """Cleanup old unused connections"""
         try:
-            cutoff_time = datetime.utcnow()
-            cutoff_time = cutoff_time.replace(minute=cutoff_time.minute - max_age_minutes)
-            
-            to_remove = []
+            cutoff_time = datetime.utcnow() - timedelta(minutes=max_age_minutes)
             
             with self.connection_lock:
-                for conn_id, conn in self.connections.items():
-                    if conn['last_used'] < cutoff_time:
-                        to_remove.append(conn_id)
-                
-                for conn_id in to_remove:
-                    logger.info(f"Cleaning up old SSH connection: {conn_id}")
-                    self.disconnect(conn_id)
+                to_remove = [conn_id for conn_id, conn in self.connections.items()
+                             if conn['last_used'] < cutoff_time]
+            
+            # disconnect() takes the lock itself
+            for conn_id in to_remove:
+                logger.info(f"Cleaning up old SSH connection: {conn_id}")
+                self.disconnect(conn_id)
                     
         except Exception as e:
             logger.error(f"Connection cleanup error: {str(e)}")
\ No newline at end of file
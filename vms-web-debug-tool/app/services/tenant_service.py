@@ -7,14 +7,47 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Cache TTLs (seconds) of the tenant reads; tenant writes invalidate them earlier
+TENANT_LIST_CACHE_TTL = 30
+TENANT_STATS_CACHE_TTL = 15
+TENANT_DETAIL_CACHE_TTL = 60
+
+# Cache tag of every tenant read; 'tenant:<name>' additionally tags one tenant's detail
+TENANTS_CACHE_TAG = 'tenants'
+
 class TenantService:
-    def __init__(self, db_service):
+    def __init__(self, db_service, cache_service=None):
         self.db = db_service
+        self.cache = cache_service
+    
+    def _cached(self, name, ttl, loader, tags):
+        """
+        Read through the cache when there is one and the database is up
+        
+        The loaders read with raise_errors=True, so a database error during a
+        load propagates (and the caller returns its empty result) instead of
+        being cached as "no tenants" or "tenant missing".
+        """
+        if self.cache is None or not self.db.connected:
+            return loader()
+        return self.cache.get_or_set(name, ttl, loader, tags)
     
-    def save_tenant_data(self, tenant_data_dict):
-        """Save comprehensive tenant data"""
+    def _invalidate(self, *tags):
+        if self.cache is not None:
+            self.cache.invalidate_tags(*tags)
+    
+    def save_tenant_data(self, tenant_data_dict, batch_size=None):
+        """
+        Save comprehensive tenant data
+        
+        Tenants and their discovered Redis keys are written with bulk upserts
+        (one round trip per batch instead of one per document).
+        
+        Returns:
+            dict: saved tenant count plus the bulk summaries of tenants and redis_keys
+        """
         try:
-            saved_count = 0
+            tenant_docs = []
             
             for tenant_name, data in tenant_data_dict.items():
                 # Prepare tenant document
@@ -36,86 +69,92 @@ class TenantService:
                 if data.get('redis_info') and data['redis_info'].get('keys'):
                     tenant_doc['redis_key_count'] = len(data['redis_info']['keys'])
                 
-                # Save tenant
-                if self.db.save_tenant(tenant_doc):
-                    saved_count += 1
-                    
-                    # Save Redis keys separately for better querying
-                    if data.get('redis_info') and data['redis_info'].get('keys'):
-                        self._save_tenant_redis_keys(tenant_name, data['redis_info']['keys'])
+                tenant_docs.append(tenant_doc)
             
-            logger.info(f"Saved {saved_count} tenants to database")
-            return saved_count
+            try:
+                tenant_summary = self.db.save_tenants_bulk(tenant_docs, batch_size=batch_size)
+                
+                # Save Redis keys separately for better querying (values are populated when a key is accessed)
+                redis_keys = (
+                    (tenant_name, key)
+                    for tenant_name, data in tenant_data_dict.items()
+                    if data.get('redis_info') and data['redis_info'].get('keys')
+                    for key in data['redis_info']['keys']
+                )
+                key_summary = self.db.save_redis_keys_bulk(
+                    redis_keys,
+                    metadata={'discovered_at': datetime.utcnow(), 'source': 'tenant_scan'},
+                    batch_size=batch_size
+                )
+            finally:
+                # Partial writes change the reads too
+                self._invalidate(TENANTS_CACHE_TAG)
+            
+            saved_count = tenant_summary['inserted'] + tenant_summary['updated'] + tenant_summary['unchanged']
+            logger.info(f"Saved {saved_count} tenants and {key_summary['operations'] - key_summary['failed']} "
+                        f"Redis keys to database")
+            return {'saved': saved_count, 'tenants': tenant_summary, 'redis_keys': key_summary}
             
         except Exception as e:
             logger.error(f"Save tenant data error: {str(e)}")
-            return 0
-    
-    def _save_tenant_redis_keys(self, tenant_name, keys):
-        """Save Redis keys for a tenant"""
-        try:
-            for key in keys:
-                self.db.save_redis_key(
-                    tenant_name=tenant_name,
-                    key_name=key,
-                    key_value=None,  # Will be populated when key is accessed
-                    metadata={
-                        'discovered_at': datetime.utcnow(),
-                        'source': 'tenant_scan'
-                    }
-                )
-        except Exception as e:
-            logger.error(f"Save tenant Redis keys error: {str(e)}")
+            return {'saved': 0, 'tenants': None, 'redis_keys': None}
     
     def get_all_tenants(self):
         """Get all tenants with summary information"""
         try:
-            tenants = self.db.get_all_tenants()
-            
-            # Add summary information
-            for tenant in tenants:
-                tenant['_id'] = str(tenant['_id'])  # Convert ObjectId to string
-                
-                # Calculate summary stats
-                tenant['summary'] = {
-                    'service_count': tenant.get('service_count', 0),
-                    'has_redis': tenant.get('has_redis', False),
-                    'redis_key_count': tenant.get('redis_key_count', 0),
-                    'redis_ip': None
-                }
-                
-                # Extract Redis IP if available
-                if tenant.get('redis_info') and tenant['redis_info'].get('cluster_ip'):
-                    tenant['summary']['redis_ip'] = tenant['redis_info']['cluster_ip']
-            
-            return tenants
+            return self._cached('tenant:list', TENANT_LIST_CACHE_TTL, self._load_all_tenants, [TENANTS_CACHE_TAG])
         except Exception as e:
             logger.error(f"Get all tenants error: {str(e)}")
             return []
     
+    def _load_all_tenants(self):
+        tenants = self.db.get_all_tenants(raise_errors=True)
+        
+        # Add summary information
+        for tenant in tenants:
+            tenant['_id'] = str(tenant['_id'])  # Convert ObjectId to string
+            
+            # Calculate summary stats
+            tenant['summary'] = {
+                'service_count': tenant.get('service_count', 0),
+                'has_redis': tenant.get('has_redis', False),
+                'redis_key_count': tenant.get('redis_key_count', 0),
+                'redis_ip': None
+            }
+            
+            # Extract Redis IP if available
+            if tenant.get('redis_info') and tenant['redis_info'].get('cluster_ip'):
+                tenant['summary']['redis_ip'] = tenant['redis_info']['cluster_ip']
+        
+        return tenants
+    
     def get_tenant_by_name(self, name):
         """Get detailed tenant information"""
         try:
-            tenant = self.db.get_tenant_by_name(name)
-            if tenant:
-                tenant['_id'] = str(tenant['_id'])
-                
-                # Get Redis keys
-                redis_keys = self.db.get_tenant_redis_keys(name)
-                tenant['redis_keys'] = [
-                    {
-                        'key_name': key['key_name'],
-                        'has_value': bool(key.get('key_value')),
-                        'last_accessed': key.get('updated_at')
-                    }
-                    for key in redis_keys
-                ]
-                
-            return tenant
+            return self._cached(f'tenant:detail:{name}', TENANT_DETAIL_CACHE_TTL,
+                                lambda: self._load_tenant(name), [TENANTS_CACHE_TAG, f'tenant:{name}'])
         except Exception as e:
             logger.error(f"Get tenant by name error: {str(e)}")
             return None
     
+    def _load_tenant(self, name):
+        tenant = self.db.get_tenant_by_name(name, raise_errors=True)
+        if tenant:
+            tenant['_id'] = str(tenant['_id'])
+            
+            # Get Redis keys
+            redis_keys = self.db.get_tenant_redis_keys(name, raise_errors=True)
+            tenant['redis_keys'] = [
+                {
+                    'key_name': key['key_name'],
+                    'has_value': bool(key.get('key_value')),
+                    'last_accessed': key.get('updated_at')
+                }
+                for key in redis_keys
+            ]
+            
+        return tenant
+    
     def update_tenant_metadata(self, tenant_name, metadata):
         """Update tenant metadata"""
         try:
@@ -125,7 +164,9 @@ class TenantService:
                 tenant['metadata'].update(metadata)
                 tenant['updated_at'] = datetime.utcnow()
                 
-                return self.db.save_tenant(tenant)
+                saved = self.db.save_tenant(tenant)
+                self._invalidate(TENANTS_CACHE_TAG)
+                return saved
             return False
         except Exception as e:
             logger.error(f"Update tenant metadata error: {str(e)}")
@@ -136,6 +177,7 @@ class TenantService:
         try:
             # Delete tenant
             tenant_deleted = self.db.delete_tenant(tenant_name)
+            self._invalidate(TENANTS_CACHE_TAG)
             
             # Delete Redis keys
             # Note: This would need to be implemented in database_service
@@ -149,37 +191,34 @@ class TenantService:
             logger.error(f"Delete tenant error: {str(e)}")
             return False
     
+    def get_tenant_stats(self):
+        """Get dashboard tenant statistics (aggregated and cached by the database service)"""
+        if not self.db.connected:
+            return {'total': 0, 'active': 0, 'inactive': 0, 'total_services': 0,
+                    'total_pods': 0, 'total_redis_keys': 0}
+        
+        stats = self._cached('tenant:stats', TENANT_STATS_CACHE_TTL, self.db.get_tenant_stats, [TENANTS_CACHE_TAG])
+        return {
+            'total': stats['total'],
+            'active': stats['active'],
+            'inactive': stats['inactive'],
+            'total_services': stats['total_services'],
+            'total_pods': stats['total_pods'],
+            'total_redis_keys': stats['total_redis_keys']
+        }
+    
     def get_tenant_statistics(self):
         """Get tenant statistics"""
         try:
-            all_tenants = self.db.get_all_tenants()
+            stats = self.db.get_tenant_stats()
             
-            stats = {
-                'total_tenants': len(all_tenants),
-                'tenants_with_redis': 0,
-                'total_services': 0,
-                'total_redis_keys': 0,
-                'latest_scan': None
+            return {
+                'total_tenants': stats['total'],
+                'tenants_with_redis': stats['tenants_with_redis'],
+                'total_services': stats['total_services'],
+                'total_redis_keys': stats['total_redis_keys'],
+                'latest_scan': stats['latest_scan']
             }
-            
-            for tenant in all_tenants:
-                if tenant.get('has_redis'):
-                    stats['tenants_with_redis'] += 1
-                
-                stats['total_services'] += tenant.get('service_count', 0)
-                stats['total_redis_keys'] += tenant.get('redis_key_count', 0)
-                
-                # Track latest scan
-                scan_time = None
-                if tenant.get('scan_metadata') and tenant['scan_metadata'].get('scan_time'):
-                    scan_time = tenant['scan_metadata']['scan_time']
-                elif tenant.get('created_at'):
-                    scan_time = tenant['created_at']
-                
-                if scan_time and (not stats['latest_scan'] or scan_time > stats['latest_scan']):
-                    stats['latest_scan'] = scan_time
-            
-            return stats
         except Exception as e:
             logger.error(f"Get tenant statistics error: {str(e)}")
             return {
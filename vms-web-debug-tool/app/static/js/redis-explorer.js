@@ -9,6 +9,9 @@ class RedisExplorer {
         this.currentKey = null;
         this.keyDetailModal = null;
         this.keyAnalysisModal = null;
+        this.searchTimer = null;
+        this.searchCursor = null;
+        this.searchPageSize = 500;
 
         this.init();
     }
@@ -233,24 +236,46 @@ class RedisExplorer {
     }
 
     filterKeys() {
-        const searchTerm = document.getElementById('key-search').value.toLowerCase();
+        // Name searches run on the server's key index; wait for typing to pause
+        clearTimeout(this.searchTimer);
+        this.searchTimer = setTimeout(() => this.searchKeys(), 250);
+    }
+
+    async searchKeys(append = false) {
+        const searchTerm = document.getElementById('key-search').value.trim();
         const tenantFilter = document.getElementById('tenant-filter').value;
         const typeFilter = document.getElementById('type-filter').value;
+        const matchesType = key => !typeFilter || key.type === typeFilter;
 
-        this.filteredKeys = this.allKeys.filter(key => {
-            // Name filter
-            const matchesName = key.name.toLowerCase().includes(searchTerm);
-
-            // Tenant filter
-            const matchesTenant = !tenantFilter || key.tenant === tenantFilter;
+        if (!searchTerm) {
+            this.searchCursor = null;
+            this.filteredKeys = this.allKeys.filter(key =>
+                (!tenantFilter || key.tenant === tenantFilter) && matchesType(key));
+        } else {
+            const params = new URLSearchParams({ q: searchTerm, limit: this.searchPageSize });
+            if (tenantFilter) params.set('tenant', tenantFilter);
+            if (append && this.searchCursor) params.set('cursor', this.searchCursor);
 
-            // Type filter
-            const matchesType = !typeFilter || key.type === typeFilter;
-
-            return matchesName && matchesTenant && matchesType;
-        });
+            try {
+                const response = await fetch(`/api/redis/search?${params}`);
+                const result = await response.json();
+                if (!result.success) {
+                    this.showError('Failed to search Redis keys: ' + result.error);
+                    return;
+                }
+                // Ignore responses for a term the user has already changed
+                if (document.getElementById('key-search').value.trim() !== searchTerm) return;
+
+                const keys = result.data.filter(matchesType);
+                this.filteredKeys = append ? this.filteredKeys.concat(keys) : keys;
+                this.searchCursor = result.next_cursor;
+            } catch (error) {
+                this.showError('Error searching Redis keys: ' + error.message);
+                return;
+            }
+        }
 
-        this.currentPage = 1; // Reset to first page
+        if (!append) this.currentPage = 1; // Reset to first page
         this.renderKeys();
         this.updateStatistics();
     }
@@ -356,12 +381,17 @@ class RedisExplorer {
         document.getElementById('pagination-nav').style.display = 'none';
     }
 
-    goToPage(page) {
+    async goToPage(page) {
         const totalPages = Math.ceil(this.filteredKeys.length / this.keysPerPage);
 
         if (page < 1 || page > totalPages) return;
 
         this.currentPage = page;
+        if (page === totalPages && this.searchCursor) {
+            // Reached the last loaded page of a search: fetch the next page of matches
+            await this.searchKeys(true);
+            return;
+        }
         this.renderKeys();
     }
 
@@ -4,8 +4,17 @@ class SystemLogsManager {
     constructor() {
         this.allLogs = [];
         this.filteredLogs = [];
-        this.currentPage = 1;
         this.logsPerPage = 20;
+        // Keyset pagination: the server returns opaque cursors for the older/newer page
+        this.cursor = null;
+        this.nextCursor = null;
+        this.prevCursor = null;
+        this.totalLogs = 0;
+        this.unfilteredTotal = 0;
+        // Search / command / date filters, applied by the server before paging
+        this.filters = {};
+        this.filterTimer = null;
+        this.commands = [];
         this.currentLog = null;
         this.logDetailModal = null;
         this.autoRefreshInterval = null;
@@ -19,21 +28,30 @@ class SystemLogsManager {
         this.logDetailModal = new bootstrap.Modal(document.getElementById('logDetailModal'));
 
         // Load system logs
+        this.loadCommands();
         this.loadSystemLogs();
 
         // Set today's date as default filter
         document.getElementById('date-filter').valueAsDate = new Date();
     }
 
-    async loadSystemLogs() {
+    async loadSystemLogs(cursor = this.cursor) {
         try {
-            const response = await fetch('/api/logs/system');
+            const params = new URLSearchParams({ limit: this.logsPerPage, ...this.filters });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`/api/logs/system?${params}`);
             const result = await response.json();
 
-            if (result.success) {
-                this.allLogs = result.data;
+            if (response.ok && result.logs) {
+                this.cursor = cursor;
+                this.nextCursor = result.logs.next_cursor;
+                this.prevCursor = result.logs.prev_cursor;
+                this.totalLogs = result.logs.total;
+                if (Object.keys(this.filters).length === 0) {
+                    this.unfilteredTotal = this.totalLogs;
+                }
+                this.allLogs = result.logs.logs;
                 this.filteredLogs = [...this.allLogs];
-                this.populateFilters();
                 this.renderLogs();
                 this.updateStatistics();
             } else {
@@ -44,10 +62,25 @@ class SystemLogsManager {
         }
     }
 
+    async loadCommands() {
+        try {
+            const response = await fetch('/api/logs/system/commands');
+            const result = await response.json();
+            if (response.ok && result.commands) {
+                this.commands = result.commands;
+                this.populateFilters();
+                this.updateStatistics();
+            }
+        } catch (error) {
+            this.showError('Error loading log commands: ' + error.message);
+        }
+    }
+
     populateFilters() {
-        // Populate command filter
-        const commands = [...new Set(this.allLogs.map(log => log.command))].sort();
+        // Populate command filter (every command in the logs, not just this page)
+        const commands = this.commands;
         const commandFilter = document.getElementById('command-filter');
+        const selected = commandFilter.value;
 
         // Clear existing options except "All Commands"
         while (commandFilter.children.length > 1) {
@@ -61,6 +94,7 @@ class SystemLogsManager {
             option.textContent = command;
             commandFilter.appendChild(option);
         });
+        commandFilter.value = selected;
     }
 
     renderLogs() {
@@ -79,21 +113,15 @@ class SystemLogsManager {
             return;
         }
 
-        // Calculate pagination
-        const totalPages = Math.ceil(totalLogs / this.logsPerPage);
-        const startIndex = (this.currentPage - 1) * this.logsPerPage;
-        const endIndex = Math.min(startIndex + this.logsPerPage, totalLogs);
-        const pageLogs = this.filteredLogs.slice(startIndex, endIndex);
-
-        // Render logs
-        const logsHtml = pageLogs.map(log => this.createLogCard(log)).join('');
+        // Render logs (the server already returned one page)
+        const logsHtml = this.filteredLogs.map(log => this.createLogCard(log)).join('');
         container.innerHTML = logsHtml;
 
         // Update pagination
-        this.updatePagination(totalPages);
+        this.updatePagination();
 
-        // Update counts
-        document.getElementById('logs-count').textContent = totalLogs;
+        // Update counts (all matching logs, not just this page)
+        document.getElementById('logs-count').textContent = this.totalLogs;
     }
 
     createLogCard(log) {
@@ -221,33 +249,27 @@ class SystemLogsManager {
     }
 
     filterLogs() {
-        const searchTerm = document.getElementById('log-search').value.toLowerCase();
-        const commandFilter = document.getElementById('command-filter').value;
-        const dateFilter = document.getElementById('date-filter').value;
-
-        this.filteredLogs = this.allLogs.filter(log => {
-            // Text search (command and output)
-            const matchesSearch = !searchTerm ||
-                log.command.toLowerCase().includes(searchTerm) ||
-                (log.output && log.output.toLowerCase().includes(searchTerm));
-
-            // Command filter
-            const matchesCommand = !commandFilter || log.command === commandFilter;
-
-            // Date filter
-            let matchesDate = true;
+        // Filters run on the server over all logs; wait for typing to pause before asking
+        clearTimeout(this.filterTimer);
+        this.filterTimer = setTimeout(() => {
+            const searchTerm = document.getElementById('log-search').value.trim();
+            const commandFilter = document.getElementById('command-filter').value;
+            const dateFilter = document.getElementById('date-filter').value;
+
+            const filters = {};
+            if (searchTerm) filters.search = searchTerm;
+            if (commandFilter) filters.command = commandFilter;
             if (dateFilter) {
-                const logDate = new Date(log.timestamp).toDateString();
-                const filterDate = new Date(dateFilter).toDateString();
-                matchesDate = logDate === filterDate;
+                // The chosen day in the browser's time zone, as a UTC range
+                const [year, month, day] = dateFilter.split('-').map(Number);
+                filters.since = new Date(year, month - 1, day).toISOString();
+                filters.until = new Date(year, month - 1, day + 1).toISOString();
             }
 
-            return matchesSearch && matchesCommand && matchesDate;
-        });
-
-        this.currentPage = 1; // Reset to first page
-        this.renderLogs();
-        this.updateStatistics();
+            // Cursors belong to the filters they were issued for: start again from the newest page
+            this.filters = filters;
+            this.loadSystemLogs(null);
+        }, 300);
     }
 
     sortLogs() {
@@ -270,9 +292,9 @@ class SystemLogsManager {
     }
 
     updateStatistics() {
-        const totalLogs = this.allLogs.length;
-        const uniqueCommands = new Set(this.allLogs.map(log => log.command)).size;
-        const filteredLogs = this.filteredLogs.length;
+        const totalLogs = this.unfilteredTotal;
+        const uniqueCommands = this.commands.length;
+        const filteredLogs = this.totalLogs;
 
         // Find latest run time
         let latestRun = 'Never';
@@ -287,8 +309,8 @@ class SystemLogsManager {
         document.getElementById('latest-run').textContent = latestRun;
     }
 
-    updatePagination(totalPages) {
-        if (totalPages <= 1) {
+    updatePagination() {
+        if (!this.nextCursor && !this.prevCursor) {
             this.hidePagination();
             return;
         }
@@ -299,28 +321,18 @@ class SystemLogsManager {
         // Clear existing pagination
         paginationList.innerHTML = '';
 
-        // Previous button
-        const prevLi = document.createElement('li');
-        prevLi.className = `page-item ${this.currentPage === 1 ? 'disabled' : ''}`;
-        prevLi.innerHTML = `<a class="page-link" href="#" onclick="systemLogsManager.goToPage(${this.currentPage - 1})">Previous</a>`;
-        paginationList.appendChild(prevLi);
-
-        // Page numbers
-        const startPage = Math.max(1, this.currentPage - 2);
-        const endPage = Math.min(totalPages, this.currentPage + 2);
-
-        for (let i = startPage; i <= endPage; i++) {
-            const pageLi = document.createElement('li');
-            pageLi.className = `page-item ${i === this.currentPage ? 'active' : ''}`;
-            pageLi.innerHTML = `<a class="page-link" href="#" onclick="systemLogsManager.goToPage(${i})">${i}</a>`;
-            paginationList.appendChild(pageLi);
-        }
-
-        // Next button
-        const nextLi = document.createElement('li');
-        nextLi.className = `page-item ${this.currentPage === totalPages ? 'disabled' : ''}`;
-        nextLi.innerHTML = `<a class="page-link" href="#" onclick="systemLogsManager.goToPage(${this.currentPage + 1})">Next</a>`;
-        paginationList.appendChild(nextLi);
+        // Newest / Newer / Older buttons (keyset pages have no page numbers)
+        const buttons = [
+            ['Newest', this.cursor ? "systemLogsManager.goToNewest()" : null],
+            ['Newer', this.prevCursor ? "systemLogsManager.goToPage('prev')" : null],
+            ['Older', this.nextCursor ? "systemLogsManager.goToPage('next')" : null]
+        ];
+        buttons.forEach(([label, action]) => {
+            const li = document.createElement('li');
+            li.className = `page-item ${action ? '' : 'disabled'}`;
+            li.innerHTML = `<a class="page-link" href="#" onclick="${action || 'return false'}; return false;">${label}</a>`;
+            paginationList.appendChild(li);
+        });
 
         paginationNav.style.display = 'block';
     }
@@ -329,13 +341,15 @@ class SystemLogsManager {
         document.getElementById('pagination-nav').style.display = 'none';
     }
 
-    goToPage(page) {
-        const totalPages = Math.ceil(this.filteredLogs.length / this.logsPerPage);
+    goToPage(direction) {
+        const cursor = direction === 'next' ? this.nextCursor : this.prevCursor;
+        if (!cursor) return;
 
-        if (page < 1 || page > totalPages) return;
+        this.loadSystemLogs(cursor);
+    }
 
-        this.currentPage = page;
-        this.renderLogs();
+    goToNewest() {
+        this.loadSystemLogs(null);
     }
 
     toggleAutoRefresh() {
@@ -367,6 +381,7 @@ class SystemLogsManager {
             </div>
         `;
 
+        this.loadCommands();
         await this.loadSystemLogs();
     }
 
@@ -408,7 +423,8 @@ class SystemLogsManager {
 
             if (result.success) {
                 this.showSuccess('All system logs cleared successfully');
-                await this.loadSystemLogs();
+                this.loadCommands();
+                await this.loadSystemLogs(null);
             } else {
                 this.showError('Failed to clear logs: ' + result.error);
             }
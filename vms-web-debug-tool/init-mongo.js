@@ -8,24 +8,36 @@ db.createCollection('system_logs');
 db.createCollection('ssh_connections');
 db.createCollection('vms_status_logs');
 
+// Log retention: TTL indexes expire log documents after 30 days (2592000s) in the background.
+// The app re-applies these at startup with LOG_RETENTION_DAYS (see ensure_retention_indexes).
+const logRetentionSeconds = 30 * 24 * 60 * 60;
+
 // Create indexes for better performance
 db.tenants.createIndex({ "name": 1 }, { unique: true });
 db.tenants.createIndex({ "redis_info.cluster_ip": 1 });
 db.tenants.createIndex({ "created_at": -1 });
 
 db.redis_keys.createIndex({ "tenant_name": 1 });
+db.redis_keys.createIndex({ "tenant_name": 1, "key_name": 1 }, { unique: true });
 db.redis_keys.createIndex({ "key_name": 1 });
+// Key search: prefix ranges / page order, and trigram (multikey) lookups for substrings
+db.redis_keys.createIndex({ "tenant_name": 1, "key_name_lower": 1, "key_name": 1 });
+db.redis_keys.createIndex({ "tenant_name": 1, "key_trigrams": 1 });
+db.redis_keys.createIndex({ "key_trigrams": 1 });
 db.redis_keys.createIndex({ "created_at": -1 });
 
-db.system_logs.createIndex({ "timestamp": -1 });
+db.system_logs.createIndex({ "timestamp": -1 }, { expireAfterSeconds: logRetentionSeconds });
+db.system_logs.createIndex({ "timestamp": -1, "_id": -1 });
+db.system_logs.createIndex({ "log_type": 1, "timestamp": -1, "_id": -1 });
 db.system_logs.createIndex({ "log_type": 1 });
 db.system_logs.createIndex({ "level": 1 });
 
 db.ssh_connections.createIndex({ "host": 1 });
 db.ssh_connections.createIndex({ "status": 1 });
-db.ssh_connections.createIndex({ "created_at": -1 });
+db.ssh_connections.createIndex({ "created_at": -1 }, { expireAfterSeconds: logRetentionSeconds });
 
-db.vms_status_logs.createIndex({ "run_time": -1 });
+db.vms_status_logs.createIndex({ "run_time": -1 }, { expireAfterSeconds: logRetentionSeconds });
+db.vms_status_logs.createIndex({ "run_time": -1, "_id": -1 });
 db.vms_status_logs.createIndex({ "command": 1 });
 
 print('MongoDB initialized with VMS Debug Tool collections and indexes');
\ No newline at end of file